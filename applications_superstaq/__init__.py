@@ -2,33 +2,57 @@ from applications_superstaq._init_vars import API_URL, API_VERSION
 from applications_superstaq._version import __version__
 from applications_superstaq.resource_estimate import ResourceEstimate
 from applications_superstaq.superstaq_exceptions import (
+    SuperstaQCircuitOpenException,
     SuperstaQException,
     SuperstaQModuleNotFoundException,
     SuperstaQNotFoundException,
     SuperstaQUnsuccessfulJobException,
 )
+from . import async_superstaq_client
+from . import circuit_breaker
 from . import converters
 from . import finance
+from . import job_poller
+from . import json_backend
+from . import json_stream
 from . import logistics
+from . import metadata_cache
 from . import qubo
+from . import rate_limiter
+from . import result_cache
+from . import retry_policy
+from . import returns_cache
 from . import superstaq_client
 from . import superstaq_exceptions
+from . import tracing
 from . import user_config
 
 __all__ = [
     "__version__",
     "API_URL",
     "API_VERSION",
+    "SuperstaQCircuitOpenException",
     "SuperstaQException",
     "SuperstaQModuleNotFoundException",
     "SuperstaQNotFoundException",
     "SuperstaQUnsuccessfulJobException",
+    "async_superstaq_client",
+    "circuit_breaker",
     "converters",
     "finance",
+    "job_poller",
+    "json_backend",
+    "json_stream",
     "logistics",
+    "metadata_cache",
     "qubo",
     "ResourceEstimate",
+    "rate_limiter",
+    "result_cache",
+    "retry_policy",
+    "returns_cache",
     "superstaq_client",
     "superstaq_exceptions",
+    "tracing",
     "user_config",
 ]
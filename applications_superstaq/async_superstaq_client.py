@@ -0,0 +1,472 @@
+"""Asynchronous client for making requests to SuperstaQ's API."""
+
+import asyncio
+import contextlib
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import applications_superstaq
+from applications_superstaq import superstaq_client
+
+
+def _import_aiohttp() -> Any:
+    """Imports `aiohttp`, which is only required by the asynchronous client."""
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise applications_superstaq.SuperstaQModuleNotFoundException(
+            "aiohttp", "AsyncSuperstaQClient"
+        ) from e
+    return aiohttp
+
+
+_TraceCallback = Callable[[Any, Any, Any], Awaitable[None]]
+
+
+def _timer(field: str) -> Tuple[_TraceCallback, _TraceCallback]:
+    """Returns `aiohttp` trace callbacks which time the interval between two signals, recording it
+    as `field` of the `RequestTrace` passed as the request's `trace_request_ctx`."""
+
+    async def start(session: Any, context: Any, params: Any) -> None:
+        setattr(context, field, time.perf_counter())
+
+    async def end(session: Any, context: Any, params: Any) -> None:
+        setattr(context.trace_request_ctx, field, time.perf_counter() - getattr(context, field))
+
+    return start, end
+
+
+async def _on_request_chunk_sent(session: Any, context: Any, params: Any) -> None:
+    context.trace_request_ctx.request_bytes += len(params.chunk)
+
+
+async def _on_response_chunk_received(session: Any, context: Any, params: Any) -> None:
+    context.trace_request_ctx.response_bytes += len(params.chunk)
+
+
+async def _iterate(stream: "applications_superstaq.json_stream.JsonStream") -> AsyncIterator[bytes]:
+    for chunk in stream:
+        yield chunk
+
+
+def _request_body(body_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the body keyword arguments of one attempt at a request, with any `JsonStream`
+    wrapped in a new asynchronous iterator (which `aiohttp` sends with chunked encoding)."""
+    data = body_kwargs.get("data")
+    if isinstance(data, applications_superstaq.json_stream.JsonStream):
+        return {**body_kwargs, "data": _iterate(data)}
+    return body_kwargs
+
+
+async def _iter_chunks(stack: contextlib.AsyncExitStack, response: Any) -> AsyncIterator[bytes]:
+    """Iterates over the body of a response, releasing it (via its exit stack) afterwards."""
+    async with stack:
+        async for chunk in response.content.iter_any():
+            yield chunk
+
+
+def _trace_config(aiohttp: Any) -> Any:
+    """Returns an `aiohttp.TraceConfig` recording the timings and sizes of each request in the
+    `RequestTrace` passed as its `trace_request_ctx`."""
+    trace_config = aiohttp.TraceConfig()
+    signals = [
+        ("dns_seconds", trace_config.on_dns_resolvehost_start, trace_config.on_dns_resolvehost_end),
+        (
+            "connect_seconds",
+            trace_config.on_connection_create_start,
+            trace_config.on_connection_create_end,
+        ),
+        ("server_seconds", trace_config.on_request_headers_sent, trace_config.on_request_end),
+    ]
+    for field, start_signal, end_signal in signals:
+        start, end = _timer(field)
+        start_signal.append(start)
+        end_signal.append(end)
+    trace_config.on_request_chunk_sent.append(_on_request_chunk_sent)
+    trace_config.on_response_chunk_received.append(_on_response_chunk_received)
+    return trace_config
+
+
+class AsyncSuperstaQClient(superstaq_client._BaseSuperstaQClient):
+    """Handles asynchronous calls to SuperstaQ's API.
+
+    Mirrors every endpoint of `_SuperstaQClient` with a coroutine, so that a single event loop can
+    keep many requests in flight at once. Retries follow the same `RetryPolicy` as
+    `_SuperstaQClient`, but wait with `asyncio.sleep` instead of blocking the event loop.
+
+    Requires the optional `aiohttp` package. The underlying `aiohttp.ClientSession` is created on
+    first use (i.e. inside the running event loop), and should be released with `close()` or by
+    using the client as an asynchronous context manager.
+    """
+
+    def _init_session(self) -> None:
+        self._aiohttp = _import_aiohttp()
+        self._session: Optional[Any] = None
+
+    def _get_session(self) -> Any:
+        if self._session is None or self._session.closed:
+            connector = self._aiohttp.TCPConnector(
+                limit=self.pool_connections * self.pool_maxsize,
+                limit_per_host=self.pool_maxsize,
+                force_close=not self.keep_alive,
+            )
+            trace_configs = [_trace_config(self._aiohttp)] if self.request_hooks else None
+            self._session = self._aiohttp.ClientSession(
+                connector=connector, trace_configs=trace_configs
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Closes all pooled connections held by this client."""
+        if self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self) -> "AsyncSuperstaQClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def get_request(self, endpoint: str) -> dict:
+        return await self._make_request("GET", endpoint, idempotent=True)
+
+    async def post_request(self, endpoint: str, json_dict: Dict[str, Any]) -> dict:
+        return await self._post_request(endpoint, json_dict)
+
+    async def _post_request(
+        self, endpoint: str, json_dict: Dict[str, Any], stream: bool = False
+    ) -> Any:
+        """Makes a POST request (see `_make_request`)."""
+        try:
+            idempotent = endpoint in self.IDEMPOTENT_ENDPOINTS
+            return await self._make_request("POST", endpoint, idempotent, json_dict, stream)
+        finally:
+            self._invalidate_balance(endpoint)
+
+    async def _cached_get_request(self, endpoint: str) -> dict:
+        """Makes a GET request to a metadata endpoint, via the metadata cache (if any)."""
+        if self.metadata_cache is None:
+            return await self.get_request(endpoint)
+        return await self.metadata_cache.get_async(endpoint, lambda: self.get_request(endpoint))
+
+    async def create_job(
+        self,
+        serialized_circuits: Dict[str, str],
+        repetitions: Optional[int] = None,
+        target: Optional[str] = None,
+        ibmq_pulse: Optional[bool] = None,
+    ) -> dict:
+        """Create a job (see `_SuperstaQClient.create_job`)."""
+        json_dict = self._create_job_json(serialized_circuits, repetitions, target, ibmq_pulse)
+        return await self.post_request("/jobs", json_dict)
+
+    async def get_job(self, job_id: str) -> dict:
+        """Get the job from the SuperstaQ API (see `_SuperstaQClient.get_job`)."""
+        return await self.get_request(f"/job/{job_id}")
+
+    async def create_jobs(
+        self,
+        batch: Sequence[Dict[str, str]],
+        repetitions: Optional[int] = None,
+        target: Optional[str] = None,
+        ibmq_pulse: Optional[bool] = None,
+    ) -> List[superstaq_client.JobResult]:
+        """Create many jobs concurrently (see `_SuperstaQClient.create_jobs`).
+
+        At most `pool_maxsize` requests are in flight at once.
+        """
+        semaphore = asyncio.Semaphore(self.pool_maxsize)
+
+        async def create(serialized_circuits: Dict[str, str]) -> superstaq_client.JobResult:
+            async with semaphore:
+                try:
+                    return await self.create_job(
+                        serialized_circuits, repetitions, target, ibmq_pulse
+                    )
+                except (applications_superstaq.SuperstaQException, TimeoutError) as e:
+                    return e
+
+        return list(await asyncio.gather(*(create(circuits) for circuits in batch)))
+
+    async def get_jobs(
+        self, job_ids: Sequence[str], chunk_size: int = 100
+    ) -> List[superstaq_client.JobResult]:
+        """Get many jobs from the SuperstaQ API at once (see `_SuperstaQClient.get_jobs`).
+
+        At most `pool_maxsize` requests are in flight at once.
+        """
+        semaphore = asyncio.Semaphore(self.pool_maxsize)
+
+        async def get_job(job_id: str) -> superstaq_client.JobResult:
+            async with semaphore:
+                try:
+                    return await self.get_job(job_id)
+                except (applications_superstaq.SuperstaQException, TimeoutError) as e:
+                    return e
+
+        async def get_chunk(chunk: List[str]) -> Optional[List[superstaq_client.JobResult]]:
+            async with semaphore:
+                if not self._bulk_get_jobs:
+                    return None
+                try:
+                    jobs = await self.post_request("/get_jobs", {"job_ids": chunk})
+                except applications_superstaq.SuperstaQNotFoundException:
+                    self._bulk_get_jobs = False
+                    return None
+                except (applications_superstaq.SuperstaQException, TimeoutError) as e:
+                    return self._unpack_jobs(chunk, e)
+                return self._unpack_jobs(chunk, jobs)
+
+        chunks = self._job_id_chunks(job_ids, chunk_size)
+        chunk_results = await asyncio.gather(*(get_chunk(chunk) for chunk in chunks))
+
+        # Fall back to individual requests for any chunks the bulk endpoint was not available for.
+        unfetched = [
+            job_id for chunk, jobs in zip(chunks, chunk_results) if jobs is None for job_id in chunk
+        ]
+        fetched = iter(await asyncio.gather(*(get_job(job_id) for job_id in unfetched)))
+        return [
+            job
+            for chunk, jobs in zip(chunks, chunk_results)
+            for job in (jobs if jobs is not None else [next(fetched) for _ in chunk])
+        ]
+
+    async def get_balance(self) -> dict:
+        """Get the querying user's account balance in USD."""
+        return await self._cached_get_request("/balance")
+
+    async def get_backends(self) -> dict:
+        """Makes a GET request to SuperstaQ API to get a list of available backends."""
+        return await self._cached_get_request("/backends")
+
+    async def ibmq_set_token(self, ibmq_token: Dict[str, str]) -> dict:
+        """Makes a POST request to SuperstaQ API to set IBMQ token field in database."""
+        return await self.post_request("/ibmq_token", ibmq_token)
+
+    async def resource_estimate(self, json_dict: Dict[str, str]) -> dict:
+        return await self.post_request("/resource_estimate", json_dict)
+
+    async def aqt_compile(self, json_dict: Dict[str, Union[int, str, List[str]]]) -> dict:
+        """Makes a POST request to SuperstaQ API to compile a list of circuits for Berkeley-AQT."""
+        return await self.post_request("/aqt_compile", json_dict)
+
+    async def qscout_compile(self, json_dict: Dict[str, Union[str, List[str]]]) -> dict:
+        """Makes a POST request to SuperstaQ API to compile a list of circuits for QSCOUT."""
+        return await self.post_request("/qscout_compile", json_dict)
+
+    async def cq_compile(self, json_dict: Dict[str, Union[str, List[str]]]) -> dict:
+        """Makes a POST request to SuperstaQ API to compile a list of circuits for CQ."""
+        return await self.post_request("/cq_compile", json_dict)
+
+    async def ibmq_compile(self, json_dict: Dict[str, Union[str, List[str]]]) -> dict:
+        """Makes a POST request to SuperstaQ API to compile a circuits for IBM devices."""
+        return await self.post_request("/ibmq_compile", json_dict)
+
+    async def neutral_atom_compile(self, json_dict: Dict[str, Union[str, List[str]]]) -> dict:
+        """Makes a POST request to SuperstaQ API to compile a circuits for neutral atom devices."""
+        return await self.post_request("/neutral_atom_compile", json_dict)
+
+    async def submit_qubo(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int = 1000,
+        variables: Optional[Sequence[Any]] = None,
+    ) -> dict:
+        """Submits a QUBO problem to the given target (see `_SuperstaQClient.submit_qubo`)."""
+        return await self._submit_qubo(qubo, target, repetitions, variables)
+
+    async def submit_qubo_stream(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int = 1000,
+        variables: Optional[Sequence[Any]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Submits a QUBO problem, streaming the response as it is received (see
+        `_SuperstaQClient.submit_qubo_stream` and `qubo.aiter_json_qubo_result`)."""
+        return await self._submit_qubo(qubo, target, repetitions, variables, stream=True)
+
+    async def _submit_qubo(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int,
+        variables: Optional[Sequence[Any]],
+        stream: bool = False,
+    ) -> Any:
+        """Sends a `/qubo` request, falling back to the list-of-dictionaries format if needed."""
+        json_dict = self._submit_qubo_json(qubo, target, repetitions, variables)
+        try:
+            return await self._post_request("/qubo", json_dict, stream)
+        except applications_superstaq.SuperstaQException as e:
+            if not self._columnar_qubo_rejected(json_dict, e):
+                raise
+        json_dict = self._submit_qubo_json(qubo, target, repetitions, variables)
+        return await self._post_request("/qubo", json_dict, stream)
+
+    async def _cached_post_request(
+        self, endpoint: str, json_dict: Dict[str, Any], bypass_cache: bool
+    ) -> dict:
+        """Makes a POST request to a deterministic endpoint, via the result cache (if any)."""
+        key, result = self._cached_result(endpoint, json_dict, bypass_cache)
+        if result is None:
+            result = await self.post_request(endpoint, json_dict)
+            self._cache_result(key, endpoint, result)
+        return result
+
+    async def find_min_vol_portfolio(self, json_dict: dict, bypass_cache: bool = False) -> dict:
+        """Makes a POST request to SuperstaQ API to find a minimum volatility portfolio
+        that exceeds a certain specified return."""
+        return await self._cached_post_request("/minvol", json_dict, bypass_cache)
+
+    async def find_min_vol_frontier(
+        self, json_dict: dict, bypass_cache: bool = False
+    ) -> List[dict]:
+        """Finds the minimum volatility portfolio for each of a list of desired returns (see
+        `_SuperstaQClient.find_min_vol_frontier`).
+
+        Without the batched endpoint, at most `pool_maxsize` points are requested at once.
+        """
+        if self._bulk_minvol_frontier:
+            try:
+                result = await self._cached_post_request(
+                    "/minvol_frontier", json_dict, bypass_cache
+                )
+                return result["frontier"]
+            except applications_superstaq.SuperstaQNotFoundException:
+                self._bulk_minvol_frontier = False
+
+        semaphore = asyncio.Semaphore(self.pool_maxsize)
+
+        async def find_point(point: Dict[str, Any]) -> dict:
+            async with semaphore:
+                return await self.find_min_vol_portfolio(point, bypass_cache)
+
+        points = self._minvol_frontier_points(json_dict)
+        return list(await asyncio.gather(*(find_point(point) for point in points)))
+
+    async def find_max_pseudo_sharpe_ratio(
+        self, json_dict: dict, bypass_cache: bool = False
+    ) -> dict:
+        """Makes a POST request to SuperstaQ API to find a max Sharpe ratio portfolio."""
+        return await self._cached_post_request("/maxsharpe", json_dict, bypass_cache)
+
+    async def tsp(self, json_dict: dict, bypass_cache: bool = False) -> dict:
+        """Makes a POST request to SuperstaQ API to find a optimal TSP tour."""
+        return await self._cached_post_request("/tsp", json_dict, bypass_cache)
+
+    async def warehouse(self, json_dict: dict, bypass_cache: bool = False) -> dict:
+        """Makes a POST request to SuperstaQ API to find optimal warehouse assignment."""
+        return await self._cached_post_request("/warehouse", json_dict, bypass_cache)
+
+    async def aqt_upload_configs(self, aqt_configs: Dict[str, str]) -> dict:
+        """Makes a POST request to SuperstaQ API to upload configurations."""
+        return await self.post_request("/aqt_configs", aqt_configs)
+
+    async def aqt_get_configs(self) -> dict:
+        """Gets AQT configs from the AQT system."""
+        return await self.get_request("/get_aqt_configs")
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        idempotent: bool,
+        json_dict: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+    ) -> Any:
+        """Make a request to the API, retrying if necessary (see `RetryPolicy`).
+
+        Every attempt is subject to the client's circuit breaker and rate limiter (if any), and the
+        whole request is traced for the client's request hooks.
+
+        Args:
+            method: The http method of the request ("GET" or "POST").
+            endpoint: The API endpoint to send the request to.
+            idempotent: Whether the request can safely be sent more than once.
+            json_dict: The json body of the request, if any.
+            stream: Whether to return an asynchronous iterator over the chunks of the body of the
+                response, which is downloaded as it is iterated over (and holds the response's
+                connection until it is exhausted or closed).
+
+        Raises:
+            SuperstaQException: If there was a not-retriable error from the API.
+            SuperstaQCircuitOpenException: If the client's circuit breaker is open.
+            TimeoutError: If the requests retried for more than `max_retry_seconds`.
+
+        Returns:
+            The json body of the final successful response (or an iterator over it, if `stream`).
+        """
+        body_kwargs, uncompressed_bytes = self._body_kwargs(json_dict)
+        with self._traced(method, endpoint, uncompressed_bytes) as trace:
+            stack, response = await self._send(trace, method, endpoint, idempotent, body_kwargs)
+            if stream:
+                return _iter_chunks(stack, response)
+            async with stack:
+                return self.json_backend.loads(await response.read())
+
+    async def _send(
+        self,
+        trace: "applications_superstaq.tracing.RequestTrace",
+        method: str,
+        endpoint: str,
+        idempotent: bool,
+        body_kwargs: Dict[str, Any],
+    ) -> Tuple[contextlib.AsyncExitStack, Any]:
+        """Sends a request until it succeeds (see `_make_request`).
+
+        Returns:
+            The successful response (whose body has not been read yet), and the exit stack which
+            releases it (and the request's rate limiter slot, if any) once it has been read.
+        """
+        deadline = self._retry_deadline()
+        delays = self.retry_policy.delays()
+        while True:
+            retry_after = None
+            try:
+                with self._circuit_attempt() as attempt:
+                    trace.start_attempt()
+                    async with contextlib.AsyncExitStack() as stack:
+                        await stack.enter_async_context(self._rate_limited_async(endpoint))
+                        response = await stack.enter_async_context(
+                            self._get_session().request(
+                                method,
+                                f"{self.url}{endpoint}",
+                                **_request_body(body_kwargs),
+                                ssl=self.verify_https,
+                                trace_request_ctx=trace,
+                            )
+                        )
+                        attempt.status_code = trace.status_code = response.status
+                        self._trace_stream(trace, body_kwargs.get("data"))
+                        if response.ok:
+                            return stack.pop_all(), response
+
+                        text = await response.text()
+                        self._check_status_code(
+                            response.status, lambda: self._error_message(text), idempotent
+                        )
+                        message = response.reason
+                        retry_after = response.headers.get("Retry-After")
+
+            # Fallthrough should retry.
+            except (self._aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Connection error, timeout (at the server, or of the client's session), or too
+                # many redirects.
+                message = self._check_request_error(e, idempotent)
+            delay_seconds = self.retry_policy.retry_delay(next(delays), retry_after)
+            self._check_retry(deadline, delay_seconds, message)
+            trace.backoff_seconds += delay_seconds
+            await asyncio.sleep(delay_seconds)
@@ -0,0 +1,597 @@
+import asyncio
+import contextlib
+import gzip
+import io
+import json
+import sys
+import types
+from typing import Any, AsyncIterator, Dict, List, Optional
+from unittest import mock
+
+import aiohttp
+import pytest
+import qubovert as qv
+import requests
+
+import applications_superstaq
+from applications_superstaq.retry_policy import RetryPolicy
+
+API_VERSION = applications_superstaq.API_VERSION
+EXPECTED_HEADERS = {
+    "Authorization": "to_my_heart",
+    "Content-Type": "application/json",
+    "X-Client-Version": API_VERSION,
+    "X-Client-Name": "applications-superstaq",
+}
+
+
+class _MockResponse:
+    """Stands in for an `aiohttp.ClientResponse` (and the context manager returning it)."""
+
+    def __init__(
+        self, status: int = 200, body: Any = None, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        self.status = status
+        self.ok = status < 400
+        self.reason = "reason"
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self) -> "_MockResponse":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        pass
+
+    async def read(self) -> bytes:
+        return (await self.text()).encode()
+
+    async def text(self) -> str:
+        return self.body if isinstance(self.body, str) else json.dumps(self.body)
+
+    @property
+    def content(self) -> Any:
+        async def iter_any() -> AsyncIterator[bytes]:
+            text = await self.text()
+            for start in range(0, len(text), 4):
+                yield text[start:][:4].encode()
+
+        return types.SimpleNamespace(iter_any=iter_any)
+
+
+def _client(**kwargs: Any) -> applications_superstaq.async_superstaq_client.AsyncSuperstaQClient:
+    return applications_superstaq.async_superstaq_client.AsyncSuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+        **kwargs,
+    )
+
+
+def _mock_request(*responses: Any) -> Any:
+    return mock.patch("aiohttp.ClientSession.request", side_effect=list(responses))
+
+
+def test_async_superstaq_client_str_and_repr() -> None:
+    client = _client()
+    assert (
+        str(client) == "Client with host=http://example.com/v0.1.0 and name=applications-superstaq"
+    )
+    assert str(eval(repr(client))) == str(client)
+
+
+def test_async_superstaq_client_requires_aiohttp() -> None:
+    with mock.patch.dict(sys.modules, {"aiohttp": None}):
+        with pytest.raises(
+            applications_superstaq.SuperstaQModuleNotFoundException, match="aiohttp"
+        ):
+            _ = _client()
+
+
+def test_async_superstaq_client_session() -> None:
+    async def run() -> None:
+        async with _client(pool_connections=2, pool_maxsize=3, keep_alive=False) as client:
+            session = client._get_session()
+            assert client._get_session() is session
+            assert session.connector.limit == 6
+            assert session.connector.limit_per_host == 3
+            assert session.connector.force_close
+        assert session.closed
+
+        # A new session is opened if the client is used after being closed.
+        assert client._get_session() is not session
+        await client.close()
+
+    asyncio.run(run())
+    asyncio.run(_client().close())
+
+
+@pytest.mark.parametrize(
+    "method_name, args, http_method, endpoint, expected_json",
+    [
+        ("get_job", ["job_id"], "GET", "/job/job_id", None),
+        ("get_balance", [], "GET", "/balance", None),
+        ("get_backends", [], "GET", "/backends", None),
+        ("aqt_get_configs", [], "GET", "/get_aqt_configs", None),
+        ("ibmq_set_token", [{"ibmq_token": "token"}], "POST", "/ibmq_token", None),
+        ("resource_estimate", [{"Hello": "World"}], "POST", "/resource_estimate", None),
+        ("aqt_compile", [{"Hello": "World"}], "POST", "/aqt_compile", None),
+        ("qscout_compile", [{"Hello": "World"}], "POST", "/qscout_compile", None),
+        ("cq_compile", [{"Hello": "World"}], "POST", "/cq_compile", None),
+        ("ibmq_compile", [{"Hello": "World"}], "POST", "/ibmq_compile", None),
+        ("neutral_atom_compile", [{"Hello": "World"}], "POST", "/neutral_atom_compile", None),
+        ("find_min_vol_portfolio", [{"desired_return": 8}], "POST", "/minvol", None),
+        ("find_max_pseudo_sharpe_ratio", [{"k": 0.5}], "POST", "/maxsharpe", None),
+        ("tsp", [{"locs": ["Chicago", "St Louis"]}], "POST", "/tsp", None),
+        ("warehouse", [{"k": 1}], "POST", "/warehouse", None),
+        ("aqt_upload_configs", [{"pulses": "Hello"}], "POST", "/aqt_configs", None),
+        (
+            "create_job",
+            [{"Hello": "World"}, 200, "qpu", True],
+            "POST",
+            "/jobs",
+            {"Hello": "World", "backend": "qpu", "shots": 200, "ibmq_pulse": True},
+        ),
+        (
+            "submit_qubo",
+            [qv.QUBO({(0,): 1.0, (0, 1): -2.0}), "example_target", 10],
+            "POST",
+            "/qubo",
+            {
+                "qubo": {
+                    "format": "columnar",
+                    "variables": ["0", "1"],
+                    "row": [0, 0],
+                    "col": [0, 1],
+                    "value": [1.0, -2.0],
+                },
+                "backend": "example_target",
+                "shots": 10,
+            },
+        ),
+    ],
+)
+def test_async_superstaq_client_endpoints(
+    method_name: str,
+    args: List[Any],
+    http_method: str,
+    endpoint: str,
+    expected_json: Optional[Dict[str, Any]],
+) -> None:
+    if expected_json is None and http_method == "POST":
+        expected_json = args[0]
+
+    async def run() -> Any:
+        async with _client() as client:
+            return await getattr(client, method_name)(*args)
+
+    with _mock_request(_MockResponse(body={"foo": "bar"})) as mock_request:
+        assert asyncio.run(run()) == {"foo": "bar"}
+
+    body_kwargs = {}
+    if expected_json is not None:
+        body_kwargs["data"] = applications_superstaq.json_backend.get_backend().dumps(expected_json)
+    mock_request.assert_called_once_with(
+        http_method,
+        f"http://example.com/{API_VERSION}{endpoint}",
+        **body_kwargs,
+        headers=EXPECTED_HEADERS,
+        ssl=False,
+        trace_request_ctx=mock.ANY,
+    )
+
+
+@pytest.mark.parametrize(
+    "status_code, body, exception, match",
+    [
+        (
+            requests.codes.unauthorized,
+            None,
+            applications_superstaq.SuperstaQException,
+            "Not authorized",
+        ),
+        (
+            requests.codes.not_found,
+            None,
+            applications_superstaq.SuperstaQNotFoundException,
+            "not find",
+        ),
+        (
+            requests.codes.bad_request,
+            {"message": "foo bar"},
+            applications_superstaq.SuperstaQException,
+            "Status code: 400, Message: 'Non-retriable error making request to SuperstaQ API, "
+            "foo bar'",
+        ),
+        (
+            requests.codes.not_implemented,
+            "not json",
+            applications_superstaq.SuperstaQException,
+            "Status code: 501, Message: 'Non-retriable error making request to SuperstaQ API, "
+            "not json'",
+        ),
+    ],
+)
+def test_async_superstaq_client_errors(
+    status_code: int, body: Any, exception: type, match: str
+) -> None:
+    client = _client()
+    with _mock_request(_MockResponse(status_code, body)):
+        with pytest.raises(exception, match=match):
+            asyncio.run(client.get_job("job_id"))
+
+
+def test_async_superstaq_client_retry() -> None:
+    client = _client(verbose=True, retry_policy=RetryPolicy(jitter=None))
+    responses = [
+        _MockResponse(503),
+        aiohttp.ClientConnectionError(),
+        # aiohttp raises this when the session's total timeout expires.
+        asyncio.TimeoutError(),
+        _MockResponse(body={"foo": "bar"}),
+    ]
+    test_stdout = io.StringIO()
+    with _mock_request(*responses) as mock_request, mock.patch("asyncio.sleep") as mock_sleep:
+        with contextlib.redirect_stdout(test_stdout):
+            assert asyncio.run(client.get_job("job_id")) == {"foo": "bar"}
+
+    assert mock_request.call_count == 4
+    mock_sleep.assert_has_calls([mock.call(0.1), mock.call(0.2), mock.call(0.4)])
+    assert test_stdout.getvalue().splitlines() == [
+        "Waiting 0.1 seconds before retrying.",
+        "Waiting 0.2 seconds before retrying.",
+        "Waiting 0.4 seconds before retrying.",
+    ]
+
+
+def test_async_superstaq_client_timeout() -> None:
+    client = _client(max_retry_seconds=0.2, retry_policy=RetryPolicy(jitter=None))
+    responses = [_MockResponse(503) for _ in range(3)]
+    with _mock_request(*responses), mock.patch("asyncio.sleep"):
+        with pytest.raises(TimeoutError):
+            asyncio.run(client.get_job("job_id"))
+
+
+def test_async_superstaq_client_circuit_breaker() -> None:
+    breaker = applications_superstaq.circuit_breaker.CircuitBreaker(failure_threshold=2)
+    client = _client(retry_policy=RetryPolicy(jitter=None), circuit_breaker=breaker)
+    responses = [_MockResponse(503), aiohttp.ClientConnectionError()]
+    with _mock_request(*responses) as mock_request, mock.patch("asyncio.sleep"):
+        with pytest.raises(applications_superstaq.SuperstaQCircuitOpenException):
+            asyncio.run(client.get_job("job_id"))
+    assert mock_request.call_count == 2
+    assert breaker.state == "open"
+
+
+def test_async_superstaq_client_retry_policy() -> None:
+    client = _client(default_target="qpu", retry_policy=RetryPolicy(jitter=None))
+    responses = [
+        _MockResponse(429, headers={"Retry-After": "2"}),
+        _MockResponse(body={"job_ids": ["job0"]}),
+        _MockResponse(502),
+    ]
+    with _mock_request(*responses), mock.patch("asyncio.sleep") as mock_sleep:
+        assert asyncio.run(client.create_job({"Hello": "World"})) == {"job_ids": ["job0"]}
+        with pytest.raises(applications_superstaq.SuperstaQException, match="Status code: 502"):
+            asyncio.run(client.create_job({"Hello": "World"}))
+    mock_sleep.assert_called_once_with(2.0)
+
+    with _mock_request(aiohttp.ClientConnectionError()):
+        with pytest.raises(applications_superstaq.SuperstaQException, match="ClientConnection"):
+            asyncio.run(client.create_job({"Hello": "World"}))
+
+
+def test_async_superstaq_client_create_jobs() -> None:
+    client = _client(default_target="qpu")
+    responses = [
+        _MockResponse(body={"job_ids": ["job0"]}),
+        _MockResponse(400, {"message": "invalid circuit"}),
+        _MockResponse(body={"job_ids": ["job1"]}),
+    ]
+    with _mock_request(*responses) as mock_request:
+        results = asyncio.run(client.create_jobs([{"c": "0"}, {"c": "1"}, {"c": "2"}], 10))
+
+    assert results[0] == {"job_ids": ["job0"]}
+    assert isinstance(results[1], applications_superstaq.SuperstaQException)
+    assert "invalid circuit" in results[1].message
+    assert results[2] == {"job_ids": ["job1"]}
+    assert [json.loads(call[1]["data"]) for call in mock_request.call_args_list] == [
+        {"c": "0", "backend": "qpu", "shots": 10},
+        {"c": "1", "backend": "qpu", "shots": 10},
+        {"c": "2", "backend": "qpu", "shots": 10},
+    ]
+
+
+def test_async_superstaq_client_create_jobs_timeout() -> None:
+    client = _client(
+        default_target="qpu",
+        max_retry_seconds=0.2,
+        pool_maxsize=1,
+        retry_policy=RetryPolicy(jitter=None),
+    )
+    responses = [
+        _MockResponse(body={"job_ids": ["job0"]}),
+        *(_MockResponse(503) for _ in range(3)),
+        _MockResponse(body={"job_ids": ["job1"]}),
+    ]
+    with _mock_request(*responses), mock.patch("asyncio.sleep"):
+        results = asyncio.run(client.create_jobs([{"c": "0"}, {"c": "1"}, {"c": "2"}]))
+
+    assert results[0] == {"job_ids": ["job0"]}
+    assert isinstance(results[1], TimeoutError)
+    assert results[2] == {"job_ids": ["job1"]}
+
+
+def test_async_superstaq_client_jobs_concurrency() -> None:
+    client = _client(default_target="qpu", pool_maxsize=2)
+    in_flight = 0
+    max_in_flight = 0
+
+    class _SlowResponse(_MockResponse):
+        async def __aenter__(self) -> "_MockResponse":
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return self
+
+    with _mock_request(*(_SlowResponse(body={}) for _ in range(6))):
+        asyncio.run(client.create_jobs([{"c": str(i)} for i in range(6)]))
+    assert max_in_flight == 2
+
+
+def test_async_superstaq_client_get_jobs() -> None:
+    client = _client()
+    responses = [
+        _MockResponse(body={"job0": {"status": "Done"}}),
+        _MockResponse(401),
+    ]
+    with _mock_request(*responses) as mock_request:
+        results = asyncio.run(client.get_jobs(["job0", "job1", "job2"], chunk_size=2))
+
+    assert results[0] == {"status": "Done"}
+    assert isinstance(results[1], applications_superstaq.SuperstaQNotFoundException)
+    assert isinstance(results[2], applications_superstaq.SuperstaQException)
+    assert results[2].status_code == requests.codes.unauthorized
+    assert [json.loads(call[1]["data"]) for call in mock_request.call_args_list] == [
+        {"job_ids": ["job0", "job1"]},
+        {"job_ids": ["job2"]},
+    ]
+
+
+def test_async_superstaq_client_get_jobs_without_bulk_endpoint() -> None:
+    client = _client(pool_maxsize=1)
+    responses = [
+        _MockResponse(404),
+        _MockResponse(body={"status": "Done"}),
+        _MockResponse(404),
+        _MockResponse(503),
+        _MockResponse(body={"status": "Running"}),
+    ]
+    with _mock_request(*responses) as mock_request, mock.patch("asyncio.sleep"):
+        results = asyncio.run(client.get_jobs(["job0", "missing", "job2"], chunk_size=2))
+
+    assert results[0] == {"status": "Done"}
+    assert isinstance(results[1], applications_superstaq.SuperstaQNotFoundException)
+    assert results[2] == {"status": "Running"}
+    assert [call[0] for call in mock_request.call_args_list] == [
+        ("POST", f"http://example.com/{API_VERSION}/get_jobs"),
+        ("GET", f"http://example.com/{API_VERSION}/job/job0"),
+        ("GET", f"http://example.com/{API_VERSION}/job/missing"),
+        ("GET", f"http://example.com/{API_VERSION}/job/job2"),
+        ("GET", f"http://example.com/{API_VERSION}/job/job2"),
+    ]
+
+
+def test_async_superstaq_client_find_min_vol_frontier() -> None:
+    client = _client(pool_maxsize=1)
+    json_dict = {"stock_symbols": ["AAPL"], "desired_returns": [8.0, 9.0]}
+    responses = [
+        _MockResponse(body={"frontier": [{"best_ret": 8.1}, {"best_ret": 9.1}]}),
+        _MockResponse(404),
+        _MockResponse(body={"best_ret": 8.2}),
+        _MockResponse(body={"best_ret": 9.2}),
+        _MockResponse(body={"best_ret": 8.3}),
+        _MockResponse(body={"best_ret": 9.3}),
+    ]
+    with _mock_request(*responses) as mock_request:
+        assert asyncio.run(client.find_min_vol_frontier(json_dict)) == [
+            {"best_ret": 8.1},
+            {"best_ret": 9.1},
+        ]
+        assert asyncio.run(client.find_min_vol_frontier(json_dict)) == [
+            {"best_ret": 8.2},
+            {"best_ret": 9.2},
+        ]
+        # The batched endpoint is not tried again.
+        assert asyncio.run(client.find_min_vol_frontier(json_dict)) == [
+            {"best_ret": 8.3},
+            {"best_ret": 9.3},
+        ]
+
+    assert [call[0][1].rsplit("/", 1)[1] for call in mock_request.call_args_list] == [
+        "minvol_frontier",
+        "minvol_frontier",
+    ] + ["minvol"] * 4
+    assert json.loads(mock_request.call_args[1]["data"]) == {
+        "stock_symbols": ["AAPL"],
+        "desired_return": 9.0,
+    }
+
+
+def test_async_superstaq_client_submit_qubo_fallback() -> None:
+    client = _client()
+    qubo = qv.QUBO({(0,): 1.0, (0, 1): -2.0})
+    responses = [
+        _MockResponse(400, {"message": "invalid qubo"}),
+        _MockResponse(body={"solution": "solution"}),
+        _MockResponse(400, {"message": "invalid qubo"}),
+    ]
+    with _mock_request(*responses) as mock_request:
+        assert asyncio.run(client.submit_qubo(qubo, "example_target")) == {"solution": "solution"}
+        with pytest.raises(applications_superstaq.SuperstaQException, match="invalid qubo"):
+            asyncio.run(client.submit_qubo(qubo, "example_target"))
+
+    assert [json.loads(call[1]["data"])["qubo"] for call in mock_request.call_args_list] == [
+        applications_superstaq.qubo.convert_qubo_to_columnar_model(qubo),
+        applications_superstaq.qubo.convert_qubo_to_model(qubo),
+        applications_superstaq.qubo.convert_qubo_to_model(qubo),
+    ]
+
+
+def test_async_superstaq_client_result_cache() -> None:
+    cache = applications_superstaq.result_cache.ResultCache()
+
+    async def run() -> None:
+        async with _client(result_cache=cache) as client:
+            assert await client.tsp({"locs": ["Chicago"]}) == {"route": ["Chicago"]}
+            assert await client.tsp({"locs": ["Chicago"]}) == {"route": ["Chicago"]}
+            assert await client.tsp({"locs": ["Chicago"]}, bypass_cache=True) == {"route": []}
+            assert await client.tsp({"locs": ["Chicago"]}) == {"route": []}
+
+    with _mock_request(
+        _MockResponse(body={"route": ["Chicago"]}), _MockResponse(body={"route": []})
+    ) as mock_request:
+        asyncio.run(run())
+    assert mock_request.call_count == 2
+    assert cache.stats.hits == 2
+
+
+def test_async_superstaq_client_metadata_cache() -> None:
+    cache = applications_superstaq.metadata_cache.MetadataCache()
+
+    async def run() -> None:
+        async with _client(metadata_cache=cache) as client:
+            assert await client.get_balance() == {"balance": 1.0}
+            assert await client.get_balance() == {"balance": 1.0}
+            # Polling jobs leaves the balance cached, but submitting work may change it.
+            await client.post_request("/get_jobs", {"job_ids": ["job_id"]})
+            assert await client.get_balance() == {"balance": 1.0}
+            await client.tsp({"locs": ["Chicago"]})
+            assert await client.get_balance() == {"balance": 2.0}
+
+    with _mock_request(
+        _MockResponse(body={"balance": 1.0}),
+        _MockResponse(body={}),
+        _MockResponse(body={"route": []}),
+        _MockResponse(body={"balance": 2.0}),
+    ) as mock_request:
+        asyncio.run(run())
+    assert mock_request.call_count == 4
+
+
+def test_async_superstaq_client_rate_limiter() -> None:
+    limiter = applications_superstaq.rate_limiter.RateLimiter(max_in_flight=1)
+
+    async def run() -> None:
+        async with _client(rate_limiter=limiter) as client:
+            await asyncio.gather(client.get_balance(), client.tsp({"locs": ["Chicago"]}))
+
+    with _mock_request(_MockResponse(body={"balance": 1.0}), _MockResponse(body={"route": []})):
+        asyncio.run(run())
+    assert limiter.stats()[""].requests == 2
+
+
+def test_async_superstaq_client_request_hooks() -> None:
+    traces: List[applications_superstaq.tracing.RequestTrace] = []
+    client = _client(request_hooks=[traces.append], retry_policy=RetryPolicy(jitter=None))
+
+    async def run() -> None:
+        async with client:
+            assert await client.get_balance() == {"balance": 1.0}
+            assert len(client._get_session().trace_configs) == 1
+
+    with _mock_request(_MockResponse(503), _MockResponse(body={"balance": 1.0})):
+        with mock.patch("asyncio.sleep"):
+            asyncio.run(run())
+    (trace,) = traces
+    assert (trace.method, trace.endpoint, trace.status_code) == ("GET", "/balance", 200)
+    assert (trace.attempts, trace.backoff_seconds, trace.error) == (2, 0.1, None)
+
+
+def test_async_superstaq_client_trace_config() -> None:
+    trace_config = applications_superstaq.async_superstaq_client._trace_config(aiohttp)
+    trace = applications_superstaq.tracing.RequestTrace("POST", "/jobs")
+    context = trace_config.trace_config_ctx(trace_request_ctx=trace)
+    chunk = types.SimpleNamespace(chunk=b"chunk")
+    signals = [
+        trace_config.on_dns_resolvehost_start,
+        trace_config.on_dns_resolvehost_end,
+        trace_config.on_connection_create_start,
+        trace_config.on_connection_create_end,
+        trace_config.on_request_headers_sent,
+        trace_config.on_request_chunk_sent,
+        trace_config.on_request_chunk_sent,
+        trace_config.on_request_end,
+        trace_config.on_response_chunk_received,
+    ]
+
+    async def run() -> None:
+        for signal in signals:
+            for callback in signal:
+                await callback(None, context, chunk)
+
+    with mock.patch("time.perf_counter", side_effect=[1.0, 1.5, 2.0, 2.25, 3.0, 4.0]):
+        asyncio.run(run())
+    assert (trace.dns_seconds, trace.connect_seconds, trace.server_seconds) == (0.5, 0.25, 1.0)
+    assert (trace.request_bytes, trace.response_bytes) == (10, 5)
+
+
+def test_async_superstaq_client_request_compression() -> None:
+    client = _client(request_compression="gzip", compression_threshold=100)
+
+    async def run() -> None:
+        async with client:
+            await client.tsp({"locs": ["Chicago"] * 100})
+            await client.tsp({"locs": ["Chicago"]})
+
+    with _mock_request(*[_MockResponse(body={"route": []})] * 2) as mock_request:
+        asyncio.run(run())
+    large, small = (call[1] for call in mock_request.call_args_list)
+    assert large["headers"] == {**EXPECTED_HEADERS, "Content-Encoding": "gzip"}
+    assert json.loads(gzip.decompress(large["data"])) == {"locs": ["Chicago"] * 100}
+    assert small["headers"] == EXPECTED_HEADERS
+    assert json.loads(small["data"]) == {"locs": ["Chicago"]}
+
+
+def test_async_superstaq_client_stream_qubo() -> None:
+    client = _client(request_compression="gzip", stream_threshold=3)
+    qubo = qv.QUBO({(0,): 1.0, (1,): 1.0, (0, 1): -2.0})
+    chunks: List[bytes] = []
+
+    async def run() -> None:
+        async with client:
+            await client.submit_qubo(qubo, "example_target")
+        async for chunk in mock_request.call_args[1]["data"]:
+            chunks.append(chunk)
+
+    with _mock_request(_MockResponse(body={"solution": "solution"})) as mock_request:
+        asyncio.run(run())
+    assert mock_request.call_args[1]["headers"] == {**EXPECTED_HEADERS, "Content-Encoding": "gzip"}
+    assert json.loads(gzip.decompress(b"".join(chunks)))["qubo"] == (
+        applications_superstaq.qubo.convert_qubo_to_columnar_model(qubo)
+    )
+
+
+def test_async_superstaq_client_submit_qubo_stream() -> None:
+    client = _client()
+    qubo = qv.QUBO({(0,): 1.0, (0, 1): -2.0})
+
+    async def run() -> List[bytes]:
+        async with client:
+            chunks = await client.submit_qubo_stream(qubo, "example_target")
+            return [chunk async for chunk in chunks]
+
+    responses = [
+        _MockResponse(400, {"message": "invalid qubo"}),
+        _MockResponse(body={"solution": "solution"}),
+    ]
+    with _mock_request(*responses) as mock_request:
+        chunks = asyncio.run(run())
+    assert all(len(chunk) == 4 for chunk in chunks[:-1])
+    assert json.loads(b"".join(chunks)) == {"solution": "solution"}
+    assert [json.loads(call[1]["data"])["qubo"] for call in mock_request.call_args_list] == [
+        applications_superstaq.qubo.convert_qubo_to_columnar_model(qubo),
+        applications_superstaq.qubo.convert_qubo_to_model(qubo),
+    ]
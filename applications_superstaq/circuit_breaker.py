@@ -0,0 +1,178 @@
+"""Stops sending requests to SuperstaQ's API while it is failing."""
+
+import contextlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import applications_superstaq
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class Attempt:
+    """The outcome of one attempt at a request, as reported to a `CircuitBreaker`.
+
+    Attributes:
+        status_code: The http status code of the response, or None if no response was received
+            (e.g. because of a connection error).
+        probe: Whether the attempt is probing whether a half-open circuit can be closed again.
+    """
+
+    status_code: Optional[int] = None
+    probe: bool = False
+
+
+@dataclass
+class CircuitBreakerStats:
+    """Counts of the requests guarded by a `CircuitBreaker` (since it was created)."""
+
+    successes: int = 0
+    failures: int = 0
+    # Requests rejected without being sent, while the circuit was open.
+    rejections: int = 0
+    # The number of times the circuit opened.
+    opens: int = 0
+
+
+class CircuitBreaker:
+    """A circuit breaker, which rejects requests immediately while SuperstaQ's API is down.
+
+    The circuit starts "closed", sending every request. After `failure_threshold` consecutive
+    requests fail (without a response, or with a server error), it "opens": for the next
+    `reset_timeout` seconds, requests raise a `SuperstaQCircuitOpenException` without being sent.
+    The circuit then becomes "half_open", letting up to `half_open_probes` requests through at once
+    to probe the API. The first probe to succeed closes the circuit, and any probe failing opens it
+    again.
+
+    Responses with client errors (e.g. unauthorized or not found) count as successes, since the
+    API evidently handled them. A single CircuitBreaker is thread-safe, and can be shared by any
+    number of clients.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1,
+        on_transition: Optional[Callable[[str, str], None]] = None,
+    ):
+        """Creates a CircuitBreaker.
+
+        Args:
+            failure_threshold: The number of consecutive failed requests which open the circuit.
+            reset_timeout: The time (in seconds) the circuit stays open before probing the API.
+            half_open_probes: The maximum number of probe requests in flight at once while the
+                circuit is half-open.
+            on_transition: A metrics hook, called with the old and the new state (`"closed"`,
+                `"open"` or `"half_open"`) whenever the circuit changes state.
+        """
+        assert failure_threshold >= 1, "Circuits must open after at least one failure."
+        assert reset_timeout >= 0, "Circuits cannot stay open for a negative time."
+        assert half_open_probes >= 1, "Half-open circuits must allow at least one probe."
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.on_transition = on_transition
+        self.stats = CircuitBreakerStats()
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """The current state of the circuit: `"closed"`, `"open"` or `"half_open"`."""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    @staticmethod
+    def is_failure(status_code: Optional[int]) -> bool:
+        """Checks whether a request failed because of a problem with the API (as opposed to with
+        the request).
+
+        Args:
+            status_code: The http status code of the response, or None if no response was received.
+        """
+        return status_code is None or status_code >= 500
+
+    @contextlib.contextmanager
+    def attempt(self) -> Iterator[Attempt]:
+        """Guards one attempt at a request.
+
+        The status code of the response should be set on the yielded `Attempt` as soon as it is
+        received; if the attempt exits without one, the request counts as failed.
+
+        Raises:
+            SuperstaQCircuitOpenException: If the circuit is open, so the request must not be sent.
+        """
+        attempt = self._enter()
+        try:
+            yield attempt
+        finally:
+            self._exit(attempt)
+
+    def _enter(self) -> Attempt:
+        transitions: List[Tuple[str, str]] = []
+        with self._lock:
+            if self._state == OPEN:
+                retry_in = self._opened + self.reset_timeout - time.monotonic()
+                if retry_in > 0:
+                    self.stats.rejections += 1
+                    raise applications_superstaq.SuperstaQCircuitOpenException(retry_in)
+                self._transition(HALF_OPEN, transitions)
+                self._probes = 0
+            probe = self._state == HALF_OPEN
+            if probe:
+                if self._probes >= self.half_open_probes:
+                    self.stats.rejections += 1
+                    raise applications_superstaq.SuperstaQCircuitOpenException(0.0)
+                self._probes += 1
+        self._notify(transitions)
+        return Attempt(probe=probe)
+
+    def _exit(self, attempt: Attempt) -> None:
+        transitions: List[Tuple[str, str]] = []
+        failed = self.is_failure(attempt.status_code)
+        with self._lock:
+            if failed:
+                self.stats.failures += 1
+                self._consecutive_failures += 1
+            else:
+                self.stats.successes += 1
+                self._consecutive_failures = 0
+
+            if attempt.probe and self._state == HALF_OPEN:
+                self._probes -= 1
+                if failed:
+                    self._open(transitions)
+                else:
+                    self._transition(CLOSED, transitions)
+            elif self._state == CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._open(transitions)
+        self._notify(transitions)
+
+    def _open(self, transitions: List[Tuple[str, str]]) -> None:
+        """Opens the circuit. Must be called while holding `_lock`."""
+        self._opened = time.monotonic()
+        self.stats.opens += 1
+        self._transition(OPEN, transitions)
+
+    def _transition(self, state: str, transitions: List[Tuple[str, str]]) -> None:
+        """Changes the state of the circuit, recording the transition (to report once `_lock` is
+        released). Must be called while holding `_lock`."""
+        transitions.append((self._state, state))
+        self._state = state
+
+    def _notify(self, transitions: List[Tuple[str, str]]) -> None:
+        if self.on_transition is not None:
+            for old_state, new_state in transitions:
+                self.on_transition(old_state, new_state)
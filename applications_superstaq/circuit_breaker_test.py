@@ -0,0 +1,81 @@
+from typing import List, Optional, Tuple
+from unittest import mock
+
+import pytest
+
+import applications_superstaq
+from applications_superstaq.circuit_breaker import CircuitBreaker, CircuitBreakerStats
+
+
+def _request(breaker: CircuitBreaker, status_code: Optional[int]) -> None:
+    with breaker.attempt() as attempt:
+        attempt.status_code = status_code
+
+
+def test_circuit_breaker() -> None:
+    transitions: List[Tuple[str, str]] = []
+    breaker = CircuitBreaker(
+        failure_threshold=2,
+        reset_timeout=10.0,
+        on_transition=lambda old, new: transitions.append((old, new)),
+    )
+    with mock.patch("time.monotonic", return_value=100.0):
+        _request(breaker, 503)
+        _request(breaker, 404)  # The API handled the request, so the failures aren't consecutive.
+        _request(breaker, None)
+        assert breaker.state == "closed"
+        _request(breaker, 500)
+        assert breaker.state == "open"
+
+        with pytest.raises(applications_superstaq.SuperstaQCircuitOpenException, match="10"):
+            _request(breaker, 200)
+
+    with mock.patch("time.monotonic", return_value=110.0):
+        assert breaker.state == "half_open"
+        _request(breaker, 502)
+        assert breaker.state == "open"
+
+    with mock.patch("time.monotonic", return_value=120.0):
+        _request(breaker, 200)
+        assert breaker.state == "closed"
+
+    assert transitions == [
+        ("closed", "open"),
+        ("open", "half_open"),
+        ("half_open", "open"),
+        ("open", "half_open"),
+        ("half_open", "closed"),
+    ]
+    assert breaker.stats == CircuitBreakerStats(successes=2, failures=4, rejections=1, opens=2)
+
+
+def test_circuit_breaker_probes() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0, half_open_probes=2)
+    _request(breaker, None)
+    with breaker.attempt() as other_probe:
+        with breaker.attempt() as probe:
+            assert probe.probe
+            with pytest.raises(applications_superstaq.SuperstaQCircuitOpenException):
+                _request(breaker, 200)
+            probe.status_code = 200
+        assert breaker.state == "closed"
+        other_probe.status_code = 200
+    assert other_probe.probe
+    assert breaker.state == "closed"
+    assert breaker.stats.rejections == 1
+
+    # Requests which don't probe the circuit don't close it.
+    with breaker.attempt() as attempt:
+        _request(breaker, None)
+        assert breaker.state == "half_open"
+        attempt.status_code = 200
+    assert breaker.state == "half_open"
+
+
+def test_circuit_breaker_exception() -> None:
+    breaker = CircuitBreaker(failure_threshold=1)
+    with pytest.raises(ValueError):
+        with breaker.attempt():
+            raise ValueError
+    assert breaker.state == "open"
+    assert breaker.stats.failures == 1
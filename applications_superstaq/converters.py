@@ -1,37 +1,455 @@
-import codecs
+import ast
+import base64
+import binascii
+import importlib
+import json
+import mmap
+import os
 import pickle
-from typing import Any
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
+import qubovert as qv
 
-def _bytes_to_str(bytes_data: bytes) -> str:
-    return codecs.encode(bytes_data, "base64").decode()
+import applications_superstaq
+
+# Binary frames start with this magic string, followed by the frame header (see `encode`).
+MAGIC = b"SSQB"
+FORMAT_VERSION = 1
+_FRAME_HEADER = struct.Struct("<4sBBI")
+
+# Supported compression codecs, by the id stored in the frame header.
+COMPRESSION_CODECS = {None: 0, "zstd": 1, "lz4": 2}
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# The default number of rows in each batch decoded by `FrameDecoder` (and `StreamDeserializer`).
+DECODE_BATCH_SIZE = 2**16
+
+
+def _bytes_to_str(bytes_data: BytesLike) -> str:
+    return base64.b64encode(bytes_data).decode()
 
 
 def _str_to_bytes(str_data: str) -> bytes:
-    return codecs.decode(str_data.encode(), "base64")
+    # Decodes the (ascii) str directly, without first copying it into an intermediate bytes object.
+    # Also accepts the newline-wrapped encoding previously produced by `codecs`.
+    return binascii.a2b_base64(str_data)
+
+
+def _import_codec(compression: str) -> Any:
+    """Imports the (optional) module implementing the given compression codec."""
+    module_name = {"zstd": "zstandard", "lz4": "lz4.frame"}[compression]
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise applications_superstaq.SuperstaQModuleNotFoundException(
+            module_name, f"{compression} compression"
+        ) from e
+
+
+def _compress(data: BytesLike, compression: Optional[str]) -> BytesLike:
+    if compression == "zstd":
+        return _import_codec("zstd").ZstdCompressor().compress(data)
+    if compression == "lz4":
+        return _import_codec("lz4").compress(data)
+    return data
+
+
+def _decompress(data: memoryview, compression: Optional[str]) -> BytesLike:
+    if compression == "zstd":
+        return _import_codec("zstd").ZstdDecompressor().decompress(data)
+    if compression == "lz4":
+        return _import_codec("lz4").decompress(data)
+    return data
+
+
+def _is_binary_encodable(obj: Any) -> bool:
+    """Whether `obj` can be represented without pickle (see `encode`)."""
+    if isinstance(obj, np.ndarray):
+        return not obj.dtype.hasobject
+    if isinstance(obj, qv.QUBO):
+        return all(type(variable) in (int, str) for variable in obj.variables)
+    return False
+
+
+def encode(obj: Any, compression: Optional[str] = None) -> bytes:
+    """Encodes a numpy array (or recarray) or QUBO model in the versioned binary format.
+
+    A frame consists of the magic string, format version, compression codec and header length,
+    followed by a JSON header describing the array (its dtype and shape, in the same notation as
+    the `.npy` format) and then its raw, contiguous data buffer (compressed if requested).
+    QUBO models are stored as a table of variable names plus an array of `(row, col, value)` terms.
+
+    Args:
+        obj: The array (without object fields) or QUBO (with int or str variables) to encode.
+        compression: The codec to compress the data buffer with: "zstd" (requires the `zstandard`
+            package), "lz4" (requires the `lz4` package), or None.
+
+    Returns:
+        The encoded bytes.
+
+    Raises:
+        ValueError: If `obj` cannot be represented in the binary format, or the compression codec
+            is not supported.
+    """
+    if compression not in COMPRESSION_CODECS:
+        raise ValueError(f"Unsupported compression codec: {compression!r}.")
+    if not _is_binary_encodable(obj):
+        raise ValueError(f"Objects of type {type(obj).__name__} cannot be binary-encoded.")
+
+    header: Dict[str, Any] = {}
+    if isinstance(obj, qv.QUBO):
+        variables, row, col, value = applications_superstaq.qubo._qubo_to_arrays(obj)
+        header["type"] = "qubo"
+        header["variables"] = variables
+        array = np.empty(len(value), dtype=[("row", "<i8"), ("col", "<i8"), ("value", "<f8")])
+        array["row"], array["col"], array["value"] = row, col, value
+    else:
+        header["type"] = "recarray" if isinstance(obj, np.recarray) else "ndarray"
+        array = obj if obj.flags.c_contiguous else obj.copy(order="C")
+
+    header["descr"] = repr(np.lib.format.dtype_to_descr(array.dtype))
+    header["shape"] = list(array.shape)
+    header_bytes = json.dumps(header).encode()
+    frame_header = _FRAME_HEADER.pack(
+        MAGIC, FORMAT_VERSION, COMPRESSION_CODECS[compression], len(header_bytes)
+    )
+    data = _compress(array.data.cast("B"), compression)
+    return b"".join([frame_header, header_bytes, data])
+
+
+def _header_end(view: memoryview) -> int:
+    """Returns the size of the headers of a binary frame, given (at least) its frame header."""
+    magic, _, _, header_size = _FRAME_HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("Data is not a binary frame.")
+    return _FRAME_HEADER.size + header_size
+
+
+def _read_header(view: memoryview) -> Tuple[Dict[str, Any], np.dtype, Optional[str], int]:
+    """Parses the headers of a binary frame (see `encode`).
+
+    Args:
+        view: The start of the frame, including (at least) all of its headers.
+
+    Returns:
+        The JSON header, the dtype of the encoded array, the compression codec of its data buffer,
+        and the offset of its data buffer.
+
+    Raises:
+        ValueError: If `view` does not start with valid headers.
+    """
+    header_end = _header_end(view)
+    _, version, codec, _ = _FRAME_HEADER.unpack_from(view)
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary format version: {version}.")
+    compressions = {codec_id: name for name, codec_id in COMPRESSION_CODECS.items()}
+    if codec not in compressions:
+        raise ValueError(f"Unsupported compression codec id: {codec}.")
+
+    header_start = _FRAME_HEADER.size
+    header = json.loads(bytes(view[header_start:header_end]))
+    dtype = np.lib.format.descr_to_dtype(ast.literal_eval(header["descr"]))
+    if dtype.hasobject:
+        raise ValueError("Binary frames cannot contain object arrays.")
+    return header, dtype, compressions[codec], header_end
+
+
+def decode(data: BytesLike) -> Any:
+    """Decodes an object encoded with `encode`.
+
+    Only the frame header is parsed; the data buffer is wrapped (via `memoryview` and
+    `np.frombuffer`) rather than copied, so (unless `data` is writeable) the decoded array is
+    read-only. Decoding never unpickles anything, so it is safe for untrusted data.
+
+    Args:
+        data: The encoded bytes.
+
+    Returns:
+        The decoded array, recarray or QUBO.
+
+    Raises:
+        ValueError: If `data` is not a valid binary frame.
+    """
+    view = memoryview(data).cast("B")
+    if len(view) < _FRAME_HEADER.size:
+        raise ValueError("Data is too short to be a binary frame.")
+    header, dtype, compression, header_end = _read_header(view)
+    shape = tuple(header["shape"])
+    buffer = _decompress(view[header_end:], compression)
+    array = np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+    if header["type"] == "qubo":
+        return applications_superstaq.qubo._arrays_to_qubo(
+            header["variables"], array["row"], array["col"], array["value"]
+        )
+    if header["type"] == "recarray":
+        return array.view(np.recarray)
+    return array
+
+
+def _decompressor(compression: Optional[str]) -> Any:
+    """Returns an incremental decompressor for the given codec (or None, if there is none)."""
+    if compression == "zstd":
+        return _import_codec("zstd").ZstdDecompressor().decompressobj()
+    if compression == "lz4":
+        return _import_codec("lz4").LZ4FrameDecompressor()
+    return None
 
 
-def serialize(obj: Any) -> str:
+class FrameDecoder:
+    """Decodes a binary frame (see `encode`) of an array incrementally, as it is received in chunks.
+
+    The array is decoded in batches of rows (i.e. of entries along its first axis), so that only
+    one batch (plus one chunk) is held in memory at a time, e.g. to aggregate or save the rows of a
+    huge array as it is downloaded. Compressed frames are decompressed incrementally too. QUBOs can
+    only be decoded all at once, with `decode`.
+    """
+
+    def __init__(self, batch_size: int = DECODE_BATCH_SIZE):
+        """Creates a FrameDecoder.
+
+        Args:
+            batch_size: The number of rows in each decoded batch (except the last).
+        """
+        assert batch_size > 0, "Batches must contain at least one row."
+        self.batch_size = batch_size
+        self._buffer = bytearray()
+        self._header: Optional[Dict[str, Any]] = None
+        self._dtype = np.dtype(np.uint8)
+        self._decompressor: Any = None
+        self._decoded_rows = 0
+
+    def feed(self, data: BytesLike) -> List[np.ndarray]:
+        """Decodes the next chunk of the frame.
+
+        Args:
+            data: The next chunk of the frame.
+
+        Returns:
+            The batches of rows completed by the chunk (if any).
+
+        Raises:
+            ValueError: If the frame is invalid, or does not encode an array of at least one
+                dimension.
+        """
+        if self._header is None:
+            self._buffer += data
+            if not self._read_header():
+                return []
+            data, self._buffer = self._buffer, bytearray()
+        if self._decompressor is not None:
+            data = self._decompressor.decompress(data)
+        self._buffer += data
+        return self._batches(final=False)
+
+    def close(self) -> List[np.ndarray]:
+        """Decodes the rest of the frame, once all of it has been received.
+
+        Returns:
+            The last batch of rows (if any).
+
+        Raises:
+            ValueError: If the frame is incomplete.
+        """
+        if self._header is None:
+            raise ValueError("Data is too short to be a binary frame.")
+        batches = self._batches(final=True)
+        if self._buffer or self._decoded_rows != self._header["shape"][0]:
+            raise ValueError("The binary frame is incomplete.")
+        return batches
+
+    def _read_header(self) -> bool:
+        """Parses the frame's headers (if they have been received), returning whether they have."""
+        view = memoryview(self._buffer)
+        try:
+            if len(view) < _FRAME_HEADER.size or len(view) < _header_end(view):
+                return False
+            header, self._dtype, compression, header_end = _read_header(view)
+        finally:
+            view.release()
+        if header["type"] == "qubo" or not header["shape"]:
+            raise ValueError("Only arrays of at least one dimension can be decoded incrementally.")
+        self._header = header
+        self._decompressor = _decompressor(compression)
+        del self._buffer[:header_end]
+        return True
+
+    def _batches(self, final: bool) -> List[np.ndarray]:
+        """Decodes the complete batches of rows in the buffer (and the last, incomplete one if
+        `final`)."""
+        assert self._header is not None
+        row_shape = tuple(self._header["shape"][1:])
+        row_size = self._dtype.itemsize * int(np.prod(row_shape))
+        rows = len(self._buffer) // row_size
+        if not final:
+            rows -= rows % self.batch_size
+
+        batches = []
+        for start in range(0, rows, self.batch_size):
+            stop = min(start + self.batch_size, rows)
+            first, last = start * row_size, stop * row_size
+            buffer = bytes(self._buffer[first:last])
+            batch = np.frombuffer(buffer, dtype=self._dtype).reshape((stop - start,) + row_shape)
+            batches.append(batch.view(np.recarray) if self._header["type"] == "recarray" else batch)
+        del self._buffer[: rows * row_size]
+        self._decoded_rows += rows
+        return batches
+
+
+def encode_to_file(
+    obj: Any, path: Union[str, "os.PathLike[str]"], compression: Optional[str] = None
+) -> None:
+    """Writes an object to a file in the binary format (see `encode`).
+
+    Args:
+        obj: The array or QUBO to write.
+        path: The path of the file to (over)write.
+        compression: The codec to compress the data buffer with (see `encode`).
+    """
+    with open(path, "wb") as file:
+        file.write(encode(obj, compression))
+
+
+def decode_file(path: Union[str, "os.PathLike[str]"]) -> Any:
+    """Reads an object written with `encode_to_file`.
+
+    The file is memory-mapped, so (unless it is compressed) the decoded array is a read-only view
+    of the file's pages, which are only read from disk as they are accessed.
+
+    Args:
+        path: The path of the file to read.
+
+    Returns:
+        The decoded array, recarray or QUBO.
+
+    Raises:
+        ValueError: If the file does not contain a valid binary frame.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise ValueError("Data is too short to be a binary frame.")
+        # The map remains open for as long as the decoded array (or anything else) references it.
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return decode(memoryview(mapped))
+
+
+def serialize(obj: Any, compression: Optional[str] = None) -> str:
     """Serialize picklable object into a string
 
+    Numpy arrays (without object fields) and QUBO models are serialized in the compact binary
+    format (see `encode`); anything else is pickled.
+
     Args:
         obj: a picklable object to be serialized
+        compression: the codec to compress binary-encoded objects with ("zstd", "lz4" or None)
 
     Returns:
         str representing the serialized object
     """
-
+    if _is_binary_encodable(obj):
+        return _bytes_to_str(encode(obj, compression))
     return _bytes_to_str(pickle.dumps(obj))
 
 
-def deserialize(serialized_obj: str) -> Any:
+def deserialize(serialized_obj: str, allow_pickle: bool = True) -> Any:
     """Deserialize serialized objects
 
     Args:
         serialized_obj: a str generated via applications_superstaq.converters.serialize()
+        allow_pickle: whether to unpickle objects which were not binary-encoded. Unpickling data
+            from an untrusted source can execute arbitrary code.
 
     Returns:
         the serialized object
+
+    Raises:
+        ValueError: if `serialized_obj` was pickled, but `allow_pickle` is False.
     """
+    data = _str_to_bytes(serialized_obj)
+    if data.startswith(MAGIC):
+        return decode(data)
+    if not allow_pickle:
+        raise ValueError("Refusing to unpickle serialized object (allow_pickle=False).")
+    return pickle.loads(data)
+
+
+class StreamDeserializer:
+    """Deserializes an array serialized with `serialize` incrementally, as it is received in chunks.
+
+    Binary-encoded arrays are decoded in batches of rows as their data arrives (see
+    `FrameDecoder`). Pickled arrays can only be unpickled once all of their data has arrived, and
+    are then split into batches.
+    """
+
+    def __init__(self, batch_size: int = DECODE_BATCH_SIZE, allow_pickle: bool = True):
+        """Creates a StreamDeserializer.
+
+        Args:
+            batch_size: The number of rows in each deserialized batch (except the last).
+            allow_pickle: Whether to unpickle arrays which were not binary-encoded (see
+                `deserialize`).
+        """
+        self.batch_size = batch_size
+        self.allow_pickle = allow_pickle
+        self._text = ""
+        self._data = bytearray()
+        self._frame: Optional[FrameDecoder] = None
+
+    def feed(self, text: str) -> List[np.ndarray]:
+        """Deserializes the next chunk of the serialized array.
+
+        Args:
+            text: The next chunk of the string returned by `serialize`.
+
+        Returns:
+            The batches of rows completed by the chunk (if any).
+
+        Raises:
+            ValueError: If a binary-encoded array is invalid (see `FrameDecoder.feed`).
+        """
+        # Base64 is decoded in blocks of four characters, ignoring newlines.
+        self._text += "".join(text.split())
+        end = len(self._text) - len(self._text) % 4
+        data = _str_to_bytes(self._text[:end])
+        self._text = self._text[end:]
+        return self._feed_bytes(data)
+
+    def close(self) -> List[np.ndarray]:
+        """Deserializes the rest of the array, once all of it has been received.
+
+        Returns:
+            The remaining batches of rows.
+
+        Raises:
+            ValueError: If the array is incomplete, if it was pickled but `allow_pickle` is False,
+                or if the pickled object is not an array.
+        """
+        batches = self._feed_bytes(_str_to_bytes(self._text))
+        self._text = ""
+        if self._frame is not None:
+            return batches + self._frame.close()
+        if self._data.startswith(MAGIC[: len(self._data)]):
+            raise ValueError("Data is too short to be a binary frame.")
+        if not self.allow_pickle:
+            raise ValueError("Refusing to unpickle serialized object (allow_pickle=False).")
+
+        array = pickle.loads(self._data)
+        self._data = bytearray()
+        if not isinstance(array, np.ndarray) or not array.ndim:
+            raise ValueError(
+                "Only arrays of at least one dimension can be deserialized in batches."
+            )
+        return [array[start:][: self.batch_size] for start in range(0, len(array), self.batch_size)]
 
-    return pickle.loads(_str_to_bytes(serialized_obj))
+    def _feed_bytes(self, data: BytesLike) -> List[np.ndarray]:
+        if self._frame is not None:
+            return self._frame.feed(data)
+        self._data += data
+        if len(self._data) < len(MAGIC) or not self._data.startswith(MAGIC):
+            return []
+        self._frame = FrameDecoder(self.batch_size)
+        data, self._data = self._data, bytearray()
+        return self._frame.feed(data)
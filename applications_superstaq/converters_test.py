@@ -1,3 +1,16 @@
+import base64
+import codecs
+import os
+import pickle
+import sys
+import zlib
+from typing import Any, List
+from unittest import mock
+
+import numpy as np
+import pytest
+import qubovert as qv
+
 import applications_superstaq
 
 
@@ -6,3 +19,197 @@ def test_serialization() -> None:
     serialized_obj = applications_superstaq.converters.serialize(obj)
     assert isinstance(serialized_obj, str)
     assert applications_superstaq.converters.deserialize(serialized_obj) == obj
+
+    # Strings serialized by earlier versions can still be deserialized.
+    legacy = codecs.encode(pickle.dumps(obj), "base64").decode()
+    assert "\n" in legacy
+    assert applications_superstaq.converters.deserialize(legacy) == obj
+
+    with pytest.raises(ValueError, match="allow_pickle"):
+        _ = applications_superstaq.converters.deserialize(serialized_obj, allow_pickle=False)
+
+
+@pytest.mark.parametrize("compression", [None, "lz4"])
+def test_binary_serialization(compression: str) -> None:
+    recarray = np.rec.fromrecords(
+        [((0, 1, 1), -1.0, 6), ((1, 1, 1), -1.0, 4)],
+        dtype=[("solution", "i1", (3,)), ("energy", "<f8"), ("num_occurrences", "<i8")],
+    )
+    serialized = applications_superstaq.converters.serialize(recarray, compression)
+    assert base64.b64decode(serialized).startswith(applications_superstaq.converters.MAGIC)
+    deserialized = applications_superstaq.converters.deserialize(serialized, allow_pickle=False)
+    assert isinstance(deserialized, np.recarray)
+    assert repr(deserialized) == repr(recarray)
+
+    array = np.arange(6, dtype=">i4").reshape(2, 3).T
+    deserialized = applications_superstaq.converters.deserialize(
+        applications_superstaq.converters.serialize(array, compression)
+    )
+    assert type(deserialized) is np.ndarray
+    assert deserialized.dtype == array.dtype
+    np.testing.assert_array_equal(deserialized, array)
+
+    scalar = applications_superstaq.converters.decode(
+        applications_superstaq.converters.encode(np.array(1.5), compression)
+    )
+    assert scalar.shape == () and scalar == 1.5
+
+
+def test_binary_serialization_qubo() -> None:
+    qubo = qv.QUBO({(): 3.0, (0,): 1.0, ("x",): 0.5, (0, "x"): -2.0})
+    serialized = applications_superstaq.converters.serialize(qubo)
+    assert base64.b64decode(serialized).startswith(applications_superstaq.converters.MAGIC)
+    deserialized = applications_superstaq.converters.deserialize(serialized, allow_pickle=False)
+    assert isinstance(deserialized, qv.QUBO)
+    assert deserialized == qubo
+
+    # Only int and str variables are supported.
+    with pytest.raises(ValueError, match="cannot be binary-encoded"):
+        _ = applications_superstaq.converters.encode(qv.QUBO({((0, 1),): 1.0}))
+
+
+def test_decode_is_zero_copy() -> None:
+    array = np.arange(10.0)
+    data = bytearray(applications_superstaq.converters.encode(array))
+    decoded = applications_superstaq.converters.decode(memoryview(data))
+    np.testing.assert_array_equal(decoded, array)
+    assert np.shares_memory(decoded, np.frombuffer(data, dtype=np.uint8))
+
+    decoded = applications_superstaq.converters.decode(bytes(data))
+    assert not decoded.flags.writeable
+
+
+@pytest.mark.parametrize("compression", [None, "lz4"])
+def test_encode_to_file(tmp_path: os.PathLike, compression: str) -> None:
+    recarray = np.rec.fromrecords([(1, 2.0), (3, 4.0)], dtype=[("a", "<i4"), ("b", "<f8")])
+    path = os.path.join(tmp_path, "result.ssqb")
+    applications_superstaq.converters.encode_to_file(recarray, path, compression)
+
+    decoded = applications_superstaq.converters.decode_file(path)
+    assert isinstance(decoded, np.recarray)
+    assert repr(decoded) == repr(recarray)
+    assert not decoded.flags.writeable
+
+    open(path, "wb").close()
+    with pytest.raises(ValueError, match="too short"):
+        _ = applications_superstaq.converters.decode_file(path)
+
+
+def test_zstd_compression() -> None:
+    mock_zstandard = mock.MagicMock()
+    mock_zstandard.ZstdCompressor.return_value.compress.side_effect = zlib.compress
+    mock_zstandard.ZstdDecompressor.return_value.decompress.side_effect = zlib.decompress
+    array = np.zeros(1000)
+    with mock.patch.dict(sys.modules, {"zstandard": mock_zstandard}):
+        data = applications_superstaq.converters.encode(array, "zstd")
+        assert len(data) < array.nbytes
+        np.testing.assert_array_equal(applications_superstaq.converters.decode(data), array)
+
+    with mock.patch.dict(sys.modules, {"zstandard": None}):
+        with pytest.raises(
+            applications_superstaq.SuperstaQModuleNotFoundException, match="zstandard"
+        ):
+            _ = applications_superstaq.converters.encode(array, "zstd")
+
+
+def test_encode_errors() -> None:
+    with pytest.raises(ValueError, match="compression codec"):
+        _ = applications_superstaq.converters.encode(np.zeros(1), "gzip")
+    with pytest.raises(ValueError, match="cannot be binary-encoded"):
+        _ = applications_superstaq.converters.encode(np.array([{}], dtype=object))
+    with pytest.raises(ValueError, match="cannot be binary-encoded"):
+        _ = applications_superstaq.converters.encode({"not": "an array"})
+
+
+def test_decode_errors() -> None:
+    data = applications_superstaq.converters.encode(np.zeros(1))
+
+    with pytest.raises(ValueError, match="too short"):
+        _ = applications_superstaq.converters.decode(data[:4])
+    with pytest.raises(ValueError, match="not a binary frame"):
+        _ = applications_superstaq.converters.decode(pickle.dumps(np.zeros(1)))
+    with pytest.raises(ValueError, match="format version: 2"):
+        _ = applications_superstaq.converters.decode(data[:4] + b"\x02" + data[5:])
+    with pytest.raises(ValueError, match="codec id: 9"):
+        _ = applications_superstaq.converters.decode(data[:5] + b"\x09" + data[6:])
+
+    header = b'{"type": "ndarray", "descr": "\'|O\'", "shape": [1]}'
+    frame = applications_superstaq.converters._FRAME_HEADER.pack(
+        applications_superstaq.converters.MAGIC, 1, 0, len(header)
+    )
+    with pytest.raises(ValueError, match="object arrays"):
+        _ = applications_superstaq.converters.decode(frame + header + bytes(8))
+
+
+def _chunks(data: Any, size: int) -> List[Any]:
+    return [data[start:][:size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("compression", [None, "lz4", "zstd"])
+def test_frame_decoder(compression: str) -> None:
+    mock_zstandard = mock.MagicMock()
+    mock_zstandard.ZstdCompressor.return_value.compress.side_effect = zlib.compress
+    mock_zstandard.ZstdDecompressor.return_value.decompressobj.side_effect = zlib.decompressobj
+
+    recarray = np.rec.fromrecords(
+        [(i % 2, i / 100) for i in range(100)], dtype=[("x", "<i8"), ("energy", "<f8")]
+    )
+    array = np.arange(30).reshape(10, 3)
+    with mock.patch.dict(sys.modules, {"zstandard": mock_zstandard}):
+        for obj in [recarray, array]:
+            data = applications_superstaq.converters.encode(obj, compression)
+            decoder = applications_superstaq.converters.FrameDecoder(batch_size=8)
+            batches = [batch for chunk in _chunks(data, 7) for batch in decoder.feed(chunk)]
+            batches += decoder.close()
+            assert [len(batch) for batch in batches[:-1]] == [8] * (len(batches) - 1)
+            assert all(type(batch) is type(obj) for batch in batches)
+            np.testing.assert_array_equal(np.concatenate(batches), obj)
+
+
+def test_frame_decoder_errors() -> None:
+    data = applications_superstaq.converters.encode(np.zeros(10))
+    decoder = applications_superstaq.converters.FrameDecoder()
+    assert decoder.feed(data[:-1]) == []
+    with pytest.raises(ValueError, match="incomplete"):
+        _ = decoder.close()
+
+    decoder = applications_superstaq.converters.FrameDecoder()
+    assert decoder.feed(data[:8]) == []
+    with pytest.raises(ValueError, match="too short"):
+        _ = decoder.close()
+
+    with pytest.raises(ValueError, match="not a binary frame"):
+        _ = applications_superstaq.converters.FrameDecoder().feed(b"X" * 100)
+    for obj in [np.array(1.5), qv.QUBO({(0,): 1.0})]:
+        with pytest.raises(ValueError, match="at least one dimension"):
+            _ = applications_superstaq.converters.FrameDecoder().feed(
+                applications_superstaq.converters.encode(obj)
+            )
+    with pytest.raises(AssertionError, match="at least one row"):
+        _ = applications_superstaq.converters.FrameDecoder(batch_size=0)
+
+
+def test_stream_deserializer() -> None:
+    array = np.arange(100)
+    legacy = codecs.encode(pickle.dumps(array), "base64").decode()
+    for serialized in [applications_superstaq.converters.serialize(array), legacy]:
+        deserializer = applications_superstaq.converters.StreamDeserializer(batch_size=30)
+        batches = [batch for chunk in _chunks(serialized, 5) for batch in deserializer.feed(chunk)]
+        batches += deserializer.close()
+        assert [len(batch) for batch in batches] == [30, 30, 30, 10]
+        np.testing.assert_array_equal(np.concatenate(batches), array)
+
+    deserializer = applications_superstaq.converters.StreamDeserializer(allow_pickle=False)
+    assert deserializer.feed(legacy) == []
+    with pytest.raises(ValueError, match="allow_pickle"):
+        _ = deserializer.close()
+
+    deserializer = applications_superstaq.converters.StreamDeserializer()
+    assert deserializer.feed(applications_superstaq.converters.serialize({"not": "an array"})) == []
+    with pytest.raises(ValueError, match="at least one dimension"):
+        _ = deserializer.close()
+
+    deserializer = applications_superstaq.converters.StreamDeserializer()
+    assert deserializer.feed(applications_superstaq.converters.serialize(array)[:4]) == []
+    with pytest.raises(ValueError, match="too short"):
+        _ = deserializer.close()
@@ -1,19 +1,49 @@
-from dataclasses import dataclass
-from typing import List, Optional
+import asyncio
+import concurrent.futures
+import itertools
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    overload,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import qubovert as qv
+import scipy.sparse
 
 import applications_superstaq
+import applications_superstaq.qubo  # For `QUBOOutput`, which is subclassed at import time.
+from applications_superstaq import async_superstaq_client
 from applications_superstaq import superstaq_client
 
 
-@dataclass
-class MinVolOutput:
-    best_portfolio: List[str]
-    best_ret: float
-    best_std_dev: float
-    qubo: qv.QUBO
+class MinVolOutput(applications_superstaq.qubo.QUBOOutput):
+    """The minimum volatility portfolio (see `Finance.find_min_vol_portfolio`)."""
+
+    __slots__ = ("best_portfolio", "best_ret", "best_std_dev")
+
+    def __init__(
+        self,
+        best_portfolio: List[str],
+        best_ret: float,
+        best_std_dev: float,
+        qubo: Optional[qv.QUBO] = None,
+        model: Any = None,
+    ):
+        self.best_portfolio = best_portfolio
+        self.best_ret = best_ret
+        self.best_std_dev = best_std_dev
+        super().__init__(qubo, model)
 
 
 def read_json_minvol(json_dict: dict) -> MinVolOutput:
@@ -27,17 +57,129 @@ def read_json_minvol(json_dict: dict) -> MinVolOutput:
     best_portfolio = json_dict["best_portfolio"]
     best_ret = json_dict["best_ret"]
     best_std_dev = json_dict["best_std_dev"]
-    qubo = applications_superstaq.qubo.convert_model_to_qubo(json_dict["qubo"])
-    return MinVolOutput(best_portfolio, best_ret, best_std_dev, qubo)
+    return MinVolOutput(best_portfolio, best_ret, best_std_dev, model=json_dict["qubo"])
+
+
+@dataclass(eq=False)
+class _PortfolioTable:
+    """The optimal portfolios found for a batch of inputs, stored as columns.
+
+    The QUBO of each point is only built from the model returned by the server when it is first
+    accessed, and is then kept for later accesses.
+    """
+
+    stock_symbols: List[str]
+    returns: np.ndarray
+    std_devs: np.ndarray
+    masks: np.ndarray
+    models: List[Any] = field(repr=False)
+    _qubos: Dict[int, qv.QUBO] = field(default_factory=dict, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.returns)
+
+    def portfolio(self, index: int) -> List[str]:
+        """Returns the assets in a point's optimal portfolio (in the order of `stock_symbols`)."""
+        return [symbol for symbol, held in zip(self.stock_symbols, self.masks[index]) if held]
+
+    def qubo(self, index: int) -> qv.QUBO:
+        """Returns the QUBO of a point (building it on first access)."""
+        index = range(len(self))[index]
+        if index not in self._qubos:
+            model = self.models[index]
+            self._qubos[index] = applications_superstaq.qubo.convert_model_to_qubo(model)
+        return self._qubos[index]
+
 
+def _portfolio_masks(
+    portfolios: Sequence[Optional[List[str]]], stock_symbols: Sequence[str]
+) -> np.ndarray:
+    """Marks the assets in each portfolio (if any) in a boolean array over `stock_symbols`."""
+    columns = {symbol: column for column, symbol in enumerate(stock_symbols)}
+    masks = np.zeros((len(portfolios), len(stock_symbols)), dtype=bool)
+    for row, portfolio in enumerate(portfolios):
+        if portfolio is not None:
+            masks[row, [columns[symbol] for symbol in portfolio]] = True
+    return masks
+
+
+@dataclass(eq=False)
+class MinVolFrontier(_PortfolioTable):
+    """An efficient frontier: the minimum volatility portfolio for each of a range of desired
+    returns (see `Finance.find_min_vol_frontier`).
+
+    The QUBO of each point is only built from the model returned by the server when it is first
+    accessed (by `qubo` or `point`), and is then kept for later accesses.
+
+    Attributes:
+        stock_symbols: The stock tickers the portfolios were picked from, in the order of the
+            columns of `masks`.
+        returns: The return of each point's optimal portfolio.
+        std_devs: The volatility of each point's optimal portfolio.
+        masks: A boolean array of shape `(len(desired_returns), len(stock_symbols))`, marking the
+            assets in each point's optimal portfolio.
+        models: The QUBO model of each point, as returned by the server.
+        desired_returns: The desired return of each point.
+    """
+
+    desired_returns: np.ndarray
+
+    def point(self, index: int) -> MinVolOutput:
+        """Returns a point of the frontier, like the output of `Finance.find_min_vol_portfolio`."""
+        return MinVolOutput(
+            self.portfolio(index),
+            float(self.returns[index]),
+            float(self.std_devs[index]),
+            self.qubo(index),
+        )
+
+
+def read_json_minvol_frontier(
+    json_dicts: Sequence[dict],
+    stock_symbols: Sequence[str],
+    desired_returns: Union[Sequence[float], np.ndarray],
+) -> MinVolFrontier:
+    """Reads out the returned JSON of each point of an efficient frontier.
+    Args:
+        json_dicts: a JSON dictionary matching the format returned by /minvol endpoint, for each
+            desired return.
+        stock_symbols: the stock tickers the portfolios were picked from.
+        desired_returns: the desired return of each point.
+    Returns:
+        a MinVolFrontier object with the optimal portfolio of each point.
+    """
+    return MinVolFrontier(
+        stock_symbols=list(stock_symbols),
+        returns=np.array([json_dict["best_ret"] for json_dict in json_dicts], dtype=float),
+        std_devs=np.array([json_dict["best_std_dev"] for json_dict in json_dicts], dtype=float),
+        masks=_portfolio_masks(
+            [json_dict["best_portfolio"] for json_dict in json_dicts], stock_symbols
+        ),
+        models=[json_dict["qubo"] for json_dict in json_dicts],
+        desired_returns=np.array(desired_returns, dtype=float),
+    )
 
-@dataclass
-class MaxSharpeOutput:
-    best_portfolio: List[str]
-    best_ret: float
-    best_std_dev: float
-    best_sharpe_ratio: float
-    qubo: qv.QUBO
+
+class MaxSharpeOutput(applications_superstaq.qubo.QUBOOutput):
+    """The portfolio maximizing the "pseudo" Sharpe ratio (see
+    `Finance.find_max_pseudo_sharpe_ratio`)."""
+
+    __slots__ = ("best_portfolio", "best_ret", "best_std_dev", "best_sharpe_ratio")
+
+    def __init__(
+        self,
+        best_portfolio: List[str],
+        best_ret: float,
+        best_std_dev: float,
+        best_sharpe_ratio: float,
+        qubo: Optional[qv.QUBO] = None,
+        model: Any = None,
+    ):
+        self.best_portfolio = best_portfolio
+        self.best_ret = best_ret
+        self.best_std_dev = best_std_dev
+        self.best_sharpe_ratio = best_sharpe_ratio
+        super().__init__(qubo, model)
 
 
 def read_json_maxsharpe(json_dict: dict) -> MaxSharpeOutput:
@@ -52,27 +194,555 @@ def read_json_maxsharpe(json_dict: dict) -> MaxSharpeOutput:
     best_ret = json_dict["best_ret"]
     best_std_dev = json_dict["best_std_dev"]
     best_sharpe_ratio = json_dict["best_sharpe_ratio"]
-    qubo = applications_superstaq.qubo.convert_model_to_qubo(json_dict["qubo"])
-    return MaxSharpeOutput(best_portfolio, best_ret, best_std_dev, best_sharpe_ratio, qubo)
+    return MaxSharpeOutput(
+        best_portfolio, best_ret, best_std_dev, best_sharpe_ratio, model=json_dict["qubo"]
+    )
+
+
+@dataclass(eq=False)
+class MaxSharpeSweep(_PortfolioTable):
+    """The portfolios maximizing the "pseudo" Sharpe ratio over a grid of risk factors and
+    portfolio sizes (see `Finance.sweep_max_pseudo_sharpe_ratio`).
+
+    Points which failed have no portfolio (an empty mask, and NaN returns and ratios), and their
+    exception in `errors`. The QUBO of each point is only built from the model returned by the
+    server when it is first accessed (by `qubo` or `point`), and is then kept for later accesses.
+
+    Attributes:
+        stock_symbols: The stock tickers the portfolios were picked from, in the order of the
+            columns of `masks`.
+        returns: The return of each point's optimal portfolio.
+        std_devs: The volatility of each point's optimal portfolio.
+        masks: A boolean array of shape `(len(ks), len(stock_symbols))`, marking the assets in
+            each point's optimal portfolio.
+        models: The QUBO model of each point, as returned by the server (or None if it failed).
+        ks: The risk factor of each point.
+        num_assets_in_portfolio: The number of assets in each point's portfolio, as requested (NaN
+            where any number of assets was allowed).
+        sharpe_ratios: The Sharpe ratio of each point's optimal portfolio.
+        errors: The exception raised for each point, or None for each point which succeeded.
+    """
+
+    ks: np.ndarray
+    num_assets_in_portfolio: np.ndarray
+    sharpe_ratios: np.ndarray
+    errors: List[Optional[Exception]]
+
+    @property
+    def succeeded(self) -> np.ndarray:
+        """A boolean array marking the points which succeeded."""
+        return np.array([error is None for error in self.errors], dtype=bool)
+
+    def qubo(self, index: int) -> qv.QUBO:
+        """Returns the QUBO of a point (building it on first access).
+
+        Raises:
+            ValueError: If the point failed.
+        """
+        error = self.errors[index]
+        if error is not None:
+            raise ValueError(f"Point {index} of the sweep failed.") from error
+        return super().qubo(index)
+
+    def point(self, index: int) -> MaxSharpeOutput:
+        """Returns a point of the sweep, like the output of `Finance.find_max_pseudo_sharpe_ratio`.
+
+        Raises:
+            ValueError: If the point failed.
+        """
+        qubo = self.qubo(index)
+        return MaxSharpeOutput(
+            self.portfolio(index),
+            float(self.returns[index]),
+            float(self.std_devs[index]),
+            float(self.sharpe_ratios[index]),
+            qubo,
+        )
+
+
+# The outcome of one point of a sweep: the json body of its response, or the exception it raised.
+_SweepResult = Union[dict, applications_superstaq.SuperstaQException, TimeoutError]
+
+
+def _sweep_points(
+    ks: Union[Sequence[float], np.ndarray], num_assets_in_portfolio: Sequence[Optional[int]]
+) -> List[Tuple[float, Optional[int]]]:
+    """Returns the grid of (risk factor, portfolio size) points of a sweep, in row-major order."""
+    return list(itertools.product(np.asarray(ks, dtype=float).tolist(), num_assets_in_portfolio))
+
+
+def read_json_maxsharpe_sweep(
+    results: Sequence[_SweepResult],
+    stock_symbols: Sequence[str],
+    points: Sequence[Tuple[float, Optional[int]]],
+) -> MaxSharpeSweep:
+    """Reads out the returned JSON (or the exception) of each point of a sweep.
+    Args:
+        results: a JSON dictionary matching the format returned by /maxsharpe endpoint, or the
+            exception raised by the request, for each point.
+        stock_symbols: the stock tickers the portfolios were picked from.
+        points: the risk factor and the number of assets in the portfolio (or None) of each point.
+    Returns:
+        a MaxSharpeSweep object with the optimal portfolio of each point.
+    """
+
+    def column(key: str) -> np.ndarray:
+        values = [np.nan if isinstance(result, Exception) else result[key] for result in results]
+        return np.array(values, dtype=float)
+
+    json_dicts = [None if isinstance(result, Exception) else result for result in results]
+    return MaxSharpeSweep(
+        stock_symbols=list(stock_symbols),
+        returns=column("best_ret"),
+        std_devs=column("best_std_dev"),
+        masks=_portfolio_masks(
+            [
+                None if json_dict is None else json_dict["best_portfolio"]
+                for json_dict in json_dicts
+            ],
+            stock_symbols,
+        ),
+        models=[None if json_dict is None else json_dict["qubo"] for json_dict in json_dicts],
+        ks=np.array([k for k, _ in points], dtype=float),
+        num_assets_in_portfolio=np.array(
+            [np.nan if num_assets is None else num_assets for _, num_assets in points], dtype=float
+        ),
+        sharpe_ratios=column("best_sharpe_ratio"),
+        errors=[result if isinstance(result, Exception) else None for result in results],
+    )
+
+
+@dataclass(eq=False)
+class MarketStatistics:
+    """The (annualized) expected returns and covariances of a list of stocks, which can be sent
+    with the finance requests so that the server does not derive them from its own price data.
+
+    They are sent as compact binary arrays (see `converters.serialize`), which are only encoded
+    once however many requests they are sent with. The arrays are read-only copies of those given.
+
+    Attributes:
+        expected_returns: The expected return of each stock.
+        covariance: The covariance matrix of the stocks' returns.
+    """
+
+    expected_returns: np.ndarray
+    covariance: np.ndarray
+    _serialized: Dict[str, str] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # The arrays are (copied and) made read-only, so that their serialized form stays valid.
+        self.expected_returns = np.array(self.expected_returns, dtype=float)
+        self.covariance = np.array(self.covariance, dtype=float)
+        self.expected_returns.setflags(write=False)
+        self.covariance.setflags(write=False)
+        num_stocks = len(self.expected_returns)
+        assert self.expected_returns.shape == (num_stocks,) and self.covariance.shape == (
+            num_stocks,
+            num_stocks,
+        ), "The covariance matrix must be square, with a row for each expected return."
+
+    def __len__(self) -> int:
+        return len(self.expected_returns)
+
+    @classmethod
+    def from_returns(cls, returns: np.ndarray, periods_per_year: float = 252) -> "MarketStatistics":
+        """Estimates the statistics of a list of stocks from their historical returns.
+
+        Args:
+            returns: An array of shape `(num_periods, num_stocks)` of the stocks' (e.g. daily)
+                returns.
+            periods_per_year: The number of periods in a year, to annualize the statistics with
+                (e.g. 252 trading days).
+
+        Returns:
+            The annualized mean returns and covariance matrix of the stocks.
+        """
+        returns = np.asarray(returns, dtype=float)
+        assert returns.ndim == 2 and len(returns) > 1, "Returns must span at least two periods."
+        return cls(
+            returns.mean(axis=0) * periods_per_year,
+            np.cov(returns, rowvar=False).reshape(returns.shape[1], -1) * periods_per_year,
+        )
+
+    def to_json(self) -> Dict[str, str]:
+        """Returns the (serialized) fields to add to the body of a request."""
+        if not self._serialized:
+            self._serialized = {
+                "expected_returns": applications_superstaq.converters.serialize(
+                    self.expected_returns
+                ),
+                "covariance": applications_superstaq.converters.serialize(self.covariance),
+            }
+        return self._serialized
+
+
+def _default_penalty(objective: np.ndarray) -> float:
+    """Returns a penalty weight exceeding the range of a QUBO objective (with linear terms on its
+    diagonal), so that violating a constraint by one unit always costs more than it could gain."""
+    return 2 * float(np.abs(objective).sum()) or 1.0
+
+
+def _add_squared_penalty(
+    matrix: np.ndarray, coefficients: np.ndarray, target: float, weight: float
+) -> float:
+    """Adds `weight * (coefficients @ x - target) ** 2` to a QUBO matrix (in place), using
+    `x_i ** 2 == x_i` for the linear terms, and returns its constant term."""
+    matrix += weight * np.outer(coefficients, coefficients)
+    matrix[np.diag_indices_from(matrix)] -= 2 * weight * target * coefficients
+    return weight * target**2
+
+
+def _portfolio_qubo(
+    matrix: np.ndarray, offset: float, variables: List[Any], sparse: bool
+) -> Union[Dict[str, Any], "applications_superstaq.qubo.SparseQUBO"]:
+    """Converts a (dense) QUBO matrix and constant term to a SparseQUBO or columnar model."""
+    row, col, value = applications_superstaq.qubo._matrix_to_arrays(matrix)
+    if sparse:
+        upper = scipy.sparse.coo_matrix((value, (row, col)), shape=matrix.shape)
+        return applications_superstaq.qubo.SparseQUBO(upper, variables, offset)
+    if offset:
+        row, col, value = np.append(row, -1), np.append(col, -1), np.append(value, offset)
+    return applications_superstaq.qubo._columnar_model(variables, row, col, value, stream=False)
+
+
+def _stock_variables(statistics: MarketStatistics, variables: Optional[Sequence[Any]]) -> List[Any]:
+    if variables is None:
+        return list(range(len(statistics)))
+    assert len(variables) == len(statistics), "There must be one variable per stock."
+    return list(variables)
+
+
+@overload
+def build_min_vol_qubo(
+    statistics: MarketStatistics,
+    desired_return: float,
+    num_assets_in_portfolio: int,
+    variables: Optional[Sequence[Any]] = None,
+    penalty: Optional[float] = None,
+    num_slack_bits: int = 8,
+    sparse: Literal[False] = False,
+) -> Dict[str, Any]:
+    ...
+
+
+@overload
+def build_min_vol_qubo(
+    statistics: MarketStatistics,
+    desired_return: float,
+    num_assets_in_portfolio: int,
+    variables: Optional[Sequence[Any]] = None,
+    penalty: Optional[float] = None,
+    num_slack_bits: int = 8,
+    *,
+    sparse: Literal[True],
+) -> "applications_superstaq.qubo.SparseQUBO":
+    ...
+
+
+def build_min_vol_qubo(
+    statistics: MarketStatistics,
+    desired_return: float,
+    num_assets_in_portfolio: int,
+    variables: Optional[Sequence[Any]] = None,
+    penalty: Optional[float] = None,
+    num_slack_bits: int = 8,
+    sparse: bool = False,
+) -> Union[Dict[str, Any], "applications_superstaq.qubo.SparseQUBO"]:
+    """Builds the QUBO of the minimum volatility portfolio (see `Finance.find_min_vol_portfolio`)
+    locally, so that it can be checked, cached or submitted (with `Finance.submit_qubo`) directly.
+
+    Each stock has a binary variable marking whether it is held, with the stocks held equally
+    weighted. The QUBO minimizes the portfolio's variance, `x @ covariance @ x / m ** 2`, plus
+    penalties for holding other than `m` stocks and for a return below `desired_return`.
+
+    The return constraint is rounded onto a grid of steps of `(max_return - desired_return) /
+    (2 ** num_slack_bits - 1)`, where `max_return` is the highest return of any portfolio: each
+    stock's contribution is rounded down and the desired return up. It is then an equality with an
+    integer slack, encoded in (at most `num_slack_bits`) extra binary variables named "slack_0",
+    "slack_1", ..., which matches the excess return of any portfolio meeting it exactly. So the
+    energy of the QUBO's ground state is the variance of its portfolio, which always reaches
+    `desired_return`, and is at least as low as that of any portfolio exceeding it by `m + 1` steps.
+
+    Args:
+        statistics: The expected returns and covariances of the stocks.
+        desired_return: The minimum return of the portfolio.
+        num_assets_in_portfolio: The number of stocks `m` to hold.
+        variables: The name of each stock's variable (defaults to its index).
+        penalty: The weight of the constraints' penalties. Defaults to twice the total magnitude of
+            the objective's coefficients, so that violating a constraint by a whole unit never
+            pays.
+        num_slack_bits: The precision of the return constraint (see above).
+        sparse: Whether to return a `qubo.SparseQUBO` rather than a columnar model (see
+            `qubo.convert_qubo_to_columnar_model`).
+
+    Returns:
+        The QUBO, as a columnar model or SparseQUBO. (A SparseQUBO can be submitted with
+        `submit_qubo(qubo.matrix, target, variables=qubo.variables)`.)
+
+    Raises:
+        ValueError: If no portfolio of `num_assets_in_portfolio` stocks reaches `desired_return`
+            (after rounding).
+    """
+    num_stocks = len(statistics)
+    assert (
+        0 < num_assets_in_portfolio <= num_stocks
+    ), "Portfolios must hold between 1 and all stocks."
+    returns = np.sort(statistics.expected_returns)
+    max_return = returns[-num_assets_in_portfolio:].mean()
+    if max_return < desired_return:
+        raise ValueError(
+            f"No portfolio of {num_assets_in_portfolio} assets has a return of {desired_return}."
+        )
+    # Rounding the returns down (and the desired return up) onto the grid makes the constraint
+    # integral, so a portfolio meeting it has no residual penalty, and one violating it is penalized
+    # by at least `penalty`.
+    max_excess = max_return - desired_return
+    min_return = returns[:num_assets_in_portfolio].mean()
+    resolution = (max_excess or max_return - min_return or 1.0) / max(2**num_slack_bits - 1, 1)
+    steps = np.floor(statistics.expected_returns / num_assets_in_portfolio / resolution)
+    target = np.ceil(desired_return / resolution)
+    slack_range = int(np.sort(steps)[-num_assets_in_portfolio:].sum() - target)
+    if slack_range < 0:
+        raise ValueError(
+            f"A return of {desired_return} cannot be resolved with {num_slack_bits} slack bits."
+        )
+    num_slack_bits = slack_range.bit_length()
+
+    num_variables = num_stocks + num_slack_bits
+    matrix = np.zeros((num_variables, num_variables))
+    matrix[:num_stocks, :num_stocks] = statistics.covariance / num_assets_in_portfolio**2
+    penalty = _default_penalty(matrix) if penalty is None else penalty
+
+    cardinality = np.zeros(num_variables)
+    cardinality[:num_stocks] = 1.0
+    offset = _add_squared_penalty(matrix, cardinality, num_assets_in_portfolio, penalty)
+    # steps @ x - slack == target, with 0 <= slack < 2 ** num_slack_bits.
+    excess = np.empty(num_variables)
+    excess[:num_stocks] = steps
+    excess[num_stocks:] = -(2.0 ** np.arange(num_slack_bits))
+    offset += _add_squared_penalty(matrix, excess, target, penalty)
+
+    slack_variables = [f"slack_{bit}" for bit in range(num_slack_bits)]
+    return _portfolio_qubo(
+        matrix, offset, _stock_variables(statistics, variables) + slack_variables, sparse
+    )
+
+
+@overload
+def build_max_sharpe_qubo(
+    statistics: MarketStatistics,
+    k: float,
+    num_assets_in_portfolio: Optional[int] = None,
+    variables: Optional[Sequence[Any]] = None,
+    penalty: Optional[float] = None,
+    sparse: Literal[False] = False,
+) -> Dict[str, Any]:
+    ...
+
+
+@overload
+def build_max_sharpe_qubo(
+    statistics: MarketStatistics,
+    k: float,
+    num_assets_in_portfolio: Optional[int] = None,
+    variables: Optional[Sequence[Any]] = None,
+    penalty: Optional[float] = None,
+    *,
+    sparse: Literal[True],
+) -> "applications_superstaq.qubo.SparseQUBO":
+    ...
+
+
+def build_max_sharpe_qubo(
+    statistics: MarketStatistics,
+    k: float,
+    num_assets_in_portfolio: Optional[int] = None,
+    variables: Optional[Sequence[Any]] = None,
+    penalty: Optional[float] = None,
+    sparse: bool = False,
+) -> Union[Dict[str, Any], "applications_superstaq.qubo.SparseQUBO"]:
+    """Builds the QUBO of the portfolio maximizing the "pseudo" Sharpe ratio (see
+    `Finance.find_max_pseudo_sharpe_ratio`) locally, so that it can be checked, cached or submitted
+    (with `Finance.submit_qubo`) directly.
+
+    Each stock has a binary variable marking whether it is held. With a portfolio size `m`, the
+    stocks held are equally weighted and the QUBO minimizes
+    `k * x @ covariance @ x / m ** 2 - (1 - k) * returns @ x / m`, plus a penalty for holding other
+    than `m` stocks. Without one, each stock held has unit weight and there is no penalty.
+
+    Args:
+        statistics: The expected returns and covariances of the stocks.
+        k: The risk factor, between 0 (only maximizing return) and 1 (only minimizing risk).
+        num_assets_in_portfolio: The number of stocks `m` to hold, or None for any number.
+        variables: The name of each stock's variable (defaults to its index).
+        penalty: The weight of the cardinality penalty. Defaults to twice the total magnitude of
+            the objective's coefficients, so that violating a constraint by a whole unit never
+            pays.
+        sparse: Whether to return a `qubo.SparseQUBO` rather than a columnar model (see
+            `qubo.convert_qubo_to_columnar_model`).
+
+    Returns:
+        The QUBO, as a columnar model or SparseQUBO. (A SparseQUBO can be submitted with
+        `submit_qubo(qubo.matrix, target, variables=qubo.variables)`.)
+    """
+    num_stocks = len(statistics)
+    assert 0 <= k <= 1, "The risk factor k must be between 0 and 1."
+    scale = 1 if num_assets_in_portfolio is None else num_assets_in_portfolio
+    assert 0 < scale <= num_stocks, "Portfolios must hold between 1 and all stocks."
+
+    matrix = k * statistics.covariance / scale**2
+    matrix[np.diag_indices(num_stocks)] -= (1 - k) * statistics.expected_returns / scale
+    offset = 0.0
+    if num_assets_in_portfolio is not None:
+        penalty = _default_penalty(matrix) if penalty is None else penalty
+        offset = _add_squared_penalty(matrix, np.ones(num_stocks), scale, penalty)
+    return _portfolio_qubo(matrix, offset, _stock_variables(statistics, variables), sparse)
+
+
+def _statistics_input(
+    stock_symbols: List[str], statistics: Optional[MarketStatistics]
+) -> Dict[str, Any]:
+    """Builds the fields of a request body holding the (optional) precomputed statistics."""
+    if statistics is None:
+        return {}
+    assert len(statistics) == len(
+        stock_symbols
+    ), "The statistics must cover exactly the stocks in `stock_symbols`."
+    return statistics.to_json()
+
+
+def _minvol_input(
+    stock_symbols: List[str],
+    desired_return: float,
+    years_window: float,
+    solver: str,
+    statistics: Optional[MarketStatistics] = None,
+) -> Dict[str, Any]:
+    """Builds the body of a /minvol request."""
+    return {
+        "stock_symbols": stock_symbols,
+        "desired_return": desired_return,
+        "years_window": years_window,
+        "solver": solver,
+        **_statistics_input(stock_symbols, statistics),
+    }
+
+
+def _minvol_frontier_input(
+    stock_symbols: List[str],
+    desired_returns: Union[Sequence[float], np.ndarray],
+    years_window: float,
+    solver: str,
+    statistics: Optional[MarketStatistics] = None,
+) -> Dict[str, Any]:
+    """Builds the body of a /minvol_frontier request."""
+    return {
+        "stock_symbols": stock_symbols,
+        "desired_returns": np.asarray(desired_returns, dtype=float).tolist(),
+        "years_window": years_window,
+        "solver": solver,
+        **_statistics_input(stock_symbols, statistics),
+    }
+
+
+def _maxsharpe_input(
+    stock_symbols: List[str],
+    k: float,
+    num_assets_in_portfolio: Optional[int],
+    years_window: float,
+    solver: str,
+    statistics: Optional[MarketStatistics] = None,
+) -> Dict[str, Any]:
+    """Builds the body of a /maxsharpe request."""
+    return {
+        "stock_symbols": stock_symbols,
+        "k": k,
+        "num_assets_in_portfolio": num_assets_in_portfolio,
+        "years_window": years_window,
+        "solver": solver,
+        **_statistics_input(stock_symbols, statistics),
+    }
 
 
 class Finance:
     def __init__(self, client: superstaq_client._SuperstaQClient):
         self._client = client
 
-    def submit_qubo(self, qubo: qv.QUBO, target: str, repetitions: int = 1000) -> np.recarray:
+    def submit_qubo(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int = 1000,
+        variables: Optional[Sequence[Any]] = None,
+        presolve: bool = False,
+        allow_pickle: bool = True,
+    ) -> np.recarray:
         """Submits the given QUBO to the target backend. The result of the optimization
         is returned to the user as a numpy.recarray.
         Args:
-            qubo: Qubovert QUBO object representing the optimization problem.
+            qubo: Qubovert QUBO object representing the optimization problem, or a square numpy
+                array or scipy.sparse matrix `Q` (for which the value of an assignment `x` is
+                `x @ Q @ x`).
             target: A string indicating which backend to use.
             repetitions: Number of shots to execute on the device.
+            variables: The label of each row/column of a QUBO matrix (defaults to their indices).
+            presolve: Whether to reduce the QUBO before submitting it (see
+                `applications_superstaq.qubo.presolve`). Each independent sub-QUBO left after
+                presolving is then submitted separately, and their solutions combined into
+                solutions of the full QUBO (see `qubo.reconstruct_solutions`).
+            allow_pickle: Whether to unpickle solutions which were not binary-encoded (see
+                `qubo.read_json_qubo_result`).
         Returns:
             Numpy.recarray containing the solution to the QUBO, the energy of the
             different solutions, and the number of times each solution was found.
         """
-        json_dict = self._client.submit_qubo(qubo, target, repetitions=repetitions)
-        return applications_superstaq.qubo.read_json_qubo_result(json_dict)
+        if not presolve:
+            json_dict = self._client.submit_qubo(
+                qubo, target, repetitions=repetitions, variables=variables
+            )
+            return applications_superstaq.qubo.read_json_qubo_result(json_dict, allow_pickle)
+
+        presolved = applications_superstaq.qubo.presolve(qubo, variables)
+        results = [
+            self.submit_qubo(
+                component.matrix,
+                target,
+                repetitions,
+                component.variables,
+                allow_pickle=allow_pickle,
+            )
+            for component in presolved.components
+        ]
+        return applications_superstaq.qubo.reconstruct_solutions(presolved, results)
+
+    def submit_qubo_stream(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int = 1000,
+        variables: Optional[Sequence[Any]] = None,
+        batch_size: int = applications_superstaq.converters.DECODE_BATCH_SIZE,
+        allow_pickle: bool = True,
+    ) -> Iterator[np.recarray]:
+        """Submits the given QUBO to the target backend like `submit_qubo`, but reads out the
+        solutions incrementally, as they are downloaded (see `qubo.iter_json_qubo_result`).
+        Args:
+            qubo: Qubovert QUBO object representing the optimization problem, or a square numpy
+                array or scipy.sparse matrix.
+            target: A string indicating which backend to use.
+            repetitions: Number of shots to execute on the device.
+            variables: The label of each row/column of a QUBO matrix (defaults to their indices).
+            batch_size: The number of solutions in each batch (except the last).
+            allow_pickle: Whether to unpickle solutions which were not binary-encoded (see
+                `qubo.read_json_qubo_result`).
+        Returns:
+            An iterator over batches of the solutions, as numpy.recarrays like that returned by
+            `submit_qubo`.
+        """
+        chunks = self._client.submit_qubo_stream(
+            qubo, target, repetitions=repetitions, variables=variables
+        )
+        return applications_superstaq.qubo.iter_json_qubo_result(chunks, batch_size, allow_pickle)
 
     def find_min_vol_portfolio(
         self,
@@ -80,6 +750,8 @@ class Finance:
         desired_return: float,
         years_window: float = 5.0,
         solver: str = "anneal",
+        bypass_cache: bool = False,
+        statistics: Optional[MarketStatistics] = None,
     ) -> MinVolOutput:
         """Finds the portfolio with minimum volatility that exceeds a specified desired return.
         Args:
@@ -88,21 +760,54 @@ class Finance:
             years_window: The number of years previous from today to pull data from
             for price data.
             solver: Specifies which solver to use. Defaults to a simulated annealer.
+            bypass_cache: Whether to request a new result even if the client's result cache holds
+            one for the same input.
+            statistics: Precomputed expected returns and covariances of `stock_symbols` (in the same
+            order) to send with the request, so that the server does not derive them from its
+            price data (and `years_window` is ignored).
         Returns:
             MinVolOutput object, with the following attributes:
             .best_portfolio: The assets in the optimal portfolio.
             .best_ret: The return of the optimal portfolio.
             .best_std_dev: The volatility of the optimal portfolio.
         """
-        input_dict = {
-            "stock_symbols": stock_symbols,
-            "desired_return": desired_return,
-            "years_window": years_window,
-            "solver": solver,
-        }
-        json_dict = self._client.find_min_vol_portfolio(input_dict)
+        input_dict = _minvol_input(stock_symbols, desired_return, years_window, solver, statistics)
+        json_dict = self._client.find_min_vol_portfolio(input_dict, bypass_cache)
         return read_json_minvol(json_dict)
 
+    def find_min_vol_frontier(
+        self,
+        stock_symbols: List[str],
+        desired_returns: Union[Sequence[float], np.ndarray],
+        years_window: float = 5.0,
+        solver: str = "anneal",
+        bypass_cache: bool = False,
+        statistics: Optional[MarketStatistics] = None,
+    ) -> MinVolFrontier:
+        """Finds the minimum volatility portfolio for each of a range of desired returns, i.e. an
+        efficient frontier, with a single batched request (or concurrent requests for each point,
+        if the server does not support batching).
+        Args:
+            stock_symbols: A list of stock tickers to pick from.
+            desired_returns: The minimum return needed, for each point of the frontier.
+            years_window: The number of years previous from today to pull data from
+            for price data.
+            solver: Specifies which solver to use. Defaults to a simulated annealer.
+            bypass_cache: Whether to request new results even if the client's result cache holds
+            them for the same input.
+            statistics: Precomputed expected returns and covariances of `stock_symbols` (in the same
+            order) to send with the request, so that the server does not derive them from its
+            price data (and `years_window` is ignored).
+        Returns:
+            MinVolFrontier object, with the return, volatility and assets (as a boolean mask over
+            `stock_symbols`) of the optimal portfolio of each point.
+        """
+        input_dict = _minvol_frontier_input(
+            stock_symbols, desired_returns, years_window, solver, statistics
+        )
+        json_dicts = self._client.find_min_vol_frontier(input_dict, bypass_cache)
+        return read_json_minvol_frontier(json_dicts, stock_symbols, input_dict["desired_returns"])
+
     def find_max_pseudo_sharpe_ratio(
         self,
         stock_symbols: List[str],
@@ -110,6 +815,8 @@ class Finance:
         num_assets_in_portfolio: Optional[int] = None,
         years_window: float = 5.0,
         solver: str = "anneal",
+        bypass_cache: bool = False,
+        statistics: Optional[MarketStatistics] = None,
     ) -> MaxSharpeOutput:
         """
         Finds the optimal equal-weight portfolio from a possible pool of stocks
@@ -140,6 +847,11 @@ class Finance:
             years_window: The number of years previous from today to pull data from
             for price data.
             solver: Specifies which solver to use. Defaults to a simulated annealer.
+            bypass_cache: Whether to request a new result even if the client's result cache holds
+            one for the same input.
+            statistics: Precomputed expected returns and covariances of `stock_symbols` (in the same
+            order) to send with the request, so that the server does not derive them from its
+            price data (and `years_window` is ignored).
         Return:
             A MaxSharpeOutput object with the following attributes:
             .best_portfolio: The assets in the optimal portfolio.
@@ -147,12 +859,208 @@ class Finance:
             .best_std_dev: The volatility of the optimal portfolio.
             .best_sharpe_ratio: The Sharpe ratio of the optimal portfolio.
         """
-        input_dict = {
-            "stock_symbols": stock_symbols,
-            "k": k,
-            "num_assets_in_portfolio": num_assets_in_portfolio,
-            "years_window": years_window,
-            "solver": solver,
-        }
-        json_dict = self._client.find_max_pseudo_sharpe_ratio(input_dict)
+        input_dict = _maxsharpe_input(
+            stock_symbols, k, num_assets_in_portfolio, years_window, solver, statistics
+        )
+        json_dict = self._client.find_max_pseudo_sharpe_ratio(input_dict, bypass_cache)
+        return read_json_maxsharpe(json_dict)
+
+    def sweep_max_pseudo_sharpe_ratio(
+        self,
+        stock_symbols: List[str],
+        ks: Union[Sequence[float], np.ndarray],
+        num_assets_in_portfolio: Sequence[Optional[int]] = (None,),
+        years_window: float = 5.0,
+        solver: str = "anneal",
+        max_workers: Optional[int] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        bypass_cache: bool = False,
+        statistics: Optional[MarketStatistics] = None,
+    ) -> MaxSharpeSweep:
+        """Finds the portfolio maximizing the "pseudo" Sharpe ratio (see
+        `find_max_pseudo_sharpe_ratio`) for every combination of a risk factor and a portfolio size,
+        with up to `max_workers` requests in flight at once.
+        Args:
+            stock_symbols: A list of stock tickers to pick from.
+            ks: The risk factors (between 0 and 1) to sweep over.
+            num_assets_in_portfolio: The portfolio sizes to sweep over (where None allows any
+            number of assets).
+            years_window: The number of years previous from today to pull data from
+            for price data.
+            solver: Specifies which solver to use. Defaults to a simulated annealer.
+            max_workers: The maximum number of concurrent requests. Defaults to the client's
+            `pool_maxsize`.
+            on_progress: A function called with the number of points done (whether they succeeded
+            or failed) and the total number of points, whenever a point is done.
+            bypass_cache: Whether to request new results even if the client's result cache holds
+            them for the same input.
+            statistics: Precomputed expected returns and covariances of `stock_symbols` (in the same
+            order) to send with the request, so that the server does not derive them from its
+            price data (and `years_window` is ignored).
+        Returns:
+            A MaxSharpeSweep table with a row for each point (in row-major order over `ks` and
+            `num_assets_in_portfolio`). Points which failed are included with their exception,
+            rather than raising it.
+        """
+        points = _sweep_points(ks, num_assets_in_portfolio)
+
+        def find(point: Tuple[float, Optional[int]]) -> dict:
+            input_dict = _maxsharpe_input(stock_symbols, *point, years_window, solver, statistics)
+            return self._client.find_max_pseudo_sharpe_ratio(input_dict, bypass_cache)
+
+        results: List[_SweepResult] = [{} for _ in points]
+        max_workers = max_workers or self._client.pool_maxsize
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(find, point): index for index, point in enumerate(points)}
+            for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                try:
+                    results[futures[future]] = future.result()
+                except (applications_superstaq.SuperstaQException, TimeoutError) as e:
+                    results[futures[future]] = e
+                if on_progress is not None:
+                    on_progress(done, len(points))
+        return read_json_maxsharpe_sweep(results, stock_symbols, points)
+
+
+class AsyncFinance:
+    """Asynchronous counterpart of `Finance`, for use with an `AsyncSuperstaQClient`."""
+
+    def __init__(self, client: async_superstaq_client.AsyncSuperstaQClient):
+        self._client = client
+
+    async def submit_qubo(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int = 1000,
+        variables: Optional[Sequence[Any]] = None,
+        presolve: bool = False,
+        allow_pickle: bool = True,
+    ) -> np.recarray:
+        """Submits the given QUBO to the target backend (see `Finance.submit_qubo`).
+
+        If presolving, the independent sub-QUBOs are submitted concurrently.
+        """
+        if not presolve:
+            json_dict = await self._client.submit_qubo(
+                qubo, target, repetitions=repetitions, variables=variables
+            )
+            return applications_superstaq.qubo.read_json_qubo_result(json_dict, allow_pickle)
+
+        presolved = applications_superstaq.qubo.presolve(qubo, variables)
+        results = await asyncio.gather(
+            *(
+                self.submit_qubo(
+                    component.matrix,
+                    target,
+                    repetitions,
+                    component.variables,
+                    allow_pickle=allow_pickle,
+                )
+                for component in presolved.components
+            )
+        )
+        return applications_superstaq.qubo.reconstruct_solutions(presolved, results)
+
+    async def submit_qubo_stream(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int = 1000,
+        variables: Optional[Sequence[Any]] = None,
+        batch_size: int = applications_superstaq.converters.DECODE_BATCH_SIZE,
+        allow_pickle: bool = True,
+    ) -> AsyncIterator[np.recarray]:
+        """Submits the given QUBO to the target backend, reading out the solutions incrementally
+        (see `Finance.submit_qubo_stream`)."""
+        chunks = await self._client.submit_qubo_stream(
+            qubo, target, repetitions=repetitions, variables=variables
+        )
+        return applications_superstaq.qubo.aiter_json_qubo_result(chunks, batch_size, allow_pickle)
+
+    async def find_min_vol_portfolio(
+        self,
+        stock_symbols: List[str],
+        desired_return: float,
+        years_window: float = 5.0,
+        solver: str = "anneal",
+        bypass_cache: bool = False,
+        statistics: Optional[MarketStatistics] = None,
+    ) -> MinVolOutput:
+        """Finds the portfolio with minimum volatility that exceeds a specified desired return
+        (see `Finance.find_min_vol_portfolio`)."""
+        input_dict = _minvol_input(stock_symbols, desired_return, years_window, solver, statistics)
+        json_dict = await self._client.find_min_vol_portfolio(input_dict, bypass_cache)
+        return read_json_minvol(json_dict)
+
+    async def find_min_vol_frontier(
+        self,
+        stock_symbols: List[str],
+        desired_returns: Union[Sequence[float], np.ndarray],
+        years_window: float = 5.0,
+        solver: str = "anneal",
+        bypass_cache: bool = False,
+        statistics: Optional[MarketStatistics] = None,
+    ) -> MinVolFrontier:
+        """Finds the minimum volatility portfolio for each of a range of desired returns
+        (see `Finance.find_min_vol_frontier`)."""
+        input_dict = _minvol_frontier_input(
+            stock_symbols, desired_returns, years_window, solver, statistics
+        )
+        json_dicts = await self._client.find_min_vol_frontier(input_dict, bypass_cache)
+        return read_json_minvol_frontier(json_dicts, stock_symbols, input_dict["desired_returns"])
+
+    async def find_max_pseudo_sharpe_ratio(
+        self,
+        stock_symbols: List[str],
+        k: float,
+        num_assets_in_portfolio: Optional[int] = None,
+        years_window: float = 5.0,
+        solver: str = "anneal",
+        bypass_cache: bool = False,
+        statistics: Optional[MarketStatistics] = None,
+    ) -> MaxSharpeOutput:
+        """Finds the optimal equal-weight portfolio maximizing the "pseudo" Sharpe ratio
+        (see `Finance.find_max_pseudo_sharpe_ratio`)."""
+        input_dict = _maxsharpe_input(
+            stock_symbols, k, num_assets_in_portfolio, years_window, solver, statistics
+        )
+        json_dict = await self._client.find_max_pseudo_sharpe_ratio(input_dict, bypass_cache)
         return read_json_maxsharpe(json_dict)
+
+    async def sweep_max_pseudo_sharpe_ratio(
+        self,
+        stock_symbols: List[str],
+        ks: Union[Sequence[float], np.ndarray],
+        num_assets_in_portfolio: Sequence[Optional[int]] = (None,),
+        years_window: float = 5.0,
+        solver: str = "anneal",
+        max_workers: Optional[int] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        bypass_cache: bool = False,
+        statistics: Optional[MarketStatistics] = None,
+    ) -> MaxSharpeSweep:
+        """Finds the portfolio maximizing the "pseudo" Sharpe ratio for every combination of a risk
+        factor and a portfolio size (see `Finance.sweep_max_pseudo_sharpe_ratio`)."""
+        points = _sweep_points(ks, num_assets_in_portfolio)
+        semaphore = asyncio.Semaphore(max_workers or self._client.pool_maxsize)
+        done = 0
+
+        async def find(point: Tuple[float, Optional[int]]) -> _SweepResult:
+            nonlocal done
+            input_dict = _maxsharpe_input(stock_symbols, *point, years_window, solver, statistics)
+            result: _SweepResult
+            async with semaphore:
+                try:
+                    result = await self._client.find_max_pseudo_sharpe_ratio(
+                        input_dict, bypass_cache
+                    )
+                except (applications_superstaq.SuperstaQException, TimeoutError) as e:
+                    result = e
+            done += 1
+            if on_progress is not None:
+                on_progress(done, len(points))
+            return result
+
+        results = await asyncio.gather(*(find(point) for point in points))
+        return read_json_maxsharpe_sweep(results, stock_symbols, points)
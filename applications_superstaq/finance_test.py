@@ -1,7 +1,13 @@
+import asyncio
+import itertools
+import json
+from typing import AsyncIterator, Dict, List, Tuple
 from unittest import mock
 
 import numpy as np
+import pytest
 import qubovert as qv
+import scipy.sparse
 
 import applications_superstaq
 
@@ -24,6 +30,45 @@ def test_read_json_minvol() -> None:
     )
 
 
+def test_read_json_minvol_frontier() -> None:
+    json_dicts = [
+        {
+            "best_portfolio": ["GOOG", "AAPL"],
+            "best_ret": 8.1,
+            "best_std_dev": 10.5,
+            "qubo": [{"keys": ["0"], "value": 1.0}],
+        },
+        {
+            "best_portfolio": ["MMM"],
+            "best_ret": 9.2,
+            "best_std_dev": 12.0,
+            "qubo": [{"keys": ["1"], "value": 2.0}],
+        },
+    ]
+    frontier = applications_superstaq.finance.read_json_minvol_frontier(
+        json_dicts, ["AAPL", "GOOG", "MMM"], [8, 9]
+    )
+    assert len(frontier) == 2
+    np.testing.assert_array_equal(frontier.desired_returns, [8.0, 9.0])
+    np.testing.assert_array_equal(frontier.returns, [8.1, 9.2])
+    np.testing.assert_array_equal(frontier.std_devs, [10.5, 12.0])
+    np.testing.assert_array_equal(frontier.masks, [[True, True, False], [False, False, True]])
+    assert frontier.portfolio(0) == ["AAPL", "GOOG"]
+
+    # QUBOs are only built when first accessed.
+    convert_model_to_qubo = applications_superstaq.qubo.convert_model_to_qubo
+    with mock.patch(
+        "applications_superstaq.qubo.convert_model_to_qubo", wraps=convert_model_to_qubo
+    ) as mock_convert:
+        assert not mock_convert.called
+        assert frontier.qubo(-1) is frontier.qubo(1)
+        mock_convert.assert_called_once_with(json_dicts[1]["qubo"])
+    assert frontier.point(0) == applications_superstaq.finance.MinVolOutput(
+        ["AAPL", "GOOG"], 8.1, 10.5, qv.QUBO({("0",): 1.0})
+    )
+    assert "models" not in repr(frontier)
+
+
 def test_read_json_maxsharpe() -> None:
     best_portfolio = ["AAPL", "GOOG"]
     best_ret = 8.1
@@ -65,6 +110,69 @@ def test_service_submit_qubo(mock_submit_qubo: mock.MagicMock) -> None:
         dtype=[("solution", "O"), ("energy", "<f8"), ("num_occurrences", "<i8")],
     )
     assert repr(service.submit_qubo(qv.QUBO(), "target", repetitions=10)) == repr(expected)
+    with pytest.raises(ValueError, match="allow_pickle=False"):
+        _ = service.submit_qubo(qv.QUBO(), "target", allow_pickle=False)
+
+    matrix = scipy.sparse.coo_matrix([[1.0, -2.0], [0.0, 1.0]])
+    _ = service.submit_qubo(matrix, "target", variables=["a", "b"])
+    mock_submit_qubo.assert_called_with(matrix, "target", repetitions=1000, variables=["a", "b"])
+
+
+def test_service_submit_qubo_stream() -> None:
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        remote_host="http://example.com", api_key="key", client_name="applications_superstaq"
+    )
+    service = applications_superstaq.finance.Finance(client)
+    solution = np.rec.fromrecords(
+        [((0, 1), -1.0, 6), ((1, 1), -1.0, 4), ((1, 0), 0.0, 1)],
+        dtype=[("solution", "i1", (2,)), ("energy", "<f8"), ("num_occurrences", "<i8")],
+    )
+    body = json.dumps({"solution": applications_superstaq.converters.serialize(solution)})
+    with mock.patch.object(
+        client, "submit_qubo_stream", return_value=iter([body[:10].encode(), body[10:].encode()])
+    ) as mock_submit_qubo_stream:
+        batches = list(service.submit_qubo_stream(qv.QUBO(), "target", batch_size=2))
+    mock_submit_qubo_stream.assert_called_once_with(
+        qv.QUBO(), "target", repetitions=1000, variables=None
+    )
+    assert [len(batch) for batch in batches] == [2, 1]
+    np.testing.assert_array_equal(np.concatenate(batches), solution)
+
+
+def _solve_component(
+    matrix: scipy.sparse.coo_matrix, target: str, repetitions: int, variables: List[str]
+) -> Dict[str, str]:
+    qubo = applications_superstaq.qubo.convert_to_sparse_qubo(matrix, variables)
+    samples = np.array(list(itertools.product([0, 1], repeat=len(variables))))
+    solutions = np.empty(
+        len(samples), dtype=[("solution", "O"), ("energy", "<f8"), ("num_occurrences", "<i8")]
+    )
+    solutions["solution"] = [dict(zip(variables, sample)) for sample in samples.tolist()]
+    solutions["energy"] = applications_superstaq.qubo.evaluate_energies(qubo, samples)
+    solutions["num_occurrences"] = 1
+    return {"solution": applications_superstaq.converters.serialize(solutions)}
+
+
+PRESOLVABLE_QUBO = qv.QUBO(
+    {("a",): 2.0, ("x",): -1.0, ("y",): -1.0, ("x", "y"): 1.5, ("a", "x"): -1.0, (): 1.0}
+)
+
+
+@mock.patch(
+    "applications_superstaq.superstaq_client._SuperstaQClient.submit_qubo",
+    side_effect=_solve_component,
+)
+def test_service_submit_qubo_presolve(mock_submit_qubo: mock.MagicMock) -> None:
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        remote_host="http://example.com", api_key="key", client_name="applications_superstaq"
+    )
+    service = applications_superstaq.finance.Finance(client)
+    solutions = service.submit_qubo(PRESOLVABLE_QUBO, "target", repetitions=10, presolve=True)
+    mock_submit_qubo.assert_called_once_with(
+        mock.ANY, "target", repetitions=10, variables=["x", "y"]
+    )
+    assert solutions.solution[0] in ({"a": 0, "x": 1, "y": 0}, {"a": 0, "x": 0, "y": 1})
+    assert solutions.energy[0] == 0.0
 
 
 @mock.patch(
@@ -86,6 +194,242 @@ def test_service_find_min_vol_portfolio(mock_find_min_vol_portfolio: mock.MagicM
     assert service.find_min_vol_portfolio(["AAPL", "GOOG", "IEF", "MMM"], 8) == expected
 
 
+def test_market_statistics() -> None:
+    returns = np.array([[0.01, 0.02], [0.03, -0.02], [0.02, 0.0]])
+    statistics = applications_superstaq.finance.MarketStatistics.from_returns(returns, 100)
+    np.testing.assert_allclose(statistics.expected_returns, [2.0, 0.0])
+    np.testing.assert_allclose(statistics.covariance, np.cov(returns.T) * 100)
+    assert len(statistics) == 2
+
+    fields = statistics.to_json()
+    assert statistics.to_json() is fields
+    with pytest.raises(ValueError, match="read-only"):
+        statistics.covariance[0, 0] = 1.0
+    expected_returns = np.array([0.1, 0.2])
+    copied = applications_superstaq.finance.MarketStatistics(expected_returns, np.eye(2))
+    assert expected_returns.flags.writeable
+    assert not np.shares_memory(copied.expected_returns, expected_returns)
+    assert set(fields) == {"expected_returns", "covariance"}
+    np.testing.assert_array_equal(
+        applications_superstaq.converters.deserialize(fields["covariance"], allow_pickle=False),
+        statistics.covariance,
+    )
+
+    single = applications_superstaq.finance.MarketStatistics.from_returns(returns[:, :1])
+    assert single.covariance.shape == (1, 1)
+
+    with pytest.raises(AssertionError, match="covariance matrix must be square"):
+        _ = applications_superstaq.finance.MarketStatistics(np.zeros(2), np.zeros((1, 2)))
+    with pytest.raises(AssertionError, match="at least two periods"):
+        _ = applications_superstaq.finance.MarketStatistics.from_returns(returns[:1])
+
+
+_STATISTICS = applications_superstaq.finance.MarketStatistics(
+    np.array([0.10, 0.05, 0.20, 0.15]),
+    np.array(
+        [
+            [0.04, 0.01, 0.00, 0.02],
+            [0.01, 0.01, 0.00, 0.00],
+            [0.00, 0.00, 0.09, 0.03],
+            [0.02, 0.00, 0.03, 0.05],
+        ]
+    ),
+)
+
+
+def _best_portfolio(
+    qubo: applications_superstaq.qubo.SparseQUBO, num_stocks: int
+) -> Tuple[List[int], float]:
+    """Finds the stocks held in (and the energy of) the ground state of a QUBO by brute force."""
+    samples = np.array(list(itertools.product([0, 1], repeat=len(qubo.variables))))
+    energies = applications_superstaq.qubo.evaluate_energies(qubo, samples)
+    best = samples[np.argmin(energies)][:num_stocks]
+    return [int(i) for i in np.flatnonzero(best)], float(energies.min())
+
+
+def _variance(
+    statistics: applications_superstaq.finance.MarketStatistics, portfolio: List[int]
+) -> float:
+    return float(statistics.covariance[np.ix_(portfolio, portfolio)].sum() / len(portfolio) ** 2)
+
+
+def test_build_min_vol_qubo() -> None:
+    qubo = applications_superstaq.finance.build_min_vol_qubo(_STATISTICS, 0.12, 2, sparse=True)
+    assert qubo.variables == [0, 1, 2, 3] + [f"slack_{bit}" for bit in range(8)]
+    assert np.all(qubo.matrix.row <= qubo.matrix.col)
+
+    # The least volatile pair with a mean return of at least 0.12 is (1, 2).
+    portfolio, energy = _best_portfolio(qubo, 4)
+    assert portfolio == [1, 2]
+    assert energy == pytest.approx((0.01 + 0.09) / 4)
+
+    columnar = applications_superstaq.finance.build_min_vol_qubo(
+        _STATISTICS, 0.125, 2, variables=["A", "B", "C", "D"], num_slack_bits=2
+    )
+    assert columnar["format"] == "columnar"
+    assert columnar["variables"] == ["A", "B", "C", "D", "slack_0", "slack_1"]
+    assert columnar["row"][-1] == columnar["col"][-1] == -1
+    np.testing.assert_allclose(
+        applications_superstaq.qubo.evaluate_energies(columnar, np.eye(6)),
+        applications_superstaq.qubo.evaluate_energies(
+            applications_superstaq.finance.build_min_vol_qubo(
+                _STATISTICS, 0.125, 2, num_slack_bits=2, sparse=True
+            ),
+            np.eye(6),
+        ),
+    )
+
+    # The least volatile stocks have the highest returns, so they are chosen for any target.
+    statistics = applications_superstaq.finance.MarketStatistics(
+        _STATISTICS.expected_returns, np.diag([0.09, 0.09, 0.01, 0.01])
+    )
+    for desired_return in [0.0, 0.1, 0.125, 0.15, 0.17]:
+        qubo = applications_superstaq.finance.build_min_vol_qubo(
+            statistics, desired_return, 2, sparse=True
+        )
+        portfolio, energy = _best_portfolio(qubo, 4)
+        assert portfolio == [2, 3]
+        assert energy == pytest.approx(0.005)
+
+    # Only the two stocks with the highest returns reach the desired return, leaving no slack to
+    # round the returns onto.
+    with pytest.raises(ValueError, match="cannot be resolved with 4 slack bits"):
+        _ = applications_superstaq.finance.build_min_vol_qubo(
+            _STATISTICS, 0.175, 2, num_slack_bits=4
+        )
+    with pytest.raises(ValueError, match="No portfolio of 2 assets"):
+        _ = applications_superstaq.finance.build_min_vol_qubo(_STATISTICS, 0.2, 2)
+    with pytest.raises(AssertionError, match="between 1 and all stocks"):
+        _ = applications_superstaq.finance.build_min_vol_qubo(_STATISTICS, 0.1, 5)
+    with pytest.raises(AssertionError, match="one variable per stock"):
+        _ = applications_superstaq.finance.build_min_vol_qubo(_STATISTICS, 0.1, 2, variables=["A"])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_build_min_vol_qubo_brute_force(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(scale=0.1, size=(5, 5))
+    statistics = applications_superstaq.finance.MarketStatistics(
+        rng.uniform(0.0, 0.2, size=5), factors @ factors.T
+    )
+    num_assets = int(rng.integers(1, 4))
+    returns = np.sort(statistics.expected_returns)
+    max_return = returns[-num_assets:].mean()
+    # A target between the steps of the grid the returns are rounded onto.
+    desired_return = rng.uniform(returns[:num_assets].mean(), max_return)
+    resolution = (max_return - desired_return) / (2**4 - 1)
+
+    qubo = applications_superstaq.finance.build_min_vol_qubo(
+        statistics, desired_return, num_assets, num_slack_bits=4, sparse=True
+    )
+    portfolio, energy = _best_portfolio(qubo, 5)
+    assert len(portfolio) == num_assets
+    assert statistics.expected_returns[portfolio].mean() >= desired_return
+    assert energy == pytest.approx(_variance(statistics, portfolio))
+
+    # No portfolio exceeding the target by more than the rounding error is less volatile.
+    for other in itertools.combinations(range(5), num_assets):
+        mean_return = statistics.expected_returns[list(other)].mean()
+        if mean_return >= desired_return + (num_assets + 1) * resolution:
+            assert _variance(statistics, portfolio) <= _variance(statistics, list(other)) + 1e-9
+
+
+def test_build_max_sharpe_qubo() -> None:
+    qubo = applications_superstaq.finance.build_max_sharpe_qubo(_STATISTICS, 0.5, 2, sparse=True)
+    assert qubo.variables == [0, 1, 2, 3]
+
+    # Brute force over the pairs of stocks.
+    def objective(pair: Tuple[int, int]) -> float:
+        x = np.zeros(4)
+        x[list(pair)] = 1
+        return 0.5 * x @ _STATISTICS.covariance @ x / 4 - 0.5 * _STATISTICS.expected_returns @ x / 2
+
+    best_pair = min(itertools.combinations(range(4), 2), key=objective)
+    portfolio, energy = _best_portfolio(qubo, 4)
+    assert portfolio == list(best_pair)
+    assert energy == pytest.approx(objective(best_pair))
+
+    # Without a portfolio size (and only maximizing return), every stock is held.
+    columnar = applications_superstaq.finance.build_max_sharpe_qubo(_STATISTICS, 0.0)
+    assert columnar["variables"] == ["0", "1", "2", "3"]
+    assert columnar["row"] == columnar["col"] == [0, 1, 2, 3]
+    np.testing.assert_allclose(columnar["value"], -_STATISTICS.expected_returns)
+
+    with pytest.raises(AssertionError, match="between 0 and 1"):
+        _ = applications_superstaq.finance.build_max_sharpe_qubo(_STATISTICS, 1.5)
+    with pytest.raises(AssertionError, match="between 1 and all stocks"):
+        _ = applications_superstaq.finance.build_max_sharpe_qubo(_STATISTICS, 0.5, 0)
+
+
+def test_service_market_statistics() -> None:
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        remote_host="http://example.com", api_key="key", client_name="applications_superstaq"
+    )
+    service = applications_superstaq.finance.Finance(client)
+    statistics = applications_superstaq.finance.MarketStatistics(np.array([0.1, 0.2]), np.eye(2))
+    output = {
+        "best_portfolio": ["AAPL"],
+        "best_ret": 8.1,
+        "best_std_dev": 10.5,
+        "best_sharpe_ratio": 0.771,
+        "qubo": [{"keys": ["0"], "value": 123}],
+    }
+
+    with mock.patch.object(client, "find_min_vol_portfolio", return_value=output) as mock_minvol:
+        _ = service.find_min_vol_portfolio(["AAPL", "GOOG"], 8, statistics=statistics)
+    mock_minvol.assert_called_once_with(
+        {
+            "stock_symbols": ["AAPL", "GOOG"],
+            "desired_return": 8,
+            "years_window": 5.0,
+            "solver": "anneal",
+            **statistics.to_json(),
+        },
+        False,
+    )
+
+    with mock.patch.object(client, "find_min_vol_frontier", return_value=[output]) as mock_frontier:
+        _ = service.find_min_vol_frontier(["AAPL", "GOOG"], [8], statistics=statistics)
+    assert mock_frontier.call_args[0][0]["covariance"] == statistics.to_json()["covariance"]
+
+    with mock.patch.object(
+        client, "find_max_pseudo_sharpe_ratio", return_value=output
+    ) as mock_maxsharpe:
+        _ = service.find_max_pseudo_sharpe_ratio(["AAPL", "GOOG"], 0.5, statistics=statistics)
+        _ = service.sweep_max_pseudo_sharpe_ratio(["AAPL", "GOOG"], [0.5], statistics=statistics)
+    for call in mock_maxsharpe.call_args_list:
+        assert call[0][0]["expected_returns"] == statistics.to_json()["expected_returns"]
+
+    with pytest.raises(AssertionError, match="exactly the stocks"):
+        _ = service.find_min_vol_portfolio(["AAPL"], 8, statistics=statistics)
+
+
+def test_service_find_min_vol_frontier() -> None:
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        remote_host="http://example.com", api_key="key", client_name="applications_superstaq"
+    )
+    service = applications_superstaq.finance.Finance(client)
+    point = {
+        "best_portfolio": ["AAPL"],
+        "best_ret": 8.1,
+        "best_std_dev": 10.5,
+        "qubo": [{"keys": ["0"], "value": 123}],
+    }
+    with mock.patch.object(client, "find_min_vol_frontier", return_value=[point, point]) as mock_fn:
+        frontier = service.find_min_vol_frontier(["AAPL", "GOOG"], np.array([8, 9]))
+    mock_fn.assert_called_once_with(
+        {
+            "stock_symbols": ["AAPL", "GOOG"],
+            "desired_returns": [8.0, 9.0],
+            "years_window": 5.0,
+            "solver": "anneal",
+        },
+        False,
+    )
+    np.testing.assert_array_equal(frontier.desired_returns, [8.0, 9.0])
+    np.testing.assert_array_equal(frontier.masks, [[True, False], [True, False]])
+
+
 @mock.patch(
     "applications_superstaq.superstaq_client._SuperstaQClient.find_max_pseudo_sharpe_ratio",
     return_value={
@@ -108,3 +452,171 @@ def test_service_find_max_pseudo_sharpe_ratio(
         ["AAPL", "GOOG"], 8.1, 10.5, 0.771, qubo
     )
     assert service.find_max_pseudo_sharpe_ratio(["AAPL", "GOOG", "IEF", "MMM"], k=0.5) == expected
+
+
+def _find_max_pseudo_sharpe_ratio(json_dict: dict, bypass_cache: bool) -> dict:
+    """Stands in for `find_max_pseudo_sharpe_ratio`, failing for portfolios of one asset."""
+    if json_dict["num_assets_in_portfolio"] == 1:
+        raise applications_superstaq.SuperstaQException("Status code: 500")
+    return {
+        "best_portfolio": ["GOOG", "AAPL"][: json_dict["num_assets_in_portfolio"]],
+        "best_ret": json_dict["k"],
+        "best_std_dev": 1.0,
+        "best_sharpe_ratio": 2 * json_dict["k"],
+        "qubo": [{"keys": ["0"], "value": json_dict["k"]}],
+    }
+
+
+def test_service_sweep_max_pseudo_sharpe_ratio() -> None:
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        remote_host="http://example.com", api_key="key", client_name="applications_superstaq"
+    )
+    service = applications_superstaq.finance.Finance(client)
+    progress: List[Tuple[int, int]] = []
+    with mock.patch.object(
+        client, "find_max_pseudo_sharpe_ratio", side_effect=_find_max_pseudo_sharpe_ratio
+    ) as mock_maxsharpe:
+        sweep = service.sweep_max_pseudo_sharpe_ratio(
+            ["AAPL", "GOOG"],
+            np.array([0.25, 0.75]),
+            [None, 1],
+            max_workers=2,
+            on_progress=lambda done, total: progress.append((done, total)),
+        )
+    mock_maxsharpe.assert_any_call(
+        {
+            "stock_symbols": ["AAPL", "GOOG"],
+            "k": 0.75,
+            "num_assets_in_portfolio": 1,
+            "years_window": 5.0,
+            "solver": "anneal",
+        },
+        False,
+    )
+    assert sorted(progress) == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+    assert len(sweep) == 4
+    np.testing.assert_array_equal(sweep.ks, [0.25, 0.25, 0.75, 0.75])
+    np.testing.assert_array_equal(sweep.num_assets_in_portfolio, [np.nan, 1, np.nan, 1])
+    np.testing.assert_array_equal(sweep.succeeded, [True, False, True, False])
+    np.testing.assert_array_equal(sweep.returns, [0.25, np.nan, 0.75, np.nan])
+    np.testing.assert_array_equal(sweep.sharpe_ratios, [0.5, np.nan, 1.5, np.nan])
+    np.testing.assert_array_equal(sweep.masks, [[True, True], [False, False]] * 2)
+    assert sweep.errors[0] is None
+    assert isinstance(sweep.errors[1], applications_superstaq.SuperstaQException)
+
+    assert sweep.point(2) == applications_superstaq.finance.MaxSharpeOutput(
+        ["AAPL", "GOOG"], 0.75, 1.0, 1.5, qv.QUBO({("0",): 0.75})
+    )
+    with pytest.raises(ValueError, match="Point 3 of the sweep failed"):
+        _ = sweep.point(3)
+
+
+def test_async_finance() -> None:
+    client = applications_superstaq.async_superstaq_client.AsyncSuperstaQClient(
+        remote_host="http://example.com", api_key="key", client_name="applications_superstaq"
+    )
+    service = applications_superstaq.finance.AsyncFinance(client)
+    solution = np.rec.fromrecords(
+        [({0: 0, 1: 1, 3: 1}, -1, 6), ({0: 1, 1: 1, 3: 1}, -1, 4)],
+        dtype=[("solution", "O"), ("energy", "<f8"), ("num_occurrences", "<i8")],
+    )
+    output = {
+        "best_portfolio": ["AAPL", "GOOG"],
+        "best_ret": 8.1,
+        "best_std_dev": 10.5,
+        "best_sharpe_ratio": 0.771,
+        "qubo": [{"keys": ["0"], "value": 123}],
+    }
+
+    with mock.patch.object(
+        client,
+        "submit_qubo",
+        return_value={"solution": applications_superstaq.converters.serialize(solution)},
+    ) as mock_submit_qubo:
+        result = asyncio.run(service.submit_qubo(qv.QUBO(), "target", repetitions=10))
+        assert repr(result) == repr(solution)
+        mock_submit_qubo.assert_awaited_once_with(
+            qv.QUBO(), "target", repetitions=10, variables=None
+        )
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield json.dumps(
+            {"solution": applications_superstaq.converters.serialize(solution)}
+        ).encode()
+
+    async def submit_qubo_stream() -> List[np.recarray]:
+        batches = await service.submit_qubo_stream(qv.QUBO(), "target", batch_size=1)
+        return [batch async for batch in batches]
+
+    with mock.patch.object(client, "submit_qubo_stream", return_value=chunks()):
+        batches = asyncio.run(submit_qubo_stream())
+        assert repr(np.concatenate(batches).view(np.recarray)) == repr(solution)
+
+    with mock.patch.object(client, "submit_qubo", side_effect=_solve_component):
+        result = asyncio.run(
+            service.submit_qubo(PRESOLVABLE_QUBO, "target", repetitions=10, presolve=True)
+        )
+        assert result.energy[0] == 0.0
+
+    with mock.patch.object(client, "find_min_vol_portfolio", return_value=output) as mock_minvol:
+        assert asyncio.run(
+            service.find_min_vol_portfolio(["AAPL", "GOOG", "IEF", "MMM"], 8)
+        ) == applications_superstaq.finance.MinVolOutput(["AAPL", "GOOG"], 8.1, 10.5, {("0",): 123})
+        mock_minvol.assert_awaited_once_with(
+            {
+                "stock_symbols": ["AAPL", "GOOG", "IEF", "MMM"],
+                "desired_return": 8,
+                "years_window": 5.0,
+                "solver": "anneal",
+            },
+            False,
+        )
+
+    with mock.patch.object(client, "find_min_vol_frontier", return_value=[output]) as mock_frontier:
+        frontier = asyncio.run(service.find_min_vol_frontier(["AAPL", "GOOG"], [8]))
+        assert frontier.portfolio(0) == ["AAPL", "GOOG"]
+        mock_frontier.assert_awaited_once_with(
+            {
+                "stock_symbols": ["AAPL", "GOOG"],
+                "desired_returns": [8.0],
+                "years_window": 5.0,
+                "solver": "anneal",
+            },
+            False,
+        )
+
+    progress: List[Tuple[int, int]] = []
+    with mock.patch.object(
+        client, "find_max_pseudo_sharpe_ratio", side_effect=_find_max_pseudo_sharpe_ratio
+    ):
+        sweep = asyncio.run(
+            service.sweep_max_pseudo_sharpe_ratio(
+                ["AAPL", "GOOG"],
+                [0.5],
+                [1, 2],
+                on_progress=lambda done, total: progress.append((done, total)),
+            )
+        )
+        assert progress == [(1, 2), (2, 2)]
+        np.testing.assert_array_equal(sweep.succeeded, [False, True])
+        np.testing.assert_array_equal(sweep.sharpe_ratios, [np.nan, 1.0])
+
+    with mock.patch.object(
+        client, "find_max_pseudo_sharpe_ratio", return_value=output
+    ) as mock_maxsharpe:
+        assert asyncio.run(
+            service.find_max_pseudo_sharpe_ratio(["AAPL", "GOOG", "IEF", "MMM"], k=0.5)
+        ) == applications_superstaq.finance.MaxSharpeOutput(
+            ["AAPL", "GOOG"], 8.1, 10.5, 0.771, {("0",): 123}
+        )
+        mock_maxsharpe.assert_awaited_once_with(
+            {
+                "stock_symbols": ["AAPL", "GOOG", "IEF", "MMM"],
+                "k": 0.5,
+                "num_assets_in_portfolio": None,
+                "years_window": 5.0,
+                "solver": "anneal",
+            },
+            False,
+        )
@@ -0,0 +1,248 @@
+"""Waits on SuperstaQ jobs, sharing one background poller between all waiters."""
+
+import concurrent.futures
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import applications_superstaq
+from applications_superstaq import superstaq_client
+
+DONE_STATUSES = {"Done"}
+FAILED_STATUSES = {"Failed", "Cancelled", "Deleted"}
+
+# Queued jobs rarely change status as quickly as running ones, so they are polled less often.
+STATUS_INTERVAL_FACTORS = {"Queued": 2.0, "Running": 1.0}
+
+
+@dataclass
+class _PolledJob:
+    future: concurrent.futures.Future
+    created: float
+    next_poll: float
+    status: Optional[str] = None
+    waiters: int = 0
+    # The most recent error polling this job, if its last poll failed.
+    error: Optional[Exception] = None
+
+
+class JobPoller:
+    """Polls the status of outstanding jobs on behalf of any number of waiting threads.
+
+    All outstanding job ids are merged into bulk `get_jobs` requests sent from a single background
+    thread, which only runs while there are jobs to wait on. Each job is polled at an interval which
+    grows with its age (so that long-running jobs cost fewer requests) and depends on its most
+    recent status, clamped between `min_interval` and `max_interval`. Whenever any job is polled,
+    all other jobs due within `min_interval` are polled along with it.
+
+    A job only fails when the server reports it failed or that it does not exist. Any other error
+    polling it (e.g. the request running out of retries) is treated as transient: the job is polled
+    again at its next interval, until its waiters time out.
+    """
+
+    def __init__(
+        self,
+        client: superstaq_client._SuperstaQClient,
+        min_interval: float = 0.5,
+        max_interval: float = 30.0,
+        age_factor: float = 0.1,
+        chunk_size: int = 100,
+    ):
+        """Creates the JobPoller.
+
+        Args:
+            client: The client used to poll jobs.
+            min_interval: The shortest time (in seconds) between polls of any job.
+            max_interval: The longest time (in seconds) between polls of any job.
+            age_factor: The poll interval of a job as a fraction of its age (i.e. the time since
+                it was first waited on), before applying status factors and clamping.
+            chunk_size: The maximum number of job ids to request at a time.
+        """
+        assert 0 < min_interval <= max_interval, "Poll intervals must be positive and ordered."
+        self._client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.age_factor = age_factor
+        self.chunk_size = chunk_size
+
+        self._condition = threading.Condition()
+        self._jobs: Dict[str, _PolledJob] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def poll_interval(self, status: Optional[str], age: float) -> float:
+        """Returns how long to wait before polling a job again.
+
+        Args:
+            status: The most recently polled status of the job.
+            age: The time (in seconds) since the job was first waited on.
+
+        Returns:
+            The time (in seconds) until the job should next be polled.
+        """
+        interval = age * self.age_factor * STATUS_INTERVAL_FACTORS.get(str(status), 1.0)
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def wait_for_jobs(self, job_ids: Sequence[str], timeout: Optional[float] = None) -> List[dict]:
+        """Waits until all of the given jobs are done.
+
+        Args:
+            job_ids: The UUIDs of the jobs to wait on.
+            timeout: The maximum time (in seconds) to wait, or None to wait indefinitely.
+
+        Returns:
+            The json body of each job (see `_SuperstaQClient.get_job`), in the order of `job_ids`.
+
+        Raises:
+            SuperstaQUnsuccessfulJobException: As soon as any of the jobs has been canceled,
+                deleted, or failed.
+            SuperstaQNotFoundException: If any of the jobs does not exist.
+            TimeoutError: If the jobs are not all done after `timeout` seconds. If the most recent
+                poll of an outstanding job failed, its error is included in the message.
+        """
+        futures = self._watch(job_ids)
+        try:
+            _, not_done = concurrent.futures.wait(
+                futures, timeout, return_when=concurrent.futures.FIRST_EXCEPTION
+            )
+            for future in futures:
+                exception = future.exception() if future.done() else None
+                if exception is not None:
+                    raise exception
+            if not_done:
+                raise TimeoutError(self._timeout_message(job_ids, futures))
+            return [future.result() for future in futures]
+        finally:
+            self._release(job_ids, futures)
+
+    def close(self) -> None:
+        """Stops polling, cancelling any outstanding waits."""
+        with self._condition:
+            self._closed = True
+            for job in self._jobs.values():
+                # Cancelling alone would not wake up threads blocked in `futures.wait`.
+                job.future.cancel()
+                job.future.set_running_or_notify_cancel()
+            self._jobs.clear()
+            self._condition.notify_all()
+
+    def _timeout_message(
+        self, job_ids: Sequence[str], futures: Sequence[concurrent.futures.Future]
+    ) -> str:
+        with self._condition:
+            outstanding = [
+                (job_id, self._jobs.get(job_id))
+                for job_id, future in zip(job_ids, futures)
+                if not future.done()
+            ]
+        message = f"Timed out waiting for {len(outstanding)} job(s)."
+        errors = [
+            f"{job_id}: {job.error!r}"
+            for job_id, job in outstanding
+            if job is not None and job.error is not None
+        ]
+        if errors:
+            message += " Most recent polling errors: " + ", ".join(errors)
+        return message
+
+    def _watch(self, job_ids: Sequence[str]) -> List[concurrent.futures.Future]:
+        """Starts polling the given jobs (if not already), returning a future for each."""
+        with self._condition:
+            assert not self._closed, "Cannot wait for jobs after the poller was closed."
+            futures = []
+            now = time.monotonic()
+            for job_id in job_ids:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    job = _PolledJob(concurrent.futures.Future(), created=now, next_poll=now)
+                    self._jobs[job_id] = job
+                job.waiters += 1
+                futures.append(job.future)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+            return futures
+
+    def _release(
+        self, job_ids: Sequence[str], futures: Sequence[concurrent.futures.Future]
+    ) -> None:
+        """Stops polling jobs which no longer have any waiters."""
+        with self._condition:
+            for job_id, future in zip(job_ids, futures):
+                job = self._jobs.get(job_id)
+                if job is not None and job.future is future:
+                    job.waiters -= 1
+                    if job.waiters <= 0:
+                        del self._jobs[job_id]
+
+    def _next_batch(self) -> Optional[List[Tuple[str, concurrent.futures.Future]]]:
+        """Blocks until some jobs are due, and returns the ids to poll (or None to stop).
+
+        Each id is paired with the future it was polled for, so that results are not applied to a
+        job which has since been released and waited on again.
+        """
+        with self._condition:
+            while True:
+                if self._closed or not self._jobs:
+                    self._thread = None
+                    return None
+
+                now = time.monotonic()
+                next_poll = min(job.next_poll for job in self._jobs.values())
+                if next_poll <= now:
+                    deadline = now + self.min_interval
+                    return [
+                        (job_id, job.future)
+                        for job_id, job in self._jobs.items()
+                        if job.next_poll <= deadline
+                    ]
+                self._condition.wait(next_poll - now)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            job_ids = [job_id for job_id, _ in batch]
+            results: List[Union[dict, Exception]]
+            try:
+                results = list(self._client.get_jobs(job_ids, chunk_size=self.chunk_size))
+            except Exception as e:
+                # Keep the background thread alive, and retry the whole batch next cycle.
+                results = [e] * len(job_ids)
+
+            with self._condition:
+                now = time.monotonic()
+                for (job_id, future), result in zip(batch, results):
+                    job = self._jobs.get(job_id)
+                    if job is not None and job.future is future:
+                        self._update(job_id, job, result, now)
+
+    def _update(
+        self, job_id: str, job: _PolledJob, result: Union[dict, Exception], now: float
+    ) -> None:
+        """Resolves or reschedules a job given the result of polling it."""
+        if isinstance(result, applications_superstaq.SuperstaQNotFoundException):
+            job.future.set_exception(result)
+        elif isinstance(result, Exception):
+            job.error = result
+            job.next_poll = now + self.poll_interval(job.status, now - job.created)
+            return
+        elif result.get("status") in DONE_STATUSES:
+            job.future.set_result(result)
+        elif result.get("status") in FAILED_STATUSES:
+            job.future.set_exception(
+                applications_superstaq.SuperstaQUnsuccessfulJobException(job_id, result["status"])
+            )
+        else:
+            job.status = result.get("status")
+            job.error = None
+            job.next_poll = now + self.poll_interval(job.status, now - job.created)
+            return
+
+        # Resolved jobs are no longer polled (but remain available to their waiters).
+        del self._jobs[job_id]
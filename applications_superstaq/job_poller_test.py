@@ -0,0 +1,236 @@
+import concurrent.futures
+import threading
+import time
+from typing import Dict, List, Sequence, Union
+from unittest import mock
+
+import pytest
+
+import applications_superstaq
+
+
+class _MockJobs:
+    """Stands in for `_SuperstaQClient.get_jobs`, advancing each job through a list of statuses."""
+
+    def __init__(self, statuses: Dict[str, List[str]]) -> None:
+        self.statuses = statuses
+        self.calls: List[List[str]] = []
+
+    def __call__(
+        self, job_ids: Sequence[str], chunk_size: int = 100
+    ) -> List[Union[dict, applications_superstaq.SuperstaQException]]:
+        self.calls.append(list(job_ids))
+        results: List[Union[dict, applications_superstaq.SuperstaQException]] = []
+        for job_id in job_ids:
+            if job_id not in self.statuses:
+                results.append(applications_superstaq.SuperstaQNotFoundException(job_id))
+                continue
+            statuses = self.statuses[job_id]
+            status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+            results.append({"job_id": job_id, "status": status})
+        return results
+
+
+def _poller(get_jobs: _MockJobs) -> applications_superstaq.job_poller.JobPoller:
+    client = mock.MagicMock()
+    client.get_jobs.side_effect = get_jobs
+    return applications_superstaq.job_poller.JobPoller(client, min_interval=0.01, max_interval=0.02)
+
+
+def _wait_for_thread_to_stop(poller: applications_superstaq.job_poller.JobPoller) -> None:
+    deadline = time.monotonic() + 1
+    while poller._thread is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert poller._thread is None
+
+
+def test_job_poller_invalid_intervals() -> None:
+    with pytest.raises(AssertionError, match="positive and ordered"):
+        _ = applications_superstaq.job_poller.JobPoller(mock.MagicMock(), min_interval=0)
+    with pytest.raises(AssertionError, match="positive and ordered"):
+        _ = applications_superstaq.job_poller.JobPoller(
+            mock.MagicMock(), min_interval=2, max_interval=1
+        )
+
+
+def test_job_poller_poll_interval() -> None:
+    poller = applications_superstaq.job_poller.JobPoller(
+        mock.MagicMock(), min_interval=1, max_interval=30, age_factor=0.1
+    )
+    assert poller.poll_interval("Running", 0) == 1
+    assert poller.poll_interval("Running", 50) == 5
+    assert poller.poll_interval("Queued", 50) == 10
+    assert poller.poll_interval(None, 50) == 5
+    assert poller.poll_interval("Queued", 1000) == 30
+
+
+def test_job_poller_wait_for_jobs() -> None:
+    get_jobs = _MockJobs(
+        {"job0": ["Queued", "Running", "Done"], "job1": ["Running", "Done"], "job2": ["Done"]}
+    )
+    poller = _poller(get_jobs)
+    jobs = poller.wait_for_jobs(["job0", "job1", "job2", "job0"], timeout=5)
+    assert jobs == [
+        {"job_id": "job0", "status": "Done"},
+        {"job_id": "job1", "status": "Done"},
+        {"job_id": "job2", "status": "Done"},
+        {"job_id": "job0", "status": "Done"},
+    ]
+
+    # All outstanding jobs are polled together, and finished jobs are no longer polled.
+    assert get_jobs.calls == [["job0", "job1", "job2"], ["job0", "job1"], ["job0"]]
+
+    _wait_for_thread_to_stop(poller)
+    assert not poller._jobs
+
+
+def test_job_poller_shared_between_waiters() -> None:
+    get_jobs = _MockJobs({"job0": ["Running"] * 5 + ["Done"], "job1": ["Running"] * 3 + ["Done"]})
+    poller = _poller(get_jobs)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        futures = [
+            executor.submit(poller.wait_for_jobs, ["job0", "job1"][: i % 2 + 1], 5)
+            for i in range(10)
+        ]
+        results = [future.result() for future in futures]
+
+    assert results[0] == [{"job_id": "job0", "status": "Done"}]
+    assert results[1] == [
+        {"job_id": "job0", "status": "Done"},
+        {"job_id": "job1", "status": "Done"},
+    ]
+    assert all(len(set(job_ids)) == len(job_ids) for job_ids in get_jobs.calls)
+
+
+def test_job_poller_unsuccessful_job() -> None:
+    get_jobs = _MockJobs({"job0": ["Running"], "job1": ["Running", "Failed"]})
+    poller = _poller(get_jobs)
+    with pytest.raises(
+        applications_superstaq.SuperstaQUnsuccessfulJobException, match="Job job1 was Failed"
+    ):
+        _ = poller.wait_for_jobs(["job0", "job1"], timeout=5)
+
+    # Jobs without any remaining waiters are no longer polled.
+    _wait_for_thread_to_stop(poller)
+    assert not poller._jobs
+
+
+def test_job_poller_errors() -> None:
+    poller = _poller(_MockJobs({}))
+    with pytest.raises(applications_superstaq.SuperstaQNotFoundException, match="missing"):
+        _ = poller.wait_for_jobs(["missing"], timeout=5)
+
+    # Other errors are retried until the waiter times out.
+    client = mock.MagicMock()
+    client.get_jobs.side_effect = TimeoutError("Reached maximum number of retries.")
+    poller = applications_superstaq.job_poller.JobPoller(client, min_interval=0.01)
+    with pytest.raises(TimeoutError, match="job0: TimeoutError.*maximum number of retries"):
+        _ = poller.wait_for_jobs(["job0"], timeout=0.1)
+    assert client.get_jobs.call_count > 1
+
+
+def test_job_poller_recovers_from_errors() -> None:
+    get_jobs = _MockJobs({"job0": ["Running", "Done"], "job1": ["Done"]})
+    errors: List[Union[Exception, List[Union[dict, applications_superstaq.SuperstaQException]]]] = [
+        RuntimeError("connection reset"),
+        [
+            applications_superstaq.SuperstaQException("Not authorized", 401),
+            {"job_id": "job1", "status": "Done"},
+        ],
+    ]
+
+    def flaky_get_jobs(
+        job_ids: Sequence[str], chunk_size: int = 100
+    ) -> List[Union[dict, applications_superstaq.SuperstaQException]]:
+        if errors:
+            error = errors.pop(0)
+            if isinstance(error, Exception):
+                raise error
+            return error
+        return get_jobs(job_ids, chunk_size)
+
+    client = mock.MagicMock()
+    client.get_jobs.side_effect = flaky_get_jobs
+    poller = applications_superstaq.job_poller.JobPoller(client, min_interval=0.01)
+    assert poller.wait_for_jobs(["job0", "job1"], timeout=5) == [
+        {"job_id": "job0", "status": "Done"},
+        {"job_id": "job1", "status": "Done"},
+    ]
+    assert get_jobs.calls == [["job0"], ["job0"]]
+
+
+def test_job_poller_ignores_stale_results() -> None:
+    polling = threading.Event()
+    resume = threading.Event()
+
+    def slow_get_jobs(job_ids: Sequence[str], chunk_size: int = 100) -> List[dict]:
+        polling.set()
+        resume.wait()
+        return [{"job_id": job_id, "status": "Failed"} for job_id in job_ids]
+
+    client = mock.MagicMock()
+    client.get_jobs.side_effect = slow_get_jobs
+    poller = applications_superstaq.job_poller.JobPoller(client, min_interval=0.01)
+    futures = poller._watch(["job0"])
+    polling.wait()
+
+    # While job0 is being polled, its waiter gives up and a new one starts waiting on it.
+    poller._release(["job0"], futures)
+    new_futures = poller._watch(["job0"])
+    client.get_jobs.side_effect = lambda job_ids, chunk_size: [
+        {"job_id": job_id, "status": "Done"} for job_id in job_ids
+    ]
+    resume.set()
+
+    # The result polled for the old future is not applied to the new one.
+    assert new_futures[0].result(timeout=5) == {"job_id": "job0", "status": "Done"}
+    assert not futures[0].done()
+    poller._release(["job0"], new_futures)
+    _wait_for_thread_to_stop(poller)
+
+
+def test_job_poller_timeout() -> None:
+    poller = _poller(_MockJobs({"job0": ["Queued"], "job1": ["Done"]}))
+    with pytest.raises(TimeoutError, match="1 job"):
+        _ = poller.wait_for_jobs(["job0", "job1"], timeout=0.05)
+
+    _wait_for_thread_to_stop(poller)
+    assert not poller._jobs
+
+
+def test_job_poller_close() -> None:
+    poller = _poller(_MockJobs({"job0": ["Running"]}))
+    waiting = threading.Event()
+
+    def wait() -> None:
+        waiting.set()
+        with pytest.raises(concurrent.futures.CancelledError):
+            _ = poller.wait_for_jobs(["job0"])
+
+    thread = threading.Thread(target=wait)
+    thread.start()
+    waiting.wait()
+    time.sleep(0.05)
+    poller.close()
+    thread.join()
+
+    _wait_for_thread_to_stop(poller)
+    with pytest.raises(AssertionError, match="closed"):
+        _ = poller.wait_for_jobs(["job0"])
+
+
+def test_superstaq_client_wait_for_jobs() -> None:
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+    )
+    with mock.patch.object(
+        client, "get_jobs", return_value=[{"job_id": "job0", "status": "Done"}]
+    ) as mock_get_jobs:
+        assert client.wait_for_jobs(["job0"]) == [{"job_id": "job0", "status": "Done"}]
+    mock_get_jobs.assert_called_once_with(["job0"], chunk_size=100)
+
+    client.close()
+    with pytest.raises(AssertionError, match="closed"):
+        _ = client.wait_for_jobs(["job0"])
@@ -0,0 +1,125 @@
+"""Pluggable JSON encoders and decoders for the bodies of requests to (and responses from)
+SuperstaQ's API."""
+
+import importlib
+import json
+from typing import Any, Dict, Type, Union
+
+import numpy as np
+
+import applications_superstaq
+
+
+def encode_numpy(obj: Any) -> Any:
+    """Converts a NumPy array or scalar into (nested) lists and Python numbers.
+
+    This is the `default` hook of every backend, so request bodies may contain NumPy values
+    without converting them first.
+
+    Raises:
+        TypeError: If the object is not a NumPy array or scalar.
+    """
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _import_backend(module_name: str) -> Any:
+    """Imports the (optional) module implementing a JSON backend."""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise applications_superstaq.SuperstaQModuleNotFoundException(
+            module_name, f"the {module_name} JSON backend"
+        ) from e
+
+
+class JsonBackend:
+    """Encodes and decodes JSON with the standard library's `json` module.
+
+    NumPy arrays and scalars are converted to lists and Python numbers (see `encode_numpy`) as they
+    are encoded. Subclasses use faster (optional) libraries instead.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encodes an object as (utf-8 encoded) JSON."""
+        return json.dumps(obj, default=encode_numpy).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decodes a JSON document."""
+        return json.loads(data)
+
+
+class OrjsonBackend(JsonBackend):
+    """Encodes and decodes JSON with `orjson` (requires the `orjson` package).
+
+    orjson encodes (contiguous) NumPy arrays directly from their buffers, without building lists of
+    Python numbers first, and is several times faster than `json` at both encoding and decoding.
+    Its output has no whitespace, and it encodes NaN and infinities as null.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        self._orjson = _import_backend("orjson")
+        self._options = self._orjson.OPT_SERIALIZE_NUMPY | self._orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, default=encode_numpy, option=self._options)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+
+class UjsonBackend(JsonBackend):
+    """Encodes and decodes JSON with `ujson` (requires the `ujson` package).
+
+    ujson is faster than `json`, but (unlike orjson) still converts NumPy arrays to lists first.
+    """
+
+    name = "ujson"
+
+    def __init__(self) -> None:
+        self._ujson = _import_backend("ujson")
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, default=encode_numpy).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._ujson.loads(data)
+
+
+BACKENDS: Dict[str, Type[JsonBackend]] = {
+    "json": JsonBackend,
+    "orjson": OrjsonBackend,
+    "ujson": UjsonBackend,
+}
+
+
+def get_backend(backend: Union[str, JsonBackend] = "auto") -> JsonBackend:
+    """Returns a JSON backend.
+
+    Note that the backends differ in how they encode NaN and infinities: `json` writes them as the
+    (non-standard) tokens `NaN` and `Infinity`, whereas orjson writes them as `null`. So with
+    "auto", the encoding of such values depends on whether orjson is installed.
+
+    Args:
+        backend: The name of the backend ("json", "orjson" or "ujson"), "auto" for orjson if it is
+            installed (and `json` otherwise), or a `JsonBackend` (which is returned as is).
+
+    Raises:
+        SuperstaQModuleNotFoundException: If the backend's package is not installed.
+    """
+    if isinstance(backend, JsonBackend):
+        return backend
+    if backend == "auto":
+        try:
+            return OrjsonBackend()
+        except applications_superstaq.SuperstaQModuleNotFoundException:
+            return JsonBackend()
+    assert (
+        backend in BACKENDS
+    ), f"JSON backend can only be one of {['auto', *BACKENDS]} but was {backend}."
+    return BACKENDS[backend]()
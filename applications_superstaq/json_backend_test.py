@@ -0,0 +1,77 @@
+import json
+import sys
+from typing import Any
+from unittest import mock
+
+import numpy as np
+import pytest
+
+import applications_superstaq
+from applications_superstaq.json_backend import get_backend, JsonBackend, OrjsonBackend
+
+
+def _mock_ujson() -> mock.MagicMock:
+    mock_ujson = mock.MagicMock()
+    mock_ujson.dumps.side_effect = json.dumps
+    mock_ujson.loads.side_effect = json.loads
+    return mock_ujson
+
+
+def test_encode_numpy() -> None:
+    assert applications_superstaq.json_backend.encode_numpy(np.arange(3)) == [0, 1, 2]
+    assert applications_superstaq.json_backend.encode_numpy(np.float32(0.5)) == 0.5
+    with pytest.raises(TypeError, match="object is not JSON serializable"):
+        _ = applications_superstaq.json_backend.encode_numpy(object())
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "ujson"])
+def test_json_backend(name: str) -> None:
+    with mock.patch.dict(sys.modules, {"ujson": _mock_ujson()}):
+        backend = get_backend(name)
+    assert backend.name == name
+
+    matrix = np.arange(12.0).reshape(3, 4)
+    obj: Any = {
+        "variables": ["a", "b"],
+        "matrix": matrix,
+        "columns": matrix[:, ::2],  # Not contiguous.
+        "row": np.array([0, 1], dtype=np.int32),
+        "scalars": [np.int64(2), np.float32(0.5), np.bool_(True)],
+        "nothing": None,
+    }
+    encoded = backend.dumps(obj)
+    assert isinstance(encoded, bytes)
+    assert (
+        backend.loads(encoded)
+        == backend.loads(encoded.decode())
+        == {
+            "variables": ["a", "b"],
+            "matrix": matrix.tolist(),
+            "columns": matrix[:, ::2].tolist(),
+            "row": [0, 1],
+            "scalars": [2, 0.5, True],
+            "nothing": None,
+        }
+    )
+
+    if name == "orjson":
+        assert backend.loads(backend.dumps([float("nan"), float("inf")])) == [None, None]
+
+    with pytest.raises(TypeError):
+        _ = backend.dumps({"value": object()})
+    with pytest.raises(ValueError):
+        _ = backend.loads(b"{")
+
+
+def test_get_backend() -> None:
+    backend = JsonBackend()
+    assert get_backend(backend) is backend
+    assert isinstance(get_backend(), OrjsonBackend)
+
+    with mock.patch.dict(sys.modules, {"orjson": None}):
+        assert type(get_backend()) is JsonBackend
+        with pytest.raises(applications_superstaq.SuperstaQModuleNotFoundException, match="orjson"):
+            _ = get_backend("orjson")
+
+    with pytest.raises(AssertionError, match="JSON backend"):
+        _ = get_backend("simplejson")
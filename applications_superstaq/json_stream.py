@@ -0,0 +1,350 @@
+"""Encodes huge JSON request bodies, and reads huge fields of JSON responses, in chunks (without
+ever holding the whole body in memory)."""
+
+import codecs
+import itertools
+import json
+import zlib
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import applications_superstaq
+
+# The number of elements encoded at once by `JsonArray.from_array`.
+ARRAY_BATCH_SIZE = 2**14
+
+
+class JsonArray:
+    """A JSON array whose elements are produced lazily, in batches, when it is encoded.
+
+    The batches are produced by a function (rather than a single iterator), so that the array can
+    be encoded more than once, e.g. when a request is retried. Every element must be directly
+    encodable by `json.dumps`.
+    """
+
+    def __init__(self, batches: Callable[[], Iterable[Sequence[Any]]]):
+        """Creates a JsonArray.
+
+        Args:
+            batches: A function returning (a new iterable of) the batches of elements of the array.
+        """
+        self._batches = batches
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, batch_size: int = ARRAY_BATCH_SIZE) -> "JsonArray":
+        """Returns a JsonArray of the elements of a (one-dimensional) numpy array.
+
+        Only one batch of the array is converted to Python objects at a time.
+        """
+
+        def batches() -> Iterator[List[Any]]:
+            for start in range(0, len(array), batch_size):
+                stop = start + batch_size
+                yield array[start:stop].tolist()
+
+        return cls(batches)
+
+    @classmethod
+    def from_iterable(
+        cls, elements: Callable[[], Iterable[Any]], batch_size: int = ARRAY_BATCH_SIZE
+    ) -> "JsonArray":
+        """Returns a JsonArray of the elements produced by a function (e.g. a generator)."""
+
+        def batches() -> Iterator[List[Any]]:
+            iterator = iter(elements())
+            batch = list(itertools.islice(iterator, batch_size))
+            while batch:
+                yield batch
+                batch = list(itertools.islice(iterator, batch_size))
+
+        return cls(batches)
+
+    def batches(self) -> Iterable[Sequence[Any]]:
+        """Returns (a new iterable of) the batches of elements of the array."""
+        return self._batches()
+
+    def to_list(self) -> List[Any]:
+        """Returns all of the elements of the array (in memory)."""
+        return [element for batch in self.batches() for element in batch]
+
+
+def is_streamed(obj: Any) -> bool:
+    """Checks whether a JSON body contains any `JsonArray`s (directly, or in nested dictionaries).
+
+    Lists are not searched, so `JsonArray`s must not be nested in them.
+    """
+    if isinstance(obj, JsonArray):
+        return True
+    return isinstance(obj, dict) and any(is_streamed(value) for value in obj.values())
+
+
+def _pieces(obj: Any) -> Iterator[str]:
+    """Encodes an object (which may contain `JsonArray`s) as JSON, piece by piece."""
+    if isinstance(obj, JsonArray):
+        yield "["
+        separator = ""
+        for batch in obj.batches():
+            if batch:
+                # Each batch is encoded at once (by the fast C encoder), without its brackets.
+                yield separator + json.dumps(list(batch))[1:-1]
+                separator = ", "
+        yield "]"
+    elif isinstance(obj, dict):
+        yield "{"
+        for i, (key, value) in enumerate(obj.items()):
+            yield f"{', ' if i else ''}{json.dumps(str(key))}: "
+            yield from _pieces(value)
+        yield "}"
+    else:
+        yield json.dumps(obj)
+
+
+def iter_json(obj: Any, chunk_size: int = 2**16) -> Iterator[bytes]:
+    """Encodes an object (which may contain `JsonArray`s) as JSON, in chunks.
+
+    The encoding is the same as that of `json.dumps` (with the `JsonArray`s replaced by lists).
+
+    Args:
+        obj: The object to encode.
+        chunk_size: The (minimum, except for the last chunk) size of each chunk.
+
+    Returns:
+        An iterator over the chunks of the encoded object.
+    """
+    buffer: List[str] = []
+    size = 0
+    for piece in _pieces(obj):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer).encode()
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def _compress(chunks: Iterable[bytes], compression: str) -> Iterator[bytes]:
+    """Compresses a stream of chunks with "gzip" or "zstd" (see `converters`)."""
+    if compression == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    else:
+        compressor = applications_superstaq.converters._import_codec("zstd").ZstdCompressor()
+        compressor = compressor.compressobj()
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class JsonStream:
+    """A JSON request body, which is encoded (and compressed) in chunks as it is sent.
+
+    Iterating over a JsonStream encodes the body from scratch, so the same stream can be sent again
+    when a request is retried. Sending it requires chunked transfer encoding, since the size of the
+    body is not known in advance.
+
+    Attributes:
+        obj: The object to encode, which may contain `JsonArray`s.
+        compression: The codec to compress the body with ("gzip" or "zstd"), or None.
+        size: The size (after compression) of the body sent most recently.
+        uncompressed_size: The size (before compression) of the body sent most recently.
+    """
+
+    def __init__(self, obj: Any, compression: Optional[str] = None, chunk_size: int = 2**16):
+        """Creates a JsonStream.
+
+        Args:
+            obj: The object to encode, which may contain `JsonArray`s.
+            compression: The codec to compress the body with ("gzip" or "zstd"), or None.
+            chunk_size: The (minimum) size of each chunk, before compression.
+        """
+        self.obj = obj
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.uncompressed_size = 0
+
+    def _uncompressed(self) -> Iterator[bytes]:
+        for chunk in iter_json(self.obj, self.chunk_size):
+            self.uncompressed_size += len(chunk)
+            yield chunk
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.size = self.uncompressed_size = 0
+        chunks: Iterable[bytes] = self._uncompressed()
+        if self.compression is not None:
+            chunks = _compress(chunks, self.compression)
+        for chunk in chunks:
+            self.size += len(chunk)
+            yield chunk
+
+
+_DECODER = json.JSONDecoder()
+
+# The first characters of the escape sequences of high surrogates.
+_HIGH_SURROGATES = ("\\ud8", "\\ud9", "\\uda", "\\udb")
+
+# The states of a `JsonFieldReader`, i.e. what it expects to read next.
+_OBJECT_START = "object_start"
+_KEY = "key"
+_COLON = "colon"
+_FIELD_COLON = "field_colon"
+_VALUE = "value"
+_COMMA = "comma"
+_FIELD_START = "field_start"
+_FIELD = "field"
+_END = "end"
+
+# The punctuation expected in each state, and the state following it.
+_PUNCTUATION = {
+    _OBJECT_START: ("{", _KEY),
+    _COLON: (":", _VALUE),
+    _FIELD_COLON: (":", _FIELD_START),
+    _COMMA: (",", _KEY),
+    _FIELD_START: ('"', _FIELD),
+}
+
+
+def _backslashes(text: str, end: int) -> int:
+    """Returns the number of consecutive backslashes just before `text[end]`."""
+    start = end
+    while start > 0 and text[start - 1] == "\\":
+        start -= 1
+    return end - start
+
+
+def _string_end(text: str) -> int:
+    """Returns the index of the first unescaped quote in (the inside of) a JSON string, or -1."""
+    end = text.find('"')
+    while end >= 0 and _backslashes(text, end) % 2:
+        end = text.find('"', end + 1)
+    return end
+
+
+def _escape_start(text: str) -> int:
+    """Returns the index of an escape sequence which may be cut off at the end of (the inside of) a
+    JSON string, or the length of the text if there is none.
+
+    An escaped high surrogate at the end is treated as cut off too, since its low surrogate may
+    follow in the next chunk.
+    """
+    end = text.find("\\", max(len(text) - 5, 0))
+    while end >= 0 and _backslashes(text, end) % 2:
+        end = text.find("\\", end + 1)
+    if end < 0:
+        end = len(text)
+    escape = text[:end][-6:]
+    if (
+        len(escape) == 6
+        and escape[:4].lower() in _HIGH_SURROGATES
+        and _backslashes(text, end - 6) % 2 == 0
+    ):
+        end -= 6
+    return end
+
+
+class JsonFieldReader:
+    """Reads one string field of a JSON object incrementally, as the object is received in chunks.
+
+    This avoids holding a huge string (such as the base64-encoded solutions of a `/qubo` response)
+    in memory, on top of whatever it is decoded into. The object's other fields are skipped, so
+    they should be small.
+    """
+
+    def __init__(self, key: str):
+        """Creates a JsonFieldReader.
+
+        Args:
+            key: The key of the (string) field to read.
+        """
+        self.key = key
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = _OBJECT_START
+
+    def feed(self, chunk: bytes) -> str:
+        """Reads the next chunk of the JSON object.
+
+        Args:
+            chunk: The next chunk of the (utf-8 encoded) JSON object.
+
+        Returns:
+            The next piece of the field's (unescaped) value, which is empty unless the chunk
+            contained part of it.
+
+        Raises:
+            ValueError: If the JSON object is invalid, or does not contain the field.
+        """
+        if self._state == _END:
+            return ""  # The rest of the object is skipped.
+        self._buffer += self._decoder.decode(chunk)
+        pieces: List[str] = []
+        while self._step(pieces):
+            pass
+        return "".join(pieces)
+
+    def close(self) -> None:
+        """Checks that the whole field has been read, once the JSON object has been received.
+
+        Raises:
+            ValueError: If the JSON object ended before the end of the field.
+        """
+        if self._state != _END:
+            raise ValueError(f"The JSON object ended before the end of its {self.key!r} field.")
+
+    def _step(self, pieces: List[str]) -> bool:
+        """Reads the next token in the buffer, returning whether there may be another one."""
+        if self._state == _FIELD:
+            return self._read_field(pieces)
+        self._buffer = self._buffer.lstrip()
+        if not self._buffer:
+            return False
+        if self._state in (_KEY, _COMMA) and self._buffer.startswith("}"):
+            raise ValueError(f"The JSON object has no {self.key!r} field.")
+        if self._state in _PUNCTUATION:
+            punctuation, self._state = _PUNCTUATION[self._state]
+            if not self._buffer.startswith(punctuation):
+                raise ValueError(f"Invalid JSON object: expected {punctuation!r}.")
+            self._buffer = self._buffer[1:]
+            return True
+        return self._read_value()
+
+    def _read_value(self) -> bool:
+        """Reads a key, or the value of another field."""
+        decoded = self._decode()
+        if decoded is None:
+            return False
+        value, end = decoded
+        self._buffer = self._buffer[end:]
+        if self._state == _VALUE:
+            self._state = _COMMA
+        else:
+            self._state = _FIELD_COLON if value == self.key else _COLON
+        return True
+
+    def _decode(self) -> Optional[Tuple[Any, int]]:
+        """Decodes the JSON value at the start of the buffer, returning it and its length (or None
+        if the buffer does not contain all of it yet)."""
+        try:
+            value, end = _DECODER.raw_decode(self._buffer)
+        except json.JSONDecodeError:
+            return None
+        # A number at the end of the buffer may be continued in the next chunk.
+        return (value, end) if end < len(self._buffer) else None
+
+    def _read_field(self, pieces: List[str]) -> bool:
+        """Reads (the next piece of) the field's value."""
+        end = _string_end(self._buffer)
+        if end >= 0:
+            pieces.append(json.loads(f'"{self._buffer[:end]}"'))
+            self._buffer = ""
+            self._state = _END
+            return False
+        # Escape sequences are only decoded once all of their characters have been received.
+        end = _escape_start(self._buffer)
+        pieces.append(json.loads(f'"{self._buffer[:end]}"'))
+        self._buffer = self._buffer[end:]
+        return False
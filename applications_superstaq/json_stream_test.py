@@ -0,0 +1,118 @@
+import gzip
+import json
+import sys
+import zlib
+from typing import Iterator
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from applications_superstaq.json_stream import (
+    is_streamed,
+    iter_json,
+    JsonArray,
+    JsonFieldReader,
+    JsonStream,
+)
+
+
+def test_json_array() -> None:
+    array = JsonArray.from_array(np.arange(5), batch_size=2)
+    assert list(array.batches()) == [[0, 1], [2, 3], [4]]
+    assert array.to_list() == [0, 1, 2, 3, 4]
+
+    def elements() -> Iterator[int]:
+        yield from range(3)
+
+    array = JsonArray.from_iterable(elements, batch_size=2)
+    assert list(array.batches()) == [[0, 1], [2]]
+    assert list(array.batches()) == [[0, 1], [2]]
+    assert list(JsonArray.from_iterable(list).batches()) == []
+
+
+def test_is_streamed() -> None:
+    array = JsonArray.from_array(np.arange(3))
+    assert is_streamed(array)
+    assert is_streamed({"a": 1, "b": {"c": array}})
+    assert not is_streamed({"a": 1, "b": {"c": [1, 2]}})
+    assert not is_streamed(None)
+
+
+def test_iter_json() -> None:
+    obj = {
+        "qubo": {
+            "variables": ["a", "b"],
+            "row": JsonArray.from_array(np.arange(10), batch_size=3),
+            "value": JsonArray.from_array(np.linspace(0, 1, 10), batch_size=4),
+            "empty": JsonArray(lambda: [[], []]),
+        },
+        1: "key",
+        "shots": None,
+    }
+    expected = {
+        "qubo": {
+            "variables": ["a", "b"],
+            "row": list(range(10)),
+            "value": np.linspace(0, 1, 10).tolist(),
+            "empty": [],
+        },
+        1: "key",
+        "shots": None,
+    }
+    chunks = list(iter_json(obj, chunk_size=16))
+    assert len(chunks) > 1
+    assert all(len(chunk) >= 16 for chunk in chunks[:-1])
+    assert b"".join(chunks) == json.dumps(expected).encode()
+    assert b"".join(iter_json(JsonArray(list))) == b"[]"
+
+
+def test_json_stream() -> None:
+    obj = {"row": JsonArray.from_array(np.arange(1000), batch_size=100)}
+    expected = json.dumps({"row": list(range(1000))}).encode()
+
+    stream = JsonStream(obj, chunk_size=1000)
+    assert b"".join(stream) == expected
+    assert b"".join(stream) == expected
+    assert stream.size == stream.uncompressed_size == len(expected)
+
+    stream = JsonStream(obj, compression="gzip", chunk_size=1000)
+    body = b"".join(stream)
+    assert gzip.decompress(body) == expected
+    assert stream.size == len(body) < len(expected)
+    assert stream.uncompressed_size == len(expected)
+
+    mock_zstandard = mock.MagicMock()
+    compressor = mock_zstandard.ZstdCompressor.return_value
+    compressor.compressobj.side_effect = zlib.compressobj
+    with mock.patch.dict(sys.modules, {"zstandard": mock_zstandard}):
+        body = b"".join(JsonStream(obj, compression="zstd"))
+    assert zlib.decompress(body) == expected
+
+    with pytest.raises(TypeError):
+        _ = b"".join(JsonStream({"row": JsonArray(lambda: [[object()]])}))
+
+
+def test_json_field_reader() -> None:
+    solution = 'ab\\c"dé😀/\n' * 5
+    obj = {"a": [1, {"b": "}"}], "n": 12345, "solution": solution, "z": 1}
+    for ensure_ascii in [True, False]:
+        data = json.dumps(obj, ensure_ascii=ensure_ascii).encode()
+        for size in [1, 2, 5, 13, len(data)]:
+            reader = JsonFieldReader("solution")
+            pieces = [reader.feed(data[start:][:size]) for start in range(0, len(data), size)]
+            reader.close()
+            assert "".join(pieces) == solution
+
+    reader = JsonFieldReader("solution")
+    assert reader.feed(b'{"solution": "abc') == "abc"
+    with pytest.raises(ValueError, match="ended before the end of its 'solution' field"):
+        reader.close()
+
+    for data in [b"{}", b'{"a": 1} ']:
+        with pytest.raises(ValueError, match="has no 'solution' field"):
+            _ = JsonFieldReader("solution").feed(data)
+    with pytest.raises(ValueError, match="expected '{'"):
+        _ = JsonFieldReader("solution").feed(b'["solution"]')
+    with pytest.raises(ValueError, match="expected '\"'"):
+        _ = JsonFieldReader("solution").feed(b'{"solution": 1}')
@@ -1,18 +1,30 @@
-from dataclasses import dataclass
-from typing import List
+from typing import Any, Dict, List, Optional
 
 import qubovert as qv
 
 import applications_superstaq
+import applications_superstaq.qubo  # For `QUBOOutput`, which is subclassed at import time.
 
 
-@dataclass
-class TSPOutput:
-    route: List[str]
-    route_list_numbers: List
-    total_distance: float
-    map_link: List[str]
-    qubo: qv.QUBO
+class TSPOutput(applications_superstaq.qubo.QUBOOutput):
+    """The optimal tour of a traveling salesperson problem (see `Logistics.tsp`)."""
+
+    __slots__ = ("route", "route_list_numbers", "total_distance", "map_link")
+
+    def __init__(
+        self,
+        route: List[str],
+        route_list_numbers: List,
+        total_distance: float,
+        map_link: List[str],
+        qubo: Optional[qv.QUBO] = None,
+        model: Any = None,
+    ):
+        self.route = route
+        self.route_list_numbers = route_list_numbers
+        self.total_distance = total_distance
+        self.map_link = map_link
+        super().__init__(qubo, model)
 
 
 def read_json_tsp(json_dict: dict) -> TSPOutput:
@@ -27,17 +39,28 @@ def read_json_tsp(json_dict: dict) -> TSPOutput:
     route_list_numbers = json_dict["route_list_numbers"]
     total_distance = json_dict["total_distance"]
     map_links = json_dict["map_link"]
-    qubo = applications_superstaq.qubo.convert_model_to_qubo(json_dict["qubo"])
-    return TSPOutput(route, route_list_numbers, total_distance, map_links, qubo)
+    return TSPOutput(route, route_list_numbers, total_distance, map_links, model=json_dict["qubo"])
+
+
+class WarehouseOutput(applications_superstaq.qubo.QUBOOutput):
+    """The optimal assignment of customers to warehouses (see `Logistics.warehouse`)."""
 
+    __slots__ = ("warehouse_to_destination", "total_distance", "map_link", "open_warehouses")
 
-@dataclass
-class WarehouseOutput:
-    warehouse_to_destination: List
-    total_distance: float
-    map_link: str
-    open_warehouses: List
-    qubo: qv.QUBO
+    def __init__(
+        self,
+        warehouse_to_destination: List,
+        total_distance: float,
+        map_link: str,
+        open_warehouses: List,
+        qubo: Optional[qv.QUBO] = None,
+        model: Any = None,
+    ):
+        self.warehouse_to_destination = warehouse_to_destination
+        self.total_distance = total_distance
+        self.map_link = map_link
+        self.open_warehouses = open_warehouses
+        super().__init__(qubo, model)
 
 
 def read_json_warehouse(json_dict: dict) -> WarehouseOutput:
@@ -53,17 +76,28 @@ def read_json_warehouse(json_dict: dict) -> WarehouseOutput:
     total_distance = json_dict["total_distance"]
     map_link = json_dict["map_link"]
     open_warehouses = json_dict["open_warehouses"]
-    qubo = applications_superstaq.qubo.convert_model_to_qubo(json_dict["qubo"])
     return WarehouseOutput(
-        warehouse_to_destination, total_distance, map_link, open_warehouses, qubo
+        warehouse_to_destination, total_distance, map_link, open_warehouses, model=json_dict["qubo"]
     )
 
 
+def _warehouse_input(
+    k: int, possible_warehouses: List[str], customers: List[str], solver: str
+) -> Dict[str, Any]:
+    """Builds the body of a /warehouse request."""
+    return {
+        "k": k,
+        "possible_warehouses": possible_warehouses,
+        "customers": customers,
+        "solver": solver,
+    }
+
+
 class Logistics:
     def __init__(self, client: applications_superstaq.superstaq_client._SuperstaQClient):
         self._client = client
 
-    def tsp(self, locs: List[str], solver: str = "anneal") -> TSPOutput:
+    def tsp(self, locs: List[str], solver: str = "anneal", bypass_cache: bool = False) -> TSPOutput:
         """
         This function solves the traveling salesperson problem (TSP) and
         takes a list of strings as input. TSP finds the shortest tour that
@@ -77,6 +111,8 @@ class Logistics:
             locs: List of strings where each string represents
             a location needed to be visited on tour.
             solver: A string indicating which solver to use ("rqaoa" or "anneal").
+            bypass_cache: Whether to request a new result even if the client's result cache
+            holds one for the same input.
         Returns:
             A TSPOutput object with the following attributes:
             .route: The optimal TSP tour as a list of strings in order.
@@ -86,12 +122,17 @@ class Logistics:
             .qubo: The qubo representation of the TSP problem
         """
         input_dict = {"locs": locs}
-        json_dict = self._client.tsp(input_dict)
+        json_dict = self._client.tsp(input_dict, bypass_cache)
 
         return read_json_tsp(json_dict)
 
     def warehouse(
-        self, k: int, possible_warehouses: List[str], customers: List[str], solver: str = "anneal"
+        self,
+        k: int,
+        possible_warehouses: List[str],
+        customers: List[str],
+        solver: str = "anneal",
+        bypass_cache: bool = False,
     ) -> WarehouseOutput:
         """
         This function solves the warehouse location problem, which is:
@@ -103,6 +144,8 @@ class Logistics:
             possible_warehouses: A list of possible warehouse locations.
             customers: A list of customer locations.
             solver: A string indicating which solver to use ("rqaoa" or "anneal").
+            bypass_cache: Whether to request a new result even if the client's result cache
+            holds one for the same input.
         Returns:
             A WarehouseOutput object with the following attributes:
             .warehouse_to_destination: The optimal warehouse-customer pairings in List(Tuple) form.
@@ -111,11 +154,34 @@ class Logistics:
             .open_warehouses: A list of all warehouses that are open.
             .qubo: The qubo representation of the warehouse problem
         """
-        input_dict = {
-            "k": k,
-            "possible_warehouses": possible_warehouses,
-            "customers": customers,
-            "solver": solver,
-        }
-        json_dict = self._client.warehouse(input_dict)
+        input_dict = _warehouse_input(k, possible_warehouses, customers, solver)
+        json_dict = self._client.warehouse(input_dict, bypass_cache)
+        return read_json_warehouse(json_dict)
+
+
+class AsyncLogistics:
+    """Asynchronous counterpart of `Logistics`, for use with an `AsyncSuperstaQClient`."""
+
+    def __init__(self, client: applications_superstaq.async_superstaq_client.AsyncSuperstaQClient):
+        self._client = client
+
+    async def tsp(
+        self, locs: List[str], solver: str = "anneal", bypass_cache: bool = False
+    ) -> TSPOutput:
+        """Solves the traveling salesperson problem (see `Logistics.tsp`)."""
+        input_dict = {"locs": locs}
+        json_dict = await self._client.tsp(input_dict, bypass_cache)
+        return read_json_tsp(json_dict)
+
+    async def warehouse(
+        self,
+        k: int,
+        possible_warehouses: List[str],
+        customers: List[str],
+        solver: str = "anneal",
+        bypass_cache: bool = False,
+    ) -> WarehouseOutput:
+        """Solves the warehouse location problem (see `Logistics.warehouse`)."""
+        input_dict = _warehouse_input(k, possible_warehouses, customers, solver)
+        json_dict = await self._client.warehouse(input_dict, bypass_cache)
         return read_json_warehouse(json_dict)
@@ -1,3 +1,4 @@
+import asyncio
 from unittest import mock
 
 import qubovert as qv
@@ -91,3 +92,45 @@ def test_service_warehouse(mock_warehouse: mock.MagicMock) -> None:
         [("Chicago", "Rockford"), ("Chicago", "Aurora")], 100.0, "map.html", ["Chicago"], qubo
     )
     assert service.warehouse(1, ["Chicago", "San Francisco"], ["Rockford", "Aurora"]) == expected
+
+
+def test_async_logistics() -> None:
+    client = applications_superstaq.async_superstaq_client.AsyncSuperstaQClient(
+        remote_host="http://example.com", api_key="key", client_name="applications_superstaq"
+    )
+    service = applications_superstaq.logistics.AsyncLogistics(client)
+    qubo = {("0",): 123}
+
+    tsp_output = {
+        "route": ["Chicago", "St Louis", "St Paul", "Chicago"],
+        "route_list_numbers": [0, 1, 2, 0],
+        "total_distance": 100.0,
+        "map_link": ["maps.google.com"],
+        "qubo": [{"keys": ["0"], "value": 123}],
+    }
+    with mock.patch.object(client, "tsp", return_value=tsp_output) as mock_tsp:
+        assert asyncio.run(
+            service.tsp(["Chicago", "St Louis", "St Paul"])
+        ) == applications_superstaq.logistics.TSPOutput(
+            ["Chicago", "St Louis", "St Paul", "Chicago"],
+            [0, 1, 2, 0],
+            100.0,
+            ["maps.google.com"],
+            qubo,
+        )
+        mock_tsp.assert_awaited_once_with({"locs": ["Chicago", "St Louis", "St Paul"]}, False)
+
+    warehouse_output = {
+        "warehouse_to_destination": [("Chicago", "Rockford"), ("Chicago", "Aurora")],
+        "total_distance": 100.0,
+        "map_link": "map.html",
+        "open_warehouses": ["Chicago"],
+        "qubo": [{"keys": ["0"], "value": 123}],
+    }
+    with mock.patch.object(client, "warehouse", return_value=warehouse_output) as mock_warehouse:
+        assert asyncio.run(
+            service.warehouse(1, ["Chicago", "San Francisco"], ["Rockford", "Aurora"])
+        ) == applications_superstaq.logistics.WarehouseOutput(
+            [("Chicago", "Rockford"), ("Chicago", "Aurora")], 100.0, "map.html", ["Chicago"], qubo
+        )
+        mock_warehouse.assert_awaited_once()
@@ -0,0 +1,188 @@
+"""Caches slowly-changing account and backend metadata, refreshing it in the background."""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+# How long (in seconds) metadata is fresh. Balances change with every (billed) request, so are
+# also invalidated whenever the client sends a request which may be billed.
+DEFAULT_TTLS = {"/backends": 300.0, "/balance": 30.0}
+
+
+@dataclass
+class MetadataCacheStats:
+    """Counts of lookups in a `MetadataCache` (since it was created)."""
+
+    hits: int = 0
+    # Lookups answered with an expired value, while it is refreshed in the background.
+    stale_hits: int = 0
+    misses: int = 0
+    refresh_errors: int = 0
+
+
+class MetadataCache:
+    """A TTL cache of the responses of metadata endpoints (e.g. `/backends` and `/balance`).
+
+    Fresh values are returned directly from memory. Once a value expires it remains usable for
+    another `max_stale` seconds (stale-while-revalidate): lookups keep returning it immediately,
+    while a background thread (or task) requests a new value. Only lookups of values which are
+    missing or older than that wait for a request.
+
+    Cached values are shared between callers, so must not be modified.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 60.0,
+        max_stale: float = 600.0,
+    ):
+        """Creates a MetadataCache.
+
+        Args:
+            ttls: The time (in seconds) values of each endpoint are fresh, overriding
+                `DEFAULT_TTLS`.
+            default_ttl: The time (in seconds) values of any other endpoint are fresh.
+            max_stale: The time (in seconds) after expiring that values are still returned while
+                being refreshed, or 0 to always wait for expired values to be requested again.
+        """
+        assert default_ttl >= 0 and max_stale >= 0, "Cache lifetimes cannot be negative."
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_stale = max_stale
+        self.stats = MetadataCacheStats()
+
+        self._lock = threading.Lock()
+        # The value of each endpoint, and when (by `time.monotonic`) it was requested.
+        self._entries: Dict[str, Tuple[dict, float]] = {}
+        self._refreshing: Set[str] = set()
+        # Incremented by every invalidation (of all endpoints, or of each endpoint), so that values
+        # requested before an invalidation are not cached.
+        self._epoch = 0
+        self._generations: Dict[str, int] = {}
+        self._tasks: Set["asyncio.Future[Any]"] = set()
+
+    def get(self, endpoint: str, fetch: Callable[[], dict]) -> dict:
+        """Looks up the value of an endpoint, requesting it if necessary.
+
+        Args:
+            endpoint: The endpoint whose value to look up.
+            fetch: Requests the current value of the endpoint.
+
+        Returns:
+            The (possibly stale) value of the endpoint.
+        """
+        value, refresh, generation = self._lookup(endpoint)
+        if refresh:
+            thread = threading.Thread(
+                target=self._refresh, args=(endpoint, fetch, generation), daemon=True
+            )
+            thread.start()
+        if value is None:
+            fetched = time.monotonic()
+            value = fetch()
+            with self._lock:
+                self._store(endpoint, value, fetched, generation)
+        return value
+
+    async def get_async(self, endpoint: str, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        """Looks up the value of an endpoint, requesting it if necessary (see `get`).
+
+        Stale values are refreshed in a background task instead of a thread.
+        """
+        value, refresh, generation = self._lookup(endpoint)
+        if refresh:
+            task = asyncio.ensure_future(self._refresh_async(endpoint, fetch, generation))
+            # The event loop only keeps weak references to its tasks.
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if value is None:
+            fetched = time.monotonic()
+            value = await fetch()
+            with self._lock:
+                self._store(endpoint, value, fetched, generation)
+        return value
+
+    def invalidate(self, endpoint: Optional[str] = None) -> None:
+        """Discards the value of an endpoint, so that it is requested on its next lookup.
+
+        Args:
+            endpoint: The endpoint whose value to discard, or None to discard every value.
+        """
+        with self._lock:
+            if endpoint is None:
+                self._epoch += 1
+                self._entries.clear()
+            else:
+                self._generations[endpoint] = self._generations.get(endpoint, 0) + 1
+                self._entries.pop(endpoint, None)
+
+    def _generation(self, endpoint: str) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(endpoint, 0)
+
+    def _lookup(self, endpoint: str) -> Tuple[Optional[dict], bool, Tuple[int, int]]:
+        """Looks up the cached value of an endpoint.
+
+        Returns:
+            The value (or None if it has to be requested), whether a background refresh should be
+            started, and the current generation of the endpoint's value.
+        """
+        now = time.monotonic()
+        ttl = self.ttls.get(endpoint, self.default_ttl)
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is not None and now - entry[1] < ttl:
+                self.stats.hits += 1
+                return entry[0], False, self._generation(endpoint)
+            if entry is not None and now - entry[1] < ttl + self.max_stale:
+                self.stats.stale_hits += 1
+                refresh = endpoint not in self._refreshing
+                self._refreshing.add(endpoint)
+                return entry[0], refresh, self._generation(endpoint)
+            self.stats.misses += 1
+            return None, False, self._generation(endpoint)
+
+    def _refresh(
+        self, endpoint: str, fetch: Callable[[], dict], generation: Tuple[int, int]
+    ) -> None:
+        """Requests a new value for an endpoint (in a background thread)."""
+        fetched = time.monotonic()
+        try:
+            value: Optional[dict] = fetch()
+        except Exception:
+            value = None
+        self._finish_refresh(endpoint, value, fetched, generation)
+
+    async def _refresh_async(
+        self, endpoint: str, fetch: Callable[[], Awaitable[dict]], generation: Tuple[int, int]
+    ) -> None:
+        """Requests a new value for an endpoint (in a background task)."""
+        fetched = time.monotonic()
+        try:
+            value: Optional[dict] = await fetch()
+        except Exception:
+            value = None
+        self._finish_refresh(endpoint, value, fetched, generation)
+
+    def _finish_refresh(
+        self, endpoint: str, value: Optional[dict], fetched: float, generation: Tuple[int, int]
+    ) -> None:
+        with self._lock:
+            if value is None:
+                # Keep returning the stale value; the next lookup retries the refresh.
+                self.stats.refresh_errors += 1
+            else:
+                self._store(endpoint, value, fetched, generation)
+            self._refreshing.discard(endpoint)
+
+    def _store(
+        self, endpoint: str, value: dict, fetched: float, generation: Tuple[int, int]
+    ) -> None:
+        """Caches a value, unless the cache was invalidated since it was requested.
+
+        Must be called while holding `_lock`.
+        """
+        if generation == self._generation(endpoint):
+            self._entries[endpoint] = (value, fetched)
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Iterator
+from unittest import mock
+
+import pytest
+
+from applications_superstaq.metadata_cache import MetadataCache, MetadataCacheStats
+
+
+@pytest.fixture
+def clock() -> Iterator[mock.MagicMock]:
+    with mock.patch("time.monotonic", return_value=100.0) as mock_monotonic:
+        yield mock_monotonic
+
+
+def _fetcher(*values: dict) -> mock.MagicMock:
+    return mock.MagicMock(side_effect=list(values))
+
+
+def _wait_for_refresh(cache: MetadataCache) -> None:
+    deadline = time.perf_counter() + 5
+    while cache._refreshing:
+        assert time.perf_counter() < deadline
+        time.sleep(0.001)
+
+
+def test_fresh_and_missing(clock: mock.MagicMock) -> None:
+    cache = MetadataCache(ttls={"/backends": 10.0})
+    fetch = _fetcher({"backends": ["a"]}, {"backends": ["b"]})
+    assert cache.get("/backends", fetch) == {"backends": ["a"]}
+    clock.return_value = 109.0
+    assert cache.get("/backends", fetch) == {"backends": ["a"]}
+    assert fetch.call_count == 1
+
+    # Values older than the TTL plus `max_stale` have to be requested again.
+    clock.return_value = 1000.0
+    assert cache.get("/backends", fetch) == {"backends": ["b"]}
+    assert cache.stats == MetadataCacheStats(hits=1, misses=2)
+
+
+def test_stale_while_revalidate(clock: mock.MagicMock) -> None:
+    cache = MetadataCache(default_ttl=10.0, max_stale=100.0)
+    refreshed = threading.Event()
+
+    def fetch_new() -> dict:
+        assert refreshed.wait(timeout=5)
+        return {"value": "new"}
+
+    assert cache.get("/other", lambda: {"value": "old"}) == {"value": "old"}
+    clock.return_value = 150.0
+    assert cache.get("/other", fetch_new) == {"value": "old"}
+    # Only one refresh is started at a time.
+    assert cache.get("/other", fetch_new) == {"value": "old"}
+    refreshed.set()
+    _wait_for_refresh(cache)
+
+    assert cache.get("/other", mock.MagicMock()) == {"value": "new"}
+    assert cache.stats == MetadataCacheStats(hits=1, stale_hits=2, misses=1)
+
+
+def test_refresh_error(clock: mock.MagicMock) -> None:
+    cache = MetadataCache(default_ttl=10.0)
+    cache.get("/other", lambda: {"value": "old"})
+    clock.return_value = 150.0
+    fetch = mock.MagicMock(side_effect=RuntimeError("refresh failed"))
+    assert cache.get("/other", fetch) == {"value": "old"}
+    _wait_for_refresh(cache)
+    assert cache.stats.refresh_errors == 1
+    assert cache.get("/other", fetch) == {"value": "old"}
+    _wait_for_refresh(cache)
+    assert cache.stats.refresh_errors == 2
+
+
+def test_invalidate(clock: mock.MagicMock) -> None:
+    cache = MetadataCache()
+    cache.get("/balance", lambda: {"balance": 1.0})
+    cache.get("/backends", lambda: {"backends": []})
+    cache.invalidate("/balance")
+    assert cache.get("/balance", lambda: {"balance": 2.0}) == {"balance": 2.0}
+    assert cache.get("/backends", mock.MagicMock()) == {"backends": []}
+
+    cache.invalidate()
+    assert cache.get("/balance", lambda: {"balance": 3.0}) == {"balance": 3.0}
+    assert cache.get("/backends", lambda: {"backends": ["a"]}) == {"backends": ["a"]}
+
+
+def test_invalidate_during_request(clock: mock.MagicMock) -> None:
+    cache = MetadataCache()
+
+    def fetch(value: float) -> Callable[[], dict]:
+        def fetch_and_invalidate() -> dict:
+            cache.invalidate("/balance")
+            return {"balance": value}
+
+        return fetch_and_invalidate
+
+    # Values requested before an invalidation are returned, but not cached.
+    assert cache.get("/balance", fetch(1.0)) == {"balance": 1.0}
+    assert cache.get("/balance", lambda: {"balance": 2.0}) == {"balance": 2.0}
+    assert cache.get("/balance", mock.MagicMock()) == {"balance": 2.0}
+
+
+def test_get_async(clock: mock.MagicMock) -> None:
+    cache = MetadataCache(default_ttl=10.0)
+    values = iter([{"value": "old"}, {"value": "new"}])
+
+    async def fetch() -> dict:
+        return next(values)
+
+    async def failing_fetch() -> dict:
+        raise RuntimeError("refresh failed")
+
+    async def run() -> None:
+        assert await cache.get_async("/other", fetch) == {"value": "old"}
+        clock.return_value = 150.0
+        assert await cache.get_async("/other", failing_fetch) == {"value": "old"}
+        await asyncio.gather(*cache._tasks)
+        assert await cache.get_async("/other", fetch) == {"value": "old"}
+        await asyncio.gather(*cache._tasks)
+        assert await cache.get_async("/other", fetch) == {"value": "new"}
+
+    asyncio.run(run())
+    assert cache.stats == MetadataCacheStats(hits=1, stale_hits=2, misses=1, refresh_errors=1)
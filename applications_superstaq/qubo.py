@@ -1,19 +1,182 @@
-from typing import Any, Dict, List
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    overload,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
+import numpy.typing as npt
 import qubovert as qv
+import scipy.sparse
+import scipy.sparse.csgraph
 
 import applications_superstaq
 
 
-def read_json_qubo_result(json_dict: dict) -> np.recarray:
+@dataclass
+class SparseQUBO:
+    """A QUBO represented by an upper-triangular sparse matrix.
+
+    The value of an assignment `x` (a 0/1 vector ordered like `variables`) is
+    `x @ matrix @ x + offset`, with linear terms on the diagonal of `matrix`.
+    """
+
+    matrix: scipy.sparse.coo_matrix
+    variables: List[Any]
+    offset: float = 0.0
+
+
+QUBOLike = Union[qv.QUBO, np.ndarray, scipy.sparse.spmatrix, scipy.sparse.sparray]
+
+
+def read_json_qubo_result(json_dict: dict, allow_pickle: bool = True) -> np.recarray:
     """Reads out returned JSON from SuperstaQ API's QUBO endpoint.
+
+    Binary-encoded solutions (see `applications_superstaq.converters.encode`) are decoded without
+    copying: the returned recarray is a read-only view of the decoded base64 buffer.
+
     Args:
         json_dict: a JSON dictionary matching the format returned by /qubo endpoint
+        allow_pickle: whether to unpickle solutions which were not binary-encoded (as returned by
+            servers which do not support the binary format). Unpickling data from an untrusted
+            source can execute arbitrary code.
     Returns:
         a numpy.recarray containing the results of the optimization.
+    Raises:
+        ValueError: if the solutions were pickled, but `allow_pickle` is False.
     """
-    return applications_superstaq.converters.deserialize(json_dict["solution"])
+    solution = applications_superstaq.converters.deserialize(json_dict["solution"], allow_pickle)
+    if isinstance(solution, np.ndarray) and not isinstance(solution, np.recarray):
+        return solution.view(np.recarray)
+    return solution
+
+
+class _QUBOResultReader:
+    """Reads out the solutions of a `/qubo` response in batches, as it is received in chunks."""
+
+    def __init__(self, batch_size: int, allow_pickle: bool):
+        self._json = applications_superstaq.json_stream.JsonFieldReader("solution")
+        self._solution = applications_superstaq.converters.StreamDeserializer(
+            batch_size, allow_pickle
+        )
+
+    def feed(self, chunk: bytes) -> List[np.recarray]:
+        return self._recarrays(self._solution.feed(self._json.feed(chunk)))
+
+    def close(self) -> List[np.recarray]:
+        self._json.close()
+        return self._recarrays(self._solution.close())
+
+    @staticmethod
+    def _recarrays(batches: List[np.ndarray]) -> List[np.recarray]:
+        return [batch.view(np.recarray) for batch in batches]
+
+
+def iter_json_qubo_result(
+    chunks: Iterable[bytes],
+    batch_size: int = applications_superstaq.converters.DECODE_BATCH_SIZE,
+    allow_pickle: bool = True,
+) -> Iterator[np.recarray]:
+    """Reads out the solutions returned by SuperstaQ API's QUBO endpoint incrementally, as the
+    response is received.
+
+    Unlike `read_json_qubo_result`, neither the JSON response nor the solutions are ever held in
+    memory in full (unless the solutions were pickled), so that huge sample sets can be aggregated
+    or written to disk as they are downloaded.
+
+    Args:
+        chunks: The chunks of the (raw) body of the response, e.g. as returned by
+            `_SuperstaQClient.submit_qubo_stream`.
+        batch_size: The number of solutions in each batch (except the last).
+        allow_pickle: Whether to unpickle solutions which were not binary-encoded (see
+            `read_json_qubo_result`).
+    Returns:
+        An iterator over batches of the solutions, as numpy.recarrays like those returned by
+        `read_json_qubo_result`.
+    """
+    reader = _QUBOResultReader(batch_size, allow_pickle)
+    for chunk in chunks:
+        yield from reader.feed(chunk)
+    yield from reader.close()
+
+
+async def aiter_json_qubo_result(
+    chunks: AsyncIterable[bytes],
+    batch_size: int = applications_superstaq.converters.DECODE_BATCH_SIZE,
+    allow_pickle: bool = True,
+) -> AsyncIterator[np.recarray]:
+    """Asynchronous version of `iter_json_qubo_result`, e.g. for the chunks returned by
+    `AsyncSuperstaQClient.submit_qubo_stream`."""
+    reader = _QUBOResultReader(batch_size, allow_pickle)
+    async for chunk in chunks:
+        for batch in reader.feed(chunk):
+            yield batch
+    for batch in reader.close():
+        yield batch
+
+
+def _qubo_to_arrays(qubo: qv.QUBO) -> Tuple[List[Any], np.ndarray, np.ndarray, np.ndarray]:
+    """Splits a QUBO into a variable table and integer `row`/`col` and float `value` arrays.
+
+    Linear terms have `row == col`, and the constant offset (if any) has `row == col == -1`.
+    Only the variable lookups are done in Python; everything else is vectorized.
+
+    Args:
+        qubo: a qubovert QUBO object.
+    Returns:
+        The variables (in order of first appearance) and the `row`, `col` and `value` arrays.
+    """
+    keys = list(qubo.keys())
+    variables = list(dict.fromkeys(variable for key in keys for variable in key))
+    index = {variable: i for i, variable in enumerate(variables)}
+    lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    indices = np.fromiter(
+        (index[variable] for key in keys for variable in key),
+        dtype=np.int64,
+        count=int(lengths.sum()),
+    )
+    value = np.fromiter(qubo.values(), dtype=np.float64, count=len(keys))
+
+    # Indices of each term's first and last variable in `indices` (the offset has neither).
+    ends = np.cumsum(lengths)
+    has_variables = lengths > 0
+    row = np.full(len(keys), -1, dtype=np.int64)
+    col = np.full(len(keys), -1, dtype=np.int64)
+    row[has_variables] = indices[(ends - lengths)[has_variables]]
+    col[has_variables] = indices[ends[has_variables] - 1]
+    return variables, row, col, value
+
+
+def _arrays_to_qubo(
+    variables: Sequence[Any], row: npt.ArrayLike, col: npt.ArrayLike, value: npt.ArrayLike
+) -> qv.QUBO:
+    """Builds a QUBO from the arrays returned by `_qubo_to_arrays`."""
+    names = np.empty(len(variables), dtype=object)
+    names[:] = list(variables)
+    rows = np.asarray(row, dtype=np.int64)
+    cols = np.asarray(col, dtype=np.int64)
+    values = np.asarray(value, dtype=np.float64)
+
+    offset = rows < 0
+    linear = ~offset & (rows == cols)
+    quadratic = ~offset & (rows != cols)
+    keys: List[tuple] = [()] * int(offset.sum())
+    keys += zip(names[rows[linear]].tolist())
+    keys += zip(names[rows[quadratic]].tolist(), names[cols[quadratic]].tolist())
+    term_values = np.concatenate([values[offset], values[linear], values[quadratic]]).tolist()
+    return qv.QUBO(dict(zip(keys, term_values)))
 
 
 def convert_qubo_to_model(qubo: qv.QUBO) -> List[Dict[str, Any]]:
@@ -29,14 +192,564 @@ def convert_qubo_to_model(qubo: qv.QUBO) -> List[Dict[str, Any]]:
     return model
 
 
-def convert_model_to_qubo(model: List[Dict[str, Any]]) -> qv.QUBO:
+def stream_qubo_model(qubo: qv.QUBO) -> "applications_superstaq.json_stream.JsonArray":
+    """Like `convert_qubo_to_model`, but the terms are converted lazily, as the model is encoded.
+
+    Args:
+        qubo: a qubovert QUBO object.
+    Returns:
+        An equivalent qubo represented as a `JsonArray` of dictionaries (see `json_stream`).
+    """
+
+    def terms() -> Iterator[Dict[str, Any]]:
+        for key, value in qubo.items():
+            yield {"keys": [str(variable) for variable in key], "value": value}
+
+    return applications_superstaq.json_stream.JsonArray.from_iterable(terms)
+
+
+def _columnar_model(
+    variables: Sequence[Any], row: np.ndarray, col: np.ndarray, value: np.ndarray, stream: bool
+) -> Dict[str, Any]:
+    """Builds a columnar model, with the columns as lists or (if `stream`) `JsonArray`s."""
+    column: Callable[[np.ndarray], Any] = np.ndarray.tolist
+    if stream:
+        column = applications_superstaq.json_stream.JsonArray.from_array
+    return {
+        "format": "columnar",
+        "variables": [str(variable) for variable in variables],
+        "row": column(row),
+        "col": column(col),
+        "value": column(value),
+    }
+
+
+def _matrix_to_arrays(
+    matrix: Union[np.ndarray, scipy.sparse.spmatrix, scipy.sparse.sparray]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the `row`, `col` and `value` arrays of the upper-triangular form of a square matrix.
+
+    Each pair of symmetric entries is merged into one upper-triangular term, and zeros are dropped.
+    """
+    assert matrix.ndim == 2 and matrix.shape[0] == matrix.shape[1], "QUBO matrices must be square."
+    coo = scipy.sparse.coo_matrix(matrix)
+    upper = scipy.sparse.coo_matrix(
+        (coo.data, (np.minimum(coo.row, coo.col), np.maximum(coo.row, coo.col))), shape=coo.shape
+    )
+    upper.sum_duplicates()
+    upper.eliminate_zeros()
+    return upper.row.astype(np.int64), upper.col.astype(np.int64), upper.data.astype(np.float64)
+
+
+def convert_matrix_to_columnar_model(
+    matrix: Union[np.ndarray, scipy.sparse.spmatrix, scipy.sparse.sparray],
+    variables: Optional[Sequence[Any]] = None,
+    stream: bool = False,
+) -> Dict[str, Any]:
+    """Takes in a QUBO matrix and converts it to the columnar format of the /qubo endpoint API.
+
+    The columns are built directly from the (sparse or dense) matrix buffers, without first
+    building a `qv.QUBO`. The matrix does not need to be symmetric or triangular: the QUBO's value
+    for an assignment `x` is `x @ matrix @ x`.
+
+    Args:
+        matrix: a square numpy array or scipy.sparse matrix.
+        variables: the label of each row/column of the matrix (defaults to their indices).
+        stream: whether to return the columns as `JsonArray`s, which are converted lazily as the
+            model is encoded (see `json_stream`), rather than as lists.
+    Returns:
+        An equivalent qubo represented as a dictionary of columns (see
+        `convert_qubo_to_columnar_model`).
+    """
+    row, col, value = _matrix_to_arrays(matrix)
+    if variables is None:
+        variables = range(matrix.shape[0])
+    assert len(variables) == matrix.shape[0], "There must be one variable per row of the matrix."
+    return _columnar_model(variables, row, col, value, stream)
+
+
+def convert_to_columnar_model(
+    qubo: QUBOLike, variables: Optional[Sequence[Any]] = None, stream: bool = False
+) -> Dict[str, Any]:
+    """Converts a `qv.QUBO` or QUBO matrix to the columnar format (see `submit_qubo`)."""
+    if isinstance(qubo, qv.QUBO):
+        return convert_qubo_to_columnar_model(qubo, stream)
+    return convert_matrix_to_columnar_model(qubo, variables, stream)
+
+
+def convert_qubo_to_columnar_model(qubo: qv.QUBO, stream: bool = False) -> Dict[str, Any]:
+    """Takes in a qubovert QUBO and converts it to the columnar format of the /qubo endpoint API.
+
+    The columnar format consists of a table of variable names plus `row`, `col` and `value` arrays
+    with one entry per term, where `row` and `col` index into the variable table. Linear terms have
+    `row == col`, and the constant offset (if any) has `row == col == -1`. This is much faster to
+    build (and much smaller) than the list-of-dictionaries format, but is only accepted by servers
+    supporting it.
+
+    Args:
+        qubo: a qubovert QUBO object.
+        stream: whether to return the columns as `JsonArray`s, which are converted lazily as the
+            model is encoded (see `json_stream`), rather than as lists.
+    Returns:
+        An equivalent qubo represented as a dictionary of columns.
+    """
+    variables, row, col, value = _qubo_to_arrays(qubo)
+    return _columnar_model(variables, row, col, value, stream)
+
+
+@overload
+def convert_model_to_qubo(
+    model: Union[List[Dict[str, Any]], Dict[str, Any]], sparse: Literal[False] = False
+) -> qv.QUBO:
+    ...
+
+
+@overload
+def convert_model_to_qubo(
+    model: Union[List[Dict[str, Any]], Dict[str, Any]], sparse: Literal[True]
+) -> SparseQUBO:
+    ...
+
+
+def convert_model_to_qubo(
+    model: Union[List[Dict[str, Any]], Dict[str, Any]], sparse: bool = False
+) -> Union[qv.QUBO, SparseQUBO]:
     """Takes in qubo model transferred over the wire and converts it to the qubovert format.
     Args:
-        model: The qubo model as specified in superstaq.web.server.
+        model: The qubo model as specified in superstaq.web.server, either as a list of
+            dictionaries or in the columnar format (see `convert_qubo_to_columnar_model`).
+        sparse: Whether to return a `SparseQUBO` (which is much faster to build for large models)
+            instead of a `qv.QUBO`.
     Returns:
-        An equivalent qubovert.QUBO object.
+        An equivalent qubovert.QUBO (or SparseQUBO) object.
     """
+    if isinstance(model, dict):
+        if sparse:
+            return _arrays_to_sparse_qubo(
+                model["variables"], model["row"], model["col"], model["value"]
+            )
+        return _arrays_to_qubo(model["variables"], model["row"], model["col"], model["value"])
+
     qubo_dict = {}
     for term in model:
         qubo_dict[tuple(term["keys"])] = term["value"]
-    return qv.QUBO(qubo_dict)
+    qubo = qv.QUBO(qubo_dict)
+    if sparse:
+        return _arrays_to_sparse_qubo(*_qubo_to_arrays(qubo))
+    return qubo
+
+
+class QUBOOutput:
+    """Base class of the outputs of the optimization endpoints, which include the QUBO solved.
+
+    The QUBO is only built from the model returned by the server (see `convert_model_to_qubo`) on
+    first access to `qubo`, since building it can dominate the handling of a large response and
+    most callers never read it. Subclasses declare their other fields in `__slots__` (in the order
+    of their constructor's arguments), which are compared by `==` and shown by `repr`.
+    """
+
+    __slots__ = ("_qubo", "_model")
+
+    def __init__(self, qubo: Optional[qv.QUBO] = None, model: Any = None):
+        """Sets the QUBO of the output.
+
+        Args:
+            qubo: The QUBO, if it has already been built.
+            model: The QUBO model returned by the server, to build the QUBO from when it is first
+                accessed (if `qubo` is not given).
+        """
+        assert (qubo is None) != (model is None), "Outputs need either a QUBO or its model."
+        self._qubo = qubo
+        self._model = model
+
+    @property
+    def qubo(self) -> qv.QUBO:
+        """The QUBO (built from its model on first access)."""
+        if self._qubo is None:
+            self._qubo = convert_model_to_qubo(self._model)
+            self._model = None
+        return self._qubo
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in type(self).__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._fields() == other._fields() and self.qubo == other.qubo
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={value!r}" for name, value in zip(type(self).__slots__, self._fields())
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+def _arrays_to_sparse_qubo(
+    variables: Sequence[Any], row: npt.ArrayLike, col: npt.ArrayLike, value: npt.ArrayLike
+) -> SparseQUBO:
+    """Builds a SparseQUBO from the arrays returned by `_qubo_to_arrays`."""
+    rows = np.asarray(row, dtype=np.int64)
+    cols = np.asarray(col, dtype=np.int64)
+    values = np.asarray(value, dtype=np.float64)
+    offset = rows < 0
+    rows, cols, values = rows[~offset], cols[~offset], values[~offset]
+    matrix = scipy.sparse.coo_matrix(
+        (values, (np.minimum(rows, cols), np.maximum(rows, cols))),
+        shape=(len(variables), len(variables)),
+    )
+    return SparseQUBO(matrix, list(variables), float(np.asarray(value)[offset].sum()))
+
+
+def convert_to_sparse_qubo(
+    qubo: Union[QUBOLike, SparseQUBO, List[Dict[str, Any]], Dict[str, Any]],
+    variables: Optional[Sequence[Any]] = None,
+) -> SparseQUBO:
+    """Converts a QUBO in any of the supported representations to a `SparseQUBO`.
+
+    Args:
+        qubo: a qubovert QUBO, QUBO matrix (see `convert_matrix_to_columnar_model`), qubo model
+            (in either wire format) or SparseQUBO.
+        variables: the variables to index the rows/columns of the returned matrix by (defaults to
+            the variables of `qubo`, or the row indices of a QUBO matrix). Must include every
+            variable of `qubo`, but may also include others.
+    Returns:
+        An equivalent SparseQUBO.
+    Raises:
+        ValueError: if any of the variables of `qubo` are missing from `variables`.
+    """
+    if isinstance(qubo, SparseQUBO):
+        sparse_qubo = qubo
+    elif isinstance(qubo, qv.QUBO):
+        sparse_qubo = _arrays_to_sparse_qubo(*_qubo_to_arrays(qubo))
+    elif isinstance(qubo, (list, dict)):
+        sparse_qubo = convert_model_to_qubo(qubo, sparse=True)
+    else:
+        row, col, value = _matrix_to_arrays(qubo)
+        matrix = scipy.sparse.coo_matrix((value, (row, col)), shape=qubo.shape)
+        if variables is None:
+            return SparseQUBO(matrix, list(range(qubo.shape[0])))
+        assert len(variables) == qubo.shape[0], "There must be one variable per row of the matrix."
+        return SparseQUBO(matrix, list(variables))
+
+    if variables is None or list(variables) == sparse_qubo.variables:
+        return sparse_qubo
+
+    index = {variable: i for i, variable in enumerate(variables)}
+    missing = [variable for variable in sparse_qubo.variables if variable not in index]
+    if missing:
+        raise ValueError(f"Variables {missing} of the QUBO are missing from `variables`.")
+    permutation = np.array([index[variable] for variable in sparse_qubo.variables], dtype=np.int64)
+    matrix = sparse_qubo.matrix.tocoo()
+    row = permutation[matrix.row]
+    col = permutation[matrix.col]
+    matrix = scipy.sparse.coo_matrix(
+        (matrix.data, (np.minimum(row, col), np.maximum(row, col))),
+        shape=(len(variables), len(variables)),
+    )
+    return SparseQUBO(matrix, list(variables), sparse_qubo.offset)
+
+
+def evaluate_energies(
+    qubo: Union[QUBOLike, SparseQUBO, List[Dict[str, Any]], Dict[str, Any]],
+    samples: Union[np.ndarray, Iterable[npt.ArrayLike]],
+    variables: Optional[Sequence[Any]] = None,
+    chunk_size: Optional[int] = None,
+) -> np.ndarray:
+    """Computes the energy of each of the given samples (i.e. assignments) of a QUBO.
+
+    All energies are computed as one batched `x^T Q x` over the (sparse) QUBO matrix `Q`, instead
+    of evaluating the QUBO once per sample. Samples are processed `chunk_size` at a time, so only
+    one chunk's intermediate arrays are held in memory at once. Sample sets which do not fit in
+    memory can be passed as a memory-mapped array (e.g. see `converters.decode_file`), or as an
+    iterable of 2-D chunks.
+
+    Args:
+        qubo: the QUBO, in any representation accepted by `convert_to_sparse_qubo`.
+        samples: a 2-D numpy array with one row per sample and one 0/1 column per variable, or an
+            iterable of such arrays.
+        variables: the variable corresponding to each column of `samples` (defaults to the
+            variables of `qubo`, in order of first appearance, or the row indices of a QUBO
+            matrix).
+        chunk_size: the maximum number of samples to evaluate at a time (defaults to as many as
+            occupy about 64MB as floats).
+    Returns:
+        A 1-D array with the energy of each sample.
+    """
+    sparse_qubo = convert_to_sparse_qubo(qubo, variables)
+    matrix = sparse_qubo.matrix.tocsr()
+    num_variables = len(sparse_qubo.variables)
+    if chunk_size is None:
+        chunk_size = max(1, 2**23 // max(num_variables, 1))
+    assert chunk_size > 0, "Chunks must contain at least one sample."
+
+    def chunk_energies(chunk: np.ndarray) -> np.ndarray:
+        chunk = np.asarray(chunk, dtype=np.float64)
+        return np.einsum("ij,ij->i", np.asarray(chunk @ matrix), chunk) + sparse_qubo.offset
+
+    chunks: Iterable[npt.ArrayLike] = [samples] if isinstance(samples, np.ndarray) else samples
+    energies = []
+    for chunk in chunks:
+        # `np.asanyarray` keeps memory-mapped samples on disk until each chunk is evaluated.
+        chunk = np.asanyarray(chunk)
+        assert chunk.ndim == 2, "Samples must be given as 2-D arrays."
+        assert chunk.shape[1] == num_variables, "Samples must have one column per variable."
+        for start in range(0, len(chunk), chunk_size):
+            stop = start + chunk_size
+            energies.append(chunk_energies(chunk[start:stop]))
+    return np.concatenate(energies) if energies else np.zeros(0)
+
+
+@dataclass
+class PresolvedQUBO:
+    """The result of presolving a QUBO (see `presolve`).
+
+    Attributes:
+        qubo: The original QUBO.
+        fixed: The value of each variable fixed by presolving, by index into `qubo.variables`.
+        merged: For each variable merged into another, the index of the variable it equals.
+        components: The independent sub-QUBOs over the remaining variables. Together with `offset`
+            (and the fixed and merged variables), their sum equals the original QUBO.
+        offset: The constant term of the reduced problem.
+    """
+
+    qubo: SparseQUBO
+    fixed: Dict[int, int]
+    merged: Dict[int, int]
+    components: List[SparseQUBO]
+    offset: float
+
+
+class _Presolver:
+    """Reduces a QUBO by applying persistency rules until none apply.
+
+    The QUBO is held as linear coefficients plus a symmetric adjacency map of (nonzero) quadratic
+    coefficients, both updated in place as variables are fixed or merged.
+    """
+
+    def __init__(self, qubo: SparseQUBO) -> None:
+        matrix = qubo.matrix.tocoo()
+        num_variables = len(qubo.variables)
+        diagonal = matrix.row == matrix.col
+        self.linear = np.zeros(num_variables)
+        np.add.at(self.linear, matrix.row[diagonal], matrix.data[diagonal])
+        self.adjacency: List[Dict[int, float]] = [{} for _ in range(num_variables)]
+        for i, j, value in zip(matrix.row.tolist(), matrix.col.tolist(), matrix.data.tolist()):
+            if i != j:
+                self._add_coupling(i, j, value)
+        self.offset = qubo.offset
+        self.active = set(range(num_variables))
+        self.fixed: Dict[int, int] = {}
+        self.merged: Dict[int, int] = {}
+
+    def _add_coupling(self, i: int, j: int, value: float) -> None:
+        total = self.adjacency[i].get(j, 0.0) + value
+        if total:
+            self.adjacency[i][j] = self.adjacency[j][i] = total
+        else:
+            self.adjacency[i].pop(j, None)
+            self.adjacency[j].pop(i, None)
+
+    def _fix(self, i: int, value: int) -> None:
+        self.active.remove(i)
+        self.fixed[i] = value
+        if value:
+            self.offset += self.linear[i]
+        for j, coupling in self.adjacency[i].items():
+            if value:
+                self.linear[j] += coupling
+            del self.adjacency[j][i]
+        self.adjacency[i] = {}
+
+    def _merge(self, i: int, j: int) -> None:
+        """Replaces variable `j` by variable `i` (i.e. imposes `x_j == x_i`)."""
+        self.active.remove(j)
+        self.merged[j] = i
+        self.linear[i] += self.linear[j] + self.adjacency[i].pop(j)
+        del self.adjacency[j][i]
+        for k, coupling in self.adjacency[j].items():
+            del self.adjacency[k][j]
+            self._add_coupling(i, k, coupling)
+        self.adjacency[j] = {}
+
+    def fix_variables(self, candidates: Iterable[int]) -> None:
+        """Fixes every variable whose optimal value does not depend on any other variable.
+
+        Setting `x_i = 1` changes the energy by `linear[i]` plus the couplings to its neighbors
+        which are set, so if that is nonnegative (or nonpositive) however the neighbors are set,
+        some optimal solution has `x_i = 0` (or `x_i = 1`).
+        """
+        queue = list(candidates)
+        while queue:
+            i = queue.pop()
+            if i not in self.active:
+                continue
+            couplings = self.adjacency[i].values()
+            if self.linear[i] + sum(c for c in couplings if c < 0) >= 0:
+                value = 0
+            elif self.linear[i] + sum(c for c in couplings if c > 0) <= 0:
+                value = 1
+            else:
+                continue
+            queue.extend(self.adjacency[i])
+            self._fix(i, value)
+
+    def merge_variables(self) -> List[int]:
+        """Merges pairs of variables which are equal in some optimal solution.
+
+        Given the other variables, setting `x_i = x_j = 1` instead of just one of them changes the
+        energy by `coupling + r_i` or `coupling + r_j` (where `r_i` is the change from setting `x_i`
+        alone), so if both are nonpositive however the other variables are set, then either both
+        variables or neither are set in some optimal solution.
+
+        Returns:
+            The variables whose coefficients changed.
+        """
+        changed = set()
+        for i in sorted(self.active):
+            for j in sorted(self.adjacency[i]):
+                coupling = self.adjacency[i].get(j, 0.0)
+                if i not in self.active or coupling >= 0:
+                    continue
+                if (
+                    self._max_change(i, j) + coupling <= 0
+                    and self._max_change(j, i) + coupling <= 0
+                ):
+                    self._merge(i, j)
+                    changed.add(i)
+                    changed.update(self.adjacency[i])
+        return sorted(changed)
+
+    def _max_change(self, i: int, exclude: int) -> float:
+        """The largest possible change in energy from setting `x_i` (ignoring `x_exclude`)."""
+        couplings = self.adjacency[i].items()
+        return self.linear[i] + sum(c for k, c in couplings if c > 0 and k != exclude)
+
+    def components(self, variables: List[Any]) -> List[SparseQUBO]:
+        """Splits the remaining variables into independent sub-QUBOs."""
+        active = sorted(self.active)
+        if not active:
+            return []
+        position = {i: p for p, i in enumerate(active)}
+        rows, cols, values = [], [], []
+        for i in active:
+            rows.append(position[i])
+            cols.append(position[i])
+            values.append(self.linear[i])
+            for j, coupling in self.adjacency[i].items():
+                if i < j:
+                    rows.append(position[i])
+                    cols.append(position[j])
+                    values.append(coupling)
+        matrix = scipy.sparse.coo_matrix((values, (rows, cols)), shape=(len(active), len(active)))
+        num_components, labels = scipy.sparse.csgraph.connected_components(matrix, directed=False)
+
+        matrix = matrix.tocsr()
+        components = []
+        for label in range(num_components):
+            (indices,) = np.nonzero(labels == label)
+            submatrix = matrix[indices][:, indices].tocoo()
+            component_variables = [variables[active[p]] for p in indices.tolist()]
+            components.append(SparseQUBO(submatrix, component_variables))
+        return components
+
+
+def presolve(
+    qubo: Union[QUBOLike, SparseQUBO, List[Dict[str, Any]], Dict[str, Any]],
+    variables: Optional[Sequence[Any]] = None,
+) -> PresolvedQUBO:
+    """Reduces a QUBO before it is solved, without changing its optimal value.
+
+    Repeatedly fixes variables whose optimal value can be determined locally (first-order
+    persistency), and merges pairs of variables which are equal in some optimal solution (i.e.
+    which are coupled strongly enough that neither is ever set without the other). The remaining
+    variables are then split into independent (disconnected) sub-QUBOs, which can be solved
+    separately and their solutions combined with `reconstruct_solutions`.
+
+    Args:
+        qubo: the QUBO, in any representation accepted by `convert_to_sparse_qubo`.
+        variables: the variables of the QUBO (see `convert_to_sparse_qubo`).
+    Returns:
+        The reduced problem.
+    """
+    sparse_qubo = convert_to_sparse_qubo(qubo, variables)
+    presolver = _Presolver(sparse_qubo)
+    candidates: Iterable[int] = range(len(sparse_qubo.variables))
+    while candidates:
+        presolver.fix_variables(candidates)
+        candidates = presolver.merge_variables()
+
+    return PresolvedQUBO(
+        qubo=sparse_qubo,
+        fixed=presolver.fixed,
+        merged=presolver.merged,
+        components=presolver.components(sparse_qubo.variables),
+        offset=float(presolver.offset),
+    )
+
+
+def _solution_matrix(result: np.recarray, variables: Sequence[Any]) -> np.ndarray:
+    """Extracts the solutions of a QUBO result as a 2-D array with one column per variable.
+
+    Solutions may be given as dictionaries (keyed by each variable or its name on the wire), or as
+    arrays with one column per variable.
+    """
+    if result.solution.dtype.hasobject:
+        return np.array(
+            [
+                [solution[v] if v in solution else solution[str(v)] for v in variables]
+                for solution in result.solution
+            ],
+            dtype=np.int8,
+        ).reshape(len(result), len(variables))
+    return np.asarray(result.solution, dtype=np.int8).reshape(len(result), len(variables))
+
+
+def reconstruct_solutions(presolved: PresolvedQUBO, results: Sequence[np.recarray]) -> np.recarray:
+    """Combines the solutions of each component of a presolved QUBO into full solutions.
+
+    Each component's solutions are ranked by energy, and the `k`-th full solution combines the
+    `k`-th best solution of each component (or its worst, if it has fewer), along with the values
+    of the fixed and merged variables. Energies are then evaluated against the original QUBO.
+
+    Args:
+        presolved: the presolved QUBO.
+        results: the results of solving each of `presolved.components` (e.g. as returned by
+            `read_json_qubo_result`), in order.
+    Returns:
+        A numpy.recarray like those returned by `read_json_qubo_result`, with one solution
+        dictionary over all of the original variables per row. The number of occurrences of each
+        row is the smallest number of occurrences of any of the component solutions it combines.
+    """
+    assert len(results) == len(presolved.components), "There must be one result per component."
+    variables = presolved.qubo.variables
+    index = {variable: i for i, variable in enumerate(variables)}
+    num_rows = max([len(result) for result in results], default=1)
+    samples = np.zeros((num_rows, len(variables)), dtype=np.int8)
+    occurrences = np.full(num_rows, np.iinfo(np.int64).max, dtype=np.int64)
+
+    for i, value in presolved.fixed.items():
+        samples[:, i] = value
+    for component, result in zip(presolved.components, results):
+        order = np.argsort(result.energy, kind="stable")
+        rows = order[np.minimum(np.arange(num_rows), len(result) - 1)]
+        columns = [index[variable] for variable in component.variables]
+        samples[:, columns] = _solution_matrix(result, component.variables)[rows]
+        occurrences = np.minimum(occurrences, np.asarray(result.num_occurrences)[rows])
+    if not results:
+        occurrences[:] = 1
+
+    for i in presolved.merged:
+        # Follow chains of merges to a variable which was kept (or fixed).
+        j = presolved.merged[i]
+        while j in presolved.merged:
+            j = presolved.merged[j]
+        samples[:, i] = samples[:, j]
+
+    output = np.empty(
+        num_rows, dtype=[("solution", "O"), ("energy", "<f8"), ("num_occurrences", "<i8")]
+    )
+    output["solution"] = [dict(zip(variables, sample)) for sample in samples.tolist()]
+    output["energy"] = evaluate_energies(presolved.qubo, samples)
+    output["num_occurrences"] = occurrences
+    return output.view(np.recarray)
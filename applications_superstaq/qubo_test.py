@@ -1,5 +1,14 @@
+import asyncio
+import itertools
+import json
+import os
+from typing import Any, AsyncIterator, List, Optional
+from unittest import mock
+
 import numpy as np
+import pytest
 import qubovert as qv
+import scipy.sparse
 
 import applications_superstaq
 
@@ -16,6 +25,55 @@ def test_read_json_qubo_result() -> None:
         example_solution
     )
 
+    # Pickled solutions are rejected unless unpickling is allowed.
+    with pytest.raises(ValueError, match="allow_pickle=False"):
+        _ = applications_superstaq.qubo.read_json_qubo_result(json_dict, allow_pickle=False)
+    body = json.dumps(json_dict).encode()
+    with pytest.raises(ValueError, match="allow_pickle=False"):
+        _ = list(applications_superstaq.qubo.iter_json_qubo_result([body], allow_pickle=False))
+
+
+def test_read_binary_json_qubo_result() -> None:
+    example_solution = np.array(
+        [((0, 1, 1), -1, 6), ((1, 1, 1), -1, 4)],
+        dtype=[("solution", "i1", (3,)), ("energy", "<f8"), ("num_occurrences", "<i8")],
+    )
+    json_dict = {
+        "solution": applications_superstaq.converters.serialize(example_solution),
+    }
+    result = applications_superstaq.qubo.read_json_qubo_result(json_dict)
+    assert isinstance(result, np.recarray)
+    assert not result.flags.writeable
+    np.testing.assert_array_equal(result.energy, [-1, -1])
+    np.testing.assert_array_equal(result.solution, [[0, 1, 1], [1, 1, 1]])
+
+
+def test_iter_json_qubo_result() -> None:
+    example_solution = np.array(
+        [((i % 2, 1, 1), -1, i) for i in range(10)],
+        dtype=[("solution", "i1", (3,)), ("energy", "<f8"), ("num_occurrences", "<i8")],
+    )
+    body = json.dumps(
+        {"solution": applications_superstaq.converters.serialize(example_solution), "other": 1}
+    ).encode()
+    chunks = [body[start:][:7] for start in range(0, len(body), 7)]
+    batches = list(applications_superstaq.qubo.iter_json_qubo_result(chunks, batch_size=4))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert all(isinstance(batch, np.recarray) for batch in batches)
+    np.testing.assert_array_equal(np.concatenate(batches), example_solution)
+
+    async def aiter_chunks() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+    async def read() -> List[np.recarray]:
+        reader = applications_superstaq.qubo.aiter_json_qubo_result(aiter_chunks(), batch_size=4)
+        return [batch async for batch in reader]
+
+    batches = asyncio.run(read())
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    np.testing.assert_array_equal(np.concatenate(batches), example_solution)
+
 
 def test_convert_qubo_to_model() -> None:
     example_qubo = qv.QUBO({(0,): 1.0, (1,): 1.0, (0, 1): -2.0})
@@ -25,3 +83,312 @@ def test_convert_qubo_to_model() -> None:
         {"keys": ["0", "1"], "value": -2.0},
     ]
     assert applications_superstaq.qubo.convert_qubo_to_model(example_qubo) == qubo_model
+
+
+def test_convert_qubo_to_columnar_model() -> None:
+    example_qubo = qv.QUBO({(0,): 1.0, ("x",): 1.0, (0, "x"): -2.0, (): 3.0})
+    model = applications_superstaq.qubo.convert_qubo_to_columnar_model(example_qubo)
+    assert model == {
+        "format": "columnar",
+        "variables": ["0", "x"],
+        "row": [0, 1, 0, -1],
+        "col": [0, 1, 1, -1],
+        "value": [1.0, 1.0, -2.0, 3.0],
+    }
+    assert applications_superstaq.qubo.convert_model_to_qubo(model) == qv.QUBO(
+        {("0",): 1.0, ("x",): 1.0, ("0", "x"): -2.0, (): 3.0}
+    )
+
+    empty_model = applications_superstaq.qubo.convert_qubo_to_columnar_model(qv.QUBO())
+    assert applications_superstaq.qubo.convert_model_to_qubo(empty_model) == qv.QUBO()
+
+    streamed_model = applications_superstaq.qubo.convert_qubo_to_columnar_model(
+        example_qubo, stream=True
+    )
+    assert isinstance(streamed_model["row"], applications_superstaq.json_stream.JsonArray)
+    assert json.loads(b"".join(applications_superstaq.json_stream.iter_json(streamed_model))) == (
+        model
+    )
+
+
+def test_stream_qubo_model() -> None:
+    example_qubo = qv.QUBO({(0,): 1.0, (0, "x"): -2.0})
+    model = applications_superstaq.qubo.stream_qubo_model(example_qubo)
+    assert model.to_list() == applications_superstaq.qubo.convert_qubo_to_model(example_qubo)
+
+
+def test_convert_model_to_qubo() -> None:
+    qubo_model = [
+        {"keys": ["0"], "value": 1.0},
+        {"keys": ["1"], "value": 1.0},
+        {"keys": ["0", "1"], "value": -2.0},
+    ]
+    assert applications_superstaq.qubo.convert_model_to_qubo(qubo_model) == qv.QUBO(
+        {("0",): 1.0, ("1",): 1.0, ("0", "1"): -2.0}
+    )
+
+
+class _Output(applications_superstaq.qubo.QUBOOutput):
+    __slots__ = ("value",)
+
+    def __init__(self, value: float, qubo: Optional[qv.QUBO] = None, model: Any = None):
+        self.value = value
+        super().__init__(qubo, model)
+
+
+def test_qubo_output() -> None:
+    example_qubo = qv.QUBO({("0",): 1.0, ("0", "1"): -2.0})
+    model = applications_superstaq.qubo.convert_qubo_to_model(example_qubo)
+    with mock.patch(
+        "applications_superstaq.qubo.convert_model_to_qubo",
+        wraps=applications_superstaq.qubo.convert_model_to_qubo,
+    ) as mock_convert:
+        output = _Output(1.0, model=model)
+        assert repr(output) == "_Output(value=1.0)"
+        mock_convert.assert_not_called()
+
+        assert output.qubo == example_qubo
+        assert output.qubo is output.qubo
+        mock_convert.assert_called_once_with(model)
+
+    assert output == _Output(1.0, example_qubo)
+    assert output != _Output(2.0, example_qubo)
+    assert output != _Output(1.0, qv.QUBO({("0",): 1.0}))
+    assert output != 1.0
+    assert not hasattr(output, "__dict__")
+
+    with pytest.raises(AssertionError, match="either a QUBO or its model"):
+        _ = _Output(1.0)
+    with pytest.raises(AssertionError, match="either a QUBO or its model"):
+        _ = _Output(1.0, example_qubo, model)
+
+
+def test_convert_matrix_to_columnar_model() -> None:
+    matrix = np.array([[1.0, -1.0, 0.0], [-1.0, 0.0, 2.0], [0.0, 0.0, 3.0]])
+    expected_model = {
+        "format": "columnar",
+        "variables": ["0", "1", "2"],
+        "row": [0, 0, 1, 2],
+        "col": [0, 1, 2, 2],
+        "value": [1.0, -2.0, 2.0, 3.0],
+    }
+    assert applications_superstaq.qubo.convert_matrix_to_columnar_model(matrix) == expected_model
+    for sparse_matrix in (scipy.sparse.csr_matrix(matrix), scipy.sparse.coo_array(matrix)):
+        model = applications_superstaq.qubo.convert_to_columnar_model(sparse_matrix)
+        assert model == expected_model
+
+    model = applications_superstaq.qubo.convert_matrix_to_columnar_model(matrix, ["a", "b", "c"])
+    assert model["variables"] == ["a", "b", "c"]
+    assert applications_superstaq.qubo.convert_model_to_qubo(model) == qv.QUBO(
+        {("a",): 1.0, ("a", "b"): -2.0, ("b", "c"): 2.0, ("c",): 3.0}
+    )
+
+    with pytest.raises(AssertionError, match="square"):
+        _ = applications_superstaq.qubo.convert_matrix_to_columnar_model(np.zeros((2, 3)))
+    with pytest.raises(AssertionError, match="one variable per row"):
+        _ = applications_superstaq.qubo.convert_matrix_to_columnar_model(matrix, ["a"])
+
+
+def test_convert_model_to_sparse_qubo() -> None:
+    qubo = qv.QUBO({(0,): 1.0, ("x",): 1.0, (0, "x"): -2.0, (): 3.0})
+    for model in (
+        applications_superstaq.qubo.convert_qubo_to_columnar_model(qubo),
+        applications_superstaq.qubo.convert_qubo_to_model(qubo),
+    ):
+        sparse_qubo = applications_superstaq.qubo.convert_model_to_qubo(model, sparse=True)
+        assert isinstance(sparse_qubo, applications_superstaq.qubo.SparseQUBO)
+        assert sparse_qubo.variables == ["0", "x"]
+        assert sparse_qubo.offset == 3.0
+        np.testing.assert_array_equal(sparse_qubo.matrix.toarray(), [[1.0, -2.0], [0.0, 1.0]])
+
+
+def test_convert_to_sparse_qubo() -> None:
+    qubo = qv.QUBO({(0,): 1.0, ("x",): 1.0, (0, "x"): -2.0, (): 3.0})
+    sparse_qubo = applications_superstaq.qubo.convert_to_sparse_qubo(qubo)
+    assert sparse_qubo.variables == [0, "x"]
+    assert applications_superstaq.qubo.convert_to_sparse_qubo(sparse_qubo) is sparse_qubo
+
+    reordered = applications_superstaq.qubo.convert_to_sparse_qubo(qubo, ["y", "x", 0])
+    assert reordered.variables == ["y", "x", 0]
+    assert reordered.offset == 3.0
+    np.testing.assert_array_equal(
+        reordered.matrix.toarray(), [[0.0, 0.0, 0.0], [0.0, 1.0, -2.0], [0.0, 0.0, 1.0]]
+    )
+    with pytest.raises(ValueError, match=r"\['x'\] of the QUBO are missing"):
+        _ = applications_superstaq.qubo.convert_to_sparse_qubo(qubo, [0, "y"])
+
+    model = applications_superstaq.qubo.convert_qubo_to_columnar_model(qubo)
+    assert applications_superstaq.qubo.convert_to_sparse_qubo(model).variables == ["0", "x"]
+
+    matrix = np.array([[1.0, -1.0], [-1.0, 1.0]])
+    sparse_qubo = applications_superstaq.qubo.convert_to_sparse_qubo(matrix)
+    assert sparse_qubo.variables == [0, 1]
+    np.testing.assert_array_equal(sparse_qubo.matrix.toarray(), [[1.0, -2.0], [0.0, 1.0]])
+    sparse_qubo = applications_superstaq.qubo.convert_to_sparse_qubo(matrix, ["a", "b"])
+    assert sparse_qubo.variables == ["a", "b"]
+    with pytest.raises(AssertionError, match="one variable per row"):
+        _ = applications_superstaq.qubo.convert_to_sparse_qubo(matrix, ["a"])
+
+
+def test_evaluate_energies() -> None:
+    qubo = qv.QUBO({(0,): 1.0, (1,): -1.5, (0, 1): -2.0, (1, 2): 0.5, (): 3.0})
+    rng = np.random.default_rng(0)
+    samples = rng.integers(0, 2, size=(50, 3))
+    expected = [qubo.value(dict(enumerate(sample))) for sample in samples.tolist()]
+
+    energies = applications_superstaq.qubo.evaluate_energies(qubo, samples)
+    np.testing.assert_allclose(energies, expected)
+    np.testing.assert_allclose(
+        applications_superstaq.qubo.evaluate_energies(qubo, samples, chunk_size=7), expected
+    )
+    np.testing.assert_allclose(
+        applications_superstaq.qubo.evaluate_energies(
+            applications_superstaq.qubo.convert_qubo_to_columnar_model(qubo),
+            samples,
+            variables=["0", "1", "2"],
+        ),
+        expected,
+    )
+
+    # Samples can also be given as an iterable of chunks, with columns in any order.
+    chunks = (chunk[:, ::-1] for chunk in np.array_split(samples, 3))
+    energies = applications_superstaq.qubo.evaluate_energies(qubo, chunks, variables=[2, 1, 0])
+    np.testing.assert_allclose(energies, expected)
+
+    assert applications_superstaq.qubo.evaluate_energies(qubo, []).shape == (0,)
+    with pytest.raises(AssertionError, match="2-D"):
+        _ = applications_superstaq.qubo.evaluate_energies(qubo, np.zeros(3))
+    with pytest.raises(AssertionError, match="one column per variable"):
+        _ = applications_superstaq.qubo.evaluate_energies(qubo, np.zeros((1, 2)))
+    with pytest.raises(AssertionError, match="at least one sample"):
+        _ = applications_superstaq.qubo.evaluate_energies(qubo, samples, chunk_size=0)
+
+
+def test_evaluate_energies_memmap(tmp_path: os.PathLike) -> None:
+    matrix = scipy.sparse.random(30, 30, density=0.2, random_state=0)
+    samples = np.random.default_rng(0).integers(0, 2, size=(100, 30)).astype(np.int8)
+    path = os.path.join(tmp_path, "samples.ssqb")
+    applications_superstaq.converters.encode_to_file(samples, path)
+
+    energies = applications_superstaq.qubo.evaluate_energies(
+        matrix, applications_superstaq.converters.decode_file(path), chunk_size=16
+    )
+    dense = matrix.toarray()
+    np.testing.assert_allclose(energies, [sample @ dense @ sample for sample in samples])
+
+
+def _brute_force_result(qubo: applications_superstaq.qubo.SparseQUBO) -> np.recarray:
+    samples = np.array(list(itertools.product([0, 1], repeat=len(qubo.variables))))
+    result = np.empty(
+        len(samples), dtype=[("solution", "O"), ("energy", "<f8"), ("num_occurrences", "<i8")]
+    )
+    result["solution"] = [
+        {str(variable): value for variable, value in zip(qubo.variables, sample)}
+        for sample in samples.tolist()
+    ]
+    result["energy"] = applications_superstaq.qubo.evaluate_energies(qubo, samples)
+    result["num_occurrences"] = np.arange(len(samples)) + 1
+    return result.view(np.recarray)
+
+
+def test_presolve() -> None:
+    qubo = qv.QUBO(
+        {
+            ("a",): 2.0,  # Always 0.
+            ("b",): -2.0,  # Always 1.
+            ("a", "b"): 1.0,
+            ("c",): 1.0,
+            ("d",): 1.0,
+            ("c", "d"): -3.0,  # c and d are equal.
+            ("c", "e"): 2.0,
+            ("e",): -1.0,
+            ("x",): -1.0,
+            ("y",): -1.0,
+            ("z",): -1.0,
+            ("x", "y"): 1.5,
+            ("y", "z"): 1.5,
+            ("x", "z"): 1.5,
+            (): 1.0,
+        }
+    )
+    presolved = applications_superstaq.qubo.presolve(qubo)
+    variables = presolved.qubo.variables
+    assert {variables[i]: value for i, value in presolved.fixed.items()} == {"a": 0, "b": 1}
+    assert {variables[i]: variables[j] for i, j in presolved.merged.items()} == {"d": "c"}
+    assert sorted(component.variables for component in presolved.components) == [
+        ["c", "e"],
+        ["x", "y", "z"],
+    ]
+    assert presolved.offset == -1.0
+
+    results = [_brute_force_result(component) for component in presolved.components]
+    solutions = applications_superstaq.qubo.reconstruct_solutions(presolved, results)
+    assert isinstance(solutions, np.recarray)
+    assert len(solutions) == 8
+    best = solutions[np.argmin(solutions.energy)]
+    assert best.energy == min(
+        qubo.value(dict(zip(qubo.variables, sample)))
+        for sample in itertools.product([0, 1], repeat=qubo.num_binary_variables)
+    )
+    assert best.solution["a"] == 0 and best.solution["b"] == 1
+    assert best.solution["c"] == best.solution["d"]
+    for solution, energy in zip(solutions.solution, solutions.energy):
+        assert qubo.value(solution) == pytest.approx(energy)
+    assert all(solutions.num_occurrences <= 8)
+
+
+def test_presolve_random_qubos() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        num_variables = rng.integers(1, 8)
+        matrix = rng.normal(size=(num_variables, num_variables))
+        matrix *= rng.random((num_variables, num_variables)) < 0.4
+        matrix[0, 1:] -= 5
+        presolved = applications_superstaq.qubo.presolve(matrix)
+        results = [_brute_force_result(component) for component in presolved.components]
+        solutions = applications_superstaq.qubo.reconstruct_solutions(presolved, results)
+
+        samples = np.array(list(itertools.product([0, 1], repeat=int(num_variables))))
+        optimum = applications_superstaq.qubo.evaluate_energies(matrix, samples).min()
+        assert solutions.energy.min() == pytest.approx(optimum)
+
+
+def test_presolve_merge_chain() -> None:
+    # Merging 3 into 1 cancels the coupling between 0 and 1; 1 is then merged into 2 (and fixed).
+    matrix = np.array([[0, 1, 0, -1], [0, 2, -2, -3], [0, 0, 3, -2], [0, 0, 0, 3]], dtype=float)
+    presolved = applications_superstaq.qubo.presolve(matrix)
+    assert presolved.merged == {3: 1, 1: 2}
+    assert presolved.fixed == {2: 0}
+
+    results = [_brute_force_result(component) for component in presolved.components]
+    solutions = applications_superstaq.qubo.reconstruct_solutions(presolved, results)
+    assert [solution[3] for solution in solutions.solution] == [0, 0]
+    np.testing.assert_array_equal(solutions.energy, [0.0, 0.0])
+
+
+def test_presolve_fixes_everything() -> None:
+    qubo = qv.QUBO({(0,): 1.0, (1,): -1.0, (0, 1): 0.5, (): 2.0})
+    presolved = applications_superstaq.qubo.presolve(qubo)
+    assert presolved.fixed == {0: 0, 1: 1}
+    assert not presolved.components
+
+    solutions = applications_superstaq.qubo.reconstruct_solutions(presolved, [])
+    assert solutions.solution.tolist() == [{0: 0, 1: 1}]
+    assert solutions.energy.tolist() == [1.0]
+    assert solutions.num_occurrences.tolist() == [1]
+
+    with pytest.raises(AssertionError, match="one result per component"):
+        _ = applications_superstaq.qubo.reconstruct_solutions(presolved, [solutions])
+
+
+def test_reconstruct_array_solutions() -> None:
+    matrix = np.array([[-1.0, 2.0], [0.0, -1.0]])
+    presolved = applications_superstaq.qubo.presolve(matrix)
+    (component,) = presolved.components
+    result = np.rec.fromrecords(
+        [((0, 1), -1.0, 3), ((1, 0), -1.0, 2)],
+        dtype=[("solution", "i1", (2,)), ("energy", "<f8"), ("num_occurrences", "<i8")],
+    )
+    solutions = applications_superstaq.qubo.reconstruct_solutions(presolved, [result])
+    assert solutions.solution.tolist() == [{0: 0, 1: 1}, {0: 1, 1: 0}]
+    assert solutions.energy.tolist() == [-1.0, -1.0]
@@ -0,0 +1,211 @@
+"""Limits the rate and concurrency of requests to SuperstaQ's API."""
+
+import asyncio
+import contextlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+
+@dataclass(frozen=True)
+class Limit:
+    """A limit on the requests sent to (a group of) endpoints.
+
+    Attributes:
+        rate: The sustained number of requests per second, or None for no limit.
+        burst: The number of requests which can be sent at once after a pause (i.e. the capacity of
+            the token bucket).
+        max_in_flight: The maximum number of requests awaiting a response at once, or None for no
+            limit.
+    """
+
+    rate: Optional[float] = None
+    burst: int = 1
+    max_in_flight: Optional[int] = None
+
+
+@dataclass
+class LimiterStats:
+    """Counts of the requests governed by one `Limit` (since the `RateLimiter` was created).
+
+    Attributes:
+        requests: The number of requests sent.
+        queued_requests: The number of requests which had to wait before being sent.
+        queued_seconds: The total time requests waited before being sent.
+        max_queued_seconds: The longest time any request waited before being sent.
+    """
+
+    requests: int = 0
+    queued_requests: int = 0
+    queued_seconds: float = 0.0
+    max_queued_seconds: float = 0.0
+
+
+class _Governor:
+    """Enforces a single `Limit`, with a token bucket and a count of requests in flight."""
+
+    def __init__(self, limit: Limit):
+        assert limit.rate is None or limit.rate > 0, "Request rates must be positive."
+        assert limit.burst >= 1, "Bursts must allow at least one request."
+        assert limit.max_in_flight is None or limit.max_in_flight >= 1, "Limits cannot be empty."
+        self.limit = limit
+        self.stats = LimiterStats()
+        self._condition = threading.Condition()
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self._in_flight = 0
+
+    def try_enter(self) -> bool:
+        """Starts a request if fewer than `max_in_flight` requests are in flight."""
+        with self._condition:
+            if self.limit.max_in_flight is not None and self._in_flight >= self.limit.max_in_flight:
+                return False
+            self._in_flight += 1
+            return True
+
+    def enter(self) -> bool:
+        """Waits until fewer than `max_in_flight` requests are in flight, and starts a request.
+
+        Returns:
+            Whether the request had to wait.
+        """
+        with self._condition:
+            waited = False
+            while not self.try_enter():
+                self._condition.wait()
+                waited = True
+            return waited
+
+    def exit(self) -> None:
+        """Finishes a request started with `enter` or `try_enter`."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def reserve(self) -> float:
+        """Takes a token from the bucket, returning how long to wait until it is available.
+
+        Tokens are reserved even if they are not available yet (i.e. the bucket can go into debt),
+        so that waiting requests are sent in the order they reserved their tokens.
+        """
+        if self.limit.rate is None:
+            return 0.0
+        with self._condition:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self._tokens + elapsed * self.limit.rate, self.limit.burst) - 1
+            self._updated = now
+            return max(-self._tokens / self.limit.rate, 0.0)
+
+    def record(self, queued_seconds: Optional[float]) -> None:
+        """Counts a request, which waited for `queued_seconds` (or None if it didn't wait)."""
+        with self._condition:
+            self.stats.requests += 1
+            if queued_seconds is not None:
+                self.stats.queued_requests += 1
+                self.stats.queued_seconds += queued_seconds
+                self.stats.max_queued_seconds = max(self.stats.max_queued_seconds, queued_seconds)
+
+
+class RateLimiter:
+    """A token-bucket rate limiter and concurrency limit for API requests.
+
+    Every request is subject to the default limit, and to the limit of the longest endpoint prefix
+    it matches (if any). For example, with `endpoints={"/job/": Limit(rate=5)}` requests polling
+    jobs are limited to 5 per second (on top of the default limit).
+
+    A single RateLimiter can be shared by any number of clients, threads and event loops (e.g. by a
+    `_SuperstaQClient` and an `AsyncSuperstaQClient`), to keep all of their requests within what
+    the server accepts. The time requests spend waiting is recorded for each limit (see `stats`).
+    """
+
+    # The longest time (in seconds) asynchronous requests sleep between checking for a free slot.
+    MAX_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        max_in_flight: Optional[int] = None,
+        endpoints: Optional[Dict[str, Limit]] = None,
+    ):
+        """Creates a RateLimiter.
+
+        Args:
+            rate: The sustained number of requests per second (to all endpoints), or None for no
+                limit.
+            burst: The number of requests which can be sent at once after a pause.
+            max_in_flight: The maximum number of requests awaiting a response at once, or None for
+                no limit.
+            endpoints: Additional limits on the requests to endpoints starting with each prefix.
+        """
+        self._governors = {"": _Governor(Limit(rate, burst, max_in_flight))}
+        for prefix, limit in (endpoints or {}).items():
+            assert prefix, "Use the default limit to limit requests to all endpoints."
+            self._governors[prefix] = _Governor(limit)
+
+    def stats(self) -> Dict[str, LimiterStats]:
+        """Returns a snapshot of the statistics of each limit, by endpoint prefix ("" for the
+        default limit)."""
+        return {prefix: LimiterStats(**vars(gov.stats)) for prefix, gov in self._governors.items()}
+
+    def _governors_for(self, endpoint: str) -> List[_Governor]:
+        governors = [self._governors[""]]
+        prefixes = [prefix for prefix in self._governors if prefix and endpoint.startswith(prefix)]
+        if prefixes:
+            governors.append(self._governors[max(prefixes, key=len)])
+        return governors
+
+    @contextlib.contextmanager
+    def limit(self, endpoint: str) -> Iterator[None]:
+        """Waits until a request to `endpoint` may be sent, and counts it as in flight until exit.
+
+        Args:
+            endpoint: The endpoint the request is sent to.
+        """
+        start = time.monotonic()
+        entered: List[_Governor] = []
+        waited = False
+        try:
+            for governor in self._governors_for(endpoint):
+                waited |= governor.enter()
+                entered.append(governor)
+            delay = max(governor.reserve() for governor in entered)
+            if delay > 0:
+                time.sleep(delay)
+            self._record(entered, start, waited or delay > 0)
+            yield
+        finally:
+            for governor in entered:
+                governor.exit()
+
+    @contextlib.asynccontextmanager
+    async def limit_async(self, endpoint: str) -> AsyncIterator[None]:
+        """Waits (without blocking the event loop) until a request to `endpoint` may be sent, and
+        counts it as in flight until exit (see `limit`)."""
+        start = time.monotonic()
+        entered: List[_Governor] = []
+        waited = False
+        try:
+            for governor in self._governors_for(endpoint):
+                poll_interval = 0.001
+                while not governor.try_enter():
+                    waited = True
+                    await asyncio.sleep(poll_interval)
+                    poll_interval = min(2 * poll_interval, self.MAX_POLL_INTERVAL)
+                entered.append(governor)
+            delay = max(governor.reserve() for governor in entered)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._record(entered, start, waited or delay > 0)
+            yield
+        finally:
+            for governor in entered:
+                governor.exit()
+
+    @staticmethod
+    def _record(governors: List[_Governor], start: float, waited: bool) -> None:
+        queued_seconds = time.monotonic() - start if waited else None
+        for governor in governors:
+            governor.record(queued_seconds)
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from applications_superstaq.rate_limiter import Limit, LimiterStats, RateLimiter
+
+
+def test_token_bucket() -> None:
+    limiter = RateLimiter(rate=10.0, burst=2)
+    with mock.patch("time.monotonic", return_value=100.0), mock.patch("time.sleep") as mock_sleep:
+        limiter._governors[""]._updated = 100.0
+        for _ in range(4):
+            with limiter.limit("/jobs"):
+                pass
+    # The first two requests use up the burst, and the others wait for a token each.
+    assert [call.args[0] for call in mock_sleep.call_args_list] == pytest.approx([0.1, 0.2])
+
+    # Tokens refill over time (up to the burst).
+    with mock.patch("time.monotonic", return_value=110.0), mock.patch("time.sleep") as mock_sleep:
+        for _ in range(3):
+            with limiter.limit("/jobs"):
+                pass
+    mock_sleep.assert_called_once_with(pytest.approx(0.1))
+
+
+def test_endpoint_limits() -> None:
+    limiter = RateLimiter(
+        max_in_flight=10,
+        endpoints={"/job/": Limit(rate=1.0), "/job/slow": Limit(max_in_flight=1)},
+    )
+    with mock.patch("time.sleep"):
+        with limiter.limit("/job/abc"):
+            pass
+        with limiter.limit("/job/slow"):
+            pass
+        with limiter.limit("/jobs"):
+            pass
+
+    stats = limiter.stats()
+    assert stats[""].requests == 3
+    assert stats["/job/"].requests == 1
+    assert stats["/job/slow"].requests == 1
+
+    with pytest.raises(AssertionError, match="default limit"):
+        RateLimiter(endpoints={"": Limit(rate=1.0)})
+    with pytest.raises(AssertionError, match="positive"):
+        RateLimiter(rate=0.0)
+    with pytest.raises(AssertionError, match="Bursts"):
+        RateLimiter(burst=0)
+    with pytest.raises(AssertionError, match="empty"):
+        RateLimiter(max_in_flight=0)
+
+
+def test_max_in_flight() -> None:
+    limiter = RateLimiter(max_in_flight=2)
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def request() -> None:
+        nonlocal in_flight, max_in_flight
+        with limiter.limit("/jobs"):
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max_in_flight == 2
+    stats = limiter.stats()[""]
+    assert stats.requests == 6
+    assert stats.queued_requests >= 4
+    assert 0 < stats.max_queued_seconds <= stats.queued_seconds
+
+
+def test_limit_async() -> None:
+    limiter = RateLimiter(max_in_flight=1, endpoints={"/jobs": Limit(max_in_flight=1)})
+    in_flight = 0
+    max_in_flight = 0
+
+    async def request() -> None:
+        nonlocal in_flight, max_in_flight
+        async with limiter.limit_async("/jobs"):
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def run() -> None:
+        await asyncio.gather(*(request() for _ in range(3)))
+
+    asyncio.run(run())
+    assert max_in_flight == 1
+    assert limiter.stats()["/jobs"].requests == 3
+    assert limiter.stats()[""].queued_requests == 2
+
+
+def test_limit_async_rate() -> None:
+    limiter = RateLimiter(rate=10.0)
+
+    async def run() -> None:
+        for _ in range(2):
+            async with limiter.limit_async("/jobs"):
+                pass
+
+    with mock.patch("asyncio.sleep", new_callable=mock.AsyncMock) as mock_sleep:
+        asyncio.run(run())
+    mock_sleep.assert_awaited_once_with(pytest.approx(0.1, abs=0.01))
+    assert limiter.stats()[""].queued_requests == 1
+
+
+def test_limit_releases_on_error() -> None:
+    limiter = RateLimiter(max_in_flight=1)
+    with pytest.raises(ValueError):
+        with limiter.limit("/jobs"):
+            raise ValueError()
+    with limiter.limit("/jobs"):
+        pass
+    assert limiter.stats()[""] == LimiterStats(requests=2)
@@ -0,0 +1,210 @@
+"""Caches the results of deterministic SuperstaQ endpoints, in memory and (optionally) on disk."""
+
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+import applications_superstaq
+
+# How long (in seconds) results stay valid. Portfolio optimizations depend on the latest price data,
+# so are refreshed daily; routing problems only change when the maps do.
+DEFAULT_TTLS = {
+    "/minvol": 24 * 3600.0,
+    "/minvol_frontier": 24 * 3600.0,
+    "/maxsharpe": 24 * 3600.0,
+    "/tsp": 7 * 24 * 3600.0,
+    "/warehouse": 7 * 24 * 3600.0,
+}
+
+
+@dataclass
+class CacheStats:
+    """Counts of lookups in a `ResultCache` (since it was created)."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    # Results evicted (to make room for others) from memory, and from disk.
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+
+class ResultCache:
+    """A two-tier cache of API results, keyed by a hash of the request.
+
+    Results are kept in an in-memory LRU cache of up to `max_entries` results, backed by an
+    (optional) SQLite database on disk of up to `max_disk_bytes`, from which the least recently used
+    results are evicted first. Each result expires after the TTL of its endpoint, after which it is
+    requested again.
+
+    Results are stored as JSON text, so every lookup returns a fresh copy of the result. A cache may
+    be shared by any number of clients (and threads), and its database by any number of processes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        path: Optional[Union[str, "os.PathLike[str]"]] = None,
+        max_disk_bytes: int = 2**30,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 3600.0,
+    ):
+        """Creates a ResultCache.
+
+        Args:
+            max_entries: The maximum number of results to keep in memory.
+            path: The path of the SQLite database to store results in, or None to only keep them in
+                memory. The database is created if it does not exist.
+            max_disk_bytes: The maximum total size of the results stored in the database.
+            ttls: The time (in seconds) results of each endpoint stay valid, overriding
+                `DEFAULT_TTLS`.
+            default_ttl: The time (in seconds) results of any other endpoint stay valid.
+        """
+        assert max_entries >= 0 and max_disk_bytes >= 0, "Cache sizes cannot be negative."
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+
+        self._lock = threading.Lock()
+        self._memory: "collections.OrderedDict[str, Tuple[float, str]]" = collections.OrderedDict()
+        self._database: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._database = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._database.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, expires REAL, accessed REAL, size INTEGER, value TEXT)"
+            )
+
+    @staticmethod
+    def key(url: str, endpoint: str, json_dict: Dict[str, Any]) -> str:
+        """Returns the cache key of a request.
+
+        Args:
+            url: The versioned base url of the API (e.g. "https://superstaq.super.tech/v0.1.0").
+            endpoint: The endpoint the request is sent to.
+            json_dict: The json body of the request (which may contain NumPy arrays and scalars).
+
+        Returns:
+            A hash of the canonical (i.e. key-sorted, compact) JSON encoding of the request.
+        """
+        request = {"url": url, "endpoint": endpoint, "body": json_dict}
+        canonical = json.dumps(
+            request,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=applications_superstaq.json_backend.encode_numpy,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Looks up a result.
+
+        Args:
+            key: The cache key of the request (see `ResultCache.key`).
+
+        Returns:
+            A copy of the cached result, or None if there is no valid result cached.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return json.loads(entry[1])
+            self._memory.pop(key, None)
+
+            entry = self._get_from_disk(key, now)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+            self._put_in_memory(key, *entry)
+            return json.loads(entry[1])
+
+    def put(self, key: str, endpoint: str, result: dict) -> None:
+        """Stores a result (replacing any result already cached for the same request).
+
+        Args:
+            key: The cache key of the request (see `ResultCache.key`).
+            endpoint: The endpoint the request was sent to, which determines the result's TTL.
+            result: The json body of the response.
+        """
+        expires = time.time() + self.ttls.get(endpoint, self.default_ttl)
+        value = json.dumps(result)
+        with self._lock:
+            self._put_in_memory(key, expires, value)
+            self._put_on_disk(key, expires, value)
+
+    def clear(self) -> None:
+        """Removes every result from the cache (including the database)."""
+        with self._lock:
+            self._memory.clear()
+            if self._database is not None:
+                self._database.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Closes the database (if any). Results are then only cached in memory."""
+        with self._lock:
+            if self._database is not None:
+                self._database.close()
+                self._database = None
+
+    def _put_in_memory(self, key: str, expires: float, value: str) -> None:
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.memory_evictions += 1
+
+    def _get_from_disk(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        if self._database is None:
+            return None
+        row = self._database.execute(
+            "SELECT expires, value FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[0] <= now:
+            self._database.execute("DELETE FROM results WHERE key = ?", (key,))
+            return None
+        self._database.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        return row
+
+    def _put_on_disk(self, key: str, expires: float, value: str) -> None:
+        if self._database is None:
+            return
+        now = time.time()
+        size = len(value.encode())
+        self._database.execute("DELETE FROM results WHERE expires <= ?", (now,))
+        self._database.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+            (key, expires, now, size, value),
+        )
+
+        # Evict the least recently used results until the rest fit.
+        (total,) = self._database.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        if total <= self.max_disk_bytes:
+            return
+        evicted = []
+        for evicted_key, evicted_size in self._database.execute(
+            "SELECT key, size FROM results ORDER BY accessed"
+        ).fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            evicted.append((evicted_key,))
+            total -= evicted_size
+        self._database.executemany("DELETE FROM results WHERE key = ?", evicted)
+        self.stats.disk_evictions += len(evicted)
@@ -0,0 +1,123 @@
+import threading
+import time
+from unittest import mock
+
+import numpy as np
+
+import applications_superstaq
+from applications_superstaq.result_cache import CacheStats, ResultCache
+
+URL = "http://example.com/v0.1.0"
+
+
+def test_key() -> None:
+    key = ResultCache.key(URL, "/tsp", {"locs": ["a", "b"], "solver": "anneal"})
+    assert key == ResultCache.key(URL, "/tsp", {"solver": "anneal", "locs": ["a", "b"]})
+    assert key != ResultCache.key(URL, "/tsp", {"locs": ["b", "a"], "solver": "anneal"})
+    assert key != ResultCache.key(URL, "/warehouse", {"locs": ["a", "b"], "solver": "anneal"})
+    assert key != ResultCache.key(
+        "http://example.com/v0.2.0", "/tsp", {"locs": ["a", "b"], "solver": "anneal"}
+    )
+
+    # NumPy values are keyed like the equivalent lists and numbers.
+    assert ResultCache.key(URL, "/minvol", {"k": np.int64(2), "w": np.array([0.5, 1.0])}) == (
+        ResultCache.key(URL, "/minvol", {"k": 2, "w": [0.5, 1.0]})
+    )
+
+
+def test_memory_cache() -> None:
+    cache = ResultCache(max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", "/tsp", {"route": ["x"]})
+    cache.put("b", "/tsp", {"route": ["y"]})
+
+    result = cache.get("a")
+    assert result == {"route": ["x"]}
+    result["route"].append("z")
+    assert cache.get("a") == {"route": ["x"]}
+
+    # "b" is now the least recently used result.
+    cache.put("c", "/tsp", {"route": ["z"]})
+    assert cache.get("b") is None
+    assert cache.get("c") == {"route": ["z"]}
+    assert cache.stats == CacheStats(memory_hits=3, misses=2, memory_evictions=1)
+    assert cache.stats.hits == 3
+
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_ttls() -> None:
+    cache = ResultCache(ttls={"/tsp": 10.0}, default_ttl=5.0)
+    assert cache.ttls["/minvol"] == applications_superstaq.result_cache.DEFAULT_TTLS["/minvol"]
+    with mock.patch("time.time", return_value=100.0):
+        cache.put("tsp", "/tsp", {"foo": "bar"})
+        cache.put("other", "/other", {"foo": "bar"})
+    with mock.patch("time.time", return_value=107.0):
+        assert cache.get("tsp") == {"foo": "bar"}
+        assert cache.get("other") is None
+    with mock.patch("time.time", return_value=110.0):
+        assert cache.get("tsp") is None
+
+
+def test_disk_cache(tmp_path: str) -> None:
+    path = f"{tmp_path}/cache.sqlite"
+    cache = ResultCache(max_entries=1, path=path)
+    cache.put("a", "/minvol", {"best_ret": 1.0})
+    cache.put("b", "/minvol", {"best_ret": 2.0})
+    assert cache.get("a") == {"best_ret": 1.0}
+    assert cache.get("a") == {"best_ret": 1.0}
+    assert cache.stats == CacheStats(memory_hits=1, disk_hits=1, memory_evictions=2)
+    cache.close()
+    cache.close()
+
+    # Results persist across caches (and processes).
+    cache = ResultCache(path=path)
+    assert cache.get("b") == {"best_ret": 2.0}
+    assert cache.stats.disk_hits == 1
+    cache.clear()
+    assert cache.get("a") is None
+    cache.close()
+
+
+def test_disk_cache_expiry(tmp_path: str) -> None:
+    cache = ResultCache(max_entries=0, path=f"{tmp_path}/cache.sqlite", default_ttl=5.0)
+    with mock.patch("time.time", return_value=100.0):
+        cache.put("a", "/other", {"foo": "bar"})
+    with mock.patch("time.time", return_value=110.0):
+        assert cache.get("a") is None
+    assert cache.stats.misses == 1
+
+
+def test_disk_cache_eviction(tmp_path: str) -> None:
+    result = {"route": ["x" * 100]}
+    cache = ResultCache(max_entries=0, path=f"{tmp_path}/cache.sqlite", max_disk_bytes=250)
+    now = time.time()
+    for offset, key in enumerate("ab"):
+        with mock.patch("time.time", return_value=now + offset):
+            cache.put(key, "/tsp", result)
+    with mock.patch("time.time", return_value=now + 2):
+        assert cache.get("a") == result
+    with mock.patch("time.time", return_value=now + 3):
+        cache.put("c", "/tsp", result)
+
+    # "b" was the least recently used result.
+    assert cache.get("b") is None
+    assert cache.get("a") == cache.get("c") == result
+    assert cache.stats.disk_evictions == 1
+
+
+def test_threads(tmp_path: str) -> None:
+    cache = ResultCache(max_entries=10, path=f"{tmp_path}/cache.sqlite")
+
+    def run(index: int) -> None:
+        for i in range(20):
+            cache.put(f"{index}-{i}", "/tsp", {"i": i})
+            assert cache.get(f"{index}-{i}") == {"i": i}
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats.hits == 80
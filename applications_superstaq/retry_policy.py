@@ -0,0 +1,142 @@
+"""Decides which failed requests to SuperstaQ's API are retried, and when."""
+
+import datetime
+import email.utils
+import random
+from typing import Collection, Iterator, Optional
+
+# Responses which indicate a temporary problem, so that the same request may well succeed later: Too
+# Many Requests, Bad Gateway, Service Unavailable and Gateway Timeout.
+RETRIABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Responses which indicate the server refused the request without processing it, so that even
+# requests which are not idempotent can safely be retried: Too Many Requests and Service
+# Unavailable.
+UNPROCESSED_STATUS_CODES = frozenset({429, 503})
+
+JITTERS = (None, "full", "decorrelated")
+
+
+class RetryPolicy:
+    """Exponential backoff with (optional) jitter, for retrying failed requests.
+
+    Without jitter, the n-th retry waits `initial_delay * multiplier**n` seconds (up to
+    `max_delay`). So that many clients failing at the same time do not all retry in lockstep, the
+    delays can be randomized:
+
+    * "full" jitter waits a uniformly random time of up to the exponential delay.
+    * "decorrelated" jitter waits a uniformly random time between `initial_delay` and
+      `multiplier` times the previous delay (up to `max_delay`).
+
+    If the server asks clients to wait longer (with a `Retry-After` header), the longer delay is
+    used instead.
+
+    A request is only retried if it failed with one of the `retriable_status_codes` or a connection
+    error, and it is idempotent (i.e. it can safely be sent twice). Requests which are not
+    idempotent (e.g. creating jobs) are only retried if the server refused them without processing
+    them (i.e. with one of the `unprocessed_status_codes`).
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = 0.1,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: Optional[str] = "full",
+        retriable_status_codes: Collection[int] = RETRIABLE_STATUS_CODES,
+        unprocessed_status_codes: Collection[int] = UNPROCESSED_STATUS_CODES,
+        respect_retry_after: bool = True,
+        seed: Optional[int] = None,
+    ):
+        """Creates a RetryPolicy.
+
+        Args:
+            initial_delay: The time (in seconds) to wait before the first retry.
+            max_delay: The longest time (in seconds) to wait before any retry.
+            multiplier: The factor by which the delay grows with each retry.
+            jitter: How to randomize delays: "full", "decorrelated", or None for fixed delays.
+            retriable_status_codes: The http status codes of failed requests to retry.
+            unprocessed_status_codes: The http status codes of failed requests to retry even if
+                they are not idempotent.
+            respect_retry_after: Whether to wait (at least) as long as the server asks for with a
+                `Retry-After` header.
+            seed: A seed for the random delays, for reproducibility.
+        """
+        assert 0 < initial_delay <= max_delay, "Retry delays must be positive and ordered."
+        assert multiplier >= 1, "Retry delays cannot shrink."
+        assert jitter in JITTERS, f"Jitter can only be one of {JITTERS} but was {jitter}."
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retriable_status_codes = frozenset(retriable_status_codes)
+        self.unprocessed_status_codes = frozenset(unprocessed_status_codes)
+        self.respect_retry_after = respect_retry_after
+        self._random = random.Random(seed)
+
+    def is_retriable(self, status_code: Optional[int], idempotent: bool) -> bool:
+        """Checks whether a failed request should be retried.
+
+        Args:
+            status_code: The http status code of the failed response, or None if the request
+                failed without a response (e.g. with a connection error).
+            idempotent: Whether the request can safely be sent more than once.
+
+        Returns:
+            Whether the request may be retried.
+        """
+        if status_code is None:
+            return idempotent
+        if status_code in self.unprocessed_status_codes:
+            return True
+        return idempotent and status_code in self.retriable_status_codes
+
+    def delays(self) -> Iterator[float]:
+        """Returns the times (in seconds) to wait before each successive retry of a request."""
+        exponential = self.initial_delay
+        delay = self.initial_delay
+        while True:
+            if self.jitter == "full":
+                delay = self._random.uniform(0, exponential)
+            elif self.jitter == "decorrelated":
+                delay = self._random.uniform(self.initial_delay, delay * self.multiplier)
+            else:
+                delay = exponential
+            yield min(delay, self.max_delay)
+            exponential = min(exponential * self.multiplier, self.max_delay)
+
+    def retry_delay(self, delay: float, retry_after: Optional[str]) -> float:
+        """Returns how long to wait before retrying, given the `Retry-After` header (if any).
+
+        Args:
+            delay: The backoff delay (in seconds) of this retry (see `delays`).
+            retry_after: The value of the failed response's `Retry-After` header, which is either a
+                number of seconds or an http date.
+
+        Returns:
+            The longer of `delay` and the time requested by the server (if respected and valid).
+        """
+        if not self.respect_retry_after or retry_after is None:
+            return delay
+        try:
+            return max(delay, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return delay
+        now = datetime.datetime.now(retry_at.tzinfo)
+        return max(delay, (retry_at - now).total_seconds())
+
+    def __repr__(self) -> str:
+        return (
+            "applications_superstaq.retry_policy.RetryPolicy("
+            f"initial_delay={self.initial_delay!r}, "
+            f"max_delay={self.max_delay!r}, "
+            f"multiplier={self.multiplier!r}, "
+            f"jitter={self.jitter!r}, "
+            f"retriable_status_codes={sorted(self.retriable_status_codes)!r}, "
+            f"unprocessed_status_codes={sorted(self.unprocessed_status_codes)!r}, "
+            f"respect_retry_after={self.respect_retry_after!r})"
+        )
@@ -0,0 +1,73 @@
+import datetime
+import email.utils
+import itertools
+from typing import List
+
+import pytest
+import requests
+
+import applications_superstaq
+from applications_superstaq.retry_policy import RetryPolicy
+
+
+def _delays(policy: RetryPolicy, count: int) -> List[float]:
+    return list(itertools.islice(policy.delays(), count))
+
+
+def test_is_retriable() -> None:
+    policy = RetryPolicy()
+    assert policy.is_retriable(requests.codes.service_unavailable, idempotent=False)
+    assert policy.is_retriable(requests.codes.too_many_requests, idempotent=False)
+    assert not policy.is_retriable(requests.codes.bad_gateway, idempotent=False)
+    assert policy.is_retriable(requests.codes.bad_gateway, idempotent=True)
+    assert policy.is_retriable(requests.codes.gateway_timeout, idempotent=True)
+    assert not policy.is_retriable(requests.codes.bad_request, idempotent=True)
+    assert policy.is_retriable(None, idempotent=True)
+    assert not policy.is_retriable(None, idempotent=False)
+
+    policy = RetryPolicy(retriable_status_codes={500}, unprocessed_status_codes=())
+    assert policy.is_retriable(500, idempotent=True)
+    assert not policy.is_retriable(requests.codes.service_unavailable, idempotent=False)
+
+
+def test_delays() -> None:
+    policy = RetryPolicy(initial_delay=0.1, max_delay=1.0, jitter=None)
+    assert _delays(policy, 6) == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+
+    policy = RetryPolicy(initial_delay=0.1, max_delay=1.0, seed=1)
+    delays = _delays(policy, 100)
+    assert all(0 <= delay <= cap for delay, cap in zip(delays, [0.1, 0.2, 0.4, 0.8] + [1.0] * 96))
+    assert len(set(delays)) == 100
+    assert _delays(RetryPolicy(initial_delay=0.1, max_delay=1.0, seed=1), 100) == delays
+
+    policy = RetryPolicy(initial_delay=0.1, max_delay=1.0, multiplier=3.0, jitter="decorrelated")
+    delays = _delays(policy, 100)
+    assert all(0.1 <= delay <= 1.0 for delay in delays)
+    assert all(delay <= 3 * previous for previous, delay in zip([0.1] + delays, delays))
+
+    with pytest.raises(AssertionError, match="Jitter"):
+        RetryPolicy(jitter="partial")
+    with pytest.raises(AssertionError, match="positive"):
+        RetryPolicy(initial_delay=0)
+    with pytest.raises(AssertionError, match="shrink"):
+        RetryPolicy(multiplier=0.5)
+
+
+def test_retry_delay() -> None:
+    policy = RetryPolicy()
+    assert policy.retry_delay(0.5, None) == 0.5
+    assert policy.retry_delay(0.5, "3") == 3.0
+    assert policy.retry_delay(5.0, "3") == 5.0
+    assert policy.retry_delay(0.5, "soon") == 0.5
+
+    retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=60)
+    delay = policy.retry_delay(0.5, email.utils.format_datetime(retry_at, usegmt=True))
+    assert 55 < delay <= 60
+
+    assert RetryPolicy(respect_retry_after=False).retry_delay(0.5, "3") == 0.5
+
+
+def test_repr() -> None:
+    policy = RetryPolicy(jitter="decorrelated", retriable_status_codes={500, 503})
+    assert repr(eval(repr(policy))) == repr(policy)
+    assert applications_superstaq.retry_policy.RetryPolicy().jitter == "full"
@@ -0,0 +1,157 @@
+"""Caches the daily returns of stocks on disk, to compute the statistics sent with the finance
+requests (see `finance.MarketStatistics`) locally."""
+
+import functools
+import os
+import re
+import threading
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import numpy.typing as npt
+
+import applications_superstaq
+
+# Each ticker's returns are stored as an (append-only) file of these records, in order of date.
+RECORD_DTYPE = np.dtype([("date", "<M8[D]"), ("return", "<f8")])
+
+# The average number of days in a year, to convert `years_window` into a number of days.
+_DAYS_PER_YEAR = 365.25
+
+# Tickers are used as file names, so may only contain these characters.
+_TICKER_PATTERN = re.compile(r"[A-Za-z0-9.^=_-]+")
+
+
+class ReturnsCache:
+    """An on-disk cache of the daily returns of stocks, with one file per ticker.
+
+    New returns are appended to the end of a ticker's file (returns on or before the last date
+    already cached are skipped), and the files are memory-mapped when they are read, so only the
+    dates in the requested window are read from disk. Statistics for any list of cached tickers can
+    then be computed locally, however much the lists of successive requests overlap.
+
+    A cache may be shared by any number of threads, but only one process should append to it at a
+    time.
+    """
+
+    def __init__(self, directory: Union[str, "os.PathLike[str]"]):
+        """Creates a ReturnsCache.
+
+        Args:
+            directory: The directory to store the returns in, which is created if it does not
+                exist.
+        """
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str) -> str:
+        assert _TICKER_PATTERN.fullmatch(ticker), f"Invalid ticker: {ticker!r}."
+        return os.path.join(self.directory, f"{ticker}.returns")
+
+    def tickers(self) -> List[str]:
+        """Returns the (sorted) tickers with cached returns."""
+        names = sorted(os.listdir(self.directory))
+        return [name[: -len(".returns")] for name in names if name.endswith(".returns")]
+
+    def returns(self, ticker: str) -> np.ndarray:
+        """Returns the cached daily returns of a stock.
+
+        Args:
+            ticker: The stock's ticker.
+
+        Returns:
+            A (read-only, memory-mapped) array of `RECORD_DTYPE` records, in order of date, which
+            is empty if no returns are cached.
+        """
+        path = self._path(ticker)
+        # Ignores any record which is still being appended.
+        count = os.path.getsize(path) // RECORD_DTYPE.itemsize if os.path.exists(path) else 0
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+
+    def last_date(self, ticker: str) -> Optional[np.datetime64]:
+        """Returns the date of the latest cached return of a stock, or None if there is none."""
+        returns = self.returns(ticker)
+        return returns["date"][-1] if len(returns) else None
+
+    def append(self, ticker: str, dates: npt.ArrayLike, returns: npt.ArrayLike) -> int:
+        """Adds the daily returns of a stock to the cache.
+
+        Args:
+            ticker: The stock's ticker.
+            dates: The (strictly increasing) dates of the returns.
+            returns: The return on each date.
+
+        Returns:
+            The number of returns added, i.e. those after the latest date already cached.
+        """
+        records = np.empty(np.shape(dates), dtype=RECORD_DTYPE)
+        records["date"] = dates
+        records["return"] = returns
+        assert records.ndim == 1, "Dates and returns must be one-dimensional."
+        assert np.all(records["date"][1:] > records["date"][:-1]), "Dates must be increasing."
+
+        with self._lock:
+            last_date = self.last_date(ticker)
+            if last_date is not None:
+                records = records[records["date"] > last_date]
+            with open(self._path(ticker), "ab") as file:
+                file.write(records.tobytes())
+        return len(records)
+
+    def statistics(
+        self,
+        stock_symbols: Sequence[str],
+        years_window: float = 5.0,
+        end: Optional[Union[str, np.datetime64]] = None,
+        periods_per_year: float = 252,
+    ) -> "applications_superstaq.finance.MarketStatistics":
+        """Computes the statistics of a list of stocks from their cached returns.
+
+        Only the dates within the window on which every stock has a return are used.
+
+        Args:
+            stock_symbols: The stocks' tickers.
+            years_window: The number of years of returns (up to `end`) to use.
+            end: The last date to use. Defaults to the latest date cached for every stock.
+            periods_per_year: The number of trading days in a year, to annualize the statistics.
+
+        Returns:
+            The stocks' statistics, to pass to the methods of `finance.Finance`.
+
+        Raises:
+            ValueError: If any stock has no cached returns, or the stocks have fewer than two dates
+                in common within the window.
+        """
+        assert stock_symbols, "At least one stock is needed."
+        columns = [self.returns(ticker) for ticker in stock_symbols]
+        missing = [ticker for ticker, column in zip(stock_symbols, columns) if not len(column)]
+        if missing:
+            raise ValueError(f"No returns are cached for {missing}.")
+        if end is None:
+            end = min(column["date"][-1] for column in columns)
+        last_date = np.array(end, dtype=RECORD_DTYPE["date"])
+        bounds = np.array([last_date - int(years_window * _DAYS_PER_YEAR), last_date])
+
+        windows = []
+        for column in columns:
+            first, last = np.searchsorted(column["date"], bounds, side="right")
+            windows.append(column[first:last])
+        dates = functools.reduce(
+            lambda common, window: np.intersect1d(common, window["date"], assume_unique=True),
+            windows[1:],
+            windows[0]["date"],
+        )
+        if len(dates) < 2:
+            raise ValueError(
+                f"Fewer than two dates with returns for all of {list(stock_symbols)} are cached."
+            )
+
+        returns = np.column_stack(
+            [window["return"][np.searchsorted(window["date"], dates)] for window in windows]
+        )
+        return applications_superstaq.finance.MarketStatistics.from_returns(
+            returns, periods_per_year
+        )
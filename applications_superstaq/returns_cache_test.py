@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pytest
+
+from applications_superstaq.returns_cache import RECORD_DTYPE, ReturnsCache
+
+
+def _dates(start: str, stop: str) -> np.ndarray:
+    return np.arange(start, stop, dtype="datetime64[D]")
+
+
+def test_returns_cache(tmp_path: os.PathLike) -> None:
+    cache = ReturnsCache(os.path.join(tmp_path, "returns"))
+    assert cache.tickers() == []
+    assert cache.last_date("AAPL") is None
+    assert cache.returns("AAPL").dtype == RECORD_DTYPE
+
+    dates = _dates("2021-01-01", "2021-01-11")
+    assert cache.append("AAPL", dates, np.arange(10.0)) == 10
+    # Returns which are already cached are skipped.
+    assert cache.append("AAPL", ["2021-01-10", "2021-01-11"], [-1.0, 10.0]) == 1
+    assert cache.append("BRK.B", dates[::3], np.ones(4)) == 4
+
+    assert cache.tickers() == ["AAPL", "BRK.B"]
+    assert cache.last_date("AAPL") == np.datetime64("2021-01-11")
+    returns = cache.returns("AAPL")
+    assert isinstance(returns, np.memmap)
+    np.testing.assert_array_equal(returns["return"], np.arange(11.0))
+
+    # A partially appended record is ignored.
+    with open(os.path.join(tmp_path, "returns", "AAPL.returns"), "ab") as file:
+        file.write(b"\0" * 3)
+    assert len(ReturnsCache(os.path.join(tmp_path, "returns")).returns("AAPL")) == 11
+
+    with pytest.raises(AssertionError, match="increasing"):
+        _ = cache.append("AAPL", dates[::-1], np.arange(10.0))
+    with pytest.raises(AssertionError, match="one-dimensional"):
+        _ = cache.append("AAPL", dates.reshape(2, 5), np.zeros((2, 5)))
+    with pytest.raises(AssertionError, match="Invalid ticker"):
+        _ = cache.returns("../AAPL")
+
+
+def test_returns_cache_statistics(tmp_path: os.PathLike) -> None:
+    cache = ReturnsCache(tmp_path)
+    dates = _dates("2021-01-01", "2021-01-31")
+    aapl = np.sin(np.arange(30.0))
+    goog = np.cos(np.arange(30.0))
+    cache.append("AAPL", dates, aapl)
+    cache.append("GOOG", dates[5:-1], goog[5:-1])
+    cache.append("MMM", dates[:3], np.zeros(3))
+
+    # The window ends at the latest date cached for both stocks (Jan 29), and is 10 days long.
+    statistics = cache.statistics(["GOOG", "AAPL"], years_window=10 / 365.25, periods_per_year=1)
+    expected = np.column_stack([goog[19:29], aapl[19:29]])
+    np.testing.assert_allclose(statistics.expected_returns, expected.mean(axis=0))
+    np.testing.assert_allclose(statistics.covariance, np.cov(expected.T))
+
+    statistics = cache.statistics(["AAPL"], years_window=1, end="2021-01-02", periods_per_year=1)
+    np.testing.assert_allclose(statistics.expected_returns, [aapl[:2].mean()])
+
+    with pytest.raises(ValueError, match="No returns are cached for"):
+        _ = cache.statistics(["AAPL", "IEF"])
+    with pytest.raises(ValueError, match="Fewer than two dates"):
+        _ = cache.statistics(["GOOG", "MMM"])
+    with pytest.raises(AssertionError, match="At least one stock"):
+        _ = cache.statistics([])
@@ -12,29 +12,177 @@
 # limitations under the License.
 """Client for making requests to SuperstaQ's API."""
 
+import concurrent.futures
+import contextlib
+import gzip
 import sys
 import textwrap
+import threading
 import time
 import urllib
-from typing import Any, Callable, cast, Dict, List, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    cast,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
+import numpy as np
 import qubovert as qv
 import requests
+import urllib3
 
 import applications_superstaq
 
+T = TypeVar("T")
+JobResult = Union[dict, applications_superstaq.SuperstaQException, TimeoutError]
 
-class _SuperstaQClient:
-    """Handles calls to SuperstaQ's API.
 
-    Users should not instantiate this themselves,
-    but instead should use `$client_superstaq.Service`.
+E = TypeVar("E", bound=Exception)
+
+
+def _copy_exception(exception: E) -> E:
+    """Returns a distinct exception of the same type, with the same arguments and attributes."""
+    copied = type(exception).__new__(type(exception), *exception.args)
+    copied.__dict__.update(exception.__dict__)
+    return copied
+
+
+def _iter_content(response: requests.Response, chunk_size: int) -> Iterator[bytes]:
+    """Iterates over the body of a streamed response, releasing its connection afterwards."""
+    with response:
+        yield from response.iter_content(chunk_size)
+
+
+class _PoolCountingAdapter(requests.adapters.HTTPAdapter):
+    """An `HTTPAdapter` which keeps track of how often pooled connections are reused.
+
+    Every request checks a connection out of a per-host `urllib3` connection pool. A request which
+    has to open a new connection is counted as a pool miss, and any other request as a pool hit.
+    The adapter keeps its own record of the pools its pool manager creates (and disposes of), so
+    that their counts can be read without looking inside the pool manager.
     """
 
-    RETRIABLE_STATUS_CODES = {
-        requests.codes.service_unavailable,
-    }
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._pools_lock = threading.Lock()
+        self._live_pools: Set[urllib3.connectionpool.HTTPConnectionPool] = set()
+        self._retired_requests = 0
+        self._retired_connections = 0
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: self._tracked_pool_class(pool_class)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+        self.poolmanager.pools.dispose_func = self._retire_pool
+
+    def _tracked_pool_class(
+        self, pool_class: Type[urllib3.connectionpool.HTTPConnectionPool]
+    ) -> Type[urllib3.connectionpool.HTTPConnectionPool]:
+        """Returns a subclass of a connection pool class whose instances register themselves with
+        this adapter when they are created."""
+        adapter = self
+
+        def __init__(
+            pool: urllib3.connectionpool.HTTPConnectionPool, *args: Any, **kwargs: Any
+        ) -> None:
+            pool_class.__init__(pool, *args, **kwargs)
+            with adapter._pools_lock:
+                adapter._live_pools.add(pool)
+
+        return type(pool_class.__name__, (pool_class,), {"__init__": __init__})
+
+    def _retire_pool(self, pool: urllib3.connectionpool.HTTPConnectionPool) -> None:
+        """Keeps the counts of a pool evicted from (or cleared out of) the pool manager."""
+        with self._pools_lock:
+            if pool in self._live_pools:
+                self._live_pools.remove(pool)
+                self._retired_requests += pool.num_requests
+                self._retired_connections += pool.num_connections
+        pool.close()
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Returns the number of pool hits and misses since this adapter was created."""
+        with self._pools_lock:
+            num_requests = self._retired_requests
+            num_connections = self._retired_connections
+            for pool in self._live_pools:
+                num_requests += pool.num_requests
+                num_connections += pool.num_connections
+        return {"hits": num_requests - num_connections, "misses": num_connections}
+
+
+class _BaseSuperstaQClient:
+    """Configuration and request handling shared by the blocking and asynchronous clients."""
+
     SUPPORTED_TARGETS = {"qpu", "simulator"}
+
+    # The codecs request bodies can be compressed with (by their `Content-Encoding`).
+    REQUEST_COMPRESSIONS = (None, "gzip", "zstd")
+
+    # Whether the server provides the bulk `/get_jobs` endpoint. Cleared (per client) the first
+    # time it is found missing, after which jobs are requested one at a time.
+    _bulk_get_jobs = True
+
+    # Whether the server accepts QUBOs in the columnar format. Cleared (per client) the first time
+    # the server rejects one, after which QUBOs are sent as lists of dictionaries.
+    _columnar_qubo = True
+
+    # Whether the server provides the batched `/minvol_frontier` endpoint. Cleared (per client) the
+    # first time it is found missing, after which frontiers are requested one point at a time.
+    _bulk_minvol_frontier = True
+
+    # POST endpoints which can safely be retried after an ambiguous failure (e.g. a dropped
+    # connection), because sending the same request twice has the same effect as sending it once.
+    IDEMPOTENT_ENDPOINTS = {
+        "/get_jobs",
+        "/resource_estimate",
+        "/aqt_compile",
+        "/qscout_compile",
+        "/cq_compile",
+        "/ibmq_compile",
+        "/neutral_atom_compile",
+        "/minvol",
+        "/minvol_frontier",
+        "/maxsharpe",
+        "/tsp",
+        "/warehouse",
+        "/ibmq_token",
+        "/aqt_configs",
+    }
+
+    # POST endpoints which submit work, which may be charged to the user's balance. Requests to any
+    # of them discard the cached balance (if any), whereas other POST requests (e.g. polling
+    # `/get_jobs`) leave it cached.
+    WORK_ENDPOINTS = {
+        "/jobs",
+        "/qubo",
+        "/resource_estimate",
+        "/aqt_compile",
+        "/qscout_compile",
+        "/cq_compile",
+        "/ibmq_compile",
+        "/neutral_atom_compile",
+        "/minvol",
+        "/minvol_frontier",
+        "/maxsharpe",
+        "/tsp",
+        "/warehouse",
+    }
+
     SUPPORTED_VERSIONS = {
         applications_superstaq.API_VERSION,
     }
@@ -48,6 +196,20 @@ class _SuperstaQClient:
         api_version: str = applications_superstaq.API_VERSION,
         max_retry_seconds: float = 60,  # 1 minute
         verbose: bool = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        result_cache: Optional["applications_superstaq.result_cache.ResultCache"] = None,
+        metadata_cache: Optional["applications_superstaq.metadata_cache.MetadataCache"] = None,
+        retry_policy: Optional["applications_superstaq.retry_policy.RetryPolicy"] = None,
+        rate_limiter: Optional["applications_superstaq.rate_limiter.RateLimiter"] = None,
+        circuit_breaker: Optional["applications_superstaq.circuit_breaker.CircuitBreaker"] = None,
+        request_hooks: Sequence["applications_superstaq.tracing.RequestHook"] = (),
+        request_compression: Optional[str] = None,
+        compression_threshold: int = 2**16,
+        stream_threshold: Optional[int] = 10**6,
+        json_backend: Union[str, "applications_superstaq.json_backend.JsonBackend"] = "auto",
     ):
         """Creates the SuperstaQClient.
 
@@ -65,8 +227,41 @@ class _SuperstaQClient:
                 'simulator'. Can be overridden by calls with target in their signature.
             api_version: Which version fo the api to use, defaults to client_superstaq.API_VERSION,
                 which is the most recent version when this client was downloaded.
-            max_retry_seconds: The time to continue retriable responses. Defaults to 3600.
+            max_retry_seconds: The time (in seconds, since the first attempt) to keep retrying a
+                request for. Defaults to 60.
             verbose: Whether to print to stderr and stdio any retriable errors that are encountered.
+            pool_connections: The number of per-host connection pools to keep around.
+            pool_maxsize: The maximum number of connections to keep open to any single host.
+            pool_block: Whether to block when all `pool_maxsize` connections to a host are in use,
+                rather than opening (and then discarding) an additional connection.
+            keep_alive: Whether to keep connections open between requests, so that subsequent
+                requests to the same host skip the TCP and TLS handshakes.
+            result_cache: A cache of the results of the deterministic optimization endpoints
+                (`/minvol`, `/maxsharpe`, `/tsp` and `/warehouse`), or None to not cache them.
+            metadata_cache: A cache of the user's balance and the available backends, or None to
+                request them every time.
+            retry_policy: Which failed requests to retry, and how long to wait before each retry.
+                Defaults to a `RetryPolicy()`, i.e. exponential backoff with full jitter.
+            rate_limiter: Limits the rate and concurrency of requests (and can be shared with other
+                clients), or None to send requests as soon as possible.
+            circuit_breaker: Rejects requests immediately (with a `SuperstaQCircuitOpenException`)
+                after too many consecutive requests failed, or None to always keep retrying until
+                `max_retry_seconds`.
+            request_hooks: Functions called with a `RequestTrace` (of the timings and sizes) of
+                every request, e.g. `tracing.PrometheusMetrics` or `tracing.JsonLogger`.
+            request_compression: The codec to compress large request bodies with: "gzip", "zstd"
+                (requires the `zstandard` package), or None to never compress them. Responses are
+                always compressed if the server supports it (and decompressed transparently).
+            compression_threshold: The size (in bytes) above which request bodies are compressed.
+            stream_threshold: The number of terms from which QUBOs are streamed to the server (see
+                `json_stream`) with chunked transfer encoding, rather than encoded in memory all at
+                once, or None to never stream them. Streamed bodies are always compressed if
+                `request_compression` is set, since their size is not known in advance.
+            json_backend: The library to encode request bodies and decode responses with: "json",
+                "orjson" or "ujson" (which require the package of the same name), "auto" for
+                orjson if it is installed (and `json` otherwise), or a `json_backend.JsonBackend`.
+                Request bodies may contain NumPy arrays and scalars with any backend (but orjson
+                encodes NaN and infinities as null, see `json_backend.get_backend`).
         """
 
         self.api_key = api_key
@@ -75,6 +270,20 @@ class _SuperstaQClient:
         self.default_target = default_target
         self.max_retry_seconds = max_retry_seconds
         self.verbose = verbose
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.result_cache = result_cache
+        self.metadata_cache = metadata_cache
+        self.retry_policy = retry_policy or applications_superstaq.retry_policy.RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.request_hooks = list(request_hooks)
+        self.request_compression = request_compression
+        self.compression_threshold = compression_threshold
+        self.stream_threshold = stream_threshold
+        self.json_backend = applications_superstaq.json_backend.get_backend(json_backend)
         url = urllib.parse.urlparse(remote_host)
         assert url.scheme and url.netloc, (
             f"Specified remote_host {remote_host} is not a valid url, for example "
@@ -88,6 +297,14 @@ class _SuperstaQClient:
             default_target is None or default_target in self.SUPPORTED_TARGETS
         ), f"Target can only be one of {self.SUPPORTED_TARGETS} but was {default_target}."
         assert max_retry_seconds >= 0, "Negative retry not possible without time machine."
+        assert pool_connections > 0 and pool_maxsize > 0, "Connection pools cannot be empty."
+        assert request_compression in self.REQUEST_COMPRESSIONS, (
+            f"Request compression can only be one of {self.REQUEST_COMPRESSIONS} but was "
+            f"{request_compression}."
+        )
+        if request_compression == "zstd":
+            # Fail early if the codec is missing, rather than when sending the first large request.
+            applications_superstaq.converters._import_codec("zstd")
 
         self.url = f"{url.scheme}://{url.netloc}/{api_version}"
         self.verify_https: bool = f"{applications_superstaq.API_URL}/{self.api_version}" == self.url
@@ -98,26 +315,463 @@ class _SuperstaQClient:
             "X-Client-Version": self.api_version,
         }
 
+        self._init_session()
+
+    def _init_session(self) -> None:
+        """Sets up the connection pool used to send requests (implemented by subclasses)."""
+
+    def _target(self, target: Optional[str]) -> str:
+        """Returns the target if not None or the default target.
+
+        Raises:
+            AssertionError: if both `target` and `default_target` are not set.
+        """
+        assert target is not None or self.default_target is not None, (
+            "One must specify a target on this call, or a default_target on the service/client, "
+            "but neither were set."
+        )
+        return cast(str, target or self.default_target)
+
+    def _create_job_json(
+        self,
+        serialized_circuits: Dict[str, str],
+        repetitions: Optional[int] = None,
+        target: Optional[str] = None,
+        ibmq_pulse: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Builds the body of a `/jobs` request (see `create_job`)."""
+        actual_target = self._target(target)
+        json_dict: Dict[str, Any] = {
+            **serialized_circuits,
+            "backend": actual_target,
+            "shots": repetitions,
+        }
+
+        if ibmq_pulse:
+            json_dict["ibmq_pulse"] = ibmq_pulse
+
+        return json_dict
+
+    def _submit_qubo_json(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int,
+        variables: Optional[Sequence[Any]] = None,
+    ) -> Dict[str, Any]:
+        """Builds the body of a `/qubo` request (see `submit_qubo`).
+
+        QUBOs with at least `stream_threshold` terms are built with `JsonArray`s, so that they are
+        streamed rather than encoded in memory all at once.
+        """
+        stream = self._stream_qubo(qubo)
+        model: Any
+        if self._columnar_qubo:
+            model = applications_superstaq.qubo.convert_to_columnar_model(qubo, variables, stream)
+        else:
+            if not isinstance(qubo, qv.QUBO):
+                columnar_model = applications_superstaq.qubo.convert_to_columnar_model(
+                    qubo, variables
+                )
+                qubo = applications_superstaq.qubo.convert_model_to_qubo(columnar_model)
+            if stream:
+                model = applications_superstaq.qubo.stream_qubo_model(qubo)
+            else:
+                model = applications_superstaq.qubo.convert_qubo_to_model(qubo)
+        return {"qubo": model, "backend": target, "shots": repetitions}
+
+    def _stream_qubo(self, qubo: "applications_superstaq.qubo.QUBOLike") -> bool:
+        """Checks whether a QUBO has enough terms to be streamed to the server."""
+        if self.stream_threshold is None:
+            return False
+        if isinstance(qubo, qv.QUBO):
+            num_terms = len(qubo)
+        elif isinstance(qubo, np.ndarray):
+            num_terms = int(np.count_nonzero(qubo))
+        else:
+            num_terms = qubo.nnz
+        return num_terms >= self.stream_threshold
+
+    def _columnar_qubo_rejected(
+        self, json_dict: Dict[str, Any], error: applications_superstaq.SuperstaQException
+    ) -> bool:
+        """Checks whether a failed `/qubo` request should be resent as a list of dictionaries.
+
+        Args:
+            json_dict: The body of the failed request.
+            error: The exception raised by the request.
+
+        Returns:
+            Whether the request was rejected because the server does not accept columnar QUBOs, in
+            which case this client stops sending them.
+        """
+        if isinstance(json_dict["qubo"], dict) and error.status_code == requests.codes.bad_request:
+            self._columnar_qubo = False
+            return True
+        return False
+
+    def _cached_result(
+        self, endpoint: str, json_dict: Dict[str, Any], bypass_cache: bool
+    ) -> Tuple[Optional[str], Optional[dict]]:
+        """Looks up the result of a request to a deterministic endpoint in the result cache.
+
+        Args:
+            endpoint: The endpoint the request is sent to.
+            json_dict: The json body of the request.
+            bypass_cache: Whether to skip the lookup (so the result is requested, and then cached).
+
+        Returns:
+            The cache key of the request (or None if this client has no result cache), and the
+            cached result (or None if it has to be requested).
+        """
+        if self.result_cache is None:
+            return None, None
+        key = self.result_cache.key(self.url, endpoint, json_dict)
+        if bypass_cache:
+            return key, None
+        return key, self.result_cache.get(key)
+
+    @staticmethod
+    def _minvol_frontier_points(json_dict: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Splits the body of a `/minvol_frontier` request into one `/minvol` request body per
+        desired return."""
+        common = {key: value for key, value in json_dict.items() if key != "desired_returns"}
+        return [
+            {**common, "desired_return": desired_return}
+            for desired_return in json_dict["desired_returns"]
+        ]
+
+    def _cache_result(self, key: Optional[str], endpoint: str, result: dict) -> None:
+        """Stores the result of a request looked up with `_cached_result`."""
+        if self.result_cache is not None and key is not None:
+            self.result_cache.put(key, endpoint, result)
+
+    def _body_kwargs(
+        self, json_dict: Optional[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Optional[int]]:
+        """Encodes the body of a request (with the client's JSON backend), compressing it if
+        enabled and the body is large enough.
+
+        Bodies containing `JsonArray`s are sent as a `JsonStream` (compressed if compression is
+        enabled at all), whose sizes are only known once it has been sent (see `_trace_stream`).
+
+        Args:
+            json_dict: The json body of the request, if any.
+
+        Returns:
+            The keyword arguments (body and headers) to send the request with, and the size of the
+            body before compression (or None if it is not compressed, or streamed).
+        """
+        if applications_superstaq.json_stream.is_streamed(json_dict):
+            stream = applications_superstaq.json_stream.JsonStream(
+                json_dict, self.request_compression
+            )
+            headers = self.headers
+            if self.request_compression is not None:
+                headers = {**headers, "Content-Encoding": self.request_compression}
+            return {"data": stream, "headers": headers}, None
+        if json_dict is None:
+            return {"headers": self.headers}, None
+        body = self.json_backend.dumps(json_dict)
+        if self.request_compression is None or len(body) < self.compression_threshold:
+            return {"data": body, "headers": self.headers}, None
+
+        if self.request_compression == "gzip":
+            # The default level of `gzip.compress` (9) is much slower, for little gain.
+            compressed = gzip.compress(body, compresslevel=6)
+        else:
+            compressed = bytes(applications_superstaq.converters._compress(body, "zstd"))
+        headers = {**self.headers, "Content-Encoding": self.request_compression}
+        return {"data": compressed, "headers": headers}, len(body)
+
+    @staticmethod
+    def _trace_stream(trace: "applications_superstaq.tracing.RequestTrace", body: Any) -> None:
+        """Records the sizes of a request body in its trace, if it was streamed (as a
+        `JsonStream`, whose sizes are only known once it has been sent)."""
+        if isinstance(body, applications_superstaq.json_stream.JsonStream):
+            trace.request_bytes = body.size
+            if body.compression is not None:
+                trace.uncompressed_request_bytes = body.uncompressed_size
+
+    @contextlib.contextmanager
+    def _traced(
+        self, method: str, endpoint: str, uncompressed_request_bytes: Optional[int] = None
+    ) -> Iterator["applications_superstaq.tracing.RequestTrace"]:
+        """Traces a request (including its retries), passing the trace to the request hooks.
+
+        Args:
+            method: The http method of the request.
+            endpoint: The API endpoint the request is sent to.
+            uncompressed_request_bytes: The size of the request body before compression, if it is
+                compressed.
+        """
+        trace = applications_superstaq.tracing.RequestTrace(
+            method, endpoint, uncompressed_request_bytes=uncompressed_request_bytes
+        )
+        start = time.perf_counter()
+        try:
+            yield trace
+        except Exception as e:
+            trace.error = type(e).__name__
+            raise
+        finally:
+            trace.total_seconds = time.perf_counter() - start
+            for hook in self.request_hooks:
+                hook(trace)
+
+    def _circuit_attempt(self) -> ContextManager["applications_superstaq.circuit_breaker.Attempt"]:
+        """Guards one attempt at a request with the circuit breaker (if any).
+
+        Raises:
+            SuperstaQCircuitOpenException: If the circuit breaker is open.
+        """
+        if self.circuit_breaker is None:
+            return contextlib.nullcontext(applications_superstaq.circuit_breaker.Attempt())
+        return self.circuit_breaker.attempt()
+
+    @contextlib.contextmanager
+    def _rate_limited(self, endpoint: str) -> Iterator[None]:
+        """Waits until the rate limiter (if any) allows a request to `endpoint` to be sent."""
+        if self.rate_limiter is None:
+            yield
+            return
+        with self.rate_limiter.limit(endpoint):
+            yield
+
+    @contextlib.asynccontextmanager
+    async def _rate_limited_async(self, endpoint: str) -> AsyncIterator[None]:
+        """Waits until the rate limiter (if any) allows a request to `endpoint` to be sent."""
+        if self.rate_limiter is None:
+            yield
+            return
+        async with self.rate_limiter.limit_async(endpoint):
+            yield
+
+    def _invalidate_balance(self, endpoint: str) -> None:
+        """Discards the cached balance (if any) after a POST request which may have changed it."""
+        if self.metadata_cache is not None and endpoint in self.WORK_ENDPOINTS:
+            self.metadata_cache.invalidate("/balance")
+
+    @staticmethod
+    def _job_id_chunks(job_ids: Sequence[str], chunk_size: int) -> List[List[str]]:
+        """Splits `job_ids` into the lists of ids requested together by `get_jobs`."""
+        assert chunk_size > 0, "Chunks must contain at least one job id."
+        chunks = []
+        for start in range(0, len(job_ids), chunk_size):
+            stop = start + chunk_size
+            chunks.append(list(job_ids[start:stop]))
+        return chunks
+
+    @staticmethod
+    def _unpack_jobs(
+        job_ids: List[str],
+        jobs: Union[dict, applications_superstaq.SuperstaQException, TimeoutError],
+    ) -> List[JobResult]:
+        """Matches the response to a `/get_jobs` request to the requested job ids.
+
+        Args:
+            job_ids: The requested job ids.
+            jobs: The json body of the response, mapping job ids to jobs, or the exception raised
+                by the request.
+
+        Returns:
+            A list containing the job (or an exception) for each of the given job ids, in order.
+            If the request failed, each job gets its own copy of the exception.
+        """
+        if isinstance(jobs, Exception):
+            return [_copy_exception(jobs) for _ in job_ids]
+        return [
+            jobs[job_id]
+            if job_id in jobs
+            else applications_superstaq.SuperstaQNotFoundException(f"Job {job_id} was not found.")
+            for job_id in job_ids
+        ]
+
+    def _check_status_code(
+        self, status_code: int, get_message: Callable[[], str], idempotent: bool
+    ) -> None:
+        """Raises an appropriate exception for a failed request, unless it should be retried.
+
+        Args:
+            status_code: The http status code of the failed response.
+            get_message: A function returning a description of the failure, which is only called
+                if the request is not retriable.
+            idempotent: Whether the request can safely be sent more than once.
+
+        Raises:
+            SuperstaQException: If the request was not authorized, or is otherwise not retriable.
+            SuperstaQNotFoundException: If the requested resource does not exist.
+        """
+        if status_code == requests.codes.unauthorized:
+            raise applications_superstaq.SuperstaQException(
+                '"Not authorized" returned by SuperstaQ API.  '
+                "Check to ensure you have supplied the correct API key.",
+                status_code,
+            )
+        if status_code == requests.codes.not_found:
+            raise applications_superstaq.SuperstaQNotFoundException(
+                "SuperstaQ could not find requested resource."
+            )
+
+        if not self.retry_policy.is_retriable(status_code, idempotent):
+            raise applications_superstaq.SuperstaQException(
+                f"Non-retriable error making request to SuperstaQ API, {get_message()}",
+                status_code,
+            )
+
+    def _check_request_error(self, error: Exception, idempotent: bool) -> str:
+        """Checks whether a request which failed without a response should be retried.
+
+        Args:
+            error: The exception raised by the request (e.g. a connection error).
+            idempotent: Whether the request can safely be sent more than once.
+
+        Returns:
+            A description of the failure.
+
+        Raises:
+            SuperstaQException: If the request is not retriable, because it may have been processed.
+        """
+        message = f"{type(error).__name__} making request to SuperstaQ API: {error}"
+        if not self.retry_policy.is_retriable(None, idempotent):
+            raise applications_superstaq.SuperstaQException(message) from error
+        return message
+
+    def _error_message(self, text: str) -> str:
+        """Extracts the error message from the (json, or plain text) body of a failed response."""
+        try:
+            return str(self.json_backend.loads(text)["message"])
+        except (ValueError, TypeError, KeyError):
+            return text
+
+    def _retry_deadline(self) -> float:
+        """Returns the time (by `time.monotonic`) after which a request sent now is not retried."""
+        return time.monotonic() + self.max_retry_seconds
+
+    def _check_retry(self, deadline: float, delay_seconds: float, message: str) -> None:
+        """Checks whether a failed request should be retried after `delay_seconds`.
+
+        Args:
+            deadline: The time (by `time.monotonic`) after which the request is not retried.
+            delay_seconds: How long the client intends to wait before retrying.
+            message: A description of the most recent failure.
+
+        Raises:
+            TimeoutError: If the request would be retried after its deadline.
+        """
+        if time.monotonic() + delay_seconds > deadline:
+            raise TimeoutError(f"Reached maximum number of retries. Last error: {message}")
+        if self.verbose:
+            print(message, file=sys.stderr)
+            print(f"Waiting {delay_seconds:.3g} seconds before retrying.")
+
+    def __str__(self) -> str:
+        return f"Client with host={self.url} and name={self.client_name}"
+
+    def __repr__(self) -> str:
+        return textwrap.dedent(
+            f"""\
+            {type(self).__module__}.{type(self).__name__}(
+                remote_host={self.url!r},
+                api_key={self.api_key!r},
+                client_name={self.client_name!r},
+                default_target={self.default_target!r},
+                api_version={self.api_version!r},
+                max_retry_seconds={self.max_retry_seconds!r},
+                verbose={self.verbose!r},
+                pool_connections={self.pool_connections!r},
+                pool_maxsize={self.pool_maxsize!r},
+                pool_block={self.pool_block!r},
+                keep_alive={self.keep_alive!r},
+                retry_policy={self.retry_policy!r},
+            )"""
+        )
+
+
+class _SuperstaQClient(_BaseSuperstaQClient):
+    """Handles calls to SuperstaQ's API.
+
+    Users should not instantiate this themselves,
+    but instead should use `$client_superstaq.Service`.
+    """
+
+    def _init_session(self) -> None:
+        self._adapter = _PoolCountingAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        if not self.keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        self.job_poller = applications_superstaq.job_poller.JobPoller(self)
+
+    def close(self) -> None:
+        """Stops polling jobs, and closes all pooled connections held by this client."""
+        self.job_poller.close()
+        self.session.close()
+
+    def __enter__(self) -> "_SuperstaQClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Gets connection pool usage statistics for this client.
+
+        Returns:
+            A dictionary with the number of requests which reused a pooled connection ("hits"),
+            and the number of requests which had to open a new connection ("misses").
+        """
+        return self._adapter.pool_stats()
+
     def get_request(self, endpoint: str) -> dict:
         def request() -> requests.Response:
-            return requests.get(
+            return self.session.get(
                 f"{self.url}{endpoint}",
                 headers=self.headers,
                 verify=self.verify_https,
             )
 
-        return self._make_request(request).json()
+        return self._json(self._make_request("GET", endpoint, request))
 
     def post_request(self, endpoint: str, json_dict: Dict[str, Any]) -> dict:
+        return self._json(self._post_request(endpoint, json_dict))
+
+    def _json(self, response: requests.Response) -> Any:
+        """Decodes the json body of a response with the client's JSON backend."""
+        return self.json_backend.loads(response.content)
+
+    def _post_request(
+        self, endpoint: str, json_dict: Dict[str, Any], stream: bool = False
+    ) -> requests.Response:
+        """Makes a POST request, returning the response (whose body is only downloaded as it is
+        read, if `stream`)."""
+        body_kwargs, uncompressed_bytes = self._body_kwargs(json_dict)
+        request_kwargs = {**body_kwargs, "stream": True} if stream else body_kwargs
+
         def request() -> requests.Response:
-            return requests.post(
-                f"{self.url}{endpoint}",
-                json=json_dict,
-                headers=self.headers,
-                verify=self.verify_https,
+            return self.session.post(
+                f"{self.url}{endpoint}", **request_kwargs, verify=self.verify_https
             )
 
-        return self._make_request(request).json()
+        try:
+            idempotent = endpoint in self.IDEMPOTENT_ENDPOINTS
+            return self._make_request(
+                "POST", endpoint, request, idempotent, uncompressed_bytes, stream
+            )
+        finally:
+            self._invalidate_balance(endpoint)
+
+    def _cached_get_request(self, endpoint: str) -> dict:
+        """Makes a GET request to a metadata endpoint, via the metadata cache (if any)."""
+        if self.metadata_cache is None:
+            return self.get_request(endpoint)
+        return self.metadata_cache.get(endpoint, lambda: self.get_request(endpoint))
 
     def create_job(
         self,
@@ -144,16 +798,7 @@ class _SuperstaQClient:
         Raises:
             An SuperstaQException if the request fails.
         """
-        actual_target = self._target(target)
-        json_dict: Dict[str, Any] = {
-            **serialized_circuits,
-            "backend": actual_target,
-            "shots": repetitions,
-        }
-
-        if ibmq_pulse:
-            json_dict["ibmq_pulse"] = ibmq_pulse
-
+        json_dict = self._create_job_json(serialized_circuits, repetitions, target, ibmq_pulse)
         return self.post_request("/jobs", json_dict)
 
     def get_job(self, job_id: str) -> dict:
@@ -171,17 +816,129 @@ class _SuperstaQClient:
         """
         return self.get_request(f"/job/{job_id}")
 
+    def create_jobs(
+        self,
+        batch: Sequence[Dict[str, str]],
+        repetitions: Optional[int] = None,
+        target: Optional[str] = None,
+        ibmq_pulse: Optional[bool] = None,
+    ) -> List[JobResult]:
+        """Create many jobs at once.
+
+        The requests are pipelined over the client's connection pool, with up to `pool_maxsize`
+        of them in flight at any time.
+
+        Args:
+            batch: The serialized representations of the circuits to run, one per job.
+            repetitions: The number of times to repeat each circuit.
+            target: If supplied the target to run on. If not set, uses `default_target`.
+            ibmq_pulse: Specify whether to run the jobs using SuperstaQ's pulse-level optimizations.
+
+        Returns:
+            A list with the json body of the response for each job (see `create_job`), in the
+            order of `batch`. If a job could not be created, its entry is instead the
+            `SuperstaQException` (or `TimeoutError`, if it ran out of retries) raised by its
+            request.
+        """
+        json_dicts = [
+            self._create_job_json(serialized_circuits, repetitions, target, ibmq_pulse)
+            for serialized_circuits in batch
+        ]
+
+        def create(json_dict: Dict[str, Any]) -> JobResult:
+            try:
+                return self.post_request("/jobs", json_dict)
+            except (applications_superstaq.SuperstaQException, TimeoutError) as e:
+                return e
+
+        return self._map_concurrently(create, json_dicts)
+
+    def get_jobs(self, job_ids: Sequence[str], chunk_size: int = 100) -> List[JobResult]:
+        """Get many jobs from the SuperstaQ API at once.
+
+        Jobs are fetched in chunks of up to `chunk_size` job ids per request to the server's bulk
+        `/get_jobs` endpoint. If the server does not provide that endpoint (i.e. responds with a
+        404), jobs are instead fetched with individual `get_job` requests, pipelined over the
+        client's connection pool like `create_jobs`.
+
+        Args:
+            job_ids: The UUIDs of the jobs (returned when the jobs were created).
+            chunk_size: The maximum number of jobs to request at a time.
+
+        Returns:
+            A list with the json body of each job (see `get_job`), in the order of `job_ids`. If
+            a job could not be fetched, its entry is instead the `SuperstaQException` (or
+            `TimeoutError`) explaining why. In particular, it is a `SuperstaQNotFoundException`
+            if and only if no job with that id exists.
+        """
+
+        def get_chunk(chunk: List[str]) -> Optional[List[JobResult]]:
+            if not self._bulk_get_jobs:
+                return None
+            try:
+                jobs = self.post_request("/get_jobs", {"job_ids": chunk})
+            except applications_superstaq.SuperstaQNotFoundException:
+                self._bulk_get_jobs = False
+                return None
+            except (applications_superstaq.SuperstaQException, TimeoutError) as e:
+                return self._unpack_jobs(chunk, e)
+            return self._unpack_jobs(chunk, jobs)
+
+        chunks = self._job_id_chunks(job_ids, chunk_size)
+        chunk_results = self._map_concurrently(get_chunk, chunks)
+
+        # Fall back to individual requests for any chunks the bulk endpoint was not available for.
+        unfetched = [
+            job_id for chunk, jobs in zip(chunks, chunk_results) if jobs is None for job_id in chunk
+        ]
+        fetched = iter(self._map_concurrently(self._get_job_result, unfetched))
+        return [
+            job
+            for chunk, jobs in zip(chunks, chunk_results)
+            for job in (jobs if jobs is not None else [next(fetched) for _ in chunk])
+        ]
+
+    def _get_job_result(self, job_id: str) -> JobResult:
+        """Gets a job, returning (rather than raising) any error."""
+        try:
+            return self.get_job(job_id)
+        except (applications_superstaq.SuperstaQException, TimeoutError) as e:
+            return e
+
+    def wait_for_jobs(self, job_ids: Sequence[str], timeout: Optional[float] = None) -> List[dict]:
+        """Waits until all of the given jobs are done.
+
+        Jobs are polled by this client's `job_poller`, which merges the job ids of all concurrent
+        waiters into bulk `get_jobs` requests and adapts each job's poll interval to its status
+        and age (see `applications_superstaq.job_poller.JobPoller`).
+
+        Args:
+            job_ids: The UUIDs of the jobs to wait on.
+            timeout: The maximum time (in seconds) to wait, or None to wait indefinitely.
+
+        Returns:
+            The json body of each job (see `get_job`), in the order of `job_ids`.
+
+        Raises:
+            SuperstaQUnsuccessfulJobException: As soon as any of the jobs has been canceled,
+                deleted, or failed.
+            SuperstaQNotFoundException: If any of the jobs does not exist.
+            TimeoutError: If the jobs are not all done after `timeout` seconds (other errors
+                polling the jobs are retried until then).
+        """
+        return self.job_poller.wait_for_jobs(job_ids, timeout)
+
     def get_balance(self) -> dict:
         """Get the querying user's account balance in USD.
 
         Returns:
             The json body of the response as a dict.
         """
-        return self.get_request("/balance")
+        return self._cached_get_request("/balance")
 
     def get_backends(self) -> dict:
         """Makes a GET request to SuperstaQ API to get a list of available backends."""
-        return self.get_request("/backends")
+        return self._cached_get_request("/backends")
 
     def ibmq_set_token(self, ibmq_token: Dict[str, str]) -> dict:
         """Makes a POST request to SuperstaQ API to set IBMQ token field in database.
@@ -193,15 +950,14 @@ class _SuperstaQClient:
             The json body of the response as a dict.
         """
 
+        body_kwargs, _ = self._body_kwargs(ibmq_token)
+
         def request() -> requests.Response:
-            return requests.post(
-                f"{self.url}/ibmq_token",
-                headers=self.headers,
-                json=ibmq_token,
-                verify=self.verify_https,
+            return self.session.post(
+                f"{self.url}/ibmq_token", **body_kwargs, verify=self.verify_https
             )
 
-        return self._make_request(request).json()
+        return self._json(self._make_request("POST", "/ibmq_token", request, idempotent=True))
 
     def resource_estimate(self, json_dict: Dict[str, str]) -> dict:
         return self.post_request("/resource_estimate", json_dict)
@@ -226,31 +982,130 @@ class _SuperstaQClient:
         """Makes a POST request to SuperstaQ API to compile a circuits for neutral atom devices."""
         return self.post_request("/neutral_atom_compile", json_dict)
 
-    def submit_qubo(self, qubo: qv.QUBO, target: str, repetitions: int = 1000) -> dict:
-        """Makes a POST request to SuperstaQ API to submit a QUBO problem to the given target."""
-        json_dict = {
-            "qubo": applications_superstaq.qubo.convert_qubo_to_model(qubo),
-            "backend": target,
-            "shots": repetitions,
-        }
-        return self.post_request("/qubo", json_dict)
+    def submit_qubo(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int = 1000,
+        variables: Optional[Sequence[Any]] = None,
+    ) -> dict:
+        """Makes a POST request to SuperstaQ API to submit a QUBO problem to the given target.
+
+        The QUBO is sent in the columnar format (see `qubo.convert_qubo_to_columnar_model`). If the
+        server rejects that format, it is resent (as are all later QUBOs) as a list of dictionaries.
+
+        Args:
+            qubo: The QUBO, either as a `qv.QUBO` or as a square numpy array or scipy.sparse matrix
+                `Q` (for which the value of an assignment `x` is `x @ Q @ x`).
+            target: A string indicating which backend to use.
+            repetitions: Number of shots to execute on the device.
+            variables: The label of each row/column of a QUBO matrix (defaults to their indices).
+
+        Returns:
+            The json body of the response.
+        """
+        return self._json(self._submit_qubo(qubo, target, repetitions, variables))
+
+    def submit_qubo_stream(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int = 1000,
+        variables: Optional[Sequence[Any]] = None,
+        chunk_size: int = 2**16,
+    ) -> Iterator[bytes]:
+        """Submits a QUBO problem like `submit_qubo`, but streams the response as it is received.
+
+        The solutions can then be read out in batches with `qubo.iter_json_qubo_result`, without
+        ever holding the whole response in memory. The request is sent (and any error raised)
+        immediately, but the response's connection is only released once the returned iterator is
+        exhausted or closed.
+
+        Args:
+            qubo: The QUBO, either as a `qv.QUBO` or as a square numpy array or scipy.sparse matrix.
+            target: A string indicating which backend to use.
+            repetitions: Number of shots to execute on the device.
+            variables: The label of each row/column of a QUBO matrix (defaults to their indices).
+            chunk_size: The (maximum) size of each chunk of the response.
+
+        Returns:
+            An iterator over the chunks of the (raw) json body of the response.
+        """
+        response = self._submit_qubo(qubo, target, repetitions, variables, stream=True)
+        return _iter_content(response, chunk_size)
+
+    def _submit_qubo(
+        self,
+        qubo: "applications_superstaq.qubo.QUBOLike",
+        target: str,
+        repetitions: int,
+        variables: Optional[Sequence[Any]],
+        stream: bool = False,
+    ) -> requests.Response:
+        """Sends a `/qubo` request, falling back to the list-of-dictionaries format if needed."""
+        json_dict = self._submit_qubo_json(qubo, target, repetitions, variables)
+        try:
+            return self._post_request("/qubo", json_dict, stream)
+        except applications_superstaq.SuperstaQException as e:
+            if not self._columnar_qubo_rejected(json_dict, e):
+                raise
+        json_dict = self._submit_qubo_json(qubo, target, repetitions, variables)
+        return self._post_request("/qubo", json_dict, stream)
+
+    def _cached_post_request(
+        self, endpoint: str, json_dict: Dict[str, Any], bypass_cache: bool
+    ) -> dict:
+        """Makes a POST request to a deterministic endpoint, via the result cache (if any)."""
+        key, result = self._cached_result(endpoint, json_dict, bypass_cache)
+        if result is None:
+            result = self.post_request(endpoint, json_dict)
+            self._cache_result(key, endpoint, result)
+        return result
 
-    def find_min_vol_portfolio(self, json_dict: dict) -> dict:
+    def find_min_vol_portfolio(self, json_dict: dict, bypass_cache: bool = False) -> dict:
         """Makes a POST request to SuperstaQ API to find a minimum volatility portfolio
         that exceeds a certain specified return."""
-        return self.post_request("/minvol", json_dict)
+        return self._cached_post_request("/minvol", json_dict, bypass_cache)
+
+    def find_min_vol_frontier(self, json_dict: dict, bypass_cache: bool = False) -> List[dict]:
+        """Finds the minimum volatility portfolio for each of a list of desired returns.
+
+        All of the points are requested at once from the server's batched `/minvol_frontier`
+        endpoint, so that the prices are only fetched once. If the server does not provide that
+        endpoint (i.e. responds with a 404), each point is instead requested from `/minvol`,
+        pipelined over the client's connection pool like `create_jobs`.
+
+        Args:
+            json_dict: The body of a `/minvol` request, with a list of "desired_returns" instead of
+                a single "desired_return".
+            bypass_cache: Whether to request new results even if the result cache holds them.
 
-    def find_max_pseudo_sharpe_ratio(self, json_dict: dict) -> dict:
+        Returns:
+            The json body of a `/minvol` response for each desired return, in order.
+        """
+        if self._bulk_minvol_frontier:
+            try:
+                result = self._cached_post_request("/minvol_frontier", json_dict, bypass_cache)
+                return result["frontier"]
+            except applications_superstaq.SuperstaQNotFoundException:
+                self._bulk_minvol_frontier = False
+
+        return self._map_concurrently(
+            lambda point: self.find_min_vol_portfolio(point, bypass_cache),
+            self._minvol_frontier_points(json_dict),
+        )
+
+    def find_max_pseudo_sharpe_ratio(self, json_dict: dict, bypass_cache: bool = False) -> dict:
         """Makes a POST request to SuperstaQ API to find a max Sharpe ratio portfolio."""
-        return self.post_request("/maxsharpe", json_dict)
+        return self._cached_post_request("/maxsharpe", json_dict, bypass_cache)
 
-    def tsp(self, json_dict: dict) -> dict:
+    def tsp(self, json_dict: dict, bypass_cache: bool = False) -> dict:
         """Makes a POST request to SuperstaQ API to find a optimal TSP tour."""
-        return self.post_request("/tsp", json_dict)
+        return self._cached_post_request("/tsp", json_dict, bypass_cache)
 
-    def warehouse(self, json_dict: dict) -> dict:
+    def warehouse(self, json_dict: dict, bypass_cache: bool = False) -> dict:
         """Makes a POST request to SuperstaQ API to find optimal warehouse assignment."""
-        return self.post_request("/warehouse", json_dict)
+        return self._cached_post_request("/warehouse", json_dict, bypass_cache)
 
     def aqt_upload_configs(self, aqt_configs: Dict[str, str]) -> dict:
         """Makes a POST request to SuperstaQ API to upload configurations."""
@@ -260,90 +1115,95 @@ class _SuperstaQClient:
         """Writes AQT configs from the AQT system onto the given file paths."""
         return self.get_request("/get_aqt_configs")
 
-    def _target(self, target: Optional[str]) -> str:
-        """Returns the target if not None or the default target.
-
-        Raises:
-            AssertionError: if both `target` and `default_target` are not set.
-        """
-        assert target is not None or self.default_target is not None, (
-            "One must specify a target on this call, or a default_target on the service/client, "
-            "but neither were set."
+    def _handle_status_codes(self, response: requests.Response, idempotent: bool) -> None:
+        self._check_status_code(
+            response.status_code, lambda: self._error_message(response.text), idempotent
         )
-        return cast(str, target or self.default_target)
 
-    def _handle_status_codes(self, response: requests.Response) -> None:
-        if response.status_code == requests.codes.unauthorized:
-            raise applications_superstaq.SuperstaQException(
-                '"Not authorized" returned by SuperstaQ API.  '
-                "Check to ensure you have supplied the correct API key.",
-                response.status_code,
-            )
-        if response.status_code == requests.codes.not_found:
-            raise applications_superstaq.SuperstaQNotFoundException(
-                "SuperstaQ could not find requested resource."
-            )
+    def _map_concurrently(self, func: Callable[[Any], T], items: Sequence[Any]) -> List[T]:
+        """Calls `func` on each item, with up to `pool_maxsize` calls running at a time."""
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        max_workers = min(self.pool_maxsize, len(items))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(func, items))
 
-        if response.status_code not in self.RETRIABLE_STATUS_CODES:
-            if "message" in response.json():
-                message = response.json()["message"]
-            else:
-                message = str(response.text)
-            raise applications_superstaq.SuperstaQException(
-                f"Non-retriable error making request to SuperstaQ API, {message}",
-                response.status_code,
-            )
+    def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        request: Callable[[], requests.Response],
+        idempotent: bool = True,
+        uncompressed_request_bytes: Optional[int] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """Make a request to the API, retrying if necessary (see `RetryPolicy`).
 
-    def _make_request(self, request: Callable[[], requests.Response]) -> requests.Response:
-        """Make a request to the API, retrying if necessary.
+        Every attempt is subject to the client's circuit breaker and rate limiter (if any), and the
+        whole request is traced for the client's request hooks.
 
         Args:
+            method: The http method of the request ("GET" or "POST").
+            endpoint: The API endpoint the request is sent to.
             request: A function that returns a `requests.Response`.
+            idempotent: Whether the request can safely be sent more than once.
+            uncompressed_request_bytes: The size of the request body before compression, if it is
+                compressed (for the request's trace).
+            stream: Whether the body of the successful response is streamed (so it must not be read
+                for the request's trace).
 
         Raises:
             SuperstaQException: If there was a not-retriable error from the API.
+            SuperstaQCircuitOpenException: If the client's circuit breaker is open.
             TimeoutError: If the requests retried for more than `max_retry_seconds`.
 
         Returns:
             The request.Response from the final successful request call.
         """
-        # Initial backoff of 100ms.
-        delay_seconds = 0.1
-        while True:
-            try:
-                response = request()
-                if response.ok:
-                    return response
-
-                self._handle_status_codes(response)
-                message = response.reason
-
-            # Fallthrough should retry.
-            except requests.RequestException as e:
-                # Connection error, timeout at server, or too many redirects.
-                # Retry these.
-                message = f"RequestException of type {type(e)}."
-            if delay_seconds > self.max_retry_seconds:
-                raise TimeoutError(f"Reached maximum number of retries. Last error: {message}")
-            if self.verbose:
-                print(message, file=sys.stderr)
-                print(f"Waiting {delay_seconds} seconds before retrying.")
-            time.sleep(delay_seconds)
-            delay_seconds *= 2
+        with self._traced(method, endpoint, uncompressed_request_bytes) as trace:
+            deadline = self._retry_deadline()
+            delays = self.retry_policy.delays()
+            while True:
+                retry_after = None
+                try:
+                    with self._circuit_attempt() as attempt:
+                        with self._rate_limited(endpoint):
+                            trace.start_attempt()
+                            response = request()
+                        attempt.status_code = response.status_code
+                    self._trace_response(trace, response, stream and response.ok)
+                    if response.ok:
+                        return response
 
-    def __str__(self) -> str:
-        return f"Client with host={self.url} and name={self.client_name}"
+                    self._handle_status_codes(response, idempotent)
+                    message = response.reason
+                    retry_after = response.headers.get("Retry-After")
 
-    def __repr__(self) -> str:
-        return textwrap.dedent(
-            f"""\
-            applications_superstaq.superstaq_client._SuperstaQClient(
-                remote_host={self.url!r},
-                api_key={self.api_key!r},
-                client_name={self.client_name!r},
-                default_target={self.default_target!r},
-                api_version={self.api_version!r},
-                max_retry_seconds={self.max_retry_seconds!r},
-                verbose={self.verbose!r},
-            )"""
-        )
+                # Fallthrough should retry.
+                except requests.RequestException as e:
+                    # Connection error, timeout at server, or too many redirects.
+                    message = self._check_request_error(e, idempotent)
+                delay_seconds = self.retry_policy.retry_delay(next(delays), retry_after)
+                self._check_retry(deadline, delay_seconds, message)
+                trace.backoff_seconds += delay_seconds
+                time.sleep(delay_seconds)
+
+    def _trace_response(
+        self,
+        trace: "applications_superstaq.tracing.RequestTrace",
+        response: requests.Response,
+        stream: bool = False,
+    ) -> None:
+        """Records the status, sizes and server time of a response in its request's trace.
+
+        The size of a streamed response is taken from its headers (if present), since it has not
+        been downloaded yet.
+        """
+        trace.status_code = response.status_code
+        trace.request_bytes = int(response.request.headers.get("Content-Length", 0))
+        self._trace_stream(trace, response.request.body)
+        if stream:
+            trace.response_bytes = int(response.headers.get("Content-Length", 0))
+        else:
+            trace.response_bytes = len(response.content)
+        trace.server_seconds = response.elapsed.total_seconds()
@@ -11,14 +11,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import contextlib
+import gzip
 import io
+import itertools
+import json
+import sys
+import time
+import urllib
+import zlib
+from typing import Any, Dict, List, Tuple
 from unittest import mock
 
+import numpy as np
 import pytest
 import qubovert as qv
 import requests
+import scipy.sparse
+import urllib3
 
 import applications_superstaq
+from applications_superstaq.retry_policy import RetryPolicy
 
 API_VERSION = applications_superstaq.API_VERSION
 EXPECTED_HEADERS = {
@@ -29,6 +41,118 @@ EXPECTED_HEADERS = {
 }
 
 
+def _body(json_dict: Dict[str, Any]) -> bytes:
+    """Encodes a request body like a client with the default JSON backend."""
+    return applications_superstaq.json_backend.get_backend().dumps(json_dict)
+
+
+class _StandInServer(requests.adapters.BaseAdapter):
+    """A stand-in for the SuperstaQ server, answering a client's requests in-process.
+
+    Mount it on a client's session to exercise the full request path without opening sockets.
+    Circuits containing "fail" are rejected when submitted, and requests for circuits or job ids
+    containing "busy" are always answered with "service unavailable". Clear `bulk_endpoint` to
+    stand in for a server without `/get_jobs` and `/minvol_frontier`, or `columnar_qubo` for a
+    server only accepting QUBOs as lists of dictionaries. Streamed request bodies are joined, and
+    request bodies are decompressed according to their `Content-Encoding`. Responses are
+    gzip-compressed if `compress_responses` is set (and the client accepts it).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.bulk_endpoint = True
+        self.columnar_qubo = True
+        self.compress_responses = False
+        self.jobs: Dict[str, dict] = {}
+        self.requests: List[Any] = []
+        self._job_counter = itertools.count()
+
+    def handle(self, method: str, endpoint: str, body: Any) -> Tuple[Any, Any]:
+        if (method, endpoint) == ("POST", "/jobs"):
+            return self._create_job(body)
+        if (method, endpoint) == ("POST", "/get_jobs") and self.bulk_endpoint:
+            return self._get_jobs(body)
+        if (method, endpoint) == ("POST", "/qubo"):
+            if isinstance(body["qubo"], dict) and not self.columnar_qubo:
+                return requests.codes.bad_request, {"message": "invalid qubo"}
+            return requests.codes.ok, {"solution": "solution"}
+        if (method, endpoint) == ("POST", "/minvol"):
+            return requests.codes.ok, self.minvol(body["desired_return"])
+        if (method, endpoint) == ("POST", "/minvol_frontier") and self.bulk_endpoint:
+            frontier = [self.minvol(desired_return) for desired_return in body["desired_returns"]]
+            return requests.codes.ok, {"frontier": frontier}
+        if method == "GET" and endpoint.split("/job/", 1)[-1] in self.jobs:
+            return requests.codes.ok, self.jobs[endpoint.split("/job/", 1)[-1]]
+        return requests.codes.not_found, {}
+
+    @staticmethod
+    def minvol(desired_return: float) -> Dict[str, Any]:
+        return {"best_portfolio": ["AAPL"], "best_ret": desired_return, "qubo": []}
+
+    def _create_job(self, body: Any) -> Tuple[Any, Any]:
+        if "fail" in body["circuits"]:
+            return requests.codes.bad_request, {"message": "invalid circuit"}
+        if "busy" in body["circuits"]:
+            return requests.codes.service_unavailable, {}
+        job_id = f"job{next(self._job_counter)}"
+        self.jobs[job_id] = {"job_id": job_id, "status": "Queued"}
+        return requests.codes.ok, {"job_ids": [job_id]}
+
+    def _get_jobs(self, body: Any) -> Tuple[Any, Any]:
+        if "forbidden" in body["job_ids"]:
+            return requests.codes.unauthorized, {}
+        if "busy" in body["job_ids"]:
+            return requests.codes.service_unavailable, {}
+        jobs = {job_id: self.jobs[job_id] for job_id in body["job_ids"] if job_id in self.jobs}
+        return requests.codes.ok, jobs
+
+    def send(self, request: Any, *args: Any, **kwargs: Any) -> requests.Response:
+        self.requests.append(request)
+        endpoint = urllib.parse.urlparse(request.url).path.split(API_VERSION, 1)[1]
+        body = request.body
+        if body is not None and not isinstance(body, (bytes, str)):
+            body = b"".join(body)  # A streamed (chunked) body.
+        if request.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        elif request.headers.get("Content-Encoding") == "zstd":
+            body = applications_superstaq.converters._decompress(memoryview(body), "zstd")
+        body = json.loads(body) if body else None
+        status_code, response_json = self.handle(request.method, endpoint, body)
+
+        if self.compress_responses and "gzip" in request.headers["Accept-Encoding"]:
+            raw = urllib3.HTTPResponse(
+                body=io.BytesIO(gzip.compress(json.dumps(response_json).encode())),
+                headers={"Content-Encoding": "gzip"},
+                status=status_code,
+                preload_content=False,
+            )
+            return requests.adapters.HTTPAdapter().build_response(request, raw)
+
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = json.dumps(response_json).encode()
+        response.request = request
+        response.url = str(request.url)
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def _stand_in_client(
+    **kwargs: Any,
+) -> Tuple[applications_superstaq.superstaq_client._SuperstaQClient, _StandInServer]:
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+        **kwargs,
+    )
+    server = _StandInServer()
+    client.session.mount("http://", server)
+    return client, server
+
+
 def test_superstaq_client_str_and_repr() -> None:
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
@@ -124,10 +248,82 @@ def test_superstaq_client_attributes() -> None:
     assert client.verbose
 
 
-@mock.patch("requests.post")
+def test_superstaq_client_empty_pool() -> None:
+    with pytest.raises(AssertionError, match="cannot be empty"):
+        _ = applications_superstaq.superstaq_client._SuperstaQClient(
+            client_name="applications-superstaq",
+            remote_host="http://example.com",
+            api_key="a",
+            pool_maxsize=0,
+        )
+
+
+def test_superstaq_client_keep_alive() -> None:
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+    )
+    assert client.session.headers["Connection"] == "keep-alive"
+
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+        keep_alive=False,
+    )
+    assert client.session.headers["Connection"] == "close"
+
+
+def test_superstaq_client_context_manager() -> None:
+    with mock.patch("requests.Session.close") as mock_close:
+        with applications_superstaq.superstaq_client._SuperstaQClient(
+            client_name="applications-superstaq",
+            remote_host="http://example.com",
+            api_key="to_my_heart",
+        ):
+            mock_close.assert_not_called()
+        mock_close.assert_called_once()
+
+
+def test_superstaq_client_pool_stats() -> None:
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+        pool_connections=1,
+        pool_maxsize=4,
+    )
+
+    pool = client._adapter.get_connection_with_tls_context(
+        requests.Request("GET", "http://example.com").prepare(), verify=False
+    )
+    assert client._adapter._pool_maxsize == 4
+    pool.num_requests = 5
+    pool.num_connections = 2
+    assert client.pool_stats() == {"hits": 3, "misses": 2}
+
+    # Counts are kept when a pool is evicted or the client is closed.
+    other_pool = client._adapter.get_connection_with_tls_context(
+        requests.Request("GET", "http://example.org").prepare(), verify=False
+    )
+    other_pool.num_requests = 1
+    other_pool.num_connections = 1
+    assert client.pool_stats() == {"hits": 3, "misses": 3}
+
+    # Pools evicted from the pool manager keep their counts.
+    assert isinstance(pool, urllib3.HTTPConnectionPool)
+    client._adapter.poolmanager.pools.clear()
+    assert client.pool_stats() == {"hits": 3, "misses": 3}
+
+    client.close()
+    assert client.pool_stats() == {"hits": 3, "misses": 3}
+
+
+@mock.patch("requests.Session.post")
 def test_supertstaq_client_create_job(mock_post: mock.MagicMock) -> None:
     mock_post.return_value.status_code.return_value = requests.codes.ok
-    mock_post.return_value.json.return_value = {"foo": "bar"}
+    mock_post.return_value.content = json.dumps({"foo": "bar"}).encode()
 
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
@@ -150,16 +346,16 @@ def test_supertstaq_client_create_job(mock_post: mock.MagicMock) -> None:
     }
     mock_post.assert_called_with(
         f"http://example.com/{API_VERSION}/jobs",
-        json=expected_json,
+        data=_body(expected_json),
         headers=EXPECTED_HEADERS,
         verify=False,
     )
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_create_job_default_target(mock_post: mock.MagicMock) -> None:
     mock_post.return_value.status_code.return_value = requests.codes.ok
-    mock_post.return_value.json.return_value = {"foo"}
+    mock_post.return_value.content = json.dumps({"foo": "bar"}).encode()
 
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
@@ -168,15 +364,15 @@ def test_superstaq_client_create_job_default_target(mock_post: mock.MagicMock) -
         default_target="simulator",
     )
     _ = client.create_job({"Hello": "World"})
-    assert mock_post.call_args[1]["json"]["backend"] == "simulator"
+    assert json.loads(mock_post.call_args[1]["data"])["backend"] == "simulator"
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_create_job_target_overrides_default_target(
     mock_post: mock.MagicMock,
 ) -> None:
     mock_post.return_value.status_code.return_value = requests.codes.ok
-    mock_post.return_value.json.return_value = {"foo"}
+    mock_post.return_value.content = json.dumps({"foo": "bar"}).encode()
 
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
@@ -190,7 +386,7 @@ def test_superstaq_client_create_job_target_overrides_default_target(
         target="qpu",
         repetitions=1,
     )
-    assert mock_post.call_args[1]["json"]["backend"] == "qpu"
+    assert json.loads(mock_post.call_args[1]["data"])["backend"] == "qpu"
 
 
 def test_superstaq_client_create_job_no_targets() -> None:
@@ -203,7 +399,7 @@ def test_superstaq_client_create_job_no_targets() -> None:
         _ = client.create_job({"Hello": "World"})
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_create_job_unauthorized(mock_post: mock.MagicMock) -> None:
     mock_post.return_value.ok = False
     mock_post.return_value.status_code = requests.codes.unauthorized
@@ -218,7 +414,7 @@ def test_superstaq_client_create_job_unauthorized(mock_post: mock.MagicMock) ->
         _ = client.create_job({"Hello": "World"})
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_create_job_not_found(mock_post: mock.MagicMock) -> None:
     mock_post.return_value.ok = False
     mock_post.return_value.status_code = requests.codes.not_found
@@ -233,7 +429,7 @@ def test_superstaq_client_create_job_not_found(mock_post: mock.MagicMock) -> Non
         _ = client.create_job({"Hello": "World"})
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_create_job_not_retriable(mock_post: mock.MagicMock) -> None:
     mock_post.return_value.ok = False
     mock_post.return_value.status_code = requests.codes.not_implemented
@@ -248,20 +444,23 @@ def test_superstaq_client_create_job_not_retriable(mock_post: mock.MagicMock) ->
         _ = client.create_job({"Hello": "World"})
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_create_job_retry(mock_post: mock.MagicMock) -> None:
     response1 = mock.MagicMock()
     response2 = mock.MagicMock()
     mock_post.side_effect = [response1, response2]
     response1.ok = False
     response1.status_code = requests.codes.service_unavailable
+    response1.headers = {}
     response2.ok = True
+    response2.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
         api_key="to_my_heart",
         default_target="simulator",
         verbose=True,
+        retry_policy=RetryPolicy(jitter=None),
     )
     test_stdout = io.StringIO()
     with contextlib.redirect_stdout(test_stdout):
@@ -270,25 +469,34 @@ def test_superstaq_client_create_job_retry(mock_post: mock.MagicMock) -> None:
     assert mock_post.call_count == 2
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_create_job_retry_request_error(mock_post: mock.MagicMock) -> None:
     response2 = mock.MagicMock()
     mock_post.side_effect = [requests.exceptions.ConnectionError(), response2]
     response2.ok = True
+    response2.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
         api_key="to_my_heart",
         default_target="simulator",
     )
-    _ = client.create_job({"Hello": "World"})
-    assert mock_post.call_count == 2
+    # The job may have been created before the connection was lost, so it isn't resent.
+    with pytest.raises(applications_superstaq.SuperstaQException, match="ConnectionError"):
+        _ = client.create_job({"Hello": "World"})
+    assert mock_post.call_count == 1
+
+    # Idempotent requests are retried.
+    mock_post.side_effect = [requests.exceptions.ConnectionError(), response2]
+    _ = client.aqt_compile({"Hello": "World"})
+    assert mock_post.call_count == 3
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_create_job_timeout(mock_post: mock.MagicMock) -> None:
     mock_post.return_value.ok = False
     mock_post.return_value.status_code = requests.codes.service_unavailable
+    mock_post.return_value.headers = {}
 
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
@@ -301,11 +509,63 @@ def test_superstaq_client_create_job_timeout(mock_post: mock.MagicMock) -> None:
         _ = client.create_job({"Hello": "World"})
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
+def test_superstaq_client_retry_policy(mock_post: mock.MagicMock) -> None:
+    throttled = mock.MagicMock(ok=False, status_code=requests.codes.too_many_requests)
+    throttled.headers = {"Retry-After": "2"}
+    bad_gateway = mock.MagicMock(ok=False, status_code=requests.codes.bad_gateway, headers={})
+    success = mock.MagicMock(ok=True, content=b"{}")
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+        default_target="simulator",
+        retry_policy=RetryPolicy(jitter=None),
+    )
+
+    # Throttled requests are retried (even if not idempotent) once the server allows it.
+    mock_post.side_effect = [throttled, success]
+    with mock.patch("time.sleep") as mock_sleep:
+        _ = client.create_job({"Hello": "World"})
+    mock_sleep.assert_called_once_with(2.0)
+
+    # Gateway errors are only retried for idempotent requests.
+    mock_post.side_effect = [bad_gateway, success]
+    with pytest.raises(applications_superstaq.SuperstaQException, match="Status code: 502"):
+        _ = client.create_job({"Hello": "World"})
+    mock_post.side_effect = [bad_gateway, success]
+    with mock.patch("time.sleep") as mock_sleep:
+        _ = client.tsp({"locs": ["Chicago"]})
+    mock_sleep.assert_called_once_with(0.1)
+
+
+@mock.patch("requests.Session.get")
+def test_superstaq_client_retry_deadline(mock_get: mock.MagicMock) -> None:
+    mock_get.return_value = mock.MagicMock(
+        ok=False, status_code=requests.codes.service_unavailable, headers={}
+    )
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+        max_retry_seconds=10,
+        retry_policy=RetryPolicy(jitter=None),
+    )
+
+    # The deadline counts the time spent waiting for responses, not just between retries.
+    with mock.patch("time.monotonic", side_effect=[0.0, 4.0, 9.0, 9.7]):
+        with mock.patch("time.sleep") as mock_sleep:
+            with pytest.raises(TimeoutError, match="maximum number of retries"):
+                _ = client.get_job("job_id")
+    assert mock_get.call_count == 3
+    assert mock_sleep.call_count == 2
+
+
+@mock.patch("requests.Session.post")
 def test_superstaq_client_create_job_json(mock_post: mock.MagicMock) -> None:
     mock_post.return_value.ok = False
     mock_post.return_value.status_code = requests.codes.bad_request
-    mock_post.return_value.json.return_value = {"message": "foo bar"}
+    mock_post.return_value.content = json.dumps({"message": "foo bar"}).encode()
 
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
@@ -321,10 +581,10 @@ def test_superstaq_client_create_job_json(mock_post: mock.MagicMock) -> None:
         )
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_superstaq_client_get_job(mock_get: mock.MagicMock) -> None:
     mock_get.return_value.ok = True
-    mock_get.return_value.json.return_value = {"foo": "bar"}
+    mock_get.return_value.content = json.dumps({"foo": "bar"}).encode()
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -338,10 +598,10 @@ def test_superstaq_client_get_job(mock_get: mock.MagicMock) -> None:
     )
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_superstaq_client_get_balance(mock_get: mock.MagicMock) -> None:
     mock_get.return_value.ok = True
-    mock_get.return_value.json.return_value = {"balance": 123.4567}
+    mock_get.return_value.content = json.dumps({"balance": 123.4567}).encode()
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -355,8 +615,64 @@ def test_superstaq_client_get_balance(mock_get: mock.MagicMock) -> None:
     )
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
+@mock.patch("requests.Session.get")
+def test_superstaq_client_metadata_cache(
+    mock_get: mock.MagicMock, mock_post: mock.MagicMock
+) -> None:
+    cache = applications_superstaq.metadata_cache.MetadataCache()
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+        metadata_cache=cache,
+    )
+    mock_get.return_value.ok = True
+    mock_get.return_value.content = json.dumps({"balance": 123.4567}).encode()
+    assert client.get_balance() == client.get_balance() == {"balance": 123.4567}
+    assert client.get_backends() == client.get_backends() == {"balance": 123.4567}
+    assert mock_get.call_count == 2
+
+    # Polling jobs leaves the balance cached, but submitting work may change it.
+    mock_post.return_value.ok = True
+    mock_post.return_value.content = b"{}"
+    client.post_request("/get_jobs", {"job_ids": ["job_id"]})
+    assert client.get_balance() == {"balance": 123.4567}
+    assert mock_get.call_count == 2
+    client.tsp({"locs": ["Chicago"]})
+    assert client.get_balance() == {"balance": 123.4567}
+    assert client.get_backends() == {"balance": 123.4567}
+    assert mock_get.call_count == 3
+
+
+@mock.patch("requests.Session.post")
+@mock.patch("requests.Session.get")
+def test_superstaq_client_rate_limiter(mock_get: mock.MagicMock, mock_post: mock.MagicMock) -> None:
+    limiter = applications_superstaq.rate_limiter.RateLimiter(
+        endpoints={"/job/": applications_superstaq.rate_limiter.Limit(max_in_flight=1)}
+    )
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+        rate_limiter=limiter,
+    )
+    mock_get.return_value.ok = True
+    mock_get.return_value.content = json.dumps({"foo": "bar"}).encode()
+    mock_post.return_value.ok = True
+    mock_post.return_value.content = b"{}"
+    client.get_job("job_id")
+    client.get_balance()
+    client.tsp({"locs": ["Chicago"]})
+
+    stats = limiter.stats()
+    assert stats[""].requests == 3
+    assert stats["/job/"].requests == 1
+
+
+@mock.patch("requests.Session.post")
 def test_superstaq_client_ibmq_set_token(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -370,13 +686,14 @@ def test_superstaq_client_ibmq_set_token(mock_post: mock.MagicMock) -> None:
     mock_post.assert_called_with(
         f"http://example.com/{API_VERSION}/ibmq_token",
         headers=EXPECTED_HEADERS,
-        json=expected_json,
+        data=_body(expected_json),
         verify=False,
     )
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_resource_estimate(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -390,7 +707,7 @@ def test_superstaq_client_resource_estimate(mock_post: mock.MagicMock) -> None:
     assert mock_post.call_args[0][0] == f"http://example.com/{API_VERSION}/resource_estimate"
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_superstaq_client_get_backends(mock_get: mock.MagicMock) -> None:
     mock_get.return_value.ok = True
     backends = {
@@ -420,7 +737,7 @@ def test_superstaq_client_get_backends(mock_get: mock.MagicMock) -> None:
             "compile-only": ["aqt_keysight_qpu", "sandia_qscout_qpu"],
         }
     }
-    mock_get.return_value.json.return_value = backends
+    mock_get.return_value.content = json.dumps(backends).encode()
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -434,7 +751,7 @@ def test_superstaq_client_get_backends(mock_get: mock.MagicMock) -> None:
     )
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_superstaq_client_get_job_unauthorized(mock_get: mock.MagicMock) -> None:
     mock_get.return_value.ok = False
     mock_get.return_value.status_code = requests.codes.unauthorized
@@ -449,7 +766,7 @@ def test_superstaq_client_get_job_unauthorized(mock_get: mock.MagicMock) -> None
         _ = client.get_job("job_id")
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_superstaq_client_get_job_not_found(mock_get: mock.MagicMock) -> None:
     (mock_get.return_value).ok = False
     (mock_get.return_value).status_code = requests.codes.not_found
@@ -464,7 +781,7 @@ def test_superstaq_client_get_job_not_found(mock_get: mock.MagicMock) -> None:
         _ = client.get_job("job_id")
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_superstaq_client_get_job_not_retriable(mock_get: mock.MagicMock) -> None:
     mock_get.return_value.ok = False
     mock_get.return_value.status_code = requests.codes.bad_request
@@ -479,14 +796,16 @@ def test_superstaq_client_get_job_not_retriable(mock_get: mock.MagicMock) -> Non
         _ = client.get_job("job_id")
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_superstaq_client_get_job_retry(mock_get: mock.MagicMock) -> None:
     response1 = mock.MagicMock()
     response2 = mock.MagicMock()
     mock_get.side_effect = [response1, response2]
     response1.ok = False
     response1.status_code = requests.codes.service_unavailable
+    response1.headers = {}
     response2.ok = True
+    response2.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -497,8 +816,39 @@ def test_superstaq_client_get_job_retry(mock_get: mock.MagicMock) -> None:
     assert mock_get.call_count == 2
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.get")
+def test_superstaq_client_circuit_breaker(mock_get: mock.MagicMock) -> None:
+    breaker = applications_superstaq.circuit_breaker.CircuitBreaker(failure_threshold=2)
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+        retry_policy=RetryPolicy(jitter=None),
+        circuit_breaker=breaker,
+    )
+    mock_get.return_value.ok = False
+    mock_get.return_value.status_code = requests.codes.service_unavailable
+    mock_get.return_value.headers = {}
+    with mock.patch("time.sleep"):
+        with pytest.raises(applications_superstaq.SuperstaQCircuitOpenException):
+            _ = client.get_job("job_id")
+        with pytest.raises(applications_superstaq.SuperstaQCircuitOpenException):
+            _ = client.get_balance()
+    assert mock_get.call_count == 2
+    assert breaker.stats.rejections == 2
+
+    # Once the circuit half-opens, a failed probe opens it again.
+    mock_get.side_effect = requests.exceptions.ConnectionError()
+    with mock.patch("time.monotonic", return_value=time.monotonic() + 30), mock.patch("time.sleep"):
+        with pytest.raises(applications_superstaq.SuperstaQCircuitOpenException):
+            _ = client.get_job("job_id")
+    assert mock_get.call_count == 3
+    assert breaker.stats.opens == 2
+
+
+@mock.patch("requests.Session.post")
 def test_superstaq_client_aqt_compile(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -511,8 +861,9 @@ def test_superstaq_client_aqt_compile(mock_post: mock.MagicMock) -> None:
     assert mock_post.call_args[0][0] == f"http://example.com/{API_VERSION}/aqt_compile"
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_qscout_compile(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -525,8 +876,9 @@ def test_superstaq_client_qscout_compile(mock_post: mock.MagicMock) -> None:
     assert mock_post.call_args[0][0] == f"http://example.com/{API_VERSION}/qscout_compile"
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_cq_compile(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -539,8 +891,9 @@ def test_superstaq_client_cq_compile(mock_post: mock.MagicMock) -> None:
     assert mock_post.call_args[0][0] == f"http://example.com/{API_VERSION}/cq_compile"
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_ibmq_compile(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -555,8 +908,9 @@ def test_superstaq_client_ibmq_compile(mock_post: mock.MagicMock) -> None:
     assert mock_post.call_args[0][0] == f"http://example.com/{API_VERSION}/ibmq_compile"
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_neutral_atom_compile(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -571,8 +925,9 @@ def test_superstaq_client_neutral_atom_compile(mock_post: mock.MagicMock) -> Non
     assert mock_post.call_args[0][0] == f"http://example.com/{API_VERSION}/neutral_atom_compile"
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_submit_qubo(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -586,11 +941,13 @@ def test_superstaq_client_submit_qubo(mock_post: mock.MagicMock) -> None:
     client.submit_qubo(example_qubo, target, repetitions=repetitions)
 
     expected_json = {
-        "qubo": [
-            {"keys": ["0"], "value": 1.0},
-            {"keys": ["1"], "value": 1.0},
-            {"keys": ["0", "1"], "value": -2.0},
-        ],
+        "qubo": {
+            "format": "columnar",
+            "variables": ["0", "1"],
+            "row": [0, 1, 0],
+            "col": [0, 1, 1],
+            "value": [1.0, 1.0, -2.0],
+        },
         "backend": target,
         "shots": repetitions,
     }
@@ -598,13 +955,78 @@ def test_superstaq_client_submit_qubo(mock_post: mock.MagicMock) -> None:
     mock_post.assert_called_with(
         f"http://example.com/{API_VERSION}/qubo",
         headers=EXPECTED_HEADERS,
-        json=expected_json,
+        data=_body(expected_json),
+        verify=False,
+    )
+
+    # QUBOs can also be given as (sparse) matrices, whose terms are sent in row-major order.
+    expected_json["qubo"] = {
+        "format": "columnar",
+        "variables": ["0", "1"],
+        "row": [0, 0, 1],
+        "col": [0, 1, 1],
+        "value": [1.0, -2.0, 1.0],
+    }
+    matrix = np.array([[1.0, -1.0], [-1.0, 1.0]])
+    client.submit_qubo(scipy.sparse.csr_matrix(matrix), target, repetitions=repetitions)
+    mock_post.assert_called_with(
+        f"http://example.com/{API_VERSION}/qubo",
+        headers=EXPECTED_HEADERS,
+        data=_body(expected_json),
+        verify=False,
+    )
+    client.submit_qubo(matrix, target, repetitions=repetitions, variables=[0, 1])
+    mock_post.assert_called_with(
+        f"http://example.com/{API_VERSION}/qubo",
+        headers=EXPECTED_HEADERS,
+        data=_body(expected_json),
         verify=False,
     )
 
 
-@mock.patch("requests.post")
+def test_superstaq_client_submit_qubo_fallback() -> None:
+    client, server = _stand_in_client()
+    server.columnar_qubo = False
+    qubo = qv.QUBO({(0,): 1.0, (0, 1): -2.0})
+
+    assert client.submit_qubo(qubo, "example_target") == {"solution": "solution"}
+    assert [json.loads(request.body)["qubo"] for request in server.requests] == [
+        applications_superstaq.qubo.convert_qubo_to_columnar_model(qubo),
+        applications_superstaq.qubo.convert_qubo_to_model(qubo),
+    ]
+
+    # QUBO matrices are converted to the fallback format too.
+    server.requests.clear()
+    matrix = scipy.sparse.csr_matrix([[1.0, -2.0], [0.0, 0.0]])
+    assert client.submit_qubo(matrix, "example_target", variables=["a", "b"]) == {
+        "solution": "solution"
+    }
+    assert json.loads(server.requests[0].body)["qubo"] == [
+        {"keys": ["a"], "value": 1.0},
+        {"keys": ["a", "b"], "value": -2.0},
+    ]
+
+    # The columnar format is not sent again, and other errors are not retried.
+    server.requests.clear()
+    assert client.submit_qubo(qubo, "example_target") == {"solution": "solution"}
+    assert len(server.requests) == 1
+    with pytest.raises(applications_superstaq.SuperstaQException, match="invalid circuit"):
+        _ = client.create_job({"circuits": "fail"}, target="qpu")
+
+    client, server = _stand_in_client()
+    with mock.patch.object(server, "handle", return_value=(requests.codes.bad_request, {})):
+        with pytest.raises(applications_superstaq.SuperstaQException, match="400"):
+            _ = client.submit_qubo(qubo, "example_target")
+    assert len(server.requests) == 2
+    with mock.patch.object(server, "handle", return_value=(requests.codes.bad_request, {})):
+        with pytest.raises(applications_superstaq.SuperstaQException, match="400"):
+            _ = client.submit_qubo(qubo, "example_target")
+    assert len(server.requests) == 3
+
+
+@mock.patch("requests.Session.post")
 def test_superstaq_client_find_min_vol_portfolio(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -619,13 +1041,14 @@ def test_superstaq_client_find_min_vol_portfolio(mock_post: mock.MagicMock) -> N
     mock_post.assert_called_with(
         f"http://example.com/{API_VERSION}/minvol",
         headers=EXPECTED_HEADERS,
-        json=expected_json,
+        data=_body(expected_json),
         verify=False,
     )
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_find_max_pseudo_sharpe_ratio(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -638,13 +1061,14 @@ def test_superstaq_client_find_max_pseudo_sharpe_ratio(mock_post: mock.MagicMock
     mock_post.assert_called_with(
         f"http://example.com/{API_VERSION}/maxsharpe",
         headers=EXPECTED_HEADERS,
-        json=expected_json,
+        data=_body(expected_json),
         verify=False,
     )
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_tsp(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -657,13 +1081,14 @@ def test_superstaq_client_tsp(mock_post: mock.MagicMock) -> None:
     mock_post.assert_called_with(
         f"http://example.com/{API_VERSION}/tsp",
         headers=EXPECTED_HEADERS,
-        json=expected_json,
+        data=_body(expected_json),
         verify=False,
     )
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
 def test_superstaq_client_warehouse(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -686,13 +1111,39 @@ def test_superstaq_client_warehouse(mock_post: mock.MagicMock) -> None:
     mock_post.assert_called_with(
         f"http://example.com/{API_VERSION}/warehouse",
         headers=EXPECTED_HEADERS,
-        json=expected_json,
+        data=_body(expected_json),
         verify=False,
     )
 
 
-@mock.patch("requests.post")
+@mock.patch("requests.Session.post")
+def test_superstaq_client_result_cache(mock_post: mock.MagicMock) -> None:
+    cache = applications_superstaq.result_cache.ResultCache()
+    client = applications_superstaq.superstaq_client._SuperstaQClient(
+        client_name="applications-superstaq",
+        remote_host="http://example.com",
+        api_key="to_my_heart",
+        result_cache=cache,
+    )
+    mock_post.return_value.ok = True
+    mock_post.return_value.content = json.dumps({"route": ["Chicago"]}).encode()
+
+    for method in ("find_min_vol_portfolio", "find_max_pseudo_sharpe_ratio", "tsp", "warehouse"):
+        assert getattr(client, method)({"locs": ["Chicago"]}) == {"route": ["Chicago"]}
+        assert getattr(client, method)({"locs": ["Chicago"]}) == {"route": ["Chicago"]}
+    assert mock_post.call_count == 4
+    assert cache.stats.hits == 4
+
+    # Bypassing the cache requests (and caches) a new result.
+    mock_post.return_value.content = json.dumps({"route": ["St Louis"]}).encode()
+    assert client.tsp({"locs": ["Chicago"]}, bypass_cache=True) == {"route": ["St Louis"]}
+    assert client.tsp({"locs": ["Chicago"]}) == {"route": ["St Louis"]}
+    assert mock_post.call_count == 5
+
+
+@mock.patch("requests.Session.post")
 def test_superstaq_client_aqt_upload_configs(mock_post: mock.MagicMock) -> None:
+    mock_post.return_value.content = b"{}"
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -706,16 +1157,16 @@ def test_superstaq_client_aqt_upload_configs(mock_post: mock.MagicMock) -> None:
     mock_post.assert_called_with(
         f"http://example.com/{API_VERSION}/aqt_configs",
         headers=EXPECTED_HEADERS,
-        json=expected_json,
+        data=_body(expected_json),
         verify=False,
     )
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_superstaq_client_aqt_get_configs(mock_get: mock.MagicMock) -> None:
     expected_json = {"pulses": "Hello", "variables": "World"}
 
-    mock_get.return_value.json.return_value = expected_json
+    mock_get.return_value.content = json.dumps(expected_json).encode()
     client = applications_superstaq.superstaq_client._SuperstaQClient(
         client_name="applications-superstaq",
         remote_host="http://example.com",
@@ -724,3 +1175,269 @@ def test_superstaq_client_aqt_get_configs(mock_get: mock.MagicMock) -> None:
     )
 
     assert client.aqt_get_configs() == expected_json
+
+
+def test_superstaq_client_request_hooks() -> None:
+    traces: List[applications_superstaq.tracing.RequestTrace] = []
+    client, server = _stand_in_client(
+        default_target="qpu",
+        max_retry_seconds=0.25,
+        retry_policy=RetryPolicy(jitter=None),
+        request_hooks=[traces.append],
+    )
+    assert client.create_job({"circuits": "c0"}) == {"job_ids": ["job0"]}
+    with mock.patch("time.sleep"), pytest.raises(TimeoutError):
+        _ = client.create_job({"circuits": "busy"})
+
+    ok, busy = traces
+    request_bytes = len(server.requests[0].body)
+    assert (ok.method, ok.endpoint, ok.status_code, ok.attempts) == ("POST", "/jobs", 200, 1)
+    assert (ok.request_bytes, ok.response_bytes) == (request_bytes, len(b'{"job_ids": ["job0"]}'))
+    assert ok.error is None
+    assert ok.server_seconds is not None and ok.server_seconds <= ok.total_seconds
+    assert (busy.status_code, busy.attempts, busy.error) == (503, 3, "TimeoutError")
+    assert busy.backoff_seconds == pytest.approx(0.3)
+    assert busy.dns_seconds is busy.connect_seconds is None
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_superstaq_client_request_compression(compression: str) -> None:
+    mock_zstandard = mock.MagicMock()
+    mock_zstandard.ZstdCompressor.return_value.compress.side_effect = zlib.compress
+    mock_zstandard.ZstdDecompressor.return_value.decompress.side_effect = zlib.decompress
+
+    traces: List[applications_superstaq.tracing.RequestTrace] = []
+    with mock.patch.dict(sys.modules, {"zstandard": mock_zstandard}):
+        client, server = _stand_in_client(
+            default_target="qpu",
+            request_compression=compression,
+            compression_threshold=1000,
+            request_hooks=[traces.append],
+        )
+        server.compress_responses = True
+        assert client.create_job({"circuits": "c" * 10000}) == {"job_ids": ["job0"]}
+        assert client.create_job({"circuits": "c1"}) == {"job_ids": ["job1"]}
+        assert client.get_job("job0") == {"job_id": "job0", "status": "Queued"}
+
+    large, small, _ = server.requests
+    assert large.headers["Content-Encoding"] == compression
+    assert len(large.body) < 1000
+    assert "Content-Encoding" not in small.headers
+    assert json.loads(small.body) == {"circuits": "c1", "backend": "qpu", "shots": None}
+
+    assert traces[0].request_bytes == len(large.body)
+    large_json = {"circuits": "c" * 10000, "backend": "qpu", "shots": None}
+    assert traces[0].uncompressed_request_bytes == len(_body(large_json))
+    assert traces[1].uncompressed_request_bytes is None
+
+    with pytest.raises(AssertionError, match="compression"):
+        _ = _stand_in_client(request_compression="lzma")
+    with mock.patch.dict(sys.modules, {"zstandard": None}):
+        with pytest.raises(applications_superstaq.SuperstaQModuleNotFoundException):
+            _ = _stand_in_client(request_compression="zstd")
+
+
+@pytest.mark.parametrize("json_backend", ["json", "orjson"])
+def test_superstaq_client_json_backend(json_backend: str) -> None:
+    client, server = _stand_in_client(default_target="qpu", json_backend=json_backend)
+    assert client.json_backend.name == json_backend
+
+    # NumPy values are encoded without converting them first.
+    circuits: Dict[str, Any] = {"circuits": "c", "weights": np.array([[0.5, 1.5]])}
+    circuits["scale"] = np.float32(0.25)
+    assert client.create_job(circuits, repetitions=10) == {"job_ids": ["job0"]}
+    assert json.loads(server.requests[0].body) == {
+        "circuits": "c",
+        "weights": [[0.5, 1.5]],
+        "scale": 0.25,
+        "backend": "qpu",
+        "shots": 10,
+    }
+    assert client.get_job("job0") == {"job_id": "job0", "status": "Queued"}
+
+    with pytest.raises(applications_superstaq.SuperstaQException, match="invalid circuit"):
+        _ = client.create_job({"circuits": "fail"})
+
+
+def test_superstaq_client_find_min_vol_frontier() -> None:
+    client, server = _stand_in_client()
+    json_dict = {"stock_symbols": ["AAPL"], "desired_returns": [8.0, 9.0], "years_window": 5.0}
+    expected = [server.minvol(8.0), server.minvol(9.0)]
+    assert client.find_min_vol_frontier(json_dict) == expected
+
+    # Without the batched endpoint, each point is requested separately (from then on).
+    server.bulk_endpoint = False
+    assert client.find_min_vol_frontier(json_dict) == expected
+    assert client.find_min_vol_frontier(json_dict) == expected
+    endpoints = [request.url.rsplit("/", 1)[1] for request in server.requests]
+    assert endpoints == ["minvol_frontier", "minvol_frontier"] + ["minvol"] * 4
+    bodies = [json.loads(request.body) for request in server.requests[-2:]]
+    assert sorted(bodies, key=lambda body: body["desired_return"]) == [
+        {"stock_symbols": ["AAPL"], "years_window": 5.0, "desired_return": 8.0},
+        {"stock_symbols": ["AAPL"], "years_window": 5.0, "desired_return": 9.0},
+    ]
+
+
+def test_superstaq_client_stream_qubo() -> None:
+    traces: List[applications_superstaq.tracing.RequestTrace] = []
+    client, server = _stand_in_client(stream_threshold=3, request_hooks=[traces.append])
+    qubo = qv.QUBO({(0,): 1.0, (1,): 1.0, (0, 1): -2.0})
+    assert client.submit_qubo(qubo, "example_target") == {"solution": "solution"}
+
+    request = server.requests[-1]
+    assert request.headers["Transfer-Encoding"] == "chunked"
+    assert "Content-Length" not in request.headers
+    body = b"".join(request.body)
+    assert json.loads(body)["qubo"] == applications_superstaq.qubo.convert_qubo_to_columnar_model(
+        qubo
+    )
+    assert traces[-1].request_bytes == len(body)
+    assert traces[-1].uncompressed_request_bytes is None
+
+    # Smaller QUBOs (and QUBO matrices) are encoded at once.
+    matrix = np.array([[1.0, -2.0], [0.0, 1.0]])
+    _ = client.submit_qubo(qv.QUBO({(0,): 1.0}), "example_target")
+    _ = client.submit_qubo(matrix, "example_target")
+    _ = client.submit_qubo(scipy.sparse.csr_matrix(matrix), "example_target")
+    _ = client.submit_qubo(matrix[:1, :1], "example_target")
+    assert ["Transfer-Encoding" in request.headers for request in server.requests[-4:]] == [
+        False,
+        True,
+        True,
+        False,
+    ]
+
+    # The fallback format is streamed straight from the QUBO, compressed if enabled.
+    client, server = _stand_in_client(
+        stream_threshold=3, request_compression="gzip", request_hooks=[traces.append]
+    )
+    server.columnar_qubo = False
+    assert client.submit_qubo(qubo, "example_target") == {"solution": "solution"}
+    request = server.requests[-1]
+    assert request.headers["Content-Encoding"] == "gzip"
+    body = gzip.decompress(b"".join(request.body))
+    assert json.loads(body)["qubo"] == applications_superstaq.qubo.convert_qubo_to_model(qubo)
+    assert traces[-1].uncompressed_request_bytes == len(body)
+
+    client, server = _stand_in_client(stream_threshold=None)
+    server.columnar_qubo = False
+    _ = client.submit_qubo(matrix, "example_target")
+    assert not any("Transfer-Encoding" in request.headers for request in server.requests)
+
+
+def test_superstaq_client_submit_qubo_stream() -> None:
+    traces: List[applications_superstaq.tracing.RequestTrace] = []
+    client, server = _stand_in_client(request_hooks=[traces.append])
+    server.columnar_qubo = False
+    server.compress_responses = True
+    qubo = qv.QUBO({(0,): 1.0, (0, 1): -2.0})
+    chunks = list(client.submit_qubo_stream(qubo, "example_target", chunk_size=4))
+    assert all(len(chunk) <= 4 for chunk in chunks)
+    assert json.loads(b"".join(chunks)) == {"solution": "solution"}
+    assert [json.loads(request.body)["qubo"] for request in server.requests] == [
+        applications_superstaq.qubo.convert_qubo_to_columnar_model(qubo),
+        applications_superstaq.qubo.convert_qubo_to_model(qubo),
+    ]
+    assert traces[-1].response_bytes == 0
+
+
+def test_superstaq_client_create_jobs() -> None:
+    client, server = _stand_in_client(default_target="qpu", pool_maxsize=2)
+    assert client.create_jobs([]) == []
+
+    batch = [{"circuits": "c0"}, {"circuits": "fail"}, {"circuits": "c1"}]
+    results = client.create_jobs(batch, repetitions=10)
+    assert isinstance(results[1], applications_superstaq.SuperstaQException)
+    assert results[1].status_code == requests.codes.bad_request
+    assert "invalid circuit" in results[1].message
+    assert sorted([results[0], results[2]], key=str) == [
+        {"job_ids": ["job0"]},
+        {"job_ids": ["job1"]},
+    ]
+    request_bodies = sorted((json.loads(request.body) for request in server.requests), key=str)
+    assert request_bodies == [
+        {"circuits": "c0", "backend": "qpu", "shots": 10},
+        {"circuits": "c1", "backend": "qpu", "shots": 10},
+        {"circuits": "fail", "backend": "qpu", "shots": 10},
+    ]
+
+    # A single job is sent directly, without a thread pool.
+    with mock.patch("concurrent.futures.ThreadPoolExecutor") as mock_executor:
+        assert client.create_jobs([{"circuits": "c2"}]) == [{"job_ids": ["job2"]}]
+    mock_executor.assert_not_called()
+
+
+def test_superstaq_client_create_jobs_timeout() -> None:
+    client, _ = _stand_in_client(default_target="qpu", max_retry_seconds=0.2)
+    batch = [{"circuits": "c0"}, {"circuits": "busy"}, {"circuits": "c1"}]
+    with mock.patch("time.sleep"):
+        results = client.create_jobs(batch)
+
+    # Running out of retries for one job doesn't discard the others.
+    assert isinstance(results[1], TimeoutError)
+    assert sorted([results[0], results[2]], key=str) == [
+        {"job_ids": ["job0"]},
+        {"job_ids": ["job1"]},
+    ]
+
+    with mock.patch("time.sleep"):
+        results = client.get_jobs(["job0", "busy", "job1"], chunk_size=2)
+    assert isinstance(results[0], TimeoutError)
+    assert isinstance(results[1], TimeoutError)
+    assert results[0] is not results[1]
+    assert results[2] == {"job_id": "job1", "status": "Queued"}
+
+
+def test_superstaq_client_get_jobs() -> None:
+    client, server = _stand_in_client(default_target="qpu")
+    client.create_jobs([{"circuits": f"c{i}"} for i in range(5)])
+    server.requests.clear()
+
+    job_ids = ["job3", "job0", "missing", "job4", "job1", "forbidden", "job2"]
+    results = client.get_jobs(job_ids, chunk_size=3)
+    assert len(server.requests) == 3
+    assert sorted((json.loads(request.body) for request in server.requests), key=str) == [
+        {"job_ids": ["job2"]},
+        {"job_ids": ["job3", "job0", "missing"]},
+        {"job_ids": ["job4", "job1", "forbidden"]},
+    ]
+
+    assert results[0] == {"job_id": "job3", "status": "Queued"}
+    assert results[1] == {"job_id": "job0", "status": "Queued"}
+    assert isinstance(results[2], applications_superstaq.SuperstaQNotFoundException)
+    assert "missing" in results[2].message
+    for result in results[3:6]:
+        assert isinstance(result, applications_superstaq.SuperstaQException)
+        assert result.status_code == requests.codes.unauthorized
+    assert len({id(result) for result in results[3:6]}) == 3
+    assert results[6] == {"job_id": "job2", "status": "Queued"}
+
+    with pytest.raises(AssertionError, match="at least one"):
+        _ = client.get_jobs(job_ids, chunk_size=0)
+    client.close()
+
+
+def test_superstaq_client_get_jobs_without_bulk_endpoint() -> None:
+    client, server = _stand_in_client(default_target="qpu")
+    client.create_jobs([{"circuits": f"c{i}"} for i in range(3)])
+    server.bulk_endpoint = False
+    server.requests.clear()
+
+    results = client.get_jobs(["job2", "missing", "job0", "job1"], chunk_size=2)
+    assert results[0] == {"job_id": "job2", "status": "Queued"}
+    assert isinstance(results[1], applications_superstaq.SuperstaQNotFoundException)
+    assert results[2] == {"job_id": "job0", "status": "Queued"}
+    assert results[3] == {"job_id": "job1", "status": "Queued"}
+    assert not client._bulk_get_jobs
+
+    # Once the bulk endpoint is known to be missing, jobs are only requested individually.
+    server.requests.clear()
+    assert client.get_jobs(["job0", "job1"]) == [
+        {"job_id": "job0", "status": "Queued"},
+        {"job_id": "job1", "status": "Queued"},
+    ]
+    assert sorted(request.path_url for request in server.requests) == [
+        f"/{API_VERSION}/job/job0",
+        f"/{API_VERSION}/job/job1",
+    ]
+    client.close()
@@ -18,6 +18,21 @@ class SuperstaQException(Exception):
         self.message = message
 
 
+class SuperstaQCircuitOpenException(SuperstaQException):
+    """An exception for requests rejected (without being sent) because SuperstaQ's API is failing.
+
+    Attributes:
+        retry_in: The time (in seconds) until requests are sent to SuperstaQ's API again.
+    """
+
+    def __init__(self, retry_in: float):
+        super().__init__(
+            "Too many requests to SuperstaQ API failed, not sending requests for another "
+            f"{retry_in:.3g} seconds."
+        )
+        self.retry_in = retry_in
+
+
 class SuperstaQModuleNotFoundException(SuperstaQException):
     """
     An exception for SuperstaQ features requiring an uninstalled module."""
@@ -21,6 +21,16 @@ def test_superstaq_exception() -> None:
     assert ex.message == "Hello"
 
 
+def test_superstaq_circuit_open_exception() -> None:
+    ex = applications_superstaq.SuperstaQCircuitOpenException(retry_in=12.5)
+    assert str(ex) == (
+        "Status code: None, Message: 'Too many requests to SuperstaQ API failed, not sending "
+        "requests for another 12.5 seconds.'"
+    )
+    assert ex.status_code is None
+    assert ex.retry_in == 12.5
+
+
 def test_module_not_found_exception() -> None:
     ex = applications_superstaq.SuperstaQModuleNotFoundException("hello_world", "test")
     assert str(ex) == "Status code: None, Message: ''test' requires module 'hello_world''"
@@ -0,0 +1,219 @@
+"""Hooks observing the latency and size of requests to SuperstaQ's API."""
+
+import collections
+import dataclasses
+import json
+import logging
+import threading
+from typing import Callable, DefaultDict, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclasses.dataclass
+class RequestTrace:
+    """The timings and sizes of one request to SuperstaQ's API, including any retries.
+
+    Sizes, the status code and the connection timings are those of the final attempt. Timings which
+    could not be measured are None: the synchronous client (built on `requests`) cannot observe DNS
+    resolution or connection setup separately, so its `server_seconds` includes any connection
+    setup. Neither client can time TLS handshakes separately from connecting.
+
+    Attributes:
+        method: The http method of the request (e.g. "GET").
+        endpoint: The API endpoint the request was sent to.
+        status_code: The http status code of the final response, or None if there was none.
+        attempts: The number of times the request was sent.
+        request_bytes: The size of the request body (as sent, i.e. after any compression).
+        uncompressed_request_bytes: The size of the request body before compression, or None if it
+            was not compressed.
+        response_bytes: The size of the response body.
+        backoff_seconds: The total time spent waiting between attempts.
+        total_seconds: The time from the first attempt until the request succeeded or failed.
+        dns_seconds: The time spent resolving the API's hostname, if a new connection was opened.
+        connect_seconds: The time spent opening a new connection (including the TLS handshake), if
+            one was opened.
+        server_seconds: The time from sending the request until the response headers arrived.
+        error: The type of the exception the request failed with, if any.
+    """
+
+    method: str
+    endpoint: str
+    status_code: Optional[int] = None
+    attempts: int = 0
+    request_bytes: int = 0
+    uncompressed_request_bytes: Optional[int] = None
+    response_bytes: int = 0
+    backoff_seconds: float = 0.0
+    total_seconds: float = 0.0
+    dns_seconds: Optional[float] = None
+    connect_seconds: Optional[float] = None
+    server_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def retries(self) -> int:
+        """The number of times the request was retried."""
+        return max(self.attempts - 1, 0)
+
+    def start_attempt(self) -> None:
+        """Counts another attempt, forgetting the sizes and timings of the previous one."""
+        self.attempts += 1
+        self.status_code = None
+        self.request_bytes = self.response_bytes = 0
+        self.dns_seconds = self.connect_seconds = self.server_seconds = None
+
+
+RequestHook = Callable[[RequestTrace], None]
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# The counters (and their descriptions) aggregated by `PrometheusMetrics`.
+_COUNTERS = {
+    "requests_total": "Requests to SuperstaQ's API, by final status code.",
+    "retries_total": "Retries of requests to SuperstaQ's API.",
+    "backoff_seconds_total": "Time spent waiting between attempts at requests.",
+    "request_bytes_total": "Bytes sent in the bodies of requests.",
+    "request_uncompressed_bytes_total": "Bytes in the bodies of requests, before compression.",
+    "response_bytes_total": "Bytes received in the bodies of responses.",
+}
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclasses.dataclass
+class _Histogram:
+    # The number of observations in each bucket (not cumulatively, with a final bucket of +Inf).
+    counts: List[int]
+    total: float = 0.0
+
+
+class PrometheusMetrics:
+    """A request hook aggregating traces into a Prometheus-style metrics registry.
+
+    Requests are counted (by method, endpoint and status code) and their durations collected in a
+    histogram, so that slow endpoints stand out. The compression ratio of request bodies is reported
+    per endpoint. The metrics are exposed in Prometheus' text format by `render`, e.g. to be served
+    by an application's `/metrics` endpoint.
+
+    Endpoints are labelled by their first path segment (e.g. "/job" for "/job/<job_id>"), to keep
+    the number of time series bounded.
+    """
+
+    def __init__(
+        self, namespace: str = "superstaq_client", buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """Creates a PrometheusMetrics registry.
+
+        Args:
+            namespace: The prefix of the name of every metric.
+            buckets: The upper bounds (in seconds) of the buckets of the request duration histogram.
+        """
+        assert list(buckets) == sorted(buckets), "Histogram buckets must be sorted."
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+
+        self._lock = threading.Lock()
+        self._counters: DefaultDict[Tuple[str, _Labels], float] = collections.defaultdict(float)
+        self._histograms: Dict[_Labels, _Histogram] = {}
+
+    def __call__(self, trace: RequestTrace) -> None:
+        labels = (("method", trace.method), ("endpoint", self.endpoint_label(trace.endpoint)))
+        status = "error" if trace.status_code is None else str(trace.status_code)
+        bucket = next(
+            (i for i, bound in enumerate(self.buckets) if trace.total_seconds <= bound),
+            len(self.buckets),
+        )
+        with self._lock:
+            self._counters["requests_total", labels + (("status", status),)] += 1
+            self._counters["retries_total", labels] += trace.retries
+            self._counters["backoff_seconds_total", labels] += trace.backoff_seconds
+            self._counters["request_bytes_total", labels] += trace.request_bytes
+            self._counters["request_uncompressed_bytes_total", labels] += (
+                trace.request_bytes
+                if trace.uncompressed_request_bytes is None
+                else trace.uncompressed_request_bytes
+            )
+            self._counters["response_bytes_total", labels] += trace.response_bytes
+
+            histogram = self._histograms.setdefault(
+                labels, _Histogram([0] * (len(self.buckets) + 1))
+            )
+            histogram.counts[bucket] += 1
+            histogram.total += trace.total_seconds
+
+    @staticmethod
+    def endpoint_label(endpoint: str) -> str:
+        """Returns the label of an endpoint, i.e. its first path segment."""
+        return "/" + endpoint.split("/")[1]
+
+    def render(self) -> str:
+        """Returns the metrics in Prometheus' text exposition format."""
+        with self._lock:
+            lines = self._render_counters() + self._render_ratios() + self._render_histograms()
+        return "\n".join(lines) + "\n"
+
+    def _render_counters(self) -> List[str]:
+        lines = []
+        for name, description in _COUNTERS.items():
+            metric = f"{self.namespace}_{name}"
+            lines += [f"# HELP {metric} {description}", f"# TYPE {metric} counter"]
+            for (counter, labels), value in sorted(self._counters.items()):
+                if counter == name:
+                    lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+        return lines
+
+    def _render_ratios(self) -> List[str]:
+        metric = f"{self.namespace}_request_compression_ratio"
+        lines = [
+            f"# HELP {metric} The size of request bodies before compression, over their size sent.",
+            f"# TYPE {metric} gauge",
+        ]
+        for (counter, labels), sent in sorted(self._counters.items()):
+            if counter == "request_bytes_total" and sent:
+                uncompressed = self._counters["request_uncompressed_bytes_total", labels]
+                lines.append(f"{metric}{_format_labels(labels)} {uncompressed / sent:g}")
+        return lines
+
+    def _render_histograms(self) -> List[str]:
+        metric = f"{self.namespace}_request_duration_seconds"
+        lines = [
+            f"# HELP {metric} Durations of requests to SuperstaQ's API, including retries.",
+            f"# TYPE {metric} histogram",
+        ]
+        for labels, histogram in sorted(self._histograms.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                bucket_labels = labels + (("le", f"{bound:g}".replace("inf", "+Inf")),)
+                lines.append(f"{metric}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.total:g}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+def _format_labels(labels: _Labels) -> str:
+    pairs = []
+    for name, value in labels:
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class JsonLogger:
+    """A request hook logging every trace as a single-line JSON object (for structured logging)."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        """Creates a JsonLogger.
+
+        Args:
+            logger: The logger to log traces to. Defaults to the
+                "applications_superstaq.requests" logger.
+            level: The level to log traces at.
+        """
+        self.logger = logger or logging.getLogger("applications_superstaq.requests")
+        self.level = level
+
+    def __call__(self, trace: RequestTrace) -> None:
+        if self.logger.isEnabledFor(self.level):
+            record = {"event": "superstaq_request", **dataclasses.asdict(trace)}
+            record["retries"] = trace.retries
+            self.logger.log(self.level, json.dumps(record, sort_keys=True))
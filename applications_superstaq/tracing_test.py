@@ -0,0 +1,123 @@
+import json
+import logging
+
+import pytest
+
+from applications_superstaq.tracing import JsonLogger, PrometheusMetrics, RequestTrace
+
+
+def test_request_trace() -> None:
+    trace = RequestTrace("GET", "/job/job_id")
+    assert trace.retries == 0
+
+    trace.start_attempt()
+    trace.status_code = 503
+    trace.request_bytes = trace.response_bytes = 10
+    trace.server_seconds = 1.0
+    trace.start_attempt()
+    assert trace == RequestTrace("GET", "/job/job_id", attempts=2)
+    assert trace.retries == 1
+
+
+def test_prometheus_metrics() -> None:
+    metrics = PrometheusMetrics(namespace="test", buckets=[0.5, 1.0])
+    metrics(RequestTrace("GET", "/job/a", status_code=200, attempts=1, total_seconds=0.25))
+    metrics(
+        RequestTrace(
+            "GET",
+            "/job/b",
+            status_code=200,
+            attempts=3,
+            response_bytes=100,
+            backoff_seconds=0.3,
+            total_seconds=2.0,
+        )
+    )
+    metrics(
+        RequestTrace(
+            "POST",
+            '/my"\\endpoint',
+            attempts=1,
+            request_bytes=20,
+            uncompressed_request_bytes=50,
+            error="Error",
+        )
+    )
+
+    get = 'method="GET",endpoint="/job"'
+    post = 'method="POST",endpoint="/my\\"\\\\endpoint"'
+    assert metrics.render().splitlines() == [
+        "# HELP test_requests_total Requests to SuperstaQ's API, by final status code.",
+        "# TYPE test_requests_total counter",
+        f'test_requests_total{{{get},status="200"}} 2',
+        f'test_requests_total{{{post},status="error"}} 1',
+        "# HELP test_retries_total Retries of requests to SuperstaQ's API.",
+        "# TYPE test_retries_total counter",
+        f"test_retries_total{{{get}}} 2",
+        f"test_retries_total{{{post}}} 0",
+        "# HELP test_backoff_seconds_total Time spent waiting between attempts at requests.",
+        "# TYPE test_backoff_seconds_total counter",
+        f"test_backoff_seconds_total{{{get}}} 0.3",
+        f"test_backoff_seconds_total{{{post}}} 0",
+        "# HELP test_request_bytes_total Bytes sent in the bodies of requests.",
+        "# TYPE test_request_bytes_total counter",
+        f"test_request_bytes_total{{{get}}} 0",
+        f"test_request_bytes_total{{{post}}} 20",
+        "# HELP test_request_uncompressed_bytes_total Bytes in the bodies of requests, before "
+        "compression.",
+        "# TYPE test_request_uncompressed_bytes_total counter",
+        f"test_request_uncompressed_bytes_total{{{get}}} 0",
+        f"test_request_uncompressed_bytes_total{{{post}}} 50",
+        "# HELP test_response_bytes_total Bytes received in the bodies of responses.",
+        "# TYPE test_response_bytes_total counter",
+        f"test_response_bytes_total{{{get}}} 100",
+        f"test_response_bytes_total{{{post}}} 0",
+        "# HELP test_request_compression_ratio The size of request bodies before compression, over "
+        "their size sent.",
+        "# TYPE test_request_compression_ratio gauge",
+        f"test_request_compression_ratio{{{post}}} 2.5",
+        "# HELP test_request_duration_seconds Durations of requests to SuperstaQ's API, including "
+        "retries.",
+        "# TYPE test_request_duration_seconds histogram",
+        f'test_request_duration_seconds_bucket{{{get},le="0.5"}} 1',
+        f'test_request_duration_seconds_bucket{{{get},le="1"}} 1',
+        f'test_request_duration_seconds_bucket{{{get},le="+Inf"}} 2',
+        f"test_request_duration_seconds_sum{{{get}}} 2.25",
+        f"test_request_duration_seconds_count{{{get}}} 2",
+        f'test_request_duration_seconds_bucket{{{post},le="0.5"}} 1',
+        f'test_request_duration_seconds_bucket{{{post},le="1"}} 1',
+        f'test_request_duration_seconds_bucket{{{post},le="+Inf"}} 1',
+        f"test_request_duration_seconds_sum{{{post}}} 0",
+        f"test_request_duration_seconds_count{{{post}}} 1",
+    ]
+
+    with pytest.raises(AssertionError, match="sorted"):
+        _ = PrometheusMetrics(buckets=[1.0, 0.5])
+
+
+def test_json_logger(caplog: pytest.LogCaptureFixture) -> None:
+    trace = RequestTrace("GET", "/balance", status_code=200, attempts=2)
+    with caplog.at_level(logging.INFO, logger="applications_superstaq.requests"):
+        JsonLogger()(trace)
+        JsonLogger(level=logging.DEBUG)(trace)
+
+    assert len(caplog.records) == 1
+    assert caplog.records[0].levelno == logging.INFO
+    record = json.loads(caplog.records[0].getMessage())
+    assert record == {
+        "event": "superstaq_request",
+        "method": "GET",
+        "endpoint": "/balance",
+        "status_code": 200,
+        "attempts": 2,
+        "retries": 1,
+        "request_bytes": 0,
+        "uncompressed_request_bytes": None,
+        "response_bytes": 0,
+        "backoff_seconds": 0.0,
+        "total_seconds": 0.0,
+        "dns_seconds": None,
+        "connect_seconds": None,
+        "server_seconds": None,
+        "error": None,
+    }
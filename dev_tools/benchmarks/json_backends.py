@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Compares the encode and decode throughput of the JSON backends on `/qubo` request bodies.
+
+Each backend that is installed encodes a random sparse QUBO in each of the request formats, and then
+decodes the result (taking the best of several repeats). The "columnar (NumPy)" format leaves the
+columns as NumPy arrays, which orjson encodes straight from their buffers. For example:
+
+    dev_tools/benchmarks/json_backends.py --variables 2000 --density 0.05
+"""
+
+import argparse
+import textwrap
+import time
+from typing import Any, Callable, Dict
+
+import scipy.sparse
+
+import applications_superstaq
+
+
+def _request_bodies(num_variables: int, density: float) -> Dict[str, Any]:
+    """Builds the body of a `/qubo` request for a random QUBO in each format."""
+    matrix = scipy.sparse.random(num_variables, num_variables, density=density, random_state=0)
+    columnar = applications_superstaq.qubo.convert_matrix_to_columnar_model(matrix)
+    row, col, value = applications_superstaq.qubo._matrix_to_arrays(matrix)
+    qubo = applications_superstaq.qubo.convert_model_to_qubo(columnar)
+    models = {
+        "list of dictionaries": applications_superstaq.qubo.convert_qubo_to_model(qubo),
+        "columnar": columnar,
+        "columnar (NumPy)": {**columnar, "row": row, "col": col, "value": value},
+    }
+    return {
+        name: {"qubo": model, "backend": "dwave_sampler", "shots": 1000}
+        for name, model in models.items()
+    }
+
+
+def _best_seconds(func: Callable[[], Any], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=textwrap.dedent(__doc__ or ""),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--variables", type=int, default=2000, help="Number of QUBO variables.")
+    parser.add_argument("--density", type=float, default=0.05, help="Fraction of nonzero terms.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of timed repeats.")
+    args = parser.parse_args()
+
+    backends = []
+    for name in applications_superstaq.json_backend.BACKENDS:
+        try:
+            backends.append(applications_superstaq.json_backend.get_backend(name))
+        except applications_superstaq.SuperstaQModuleNotFoundException:
+            print(f"Skipping {name} (not installed)")
+
+    for format_name, body in _request_bodies(args.variables, args.density).items():
+        print(f"{format_name}:")
+        for backend in backends:
+            encoded = backend.dumps(body)
+            size_mb = len(encoded) / 2**20
+            encode_seconds = _best_seconds(lambda: backend.dumps(body), args.repeats)
+            decode_seconds = _best_seconds(lambda: backend.loads(encoded), args.repeats)
+            print(
+                f"  {backend.name}: {size_mb:.1f} MB, encode {size_mb / encode_seconds:.0f} MB/s, "
+                f"decode {size_mb / decode_seconds:.0f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
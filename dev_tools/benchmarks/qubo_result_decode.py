@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Compares the peak memory used to decode a QUBO solution recarray, with and without pickle.
+
+Each decode runs in a fresh subprocess, which reports how far its peak resident set size (RSS)
+rose above its RSS just before decoding (excluding earlier allocations requires Linux procfs).
+For example:
+
+    dev_tools/benchmarks/qubo_result_decode.py --shots 10000 --variables 1000
+"""
+
+import argparse
+import os
+import pickle
+import resource
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+import numpy as np
+
+import applications_superstaq
+
+MODES = {
+    "pickle": "legacy pickle + base64 (`converters.deserialize`)",
+    "binary": "binary frame + base64 (`qubo.read_json_qubo_result`)",
+    "mmap": "memory-mapped binary file (`converters.decode_file`)",
+}
+
+
+def _reset_peak_rss() -> None:
+    """Resets the peak RSS to the current RSS (on Linux), so earlier allocations are not counted."""
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+    except OSError:
+        pass
+
+
+def _rss_mb(field: str) -> float:
+    """Returns the current ("VmRSS") or peak ("VmHWM") RSS of this process."""
+    try:
+        with open("/proc/self/status") as file:
+            lines = [line.split() for line in file if line.startswith(field + ":")]
+        return int(lines[0][1]) / 2**10
+    except OSError:
+        # Without procfs, fall back to the peak so far (in bytes on macOS, kilobytes elsewhere).
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def _solutions(shots: int, num_variables: int) -> np.recarray:
+    rng = np.random.default_rng(0)
+    solutions = np.empty(
+        shots,
+        dtype=[("solution", "i1", (num_variables,)), ("energy", "<f8"), ("num_occurrences", "<i8")],
+    )
+    solutions["solution"] = rng.integers(0, 2, size=(shots, num_variables))
+    solutions["energy"] = rng.normal(size=shots)
+    solutions["num_occurrences"] = 1
+    return solutions.view(np.recarray)
+
+
+def _write_inputs(directory: str, shots: int, num_variables: int) -> None:
+    solutions = _solutions(shots, num_variables)
+    with open(os.path.join(directory, "pickle.txt"), "w") as file:
+        file.write(applications_superstaq.converters._bytes_to_str(pickle.dumps(solutions)))
+    with open(os.path.join(directory, "binary.txt"), "w") as file:
+        file.write(applications_superstaq.converters.serialize(solutions))
+    applications_superstaq.converters.encode_to_file(
+        solutions, os.path.join(directory, "mmap.ssqb")
+    )
+
+
+def _decode(directory: str, mode: str) -> None:
+    """Decodes one input in this process, and prints the growth of its peak RSS and the time."""
+    if mode == "mmap":
+        path = os.path.join(directory, "mmap.ssqb")
+        _reset_peak_rss()
+        before = _rss_mb("VmRSS")
+        start = time.perf_counter()
+        solutions = applications_superstaq.converters.decode_file(path)
+    else:
+        with open(os.path.join(directory, f"{mode}.txt")) as file:
+            json_dict = {"solution": file.read()}
+        _reset_peak_rss()
+        before = _rss_mb("VmRSS")
+        start = time.perf_counter()
+        solutions = applications_superstaq.qubo.read_json_qubo_result(json_dict)
+
+    # Touch every energy, as a typical consumer would.
+    _ = float(np.min(solutions.energy))
+    elapsed = time.perf_counter() - start
+    print(f"{_rss_mb('VmHWM') - before:.1f} {elapsed:.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=textwrap.dedent(__doc__ or ""),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--shots", type=int, default=10000, help="Number of samples.")
+    parser.add_argument("--variables", type=int, default=1000, help="Number of QUBO variables.")
+    parser.add_argument("--decode", nargs=2, metavar=("DIR", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.decode:
+        _decode(*args.decode)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        _write_inputs(directory, args.shots, args.variables)
+        size_mb = args.shots * (args.variables + 16) / 2**20
+        print(f"{args.shots} shots x {args.variables} variables ({size_mb:.1f} MB of solutions)")
+        for mode, description in MODES.items():
+            output = subprocess.check_output(
+                [sys.executable, __file__, "--decode", directory, mode], text=True
+            )
+            peak_rss_mb, seconds = output.split()
+            print(f"  {description}: +{peak_rss_mb} MB peak RSS, {seconds} s")
+
+
+if __name__ == "__main__":
+    main()
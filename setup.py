@@ -21,6 +21,14 @@ requirements = [r.strip() for r in requirements]
 dev_requirements = open("dev-requirements.txt").readlines()
 dev_requirements = [r.strip() for r in dev_requirements]
 
+# Optional dependencies, e.g. installed with 'pip install applications-superstaq[async]'
+extras_requirements = {
+    "async": ["aiohttp~=3.9"],
+    "lz4": ["lz4~=4.0"],
+    "orjson": ["orjson~=3.8"],
+    "zstd": ["zstandard~=0.22"],
+}
+
 # Sanity check
 assert __version__, "Version string cannot be empty"
 
@@ -35,9 +43,9 @@ setup(
     url="https://github.com/SupertechLabs/applications-superstaq",
     author="Super.tech",
     author_email="pranav@super.tech",
-    python_requires=(">=3.6.0"),
+    python_requires=(">=3.7.0"),
     install_requires=requirements,
-    extras_require={"dev": dev_requirements},
+    extras_require={"dev": dev_requirements, **extras_requirements},
     license="Apache 2",
     description=description,
     long_description=long_description,